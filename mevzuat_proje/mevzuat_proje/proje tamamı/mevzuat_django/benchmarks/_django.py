@@ -0,0 +1,40 @@
+# benchmarks/_django.py
+#
+# Veritabanı kullanan benchmark'lar için ortak Django kurulumu.
+# Gerçek db.sqlite3'e DOKUNMAZ: geçici bir SQLite dosyası oluşturup
+# migration'ları onun üzerinde çalıştırır.
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# mevzuat_backend / mevzuat_parca import edilebilsin diye proje kökü
+PROJE_KOKU = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJE_KOKU))
+
+
+def django_kur(db_path=None):
+    """
+    Django'yu geçici bir SQLite veritabanıyla başlatır ve migrate eder.
+    Dönüş: kullanılan veritabanı dosyasının yolu.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mevzuat_backend.settings")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark-only")
+    # Yeniden eşleştirme kuyruğu arka planda işlenmesin: ölçülen çağrıyla yarışır
+    os.environ.setdefault("MEVZUAT_ESLESTIRME_ARKA_PLAN", "0")
+
+    import django
+    from django.conf import settings
+
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp(prefix="mevzuat_bench_")) / "bench.sqlite3"
+
+    # Bağlantı henüz açılmadı → DB yolunu değiştirmek güvenli
+    settings.DATABASES["default"]["NAME"] = str(db_path)
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    return Path(db_path)
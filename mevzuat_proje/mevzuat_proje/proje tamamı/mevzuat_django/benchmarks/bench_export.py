@@ -0,0 +1,98 @@
+# benchmarks/bench_export.py
+#
+# Portföy dışa aktarımı (GET /api/export/portfolio/): ilk bayt süresi, toplam süre ve tepe
+# Python belleği (tracemalloc) — yükümlülük sayısı büyürken bellek sabit kalmalı.
+# Yükümlülükler INSERT ... SELECT (şirket × düzenleme) ile üretilir; ORM ile 1M satır yazmak
+# ölçülen şeyden uzun sürerdi.
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_export.py                          # 10k şirket × 100 → 1M yükümlülük
+#   python benchmarks/bench_export.py --companies 1000 --per-company 100
+
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from _django import django_kur
+
+
+def olc(client, url):
+    """(ilk bayt sn, toplam sn, bayt) — yanıt gövdesi tüketilir ama saklanmaz."""
+    t0 = time.perf_counter()
+    resp = client.get(url, HTTP_HOST="localhost")
+    akis = iter(resp.streaming_content)
+    boyut = len(next(akis))
+    ilk = time.perf_counter() - t0
+    for blok in akis:
+        boyut += len(blok)
+    return ilk, time.perf_counter() - t0, boyut
+
+
+def tepe_bellek(client, url) -> float:
+    tracemalloc.start()
+    for _ in client.get(url, HTTP_HOST="localhost").streaming_content:
+        pass
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tepe / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=10000, help="Şirket sayısı")
+    parser.add_argument("--per-company", type=int, default=100, help="Şirket başına yükümlülük")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    django_kur()
+
+    from django.db import connection
+    from django.test import Client
+
+    from mevzuat_parca.models import Duzenleme, Sirket, SirketObligation
+    from mevzuat_parca.skorlama import skorlari_yenile
+
+    Sirket.objects.bulk_create(
+        Sirket(name=f"Şirket {i}", sector=["yazilim", "imalat"][i % 2], employee_count=10, location_city="Ankara")
+        for i in range(args.companies)
+    )
+    Duzenleme.objects.bulk_create(
+        Duzenleme(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 1, 1), raw_text="",
+                  impact_type=["zorunlu", "risk", "opsiyonel_tesvik"][i % 3])
+        for i in range(args.per_company)
+    )
+    bugun = date.today()
+    tablo = SirketObligation._meta.db_table
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            INSERT INTO {tablo} (sirket_id, duzenleme_id, is_applicable, is_compliant, due_date,
+                                 risk_level, created_at, updated_at, match_state)
+            SELECT s.id, d.id, 1, (s.id + d.id) % 3 = 0, date(%s, ((s.id * 7 + d.id) % 60 - 20) || ' days'),
+                   CASE (s.id + d.id) % 2 WHEN 0 THEN 'low' ELSE 'high' END,
+                   datetime('now'), datetime('now'), 'manual'
+            FROM {Sirket._meta.db_table} s CROSS JOIN {Duzenleme._meta.db_table} d
+            """,
+            [bugun.isoformat()],
+        )
+    skorlari_yenile()
+    toplam = SirketObligation.objects.count()
+
+    client = Client()
+    # ısınma (import'lar, URL çözümleme): boş sektörle, akış hemen biter
+    b"".join(client.get("/api/export/portfolio/?sector=yok", HTTP_HOST="localhost").streaming_content)
+    print(f"{args.companies} şirket, {toplam} yükümlülük "
+          f"({SirketObligation.objects.filter(is_compliant=False).count()} açık)\n")
+    print(f"{'':<10} {'ilk bayt (ms)':>14} {'toplam (sn)':>12} {'boyut (MB)':>11} {'satır/sn':>10} {'tepe bellek (MB)':>17}")
+    for bicim in ("ndjson", "csv"):
+        url = f"/api/export/portfolio/?format={bicim}"
+        ilk, sure, boyut = olc(client, url)
+        bellek = tepe_bellek(client, url)
+        print(f"{bicim:<10} {ilk * 1000:>14.1f} {sure:>12.2f} {boyut / 2**20:>11.1f} "
+              f"{toplam / sure:>10,.0f} {bellek:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
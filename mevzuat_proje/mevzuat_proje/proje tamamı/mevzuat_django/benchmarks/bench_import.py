@@ -0,0 +1,119 @@
+# benchmarks/bench_import.py
+#
+# Toplu şirket içe aktarımı: şirket başına POST /api/companies/ vs import_companies
+# (batch doğrulama + bulk_create), eşleştirmesiz ve --match ile.
+# POST döngüsü örnek üzerinde ölçülür (--sample), satır/sn olarak karşılaştırılır.
+# Dosyanın ~%2'si hatalı satır (geçersiz sektör / çalışan sayısı): raporlanıp atlanır.
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_import.py                      # 100k satırlık CSV, 40 düzenleme
+#   python benchmarks/bench_import.py --count 20000 --regulations 200
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from io import StringIO
+from itertools import islice
+from pathlib import Path
+
+from _django import django_kur
+
+ANAHTARLAR = ("yazilim", "imalat", "perakende", "lojistik")
+SEHIRLER = ("Ankara", "İstanbul", "İzmir", "Bursa", "Mersin", "Kocaeli")
+
+
+def dosya_uret(yol: Path, count: int):
+    rnd = random.Random(24)
+    sektorler = [*ANAHTARLAR, "İmalat"]
+    with open(yol, "w", encoding="utf-8", newline="") as f:
+        yazici = csv.writer(f)
+        yazici.writerow(["name", "sector", "employee_count", "location_city", "is_exporter", "unvan"])
+        for i in range(count):
+            hatali = rnd.random() < 0.02
+            yazici.writerow([
+                f"Bağlı Şirket {i}",
+                "madencilik" if hatali and i % 2 else rnd.choice(sektorler),
+                "-5" if hatali and not i % 2 else rnd.randint(1, 5000),
+                rnd.choice(SEHIRLER),
+                rnd.choice(["evet", "hayır", "true", "0"]),
+                f"Bağlı Şirket {i} A.Ş.",
+            ])
+
+
+def olc(fn):
+    """(saniye, sorgu sayısı, sonuç)"""
+    from django.db import connection
+
+    sayac = [0]
+
+    def say(execute, sql, params, many, context):
+        sayac[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(say):
+        t0 = time.perf_counter()
+        sonuc = fn()
+        return time.perf_counter() - t0, sayac[0], sonuc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000, help="Dosyadaki şirket satırı")
+    parser.add_argument("--regulations", type=int, default=40, help="Eşleştirilecek düzenleme sayısı")
+    parser.add_argument("--sample", type=int, default=2000, help="POST döngüsünde ölçülen satır")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    django_kur()
+
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+
+    from mevzuat_parca.models import Duzenleme, SirketObligation
+
+    Duzenleme.objects.bulk_create(
+        Duzenleme(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 1, 1), raw_text="",
+                  sectors=[ANAHTARLAR[i % 4]] if i % 5 else [],
+                  tags=["ihracat"] if i % 5 == 0 else [], impact_type=["zorunlu", "risk", None][i % 3])
+        for i in range(args.regulations)
+    )
+
+    klasor = Path(tempfile.mkdtemp(prefix="mevzuat_import_"))
+    yol = klasor / "sirketler.csv"
+    dosya_uret(yol, args.count)
+    with open(yol, encoding="utf-8") as f:
+        # Serializer sektör etiketini ("İmalat") ve "evet"i tanımaz: POST'a sadece anahtar sektörlü geçerli satırlar
+        ornek = [s for s in islice(csv.DictReader(f), args.sample)
+                 if s["sector"] in ANAHTARLAR and not s["employee_count"].startswith("-")]
+
+    api = APIClient()
+
+    def post_dongusu():
+        for satir in ornek:
+            resp = api.post("/api/companies/", {**satir, "is_exporter": satir["is_exporter"] in ("evet", "true")},
+                            format="json", HTTP_HOST="localhost")
+            assert resp.status_code == 201, resp.content
+
+    def komut(*ek):
+        out = StringIO()
+        call_command("import_companies", str(yol), *ek, stdout=out, stderr=StringIO())
+        return out.getvalue().strip()
+
+    print(f"{args.count} satır ({yol.stat().st_size / 2**20:.1f} MB CSV), {args.regulations} düzenleme\n")
+    print(f"{'':<34} {'süre (sn)':>10} {'sorgu':>9} {'satır/sn':>10}")
+    sure, sorgu, _ = olc(post_dongusu)
+    print(f"{f'POST döngüsü ({len(ornek)} satır)':<34} {sure:>10.2f} {sorgu:>9} {len(ornek) / sure:>10,.0f}"
+          f"   → {args.count} satır ~{args.count * sure / len(ornek):.0f} sn")
+    for ad, ek in (("import_companies", ()), ("import_companies --match", ("--match",))):
+        onceki = SirketObligation.objects.count()
+        sure, sorgu, ozet = olc(lambda: komut(*ek))
+        print(f"{ad:<34} {sure:>10.2f} {sorgu:>9} {args.count / sure:>10,.0f}   {ozet}")
+    print(f"\n--match ile açılan yükümlülük: {SirketObligation.objects.count() - onceki}")
+
+
+if __name__ == "__main__":
+    main()
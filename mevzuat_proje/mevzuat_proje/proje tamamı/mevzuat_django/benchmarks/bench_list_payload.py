@@ -0,0 +1,86 @@
+# benchmarks/bench_list_payload.py
+#
+# GET /api/Duzenlemes/ yanıt boyutu ve gecikmesi (p50 / p95):
+#   - eski: tüm alanlar + tam metin (?include=raw_text eski "__all__" çıktısının aynısı;
+#           metin sorguda da okunur)
+#   - yeni: liste gösterimi (raw_text yok, sorguda defer)
+#   - ?fields=id,title,publish_date
+#   - keyset sayfa (?page_size=50)
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_list_payload.py                    # 2000 düzenleme × ~3000 kelime
+#   python benchmarks/bench_list_payload.py --count 500 --runs 30
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+from bench_raw_text import sozluk_uret
+
+
+def adaylar_uret(count: int, kelime_sayisi: int):
+    rnd = random.Random(1)
+    sozluk = sozluk_uret(rnd)
+    bugun = date(2025, 12, 31)
+    for i in range(count):
+        yield {
+            "source": "resmi_gazete",
+            "title": f"Tebliğ {i}",
+            "publish_date": bugun - timedelta(days=i % 3650),
+            "raw_text": " ".join(rnd.choices(sozluk, k=kelime_sayisi)),
+        }
+
+
+def olc(client, url, runs: int):
+    """(yanıt boyutu KB, p50 ms, p95 ms)"""
+    client.get(url, HTTP_HOST="localhost")  # ısınma
+    sureler, boyut = [], 0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        resp = client.get(url, HTTP_HOST="localhost")
+        sureler.append((time.perf_counter() - t0) * 1000)
+        assert resp.status_code == 200, resp.status_code
+        boyut = len(resp.content)
+    sureler.sort()
+    p95 = sureler[min(len(sureler) - 1, int(round(0.95 * (len(sureler) - 1))))]
+    return boyut / 1024, statistics.median(sureler), p95
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000, help="Düzenleme sayısı")
+    parser.add_argument("--words", type=int, default=3000, help="Düzenleme başına kelime")
+    parser.add_argument("--runs", type=int, default=20, help="Senaryo başına istek sayısı")
+    args = parser.parse_args()
+
+    # DEBUG'da connection.queries bellekte birikir; ölçümü bozmasın
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    django_kur()
+
+    from django.test import Client
+
+    from mevzuat_parca.toplu_yazma import duzenlemeleri_upsert
+
+    duzenlemeleri_upsert(adaylar_uret(args.count, args.words))
+
+    client = Client()
+    senaryolar = [
+        ("eski: tüm alanlar + raw_text", "/api/Duzenlemes/?include=raw_text"),
+        ("yeni: liste (raw_text defer)", "/api/Duzenlemes/"),
+        ("?fields=id,title,publish_date", "/api/Duzenlemes/?fields=id,title,publish_date"),
+        ("yeni + ?page_size=50", "/api/Duzenlemes/?page_size=50"),
+    ]
+
+    print(f"{args.count} düzenleme × ~{args.words} kelime, senaryo başına {args.runs} istek\n")
+    print(f"{'':<32} {'yanıt (KB)':>12} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for ad, url in senaryolar:
+        boyut, p50, p95 = olc(client, url, args.runs)
+        print(f"{ad:<32} {boyut:>12.1f} {p50:>10.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
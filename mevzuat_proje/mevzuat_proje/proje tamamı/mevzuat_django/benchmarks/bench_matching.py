@@ -0,0 +1,99 @@
+# benchmarks/bench_matching.py
+#
+# Yükümlülük eşleştirme motoru (eslestirme.yukumlulukleri_uret):
+#   - 1 yeni düzenleme × N şirket     (ör. ihracatçılara yönelik bir tebliğ)
+#   - M düzenleme × 1 yeni şirket     (yeni müşteri portföye eklendi)
+# Süre ve sorgu sayısı ölçülür; üretilen satır sayısı da yazdırılır.
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_matching.py                              # 100k şirket, 10k düzenleme
+#   python benchmarks/bench_matching.py --companies 10000 --regulations 1000
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+
+SEKTORLER = ["yazilim", "imalat", "perakende", "lojistik"]
+ETIKETLER = ["vergi", "KDV", "SGK", "ihracat", "KVKK", "KOSGEB"]
+ETKILER = ["zorunlu", "risk", "opsiyonel_tesvik", None]
+
+
+def olc(ad, fn, *args, **kwargs):
+    from django.db import connection
+
+    sayac = [0]
+
+    def say(execute, sql, params, many, context):
+        sayac[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(say):
+        t0 = time.perf_counter()
+        sonuc = fn(*args, **kwargs)
+        sure = time.perf_counter() - t0
+    print(f"{ad:<40} {sure:8.3f} sn {sayac[0]:>6} sorgu  {sonuc}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=100_000)
+    parser.add_argument("--regulations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    django_kur()
+    from mevzuat_parca.eslestirme import yukumlulukleri_uret
+    from mevzuat_parca.models import Duzenleme, Sirket
+    from mevzuat_parca.skorlama import skorlari_yenile
+
+    rnd = random.Random(1)
+    Sirket.objects.bulk_create(
+        (
+            Sirket(
+                name=f"Şirket {i}", sector=rnd.choice(SEKTORLER), employee_count=rnd.randint(1, 500),
+                location_city="İstanbul", is_exporter=rnd.random() < 0.3,
+            )
+            for i in range(args.companies)
+        ),
+        batch_size=2000,
+    )
+    # bulk_create save() çağırmaz: skor satırları (Sirket.save'in yaptığı gibi) ayrıca
+    skorlari_yenile()
+    # ORM save() NLP çalıştırır; sentetik veri doğrudan alanlarla yazılır
+    bugun = date(2025, 12, 31)
+    Duzenleme.objects.bulk_create(
+        (
+            Duzenleme(
+                source="resmi_gazete", title=f"Tebliğ {i}", publish_date=bugun - timedelta(days=i % 3650),
+                raw_text="Duyuru.", sectors=rnd.sample(SEKTORLER, rnd.randint(0, 2)),
+                tags=rnd.sample(ETIKETLER, rnd.randint(0, 3)), impact_type=rnd.choice(ETKILER),
+            )
+            for i in range(args.regulations)
+        ),
+        batch_size=500,
+    )
+    print(f"{args.companies} şirket, {args.regulations} düzenleme\n")
+
+    yeni = Duzenleme.objects.create(
+        source="gib", title="İhracatçı imalat firmaları için KDV iadesi", publish_date=bugun,
+        raw_text="Duyuru.", sectors=["imalat"], tags=["vergi", "ihracat"], impact_type="zorunlu",
+    )
+    olc("1 düzenleme × tüm şirketler", yukumlulukleri_uret, duzenlemeler=Duzenleme.objects.filter(pk=yeni.pk))
+
+    genel = Duzenleme.objects.create(
+        source="gib", title="Tüm ihracatçılara duyuru", publish_date=bugun,
+        raw_text="Duyuru.", tags=["ihracat"], impact_type="opsiyonel_tesvik",
+    )
+    olc("1 geniş düzenleme × tüm şirketler", yukumlulukleri_uret, duzenlemeler=Duzenleme.objects.filter(pk=genel.pk))
+
+    sirket = Sirket.objects.create(
+        name="Yeni Müşteri", sector="imalat", employee_count=40, location_city="Bursa", is_exporter=True
+    )
+    olc("tüm düzenlemeler × 1 yeni şirket", yukumlulukleri_uret, sirketler=Sirket.objects.filter(pk=sirket.pk))
+    olc("tekrar (hepsi mevcut)", yukumlulukleri_uret, sirketler=Sirket.objects.filter(pk=sirket.pk))
+
+
+if __name__ == "__main__":
+    main()
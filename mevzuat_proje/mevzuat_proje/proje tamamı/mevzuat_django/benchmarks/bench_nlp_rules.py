@@ -0,0 +1,160 @@
+# benchmarks/bench_nlp_rules.py
+#
+# analyze_regulation_text hız ölçümü (MB/s):
+#   - eski: metni küçült + ~40 ayrı `in` taraması
+#   - yeni: KeywordMatcher (tek geçiş + tekil kelime sözlüğü)
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_nlp_rules.py
+#   python benchmarks/bench_nlp_rules.py --sizes 0.1 1 8 --repeat 5
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# mevzuat_parca paketini import edebilmek için proje kökünü path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# nlp_rules Django'ya bağımlı değil → settings gerekmez
+from mevzuat_parca.nlp_rules import KeywordMatcher, analyze_regulation_text  # noqa: E402
+
+
+def eski_analyze_regulation_text(text: str):
+    """Karşılaştırma için: kural motorunun eski (40 ayrı tarama) hali."""
+    if not text:
+        return [], [], None
+    t = text.lower()
+    tags = set()
+    sectors = set()
+    impact_type = None
+    if "kdv" in t or "katma değer vergisi" in t:
+        tags.update(["vergi", "KDV"])
+    if "gelir vergisi" in t:
+        tags.update(["vergi", "gelir_vergisi"])
+    if "kurumlar vergisi" in t:
+        tags.update(["vergi", "kurumlar_vergisi"])
+    if "sgk" in t or "sosyal güvenlik" in t:
+        tags.add("SGK")
+    if "ihracat" in t or "ihracatçı" in t:
+        tags.add("ihracat")
+    if "kosgeb" in t:
+        tags.add("KOSGEB")
+    if "kvkk" in t or "kişisel veri" in t:
+        tags.update(["KVKK", "kişisel_veri"])
+    if any(w in t for w in ["yazılım", "bilişim", "bt", "saas"]):
+        sectors.add("yazilim")
+    if any(w in t for w in ["imalat", "üretim", "fabrika"]):
+        sectors.add("imalat")
+    if any(w in t for w in ["perakende", "mağaza", "market", "satış noktası"]):
+        sectors.add("perakende")
+    if any(w in t for w in ["lojistik", "taşımacılık", "kargo", "nakliye"]):
+        sectors.add("lojistik")
+    if any(w in t for w in ["zorunludur", "yapmak zorundadır", "yükümlüdür", "uygulamak zorundadır"]):
+        impact_type = "zorunlu"
+    elif any(w in t for w in ["teşvik", "hibe", "destek programı", "yardım programı"]):
+        impact_type = "opsiyonel_tesvik"
+    elif any(w in t for w in ["ceza", "idari para cezası", "risk", "yaptırım"]):
+        impact_type = "risk"
+    return list(tags), list(sectors), impact_type
+
+
+# Sentetik mevzuat metni için kelime havuzu (anahtar kelime içermeyen)
+DOLGU = (
+    "Madde bu yönetmelik kapsamında ilgili kurum tarafından belirlenen usul ve "
+    "esaslar çerçevesinde uygulanır. Hüküm yürürlük tarihi; Bakanlık başvuru "
+    "Türkiye'nin (İstanbul) mükellefler beyanname süresi içinde verilir, "
+    "fıkrası değiştirilmiştir tebliğin eki listede yer alan"
+).split()
+
+# Arada bir serpiştirilecek anahtar ifadeler
+ANAHTARLAR = [
+    "katma değer vergisi", "KDV'nin", "yazılım", "imalat", "kargo",
+    "zorunludur", "idari para cezası", "destek programı",
+]
+
+
+def sentetik_metin(mb: float, seed: int = 42) -> str:
+    """Yaklaşık `mb` megabayt büyüklüğünde Türkçe mevzuat benzeri metin üretir."""
+    rnd = random.Random(seed)
+    hedef = int(mb * 1_000_000)
+    parcalar, boy = [], 0
+    while boy < hedef:
+        if rnd.random() < 0.001:
+            w = rnd.choice(ANAHTARLAR)
+        else:
+            w = rnd.choice(DOLGU)
+        parcalar.append(w)
+        boy += len(w.encode("utf-8")) + 1
+    return " ".join(parcalar)
+
+
+def olc(fn, text: str, repeat: int) -> float:
+    """En iyi süreyi (saniye) döndürür."""
+    en_iyi = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi
+
+
+def kural_olcekleme(text: str, repeat: int):
+    """
+    Kural sayısı arttıkça iki yöntemin davranışı:
+    eski yöntem her anahtar kelime için metni baştan tarar (O(K·N)),
+    KeywordMatcher ise metni bir kez tarar (O(N)).
+    """
+    rnd = random.Random(7)
+    harfler = "abcçdefgğhıijklmnoöprsştuüvyz"
+    gercek_mb = len(text.encode("utf-8")) / 1_000_000
+
+    print()
+    print(f"{'kural':>6} | {'eski MB/s':>10} | {'yeni MB/s':>10} | {'hızlanma':>8}")
+    print("-" * 46)
+    for k in (40, 160, 640):
+        # metinde geçmeyen rastgele anahtar kelimeler (en kötü durum: tam tarama)
+        kws = {"".join(rnd.choice(harfler) for _ in range(rnd.randint(4, 10))) for _ in range(k)}
+        matcher = KeywordMatcher(kws)
+
+        def eski(t, kws=kws):
+            t = t.lower()
+            return {kw for kw in kws if kw in t}
+
+        t_eski = olc(eski, text, repeat)
+        t_yeni = olc(matcher.find, text, repeat)
+        print(f"{k:>6} | {gercek_mb / t_eski:>10.1f} | {gercek_mb / t_yeni:>10.1f} | {t_eski / t_yeni:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="nlp_rules throughput benchmark")
+    parser.add_argument("--sizes", nargs="+", type=float, default=[0.1, 1.0, 8.0],
+                        help="metin boyları (MB)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'boyut':>8} | {'eski MB/s':>10} | {'yeni MB/s':>10} | {'hızlanma':>8} | sonuç aynı")
+    print("-" * 62)
+    for mb in args.sizes:
+        text = sentetik_metin(mb)
+        gercek_mb = len(text.encode("utf-8")) / 1_000_000
+
+        t_eski = olc(eski_analyze_regulation_text, text, args.repeat)
+        t_yeni = olc(analyze_regulation_text, text, args.repeat)
+
+        # sonuçları sıradan bağımsız karşılaştır
+        e_tags, e_sec, e_imp = eski_analyze_regulation_text(text)
+        y_tags, y_sec, y_imp = analyze_regulation_text(text)
+        ayni = (set(e_tags), set(e_sec), e_imp) == (set(y_tags), set(y_sec), y_imp)
+
+        print(
+            f"{gercek_mb:>6.2f}MB | {gercek_mb / t_eski:>10.1f} | {gercek_mb / t_yeni:>10.1f} | "
+            f"{t_eski / t_yeni:>7.2f}x | {'evet' if ayni else 'HAYIR'}"
+        )
+
+    kural_olcekleme(sentetik_metin(1.0), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
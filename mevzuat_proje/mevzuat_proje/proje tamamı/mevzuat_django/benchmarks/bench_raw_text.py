@@ -0,0 +1,126 @@
+# benchmarks/bench_raw_text.py
+#
+# Duzenleme.raw_text saklama: düz TEXT + tam yükleme (eski) vs
+# sıkıştırılmış BLOB + defer("duzenleme__raw_text") (yeni).
+#   - DB dosya boyutu (VACUUM sonrası)
+#   - /api/companies/ liste endpoint'inin süresi ve tepe Python belleği (tracemalloc)
+# "Eski" durum aynı veriden üretilir: metinler düz TEXT'e açılır, liste
+# endpoint'i defer() etkisizleştirilerek çağrılır (select_related tam metni taşır).
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_raw_text.py                        # 5000 düzenleme, 100 şirket
+#   python benchmarks/bench_raw_text.py --count 1000 --companies 50
+
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from unittest import mock
+
+from _django import django_kur
+
+
+def sozluk_uret(rnd, adet=3000):
+    """Sentetik kelime havuzu (küçük havuz metni gerçekçi olmayan oranda sıkıştırır)."""
+    harfler = "abcçdefgğhıijklmnoöprsştuüvyz"
+    return ["".join(rnd.choice(harfler) for _ in range(rnd.randint(3, 11))) for _ in range(adet)]
+
+
+def adaylar_uret(count: int, kelime_sayisi: int):
+    rnd = random.Random(1)
+    sozluk = sozluk_uret(rnd)
+    bugun = date(2025, 12, 31)
+    for i in range(count):
+        satirlar = []
+        for m in range(kelime_sayisi // 60):
+            satirlar.append(f"MADDE {m + 1} – " + " ".join(rnd.choices(sozluk, k=60)) + ".")
+        yield {
+            "source": "resmi_gazete",
+            "title": f"Tebliğ {i}",
+            "publish_date": bugun - timedelta(days=i % 3650),
+            "raw_text": "\n".join(satirlar),
+        }
+
+
+def db_boyutu(db_path) -> float:
+    from django.db import connection
+
+    with connection.cursor() as cur:
+        cur.execute("VACUUM")
+    return os.path.getsize(db_path) / (1024 * 1024)
+
+
+def liste_olc(client, eski: bool):
+    """/api/companies/ → (süre sn, tepe bellek MB). eski=True: defer() yok sayılır."""
+    from django.db.models import QuerySet
+
+    yama = mock.patch.object(QuerySet, "defer", lambda qs, *alanlar: qs) if eski else mock.MagicMock()
+    with yama:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        resp = client.get("/api/companies/", HTTP_HOST="localhost")
+        sure = time.perf_counter() - t0
+        _, tepe = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert resp.status_code == 200, resp.status_code
+    return sure, tepe / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=5000, help="Düzenleme sayısı")
+    parser.add_argument("--words", type=int, default=3000, help="Düzenleme başına kelime")
+    parser.add_argument("--companies", type=int, default=100, help="Şirket sayısı")
+    parser.add_argument("--obligations", type=int, default=40, help="Şirket başına yükümlülük")
+    args = parser.parse_args()
+
+    # DEBUG'da connection.queries bellekte birikir; ölçümü bozmasın
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    db_path = django_kur()
+
+    from django.db import connection
+    from django.test import Client
+
+    from mevzuat_parca import arama
+    from mevzuat_parca.models import Duzenleme, Sirket, SirketObligation
+    from mevzuat_parca.sikistirma import metin_ac
+    from mevzuat_parca.skorlama import skorlari_yenile
+    from mevzuat_parca.toplu_yazma import duzenlemeleri_upsert
+
+    duzenlemeleri_upsert(adaylar_uret(args.count, args.words))
+    ids = list(Duzenleme.objects.values_list("id", flat=True))
+    rnd = random.Random(2)
+    for i in range(args.companies):
+        sirket = Sirket.objects.create(name=f"Şirket {i}", sector="yazilim", employee_count=10, location_city="İzmir")
+        SirketObligation.objects.bulk_create(
+            SirketObligation(sirket=sirket, duzenleme_id=pk) for pk in rnd.sample(ids, args.obligations)
+        )
+    # bulk_create skor farkı uygulamaz: saklanan skorlar bir kez baştan
+    skorlari_yenile()
+
+    client = Client()
+    client.get("/api/companies/", HTTP_HOST="localhost")  # ısınma (import'lar vb.)
+
+    yeni_boyut = db_boyutu(db_path)
+    yeni_sure, yeni_bellek = liste_olc(client, eski=False)
+
+    # Eski saklama: trigger'sız (FTS kuyruğu dolmasın) düz metne aç
+    with connection.schema_editor() as se:
+        arama.tetikleyicileri_kaldir(schema_editor=se)
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT id, raw_text FROM {arama.DUZENLEME_TABLE}")
+        duz = [(metin_ac(ham), pk) for pk, ham in cur.fetchall()]
+        cur.executemany(f"UPDATE {arama.DUZENLEME_TABLE} SET raw_text = %s WHERE id = %s", duz)
+    eski_boyut = db_boyutu(db_path)
+    eski_sure, eski_bellek = liste_olc(client, eski=True)
+
+    print(f"{args.count} düzenleme × ~{args.words} kelime, {args.companies} şirket × {args.obligations} yükümlülük\n")
+    print(f"{'':<34} {'DB (MB)':>9} {'liste (sn)':>11} {'tepe bellek (MB)':>17}")
+    print(f"{'eski: düz TEXT, tam yükleme':<34} {eski_boyut:>9.1f} {eski_sure:>11.2f} {eski_bellek:>17.1f}")
+    print(f"{'yeni: zlib BLOB, defer':<34} {yeni_boyut:>9.1f} {yeni_sure:>11.2f} {yeni_bellek:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
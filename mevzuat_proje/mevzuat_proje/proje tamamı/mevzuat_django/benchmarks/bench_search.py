@@ -0,0 +1,113 @@
+# benchmarks/bench_search.py
+#
+# Düzenleme araması: admin'in eski LIKE '%…%' taraması vs FTS5 indeksi.
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_search.py                 # 100k düzenleme
+#   python benchmarks/bench_search.py --count 20000   # daha hızlı deneme
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+
+# Sentetik metin için kelime havuzu (her metinde geçen dolgu kelimeleri)
+KELIMELER = (
+    "madde yönetmelik kapsamında kurum belirlenen usul esaslar çerçevesinde uygulanır "
+    "hüküm yürürlük tarihi bakanlık başvuru mükellef beyanname süresi fıkrası tebliğ"
+).split()
+
+# Konu ifadeleri: her düzenlemede birkaç tanesi geçer (gerçek mevzuata benzer dağılım)
+KONULAR = [
+    "katma değer vergisi", "ihracatçı şirketler", "kişisel veri", "sosyal güvenlik",
+    "kargo", "imalat", "yazılım", "teşvik", "idari para cezası", "lojistik",
+    "gümrük", "belge", "teminat", "iade", "mahsup", "tarım", "enerji", "sağlık",
+    "eğitim", "turizm", "bankacılık", "sigorta", "maden", "ulaştırma", "haberleşme",
+]
+
+# Ölçülecek sorgular (yaygın ve nadir terimler karışık)
+SORGULAR = ["ihracat", "kişisel veri", "iade mahsup", "gümrük", "yazılım teşvik", "nadirkelime"]
+
+
+def corpus_olustur(count: int, kelime_sayisi: int):
+    """count adet sentetik düzenlemeyi bulk_create ile ekler (FTS trigger'ları çalışır)."""
+    from mevzuat_parca.models import Duzenleme
+
+    rnd = random.Random(1)
+    batch = []
+    bugun = date.today()
+    for i in range(count):
+        metin = " ".join(rnd.choice(KELIMELER) for _ in range(kelime_sayisi))
+        metin += " " + " ".join(rnd.sample(KONULAR, 2))
+        if i % 997 == 0:
+            metin += " nadirkelime"
+        batch.append(Duzenleme(
+            source="resmi_gazete",
+            title=f"Tebliğ {i} " + rnd.choice(KONULAR),
+            publish_date=bugun - timedelta(days=i % 3650),
+            raw_text=metin,
+        ))
+        if len(batch) == 2000:
+            Duzenleme.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Duzenleme.objects.bulk_create(batch)
+
+
+def olc(fn, repeat: int):
+    sureler = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        sureler.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(sureler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs FTS5 arama benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=150, help="düzenleme başına kelime")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db_path = django_kur()
+
+    from django.db.models import Q
+    from django.db.models.expressions import RawSQL
+
+    from mevzuat_parca import arama
+    from mevzuat_parca.models import Duzenleme
+
+    t0 = time.perf_counter()
+    corpus_olustur(args.count, args.words)
+    print(f"{args.count} düzenleme eklendi ({time.perf_counter() - t0:.1f} sn, db: {db_path})")
+    print()
+    print(f"{'sorgu':<16} | {'LIKE ms':>9} | {'FTS ms':>8} | {'hızlanma':>8} | {'LIKE #':>7} | {'FTS #':>7}")
+    print("-" * 70)
+
+    for q in SORGULAR:
+        # Admin'in eski yolu: her kelime için title/raw_text LIKE (Django search_fields davranışı)
+        like_qs = Duzenleme.objects.all()
+        for kelime in q.split():
+            like_qs = like_qs.filter(Q(title__icontains=kelime) | Q(raw_text__icontains=kelime))
+        like_qs = like_qs.values_list("id", flat=True)
+
+        # Yeni yol: FTS alt sorgusu (admin) + API'nin ilk sayfası
+        sql, params = arama.eslesen_idler_sql(q)
+        fts_qs = Duzenleme.objects.filter(id__in=RawSQL(sql, params)).values_list("id", flat=True)
+
+        like_ms = olc(lambda: list(like_qs[:100]) and like_qs.count(), args.repeat)
+        fts_ms = olc(lambda: list(fts_qs[:100]) and fts_qs.count(), args.repeat)
+        api_ms = olc(lambda: arama.ara(q, limit=20), args.repeat)
+
+        print(
+            f"{q:<16} | {like_ms:>9.1f} | {fts_ms:>8.1f} | {like_ms / fts_ms:>7.1f}x | "
+            f"{like_qs.count():>7} | {fts_qs.count():>7}   (API sıralı ilk 20: {api_ms:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
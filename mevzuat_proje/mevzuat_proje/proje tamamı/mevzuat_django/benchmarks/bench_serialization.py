@@ -0,0 +1,117 @@
+# benchmarks/bench_serialization.py
+#
+# Sıcak okuma yollarının serileştirme hızı (satır/sn), eski vs yeni:
+#   - /api/companies/        eski: SirketSerializer(many=True) + DRF JSONRenderer (stdlib json)
+#                            yeni: values() + derlenmiş eşlemci + HizliJSONRenderer (orjson)
+#   - /api/companies-spa-list/  eski: JsonResponse (stdlib json)   yeni: hizli_json.yanit
+#   - dashboard payload      eski: SirketSerializer(sirket).data + JsonResponse
+#                            yeni: eslemci.nesneden + hizli_json.yanit (satır = yükümlülük)
+# Her ölçüm DB sorgusunu da içerir (endpoint'in kendi yaptığı iş); en iyi N tekrar alınır.
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_serialization.py                   # 20k şirket, 2k yükümlülüklü panel
+#   python benchmarks/bench_serialization.py --companies 5000 --repeat 3
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+
+
+def en_iyi(fn, tekrar: int) -> float:
+    fn()  # ısınma
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        fn()
+        sureler.append(time.perf_counter() - t0)
+    return min(sureler)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=20000, help="Şirket sayısı")
+    parser.add_argument("--obligations", type=int, default=2000, help="Panel şirketinin yükümlülük sayısı")
+    parser.add_argument("--repeat", type=int, default=5, help="Ölçüm tekrarı (en iyisi alınır)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    django_kur()
+
+    from django.http import JsonResponse
+    from django.test import RequestFactory
+    from rest_framework.renderers import JSONRenderer
+
+    from mevzuat_parca import hizli_json
+    from mevzuat_parca.models import Duzenleme, Sirket, SirketObligation
+    from mevzuat_parca.serilestiriciler import SirketSerializer, eslemci
+    from mevzuat_parca.skorlama import skor_ekle, skorlari_yenile
+    from mevzuat_parca.views import build_dashboard_payload, hesapla_sirket_skoru
+
+    Sirket.objects.bulk_create(
+        Sirket(name=f"Şirket {i}", sector=["yazilim", "imalat", "lojistik"][i % 3], employee_count=i % 500,
+               location_city="Ankara", is_exporter=i % 4 == 0)
+        for i in range(args.companies)
+    )
+    Duzenleme.objects.bulk_create(
+        Duzenleme(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 1, 1) + timedelta(days=i % 300),
+                  raw_text="", impact_type=["zorunlu", "risk", "opsiyonel_tesvik"][i % 3])
+        for i in range(args.obligations)
+    )
+    panel_sirketi = Sirket.objects.order_by("pk").first()
+    bugun = date.today()
+    SirketObligation.objects.bulk_create(
+        SirketObligation(sirket=panel_sirketi, duzenleme_id=pk, due_date=bugun + timedelta(days=i % 90 - 30),
+                         is_compliant=i % 3 == 0, risk_level=["low", "high"][i % 2])
+        for i, pk in enumerate(Duzenleme.objects.values_list("pk", flat=True))
+    )
+    skorlari_yenile()
+
+    istek = RequestFactory().get("/")
+    liste_qs = skor_ekle(Sirket.objects.all()).order_by("-id")
+    spa_qs = skor_ekle(Sirket.objects.all()).values("id", "name", "sector", "kayitli_skor").order_by("id")
+    alanlar = eslemci(SirketSerializer, None)
+
+    def liste_eski():
+        return JSONRenderer().render(SirketSerializer(liste_qs.all(), many=True).data)
+
+    def liste_yeni():
+        return hizli_json.HizliJSONRenderer().render(alanlar.coklu(alanlar.sorgu(liste_qs.all())))
+
+    def spa_eski():
+        return JsonResponse(list(spa_qs.all()), safe=False, json_dumps_params={"ensure_ascii": False})
+
+    def spa_yeni():
+        return hizli_json.yanit(istek, list(spa_qs.all()))
+
+    def panel_eski():
+        sirket = Sirket.objects.get(pk=panel_sirketi.pk)
+        sonuc = hesapla_sirket_skoru(sirket)
+        payload = {
+            "sirket": SirketSerializer(sirket, context={"skorlar": {sirket.pk: sonuc["score"]}}).data,
+            "uyum_skoru": sonuc["score"], "stats": sonuc["stats"],
+            "todo": sonuc["todo"], "completed": sonuc["completed"],
+        }
+        return JsonResponse(payload, json_dumps_params={"ensure_ascii": False})
+
+    def panel_yeni():
+        return hizli_json.yanit(istek, build_dashboard_payload(Sirket.objects.get(pk=panel_sirketi.pk)))
+
+    assert liste_eski() == liste_yeni()
+
+    print(f"{args.companies} şirket, panel şirketinde {args.obligations} yükümlülük, "
+          f"orjson={'var' if hizli_json.orjson else 'yok'}\n")
+    print(f"{'':<28} {'satır':>8} {'eski (satır/sn)':>16} {'yeni (satır/sn)':>16} {'hızlanma':>9}")
+    for ad, satir, eski, yeni in (
+        ("/api/companies/", args.companies, liste_eski, liste_yeni),
+        ("/api/companies-spa-list/", args.companies, spa_eski, spa_yeni),
+        ("dashboard payload", args.obligations, panel_eski, panel_yeni),
+    ):
+        t_eski, t_yeni = en_iyi(eski, args.repeat), en_iyi(yeni, args.repeat)
+        print(f"{ad:<28} {satir:>8} {satir / t_eski:>16,.0f} {satir / t_yeni:>16,.0f} {t_eski / t_yeni:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_stream_parser.py
+#
+# Tam Resmî Gazete sayısı ayrıştırma: bellek (tepe RSS) sayı boyutuyla büyüyor mu?
+#   - eski yöntem: dosyayı komple oku, string olarak <h3>'lerden böl, her parçayı html_coz
+#   - akışlı:      dosya_parcalari (mmap) → sayi_adaylari (generator)
+# Her ölçüm ayrı süreçte yapılır (tepe RSS birbirini etkilemesin).
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_stream_parser.py                  # 5, 25, 100 MB
+#   python benchmarks/bench_stream_parser.py --sizes 1 10
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJE_KOKU = Path(__file__).resolve().parent.parent
+
+KELIMELER = (
+    "madde yönetmelik kapsamında kurum belirlenen usul esaslar çerçevesinde uygulanır "
+    "hüküm yürürlük tarihi bakanlık başvuru mükellef beyanname süresi fıkrası tebliğ "
+    "katma değer vergisi ihracatçı kişisel veri sosyal güvenlik kargo imalat yazılım teşvik"
+).split()
+
+
+def sayi_olustur(path: Path, mb: int):
+    """Yaklaşık mb megabaytlık sentetik tam sayı HTML'i yazar (~200 KB'lık düzenlemeler)."""
+    rnd = random.Random(mb)
+    hedef = mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><body><h1>Resmî Gazete 20 Aralık 2025 Sayı: 33108</h1>\n")
+        yazilan = 0
+        i = 0
+        while yazilan < hedef:
+            i += 1
+            parca = [f"<h3>Tebliğ {i} {rnd.choice(KELIMELER)}</h3>\n"]
+            for m in range(400):
+                satir = " ".join(rnd.choice(KELIMELER) for _ in range(60))
+                parca.append(f"<p>MADDE {m} &ndash; {satir}.</p>\n")
+            metin = "".join(parca)
+            f.write(metin)
+            yazilan += len(metin.encode("utf-8"))
+        f.write("</body></html>\n")
+
+
+def cocuk(yontem: str, path: str):
+    """Alt süreç: ayrıştır, aday sayısı + süre + tepe RSS (MB) yazdır."""
+    sys.path.insert(0, str(PROJE_KOKU))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mevzuat_backend.settings")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark-only")
+    import django
+
+    django.setup()
+    from mevzuat_parca.ingestion.akis import dosya_parcalari, sayi_adaylari
+    from mevzuat_parca.ingestion.sources import html_coz
+
+    t0 = time.perf_counter()
+    adet = 0
+    if yontem == "eski":
+        metin = Path(path).read_text(encoding="utf-8")
+        for parca in metin.split("<h3>")[1:]:
+            sayfa = html_coz("<h3>" + parca)
+            adet += bool(sayfa.text)
+    else:
+        for _ in sayi_adaylari(dosya_parcalari(path)):
+            adet += 1
+    sure = time.perf_counter() - t0
+
+    # Linux'ta ru_maxrss KB cinsinden
+    tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{adet} {sure:.2f} {tepe:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 25, 100], help="Sayı boyutları (MB)")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        cocuk(*args.child)
+        return
+
+    klasor = Path(tempfile.mkdtemp(prefix="mevzuat_bench_sayi_"))
+    print(f"{'boyut':>7} {'yöntem':<8} {'düzenleme':>10} {'süre (sn)':>10} {'tepe RSS (MB)':>14}")
+    for mb in args.sizes:
+        path = klasor / f"sayi_{mb}mb.htm"
+        sayi_olustur(path, mb)
+        for yontem in ("eski", "akisli"):
+            cikti = subprocess.run(
+                [sys.executable, __file__, "--child", yontem, str(path)],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            adet, sure, tepe = cikti[-3:]
+            print(f"{mb:>5}MB {yontem:<8} {adet:>10} {sure:>10} {tepe:>14}")
+        path.unlink()
+    klasor.rmdir()
+
+
+if __name__ == "__main__":
+    main()
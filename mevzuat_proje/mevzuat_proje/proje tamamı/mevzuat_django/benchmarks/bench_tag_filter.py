@@ -0,0 +1,207 @@
+# benchmarks/bench_tag_filter.py
+#
+# Düzenleme listesi etiket / sektör / etki tipi / tarih filtreleri, ilk sayfa (50 kayıt) süresi:
+#   - python: satırları (id, tags, sectors, impact_type, publish_date) sırayla çekip Python'da süzmek
+#   - json_each: SQLite JSON fonksiyonuyla EXISTS (indeks yok, her satırın JSON'u açılır)
+#   - izdüşüm: etiket_indeksi.filtrele → DuzenlemeEtiketi / DuzenlemeSektoru unique indeksi
+#     (JOIN ya da yaygın değerlerde EXISTS; ORM sorgu kurma süresi dahil)
+# hızlanma: python / izdüşüm. json_each de tarih indeksinden yürüyüp ilk sayfada durabildiği için
+# ikinci tabloda eşleşen kümenin tamamı (count) ölçülür.
+# Ayrıca izdüşüm trigger'larının yazma maliyeti (100k satır trigger'sız / trigger'lı) ve
+# yeniden_doldur süresi ölçülür.
+# Satırlar ham executemany ile yazılır; FTS trigger'ları yazma sırasında kapalıdır (ölçülen şey değil).
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_tag_filter.py                   # 1M düzenleme
+#   python benchmarks/bench_tag_filter.py --count 200000
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+
+# (değer, olasılık): yaygın ve nadir etiketler / sektörler
+ETIKETLER = (("vergi", 0.30), ("KDV", 0.10), ("ihracat", 0.05), ("KOSGEB", 0.005))
+SEKTORLER = (("imalat", 0.25), ("yazilim", 0.25), ("perakende", 0.10), ("lojistik", 0.10))
+ETKILER = ("zorunlu", "risk", "opsiyonel_tesvik", None)
+
+SENARYOLAR = [
+    ("?tag=KOSGEB (nadir)", {"tag": ["KOSGEB"]}),
+    ("?tag=vergi (yaygın)", {"tag": ["vergi"]}),
+    ("?tag=KDV&sector=imalat&impact_type=zorunlu", {"tag": ["KDV"], "sector": ["imalat"], "impact_type": ["zorunlu"]}),
+    ("?sector=yazilim + 3 aylık tarih", {"sector": ["yazilim"], "date_from": ["2024-01-01"], "date_to": ["2024-03-31"]}),
+]
+
+SAYFA = 50
+
+
+class Parametreler(dict):
+    """QueryDict yerine (getlist / get)."""
+
+    def getlist(self, ad):
+        return super().get(ad, [])
+
+    def get(self, ad, varsayilan=None):
+        degerler = super().get(ad)
+        return degerler[-1] if degerler else varsayilan
+
+
+def satirlar(baslangic, adet, raw_text, simdi):
+    rnd = random.Random(baslangic)
+    ilk_gun = date(2016, 1, 1)
+    for i in range(baslangic, baslangic + adet):
+        tags = [t for t, p in ETIKETLER if rnd.random() < p]
+        sectors = [s for s, p in SEKTORLER if rnd.random() < p]
+        yield ("gib", f"Tebliğ {i}", ilk_gun + timedelta(days=rnd.randrange(3650)), raw_text,
+               json.dumps(tags), json.dumps(sectors), rnd.choice(ETKILER), simdi, "{}")
+
+
+def yaz(baslangic, adet, raw_text, simdi):
+    from django.db import connection, transaction
+
+    from mevzuat_parca.models import Duzenleme
+
+    sql = (f"INSERT INTO {Duzenleme._meta.db_table} (source, title, publish_date, raw_text, tags, sectors, "
+           f"impact_type, created_at, content_hash, nlp_version, nlp_result) "
+           f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, '', '', %s)")
+    t0 = time.perf_counter()
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.executemany(sql, list(satirlar(baslangic, adet, raw_text, simdi)))
+    return time.perf_counter() - t0
+
+
+def en_iyi(fn, tekrar=5):
+    sonuc = fn()
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        fn()
+        sureler.append(time.perf_counter() - t0)
+    return min(sureler) * 1000, sonuc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000, help="Düzenleme sayısı")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "0")
+    django_kur()
+
+    from django.db import connection
+    from django.utils import timezone
+
+    from mevzuat_parca import arama, etiket_indeksi
+    from mevzuat_parca.models import Duzenleme, DuzenlemeEtiketi, DuzenlemeSektoru
+
+    raw_text = Duzenleme._meta.get_field("raw_text").get_db_prep_value("Duyuru.", connection)
+    simdi = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.schema_editor() as se:
+        arama.tetikleyicileri_kaldir(schema_editor=se)
+
+    # Yazma maliyeti: ilk 100k trigger'sız, sonraki 100k trigger'lı; kalanı trigger'lı
+    parca = min(100_000, args.count // 2)
+    with connection.schema_editor() as se:
+        etiket_indeksi.tetikleyicileri_kaldir(schema_editor=se)
+    t_sade = yaz(0, parca, raw_text, simdi)
+    with connection.schema_editor() as se:
+        etiket_indeksi.tetikleyicileri_kur(schema_editor=se)
+    t_trigger = yaz(parca, parca, raw_text, simdi)
+    for bas in range(2 * parca, args.count, parca):
+        yaz(bas, min(parca, args.count - bas), raw_text, simdi)
+    t0 = time.perf_counter()
+    etiket_indeksi.yeniden_doldur()
+    t_doldur = time.perf_counter() - t0
+    with connection.cursor() as cur:
+        cur.execute("ANALYZE")
+
+    print(f"{Duzenleme.objects.count()} düzenleme, {DuzenlemeEtiketi.objects.count()} etiket satırı, "
+          f"{DuzenlemeSektoru.objects.count()} sektör satırı\n")
+    print(f"{parca} satır yazma: trigger'sız {t_sade:.2f} sn, izdüşüm trigger'larıyla {t_trigger:.2f} sn "
+          f"(+%{(t_trigger / t_sade - 1) * 100:.0f}); yeniden_doldur (tümü): {t_doldur:.2f} sn\n")
+
+    tablo = Duzenleme._meta.db_table
+    sira = ("-publish_date", "-id")
+
+    def python_ile(p):
+        def fn():
+            tags, sectors = set(p.getlist("tag")), set(p.getlist("sector"))
+            bas, son = p.get("date_from"), p.get("date_to")
+            bas = date.fromisoformat(bas) if bas else None
+            son = date.fromisoformat(son) if son else None
+            sonuc = []
+            qs = Duzenleme.objects.order_by(*sira).values_list("id", "tags", "sectors", "impact_type", "publish_date")
+            for pk, t, s, etki, tarih in qs.iterator(chunk_size=5000):
+                if (tags <= set(t) and sectors <= set(s) and p.get("impact_type") in (None, etki)
+                        and (bas is None or tarih >= bas) and (son is None or tarih <= son)):
+                    sonuc.append(pk)
+                    if len(sonuc) == SAYFA:
+                        break
+            return sonuc
+        return fn
+
+    def json_each_ile(p, sayac=False):
+        kosullar, params = [], []
+        for kolon, json_kolon in (("tag", "tags"), ("sector", "sectors")):
+            for deger in p.getlist(kolon):
+                kosullar.append(f"EXISTS (SELECT 1 FROM json_each(d.{json_kolon}) WHERE value = %s)")
+                params.append(deger)
+        for param, kosul in (("impact_type", "d.impact_type = %s"), ("date_from", "d.publish_date >= %s"),
+                             ("date_to", "d.publish_date <= %s")):
+            if p.get(param):
+                kosullar.append(kosul)
+                params.append(p.get(param))
+        if sayac:
+            sql = f"SELECT count(*) FROM {tablo} d WHERE {' AND '.join(kosullar)}"
+        else:
+            sql = (f"SELECT d.id FROM {tablo} d WHERE {' AND '.join(kosullar)} "
+                   f"ORDER BY d.publish_date DESC, d.id DESC LIMIT {SAYFA}")
+
+        def fn():
+            with connection.cursor() as cur:
+                cur.execute(sql, params)
+                sonuc = [r[0] for r in cur.fetchall()]
+            return sonuc[0] if sayac else sonuc
+        return fn
+
+    def izdusum_ile(p):
+        # Plan seçimi (yaygın değer yoklaması) ölçüme dahil
+        return lambda: list(
+            etiket_indeksi.filtrele(Duzenleme.objects.order_by(*sira), p, sayfali=True).values_list("id", flat=True)[:SAYFA]
+        )
+
+    print(f"{'ilk 50 kayıt (ms)':<46} {'eşleşen':>8} {'python':>9} {'json_each':>10} {'izdüşüm':>9} {'hızlanma':>9}")
+    for ad, ham in SENARYOLAR:
+        p = Parametreler(ham)
+        eslesen = etiket_indeksi.filtrele(Duzenleme.objects.all(), p).count()
+        t_py, r_py = en_iyi(python_ile(p), tekrar=1)
+        t_json, r_json = en_iyi(json_each_ile(p), tekrar=3)
+        t_yeni, r_yeni = en_iyi(izdusum_ile(p))
+        assert r_py == r_json == r_yeni, ad
+        print(f"{ad:<46} {eslesen:>8} {t_py:>9.1f} {t_json:>10.1f} {t_yeni:>9.2f} {t_py / t_yeni:>8.0f}x")
+
+    print(f"\n{'eşleşenlerin tümü, count (ms)':<46} {'eşleşen':>8} {'json_each':>10} {'izdüşüm':>9} {'hızlanma':>9}")
+    for ad, ham in SENARYOLAR:
+        p = Parametreler(ham)
+        t_json, n_json = en_iyi(json_each_ile(p, sayac=True), tekrar=1)
+        t_yeni, n_yeni = en_iyi(lambda: etiket_indeksi.filtrele(Duzenleme.objects.all(), p).count(), tekrar=3)
+        assert n_json == n_yeni, ad
+        print(f"{ad:<46} {n_yeni:>8} {t_json:>10.1f} {t_yeni:>9.2f} {t_json / t_yeni:>8.0f}x")
+
+    for ad, ham in (SENARYOLAR[1], SENARYOLAR[2]):
+        p = Parametreler(ham)
+        qs = etiket_indeksi.filtrele(Duzenleme.objects.order_by(*sira), p, sayfali=True)
+        sql, params = qs.values_list("id", flat=True)[:SAYFA].query.sql_with_params()
+        with connection.cursor() as cur:
+            cur.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            print(f"\nSorgu planı ({ad}):")
+            for satir in cur.fetchall():
+                print("   ", satir[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_upsert.py
+#
+# Düzenleme içe aktarma: eski get_or_create döngüsü vs toplu upsert
+# (duzenlemeleri_upsert: batch başına SELECT + INSERT ... ON CONFLICT DO UPDATE).
+#
+# Çalıştırma (mevzuat_django klasöründen):
+#   python benchmarks/bench_upsert.py                 # 50k düzenleme
+#   python benchmarks/bench_upsert.py --count 5000    # daha hızlı deneme
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from _django import django_kur
+
+# Sentetik metin için kelime havuzu
+KELIMELER = (
+    "madde yönetmelik kapsamında kurum belirlenen usul esaslar çerçevesinde uygulanır "
+    "hüküm yürürlük tarihi bakanlık başvuru mükellef beyanname süresi fıkrası tebliğ "
+    "katma değer vergisi ihracatçı kişisel veri sosyal güvenlik kargo imalat yazılım teşvik"
+).split()
+
+
+def adaylar_uret(count: int, degisen_oran=0.0, tohum=1):
+    """count adet aday dict (degisen_oran kadarının metni farklı)."""
+    rnd = random.Random(tohum)
+    bugun = date(2025, 12, 31)
+    for i in range(count):
+        satir_rnd = random.Random(i)  # aynı i → aynı metin (tekrar çalıştırmada "değişmedi")
+        metin = " ".join(satir_rnd.choice(KELIMELER) for _ in range(150))
+        if rnd.random() < degisen_oran:
+            metin += " Değişiklik: yeni fıkra eklenmiştir."
+        yield {
+            "source": "resmi_gazete",
+            "title": f"Tebliğ {i}",
+            "publish_date": bugun - timedelta(days=i % 3650),
+            "url": f"https://www.resmigazete.gov.tr/{i}.htm",
+            "raw_text": metin,
+        }
+
+
+def eski_yontem(adaylar):
+    """user-005'teki desen: satır başına get_or_create (SELECT + INSERT)."""
+    from django.db import transaction
+    from mevzuat_parca.models import Duzenleme
+
+    eklenen = 0
+    with transaction.atomic():
+        for aday in adaylar:
+            _, created = Duzenleme.objects.get_or_create(
+                source=aday["source"], title=aday["title"], publish_date=aday["publish_date"],
+                defaults={"raw_text": aday["raw_text"], "url": aday["url"]},
+            )
+            eklenen += created
+    return {"inserted": eklenen}
+
+
+def olc(ad, fn, *args):
+    from django.db import connection
+
+    # Sorgu sayacı (CaptureQueriesContext 9000 sorguda kesiliyor)
+    sayac = [0]
+
+    def say(execute, sql, params, many, context):
+        sayac[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(say):
+        t0 = time.perf_counter()
+        sonuc = fn(*args)
+        sure = time.perf_counter() - t0
+    print(f"{ad:<38} {sure:8.2f} sn {sayac[0]:>9} sorgu  {sonuc}")
+
+
+def temizle():
+    from mevzuat_parca.models import Duzenleme
+
+    Duzenleme.objects.all().delete()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    django_kur()
+    from mevzuat_parca.toplu_yazma import duzenlemeleri_upsert
+
+    n = args.count
+    print(f"{n} düzenleme, batch={args.batch_size}\n")
+
+    olc("get_or_create döngüsü (boş DB)", eski_yontem, list(adaylar_uret(n)))
+    temizle()
+
+    olc("upsert (boş DB)", duzenlemeleri_upsert, adaylar_uret(n), args.batch_size)
+    olc("upsert (hepsi aynı)", duzenlemeleri_upsert, adaylar_uret(n), args.batch_size)
+    olc("upsert (%10 değişmiş)", duzenlemeleri_upsert, adaylar_uret(n, 0.10, tohum=2), args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
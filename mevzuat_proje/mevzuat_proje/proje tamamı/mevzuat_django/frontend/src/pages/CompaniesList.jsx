@@ -1,11 +1,26 @@
-import { useEffect, useMemo, useState } from "react"; // React hook'ları
+import { useCallback, useEffect, useMemo, useRef, useState } from "react"; // React hook'ları
 import { useNavigate } from "react-router-dom"; // sayfa yönlendirme
 import { fetchJson } from "../lib/api"; // JSON fetch helper
 
+// Bir seferde çekilen şirket sayısı (API keyset sayfalama: ?page_size= & ?cursor=)
+const PAGE_SIZE = 50;
+
 export default function CompaniesList() {
-  // Şirket listesi (API'den gelecek)
+  // Şirket listesi (API'den sayfa sayfa gelip birikir)
   const [data, setData] = useState([]);
 
+  // Sonraki sayfanın cursor'ı (null = son sayfa okundu)
+  const [cursor, setCursor] = useState(null);
+
+  // Sonraki sayfa yükleniyor mu? (ilk yüklemeden ayrı: tablo ekranda kalır)
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Listenin sonundaki görünmez satır: ekrana girince sonraki sayfa çekilir
+  const sentinelRef = useRef(null);
+
+  // Devam eden "sonraki sayfa" isteğinin AbortController'ı (filtre değişince iptal edilir)
+  const moreAbortRef = useRef(null);
+
   // Hata mesajı (UI'da basacağız)
   const [err, setErr] = useState("");
 
@@ -33,36 +48,92 @@ export default function CompaniesList() {
       p.set("threshold", String(threshold));
     }
 
+    // sayfalı yanıt iste: {results, next, page_size}
+    p.set("page_size", String(PAGE_SIZE));
+
     // DRF şirket listesi endpoint'i (JSON döner)
-    const qs = p.toString();
-    return qs ? `/api/companies/?${qs}` : `/api/companies/`;
+    return `/api/companies/?${p.toString()}`;
   }, [sector, riskyOnly, threshold]);
 
-  // Sayfa açılınca + filtre değişince listeyi çek
+  // Yanıttaki next URL'sinden sadece cursor'ı al (URL Django'nun gördüğü host'la gelir,
+  // proxy arkasında relative URL kullanmak için)
+  const nextCursor = (json) =>
+    json?.next ? new URL(json.next, window.location.origin).searchParams.get("cursor") : null;
+
+  // Sayfa açılınca + filtre değişince listeyi baştan çek (ilk sayfa)
   useEffect(() => {
     const ac = new AbortController(); // sayfadan çıkınca fetch iptal
 
+    // Eski filtrenin yarıda kalan sonraki sayfa isteği: satırları yeni listeye eklenmesin,
+    // cursor'ı yeni listenin cursor'ını ezmesin
+    moreAbortRef.current?.abort();
+    moreAbortRef.current = null;
+    setLoadingMore(false);
+
     (async () => {
       try {
         setLoading(true);
         setErr("");
+        setData([]);
+        setCursor(null);
 
         // JSON beklediğimiz doğru endpoint: /api/companies/
         const json = await fetchJson(listUrl, { signal: ac.signal });
 
-        // API list döndürür (array)
-        setData(Array.isArray(json) ? json : []);
+        // API sayfalı nesne döndürür: {results, next}
+        setData(Array.isArray(json?.results) ? json.results : []);
+        setCursor(nextCursor(json));
       } catch (e) {
         // abort ise hata yazma
         if (e?.name !== "AbortError") setErr(e?.message || String(e));
       } finally {
-        setLoading(false);
+        // iptal edilen istek, yerine başlayan isteğin loading'ini kapatmasın
+        if (!ac.signal.aborted) setLoading(false);
       }
     })();
 
-    return () => ac.abort();
+    return () => {
+      ac.abort();
+      moreAbortRef.current?.abort();
+    };
   }, [listUrl]);
 
+  // Sonraki sayfayı çek ve listeye ekle
+  // (listUrl değişince istek iptal edilir; geç gelen yanıt da iptal edilmişse yok sayılır)
+  const loadMore = useCallback(async () => {
+    if (!cursor || loadingMore) return;
+    const ac = new AbortController();
+    moreAbortRef.current = ac;
+    try {
+      setLoadingMore(true);
+      const json = await fetchJson(`${listUrl}&cursor=${encodeURIComponent(cursor)}`, { signal: ac.signal });
+      if (ac.signal.aborted) return;
+      setData((prev) => [...prev, ...(json?.results || [])]);
+      setCursor(nextCursor(json));
+    } catch (e) {
+      if (e?.name !== "AbortError") setErr(e?.message || String(e));
+    } finally {
+      // sadece hâlâ güncel istekse: yeni filtrenin yüklemesine dokunma
+      if (moreAbortRef.current === ac) {
+        moreAbortRef.current = null;
+        setLoadingMore(false);
+      }
+    }
+  }, [cursor, loadingMore, listUrl]);
+
+  // Sonsuz kaydırma: listenin sonu görünür olunca sonraki sayfa
+  useEffect(() => {
+    const el = sentinelRef.current;
+    if (!el || !cursor) return;
+
+    const io = new IntersectionObserver((entries) => {
+      if (entries.some((e) => e.isIntersecting)) loadMore();
+    }, { rootMargin: "200px" });
+
+    io.observe(el);
+    return () => io.disconnect();
+  }, [cursor, loadMore]);
+
   return (
     <div style={{ padding: 24 }}>
       <h1>Şirketler (SPA)</h1>
@@ -166,6 +237,15 @@ export default function CompaniesList() {
           </tbody>
         </table>
       )}
+
+      {/* Sonsuz kaydırma: görünür olunca sonraki sayfa (buton IntersectionObserver'sız tarayıcılar için) */}
+      {!loading && !err && cursor && (
+        <div ref={sentinelRef} style={{ padding: 12, textAlign: "center" }}>
+          <button type="button" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Yükleniyor..." : "Daha fazla yükle"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -155,3 +155,61 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Mevzuat çekme motoru (fetch_duzenlemeler) ayarları
+# Eksik anahtarlar mevzuat_parca/ingestion/pipeline.py içindeki varsayılanlardan gelir.
+MEVZUAT_INGESTION = {
+    "SOURCES": {
+        "resmi_gazete": os.getenv("MEVZUAT_RG_URL", "https://www.resmigazete.gov.tr"),
+        "gib": os.getenv("MEVZUAT_GIB_URL", "https://www.gib.gov.tr"),
+    },
+    "PER_HOST": int(os.getenv("MEVZUAT_PER_HOST", "4")),
+    "RATE": float(os.getenv("MEVZUAT_RATE", "5")),
+}
+
+# Şirket / düzenleme değişince yükümlülük farkı commit sonrası arka plan thread'inde uygulanır.
+# Çok süreçli dağıtımda (gunicorn vb.) "0" yapılıp process_rematch_queue cron'dan çalıştırılabilir.
+ESLESTIRME_ARKA_PLAN = os.getenv("MEVZUAT_ESLESTIRME_ARKA_PLAN", "1") == "1"
+
+# Dashboard payload önbelleği (mevzuat_parca/panel_onbellek.py). Geçersiz kılma sürüm anahtarlarıyla
+# yapılır ve liste / dashboard ETag'leri de bu anahtarlardan üretilir: backend bütün süreçlerce
+# paylaşılmalı, yoksa bir süreçteki yazmayı diğerleri görmez (eski dashboard ve 304 döner).
+# Varsayılan ortak backend veritabanı tablosu (ek bağımlılık yok; tablo migrate sonunda kurulur,
+# elle: manage.py createcachetable). Daha hızlı ortak backend, ör.:
+#   MEVZUAT_PANEL_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   MEVZUAT_PANEL_CACHE_LOCATION=redis://127.0.0.1:6379/1
+# LocMemCache süreç içidir: sadece tek süreçli çalıştırmada (runserver, testler) kullanılmalı.
+# TIMEOUT üst sınırdır: kayıt en geç bir sonraki son tarih sınırında zaten geçersiz olur.
+PANEL_ONBELLEK = "panel"
+_PANEL_BACKEND = os.getenv("MEVZUAT_PANEL_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache")
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    PANEL_ONBELLEK: {
+        "BACKEND": _PANEL_BACKEND,
+        "LOCATION": os.getenv("MEVZUAT_PANEL_CACHE_LOCATION", "mevzuat_panel_cache"),
+        "TIMEOUT": int(os.getenv("MEVZUAT_PANEL_CACHE_TIMEOUT", "86400")),
+    },
+}
+if _PANEL_BACKEND.endswith(("LocMemCache", "DatabaseCache")):
+    # Şirket başına iki anahtar (sürüm + kayıt); varsayılan 300 küçük
+    CACHES[PANEL_ONBELLEK]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("MEVZUAT_PANEL_CACHE_MAX_ENTRIES", "20000"))}
+
+# Liste endpoint'lerinde keyset sayfalama (mevzuat_parca/sayfalama.py): ?page_size= ya da ?cursor=
+# gelince devreye girer. page_size verilmezse varsayılan, verilirse en fazla azami kadar satır döner.
+LISTE_SAYFA_BOYUTU = int(os.getenv("MEVZUAT_LISTE_SAYFA_BOYUTU", "50"))
+LISTE_AZAMI_SAYFA_BOYUTU = int(os.getenv("MEVZUAT_LISTE_AZAMI_SAYFA_BOYUTU", "500"))
+
+# DRF yanıtları mevzuat_parca/hizli_json.py ile (orjson kuruluysa orjson, değilse stdlib json).
+# MessagePack isteğe bağlı: msgpack paketi kuruluysa Accept: application/msgpack ile seçilir
+# (MEVZUAT_MSGPACK=0 kapatır); JSON her zaman ilk sırada → Accept: */* JSON alır.
+from importlib.util import find_spec
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "mevzuat_parca.hizli_json.HizliJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+MEVZUAT_MSGPACK = os.getenv("MEVZUAT_MSGPACK", "1") == "1" and find_spec("msgpack") is not None
+if MEVZUAT_MSGPACK:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("mevzuat_parca.hizli_json.MessagePackRenderer")
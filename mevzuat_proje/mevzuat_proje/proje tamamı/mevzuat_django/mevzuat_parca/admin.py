@@ -1,8 +1,14 @@
 # Django admin panelini özelleştirmek için
 from django.contrib import admin
 
+# FTS alt sorgusunu queryset filtresine gömmek için
+from django.db.models.expressions import RawSQL
+
+# FTS5 tam metin arama yardımcıları
+from . import arama
+
 # Admin panelde göstereceğimiz modeller
-from .models import Sirket, Duzenleme, SirketObligation
+from .models import Sirket, Duzenleme, SirketObligation, KaynakCheckpoint, EslestirmeIsi, SirketSkoru
 
 
 # Sirket modelini admin paneline kaydet + ayarlarını özelleştir
@@ -38,6 +44,7 @@ class DuzenlemeAdmin(admin.ModelAdmin):
         "source",       # kaynak
         "publish_date", # yayın tarihi
         "impact_type",  # etki tipi (zorunlu/risk/teşvik)
+        "duplicate_of", # yakın kopyasıysa asıl kayıt
         "created_at",   # eklenme zamanı
     )
 
@@ -48,8 +55,27 @@ class DuzenlemeAdmin(admin.ModelAdmin):
         "publish_date", # yayın tarihine göre filtre
     )
 
-    # Arama kutusu: title ve raw_text içinde arama yapar
-    search_fields = ("title", "raw_text")
+    # Arama kutusu: SQLite'ta get_search_results FTS indeksinde title + raw_text arar;
+    # FTS yoksa sadece title'da LIKE (raw_text sıkıştırılmış saklanıyor)
+    search_fields = ("title",)
+
+    # Yakın kopya bağlantısı: açılır listede tüm düzenlemeler yüklenmesin, id ile seçilsin
+    raw_id_fields = ("duplicate_of",)
+
+    def get_queryset(self, request):
+        # Liste ekranı tam metni göstermez; düzenleme formunda tek kayıt için ayrıca yüklenir
+        return super().get_queryset(request).defer("raw_text")
+
+    def get_search_results(self, request, queryset, search_term):
+        # FTS yoksa (SQLite dışı DB) Django'nun varsayılan LIKE aramasına düş
+        if not search_term or not arama.fts_kullanilabilir():
+            return super().get_search_results(request, queryset, search_term)
+
+        sql, params = arama.eslesen_idler_sql(search_term)
+        if not params[0]:
+            # sorguda aranabilir kelime yok ("!!!" gibi) → sonuç yok
+            return queryset.none(), False
+        return queryset.filter(id__in=RawSQL(sql, params)), False
 
 
 # SirketObligation modelini admin paneline kaydet + ayarlarını özelleştir
@@ -63,18 +89,49 @@ class SirketObligationAdmin(admin.ModelAdmin):
         "is_compliant",  # tamamlandı mı (uyumlu mu)
         "due_date",      # son tarih
         "risk_level",    # risk seviyesi
+        "match_state",   # elle mi, eşleştirmeyle mi açıldı
         "created_at",    # oluşturulma zamanı
     )
 
-    # Filtre paneli (uygun mu / tamam mı / risk / son tarih)
+    # Filtre paneli (uygun mu / tamam mı / risk / son tarih / eşleşme durumu)
     list_filter = (
         "is_applicable",
         "is_compliant",
         "risk_level",
         "due_date",
+        "match_state",
     )
 
     # Arama kutusu:
     # - sirket__name: şirket adında arama (ForeignKey üzerinden)
     # - duzenleme__title: mevzuat başlığında arama
     search_fields = ("sirket__name", "duzenleme__title")
+
+
+# Çekme checkpoint'leri: bir kaynağı baştan taratmak için kaydı silmek yeterli
+@admin.register(KaynakCheckpoint)
+class KaynakCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("source", "last_publish_date", "cursor", "updated_at")
+
+
+# Yeniden eşleştirme kuyruğu: takılı kalan işleri görmek için (process_rematch_queue işler)
+@admin.register(EslestirmeIsi)
+class EslestirmeIsiAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "version", "created_at", "updated_at")
+    list_filter = ("kind",)
+
+
+# Saklanan uyum skorları: elle düzenlenmez (yükümlülüklerden / refresh_scores ile hesaplanır)
+@admin.register(SirketSkoru)
+class SirketSkoruAdmin(admin.ModelAdmin):
+    list_display = (
+        "sirket", "score", "open_obligations", "overdue_obligations", "total_obligations", "computed_for", "computed_at",
+    )
+    list_select_related = ("sirket",)
+    ordering = ("score",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,6 +1,64 @@
 from django.apps import AppConfig
+from django.db import connections
+
+
+def tetikleyicileri_onar(sender, using="default", verbosity=1, **kwargs):
+    """post_migrate: eksik Duzenleme trigger'larını kurar, etkilenen indeksi baştan doldurur."""
+    from . import arama, etiket_indeksi
+
+    conn = connections[using]
+    for modul in (arama, etiket_indeksi):
+        if modul.tetikleyicileri_onar(conn) and verbosity >= 1:
+            print(f"  {modul.__name__}: eksik trigger'lar kuruldu, indeks yeniden dolduruldu")
+
+
+def onbellek_tablosunu_kur(sender, using="default", verbosity=1, **kwargs):
+    """post_migrate: veritabanı cache backend'inin (varsayılan panel önbelleği) tablosu; varsa dokunulmaz."""
+    from django.core.management import call_command
+
+    call_command("createcachetable", database=using, verbosity=max(0, verbosity - 1))
 
 
 class MevzuatParcaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mevzuat_parca'
+
+    def ready(self):
+        # Duzenleme trigger'ları (FTS kuyruğu, etiket / sektör izdüşümü): SQLite'ta tabloyu yeniden
+        # oluşturan migration'lar onları siler; her migrate sonunda eksikse kurulur ve senkronlanır
+        from django.db.models.signals import post_migrate
+
+        post_migrate.connect(tetikleyicileri_onar, sender=self, dispatch_uid="mevzuat_parca_tetikleyiciler")
+
+        # Panel önbelleği varsayılan olarak ortak DB tablosunda (settings.CACHES["panel"]):
+        # ayrı createcachetable adımı gerekmesin diye migrate sonunda kurulur
+        post_migrate.connect(onbellek_tablosunu_kur, sender=self, dispatch_uid="mevzuat_parca_onbellek_tablosu")
+
+        # Silinen yükümlülüğün katkısı saklanan şirket skorundan düşülsün: tek nesne silmede
+        # yükümlülük başına; düzenleme cascade'inde şirket başına tek farkla (pre_delete'te tek
+        # GROUP BY sorgusu, yükümlülükler silinince tek UPDATE). QuerySet.delete(): SirketObligationQuerySet
+        from django.db.models.signals import post_delete, pre_delete
+
+        from .models import Duzenleme, SirketObligation
+        from .skorlama import duzenleme_silindi, duzenleme_siliniyor, yukumluluk_silindi
+
+        post_delete.connect(yukumluluk_silindi, sender=SirketObligation, dispatch_uid="mevzuat_parca_skor_silme")
+        pre_delete.connect(duzenleme_siliniyor, sender=Duzenleme, dispatch_uid="mevzuat_parca_skor_duzenleme_oncesi")
+        post_delete.connect(duzenleme_silindi, sender=Duzenleme, dispatch_uid="mevzuat_parca_skor_duzenleme_silme")
+
+        # Dashboard payload önbelleği: şirket / yükümlülük / düzenleme değişince geçersiz
+        # (yazma yolları save() çağırmıyorsa — bulk, raw SQL — panel_onbellek.gecersiz_kil'i kendileri çağırır)
+        from django.db.models.signals import post_save
+
+        from . import panel_onbellek
+        from .models import Duzenleme, Sirket
+
+        post_delete.connect(panel_onbellek.yukumluluk_silindi, sender=SirketObligation,
+                            dispatch_uid="mevzuat_parca_panel_yukumluluk")
+        post_save.connect(panel_onbellek.sirket_degisti, sender=Sirket, dispatch_uid="mevzuat_parca_panel_sirket")
+        post_delete.connect(panel_onbellek.sirket_degisti, sender=Sirket,
+                            dispatch_uid="mevzuat_parca_panel_sirket_silme")
+        post_save.connect(panel_onbellek.duzenleme_kaydedildi, sender=Duzenleme,
+                          dispatch_uid="mevzuat_parca_panel_duzenleme")
+        post_delete.connect(panel_onbellek.duzenleme_silindi, sender=Duzenleme,
+                            dispatch_uid="mevzuat_parca_panel_duzenleme_silme")
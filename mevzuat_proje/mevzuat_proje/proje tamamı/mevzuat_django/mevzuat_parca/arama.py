@@ -0,0 +1,319 @@
+# mevzuat_parca/arama.py
+#
+# Düzenleme metinleri için SQLite FTS5 tam metin arama.
+#
+# - FTS tablosu (mevzuat_parca_duzenleme_fts) içerik saklamaz (content=''):
+#   raw_text ikinci kez diske yazılmaz, sadece ters indeks tutulur.
+# - raw_text kolonu sıkıştırılmış (sikistirma.py) ve Türkçe katlama (tr_fold) Python'da:
+#   ikisi de SQL'de yapılamadığı için indeks doğrudan trigger'la güncellenmez.
+#   Duzenleme tablosundaki trigger'lar (sadece yerleşik SQL) her insert / update / delete'te
+#   AramaIndeksIsi kuyruğuna satır yazar (bulk_create / bulk_update / ham SQL dahil; başka
+#   bağlantılar — dbshell, yedek betikleri — Python fonksiyonu olmadan yazabilir).
+#   indeksi_guncelle kuyruğu Python'da işler: toplu yazma her batch'te, arama ise sorgudan
+#   önce çağırır (başka bağlantıdan yapılan yazma da aramada görünür).
+# - Trigger'lar eksikse (SQLite'ta tabloyu yeniden oluşturan migration'lar siler)
+#   post_migrate'te geri kurulur ve indeks baştan doldurulur (tetikleyicileri_onar).
+
+# HTML snippet'te metni kaçışlamak için
+import html
+
+# Kelime ayırma + snippet eşleşmesi için
+import re
+
+# Ham SQL sorguları için
+from django.db import connection, transaction
+
+# Türkçe küçültme (nlp_rules ile aynı kural)
+from .nlp_rules import turkce_kucult
+
+# Sıkıştırılmış raw_text'i açan fonksiyon (indekse yazarken)
+from .sikistirma import metin_ac
+
+# İndeks kuyruğu tablosu
+from .models import AramaIndeksIsi
+
+
+# FTS sanal tablosunun adı
+FTS_TABLE = "mevzuat_parca_duzenleme_fts"
+
+# Trigger'ların bağlı olduğu tablo
+DUZENLEME_TABLE = "mevzuat_parca_duzenleme"
+
+# Trigger'ların yazdığı kuyruk
+KUYRUK_TABLE = AramaIndeksIsi._meta.db_table
+
+# Kuyruktan tek seferde işlenen düzenleme sayısı (IN listesi SQLite parametre sınırının altında)
+KUYRUK_PARCASI = 500
+
+# Kuyruğu dolduran trigger'lar (0014_fts_index_queue'dakilerin aynısı). Eski değerler
+# (sıkıştırılmış haliyle) kuyruğa kopyalanır: contentless FTS5'ten silerken indekslenen
+# değerin aynısı verilmeli. Metin değişmeyen update (NLP alanları vb.) kuyruğa girmez.
+TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {DUZENLEME_TABLE} BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {DUZENLEME_TABLE} BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id, eski_title, eski_raw_text)
+        VALUES (old.id, old.title, old.raw_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, raw_text ON {DUZENLEME_TABLE}
+    WHEN old.title IS NOT new.title OR old.raw_text IS NOT new.raw_text BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id, eski_title, eski_raw_text)
+        VALUES (old.id, old.title, old.raw_text);
+    END
+    """,
+]
+TRIGGER_ADLARI = [f"{FTS_TABLE}_{ek}" for ek in ("ai", "ad", "au")]
+
+# Başlık eşleşmesi gövde eşleşmesinden daha değerli (bm25 kolon ağırlıkları)
+BM25_WEIGHTS = (10.0, 1.0)
+
+# Türkçe harfleri ASCII karşılığına katla: "şirket" = "sirket", "ılık" = "ilik"
+_KATLAMA = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+# Snippet'te katlanmış harfin orijinal metinde karşılık gelebileceği harfler
+_GERI_KATLAMA = {
+    "c": "cçCÇ", "g": "gğGĞ", "i": "iıİIîÎ", "o": "oöOÖ",
+    "s": "sşSŞ", "u": "uüUÜûÛ", "a": "aâAÂ",
+}
+
+_KELIME = re.compile(r"\w+")
+
+
+def tr_fold(metin):
+    """
+    Arama için Türkçe katlama: Türkçe küçült + Türkçe harfleri ASCII'ye indir.
+    Hem indekslenen metne hem de kullanıcı sorgusuna aynı şekilde uygulanır.
+    NOT: Bu fonksiyon değişirse indeks yeniden kurulmalı (rebuild_search_index).
+    """
+    if metin is None:
+        return None
+    return turkce_kucult(metin).translate(_KATLAMA)
+
+
+def fts_kullanilabilir(conn=None) -> bool:
+    """FTS5 sadece SQLite'ta var; diğer veritabanlarında LIKE'a düşülür."""
+    return (conn or connection).vendor == "sqlite"
+
+
+def tetikleyicileri_kur(apps=None, schema_editor=None):
+    """Kuyruk trigger'larını kurar (varsa dokunmaz). SQLite dışında hiçbir şey yapmaz."""
+    if not fts_kullanilabilir(schema_editor.connection):
+        return
+    for sql in TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+def tetikleyicileri_kaldir(apps=None, schema_editor=None):
+    """
+    Trigger'ları kaldırır (indeks korunur). Toplu yazan betikler / benchmark'lar
+    kuyruğu boşuna doldurmamak için kullanır; sonra indeksi_yeniden_kur gerekir.
+    """
+    if not fts_kullanilabilir(schema_editor.connection):
+        return
+    for ad in TRIGGER_ADLARI:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {ad}")
+
+
+def eksik_tetikleyiciler(conn=None) -> list:
+    """Duzenleme tablosunda olmayan FTS kuyruk trigger'ları (SQLite dışında boş)."""
+    conn = conn or connection
+    if not fts_kullanilabilir(conn):
+        return []
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [DUZENLEME_TABLE])
+        mevcut = {ad for ad, in cur.fetchall()}
+    return [ad for ad in TRIGGER_ADLARI if ad not in mevcut]
+
+
+def tetikleyicileri_onar(conn=None) -> bool:
+    """
+    post_migrate: trigger'lardan biri eksikse (SQLite'ta AlterField / RemoveField gibi
+    tabloyu yeniden oluşturan işlemler trigger'ları sessizce siler) hepsini kurar ve
+    aradaki yazmalar kuyruğa girmediği için indeksi baştan doldurur.
+    Tablolar yoksa (migration'lar geri alınmış) dokunmaz. Dönüş: onarım yapıldı mı?
+    """
+    conn = conn or connection
+    if not fts_kullanilabilir(conn):
+        return False
+    if not {DUZENLEME_TABLE, FTS_TABLE, KUYRUK_TABLE} <= set(conn.introspection.table_names()):
+        return False
+    if not eksik_tetikleyiciler(conn):
+        return False
+    with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+        for sql in TRIGGER_SQL:
+            cur.execute(sql)
+    indeksi_yeniden_kur(conn)
+    return True
+
+
+def _indeks_degerleri(pk, title, raw_text):
+    # İndekse yazılan satır: katlanmış başlık + açılmış ve katlanmış metin
+    return pk, tr_fold(title), tr_fold(metin_ac(raw_text))
+
+
+def _indekse_ekle(cur, satirlar):
+    cur.executemany(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, raw_text) VALUES (%s, %s, %s)",
+        [_indeks_degerleri(*satir) for satir in satirlar],
+    )
+
+
+def indeksi_guncelle(conn=None) -> int:
+    """
+    Kuyruktaki değişiklikleri indekse işler. Dönüş: indekste güncellenen düzenleme sayısı.
+    Düzenleme başına kuyruktaki ilk satırın eski değerleri indeksteki haldir: o değerlerle
+    silinir, tablodaki güncel hal (varsa) eklenir; aradaki değişiklikler atlanır.
+    """
+    conn = conn or connection
+    if not fts_kullanilabilir(conn):
+        return 0
+    with conn.cursor() as cur:
+        # Boş kuyrukta yazma kilidi alınmasın (her aramada çağrılır)
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {KUYRUK_TABLE})")
+        if not cur.fetchone()[0]:
+            return 0
+
+    toplam = 0
+    while True:
+        with transaction.atomic(using=conn.alias, savepoint=False), conn.cursor() as cur:
+            # İlk komut silme: yazma kilidi baştan alınır, eşzamanlı işleyen aynı satırları alamaz.
+            # Seçilen düzenlemelerin bütün satırları birlikte alınır (sonraki parçada eski değer kalmasın).
+            cur.execute(
+                f"DELETE FROM {KUYRUK_TABLE} WHERE duzenleme_id IN "
+                f"(SELECT duzenleme_id FROM {KUYRUK_TABLE} ORDER BY id LIMIT {KUYRUK_PARCASI}) "
+                f"RETURNING id, duzenleme_id, eski_title, eski_raw_text"
+            )
+            ilk = {}
+            for _, pk, title, raw_text in sorted(cur.fetchall()):
+                ilk.setdefault(pk, (title, raw_text))
+            if not ilk:
+                return toplam
+
+            # Yeni eklenende (eski_title boş) indekste bir şey yok
+            silinecek = [_indeks_degerleri(pk, *eski) for pk, eski in ilk.items() if eski[0] is not None]
+            if silinecek:
+                cur.executemany(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text) VALUES ('delete', %s, %s, %s)",
+                    silinecek,
+                )
+            cur.execute(
+                f"SELECT id, title, raw_text FROM {DUZENLEME_TABLE} WHERE id IN ({', '.join(['%s'] * len(ilk))})",
+                list(ilk),
+            )
+            _indekse_ekle(cur, cur.fetchall())
+        toplam += len(ilk)
+        if len(ilk) < KUYRUK_PARCASI:
+            return toplam
+
+
+def fts_sorgusu(q: str) -> str:
+    """
+    Kullanıcı sorgusunu güvenli bir FTS5 MATCH ifadesine çevirir.
+    - Her kelime tırnak içine alınır (FTS sözdizimi enjekte edilemez)
+    - Her kelime önek araması yapar ("ihracat" → "ihracatçı", "ihracatın")
+    - Kelimeler arasında VE (AND) vardır
+    Aranacak kelime yoksa "" döner.
+    """
+    kelimeler = _KELIME.findall(tr_fold(q or ""))
+    return " ".join(f'"{k}"*' for k in kelimeler)
+
+
+def ara(q: str, limit: int = 20, offset: int = 0):
+    """
+    FTS indeksinde arama yapar.
+    Dönüş: (toplam_sonuc, [(duzenleme_id, skor), ...])  — skor küçük = daha alakalı
+    """
+    match = fts_sorgusu(q)
+    if not match:
+        return 0, []
+    indeksi_guncelle()
+
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        toplam = cur.fetchone()[0]
+
+        cur.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, %s, %s) AS skor FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY skor LIMIT %s OFFSET %s",
+            [*BM25_WEIGHTS, match, limit, offset],
+        )
+        return toplam, cur.fetchall()
+
+
+def eslesen_idler_sql(q: str):
+    """
+    Admin araması gibi queryset filtreleri için alt sorgu: (sql, params)
+    Kullanım: qs.filter(id__in=RawSQL(*eslesen_idler_sql(q)))
+    """
+    indeksi_guncelle()
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [fts_sorgusu(q)]
+
+
+def _terim_deseni(terim: str) -> str:
+    """Katlanmış bir terimi orijinal metinde bulan regex (kelime başı + önek)."""
+    parcalar = []
+    for ch in terim:
+        alternatifler = _GERI_KATLAMA.get(ch)
+        if alternatifler:
+            parcalar.append(f"[{alternatifler}]")
+        else:
+            parcalar.append(f"[{re.escape(ch)}{re.escape(ch.upper())}]")
+    return r"(?<!\w)" + "".join(parcalar) + r"\w*"
+
+
+def snippet(metin: str, q: str, genislik: int = 80) -> str:
+    """
+    Metinden ilk eşleşmenin çevresini alır, eşleşen kelimeleri <mark> ile işaretler.
+    Metin HTML-kaçışlanır; sadece <mark> etiketleri ham HTML'dir.
+    """
+    metin = metin or ""
+    terimler = _KELIME.findall(tr_fold(q or ""))
+    if not terimler or not metin:
+        return html.escape(metin[: genislik * 2])
+
+    desen = re.compile("|".join(_terim_deseni(t) for t in terimler))
+    ilk = desen.search(metin)
+    if not ilk:
+        return html.escape(metin[: genislik * 2])
+
+    bas = max(0, ilk.start() - genislik)
+    son = min(len(metin), ilk.end() + genislik)
+    pencere = metin[bas:son]
+
+    parcalar = []
+    konum = 0
+    for m in desen.finditer(pencere):
+        parcalar.append(html.escape(pencere[konum:m.start()]))
+        parcalar.append(f"<mark>{html.escape(m.group())}</mark>")
+        konum = m.end()
+    parcalar.append(html.escape(pencere[konum:]))
+
+    onek = "…" if bas > 0 else ""
+    sonek = "…" if son < len(metin) else ""
+    return onek + "".join(parcalar) + sonek
+
+
+def indeksi_yeniden_kur(conn=None):
+    """FTS indeksini sıfırdan doldurur (tr_fold değiştiyse, indeks bozulduysa, trigger'lar eksik kaldıysa)."""
+    conn = conn or connection
+    with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+        # Kuyruktakiler de aşağıda güncel halleriyle indekslenir
+        cur.execute(f"DELETE FROM {KUYRUK_TABLE}")
+        cur.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        son_id = 0
+        while True:
+            cur.execute(
+                f"SELECT id, title, raw_text FROM {DUZENLEME_TABLE} WHERE id > %s ORDER BY id LIMIT %s",
+                [son_id, KUYRUK_PARCASI],
+            )
+            satirlar = cur.fetchall()
+            if not satirlar:
+                break
+            son_id = satirlar[-1][0]
+            _indekse_ekle(cur, satirlar)
@@ -0,0 +1,268 @@
+# mevzuat_parca/benzerlik.py
+#
+# Yakın kopya (near-duplicate) tespiti: MinHash + LSH.
+#
+# Aynı düzenleme hem Resmî Gazete'de hem GİB'de yayımlanabiliyor ya da küçük
+# düzeltmelerle tekrar yayımlanıyor. Her kopya ayrı yükümlülük üretmesin diye
+# kopyalar asıl kayda bağlanır (Duzenleme.duplicate_of).
+#
+# - Metin 5 kelimelik parçalara (shingle) bölünür
+# - İmza: tek permütasyonlu MinHash (one permutation hashing + densification):
+#   her shingle bir kez hash'lenir, hash hangi kutuya düşerse o kutunun minimumu
+#   güncellenir → 128 değerlik imza O(kelime) sürede çıkar (128 ayrı hash yerine)
+# - LSH: imza 16 banda (8'er değer) bölünür, her bandın özeti ImzaBandi'na yazılır.
+#   Aday arama sadece (band, hash) indeksine bakar; tablo taranmaz.
+# - Adaylar imza benzerliğiyle (tahmini Jaccard) doğrulanır, ESIK üstü → kopya
+#
+# İndeks kalıcıdır ve artımlı güncellenir: sadece yeni/metni değişen kayıtlar
+# (toplu upsert'te veya index_duplicates komutunda) yeniden imzalanır.
+
+import hashlib
+import re
+import zlib
+from array import array
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import panel_onbellek, skorlama
+from .models import Duzenleme, DuzenlemeImzasi, ImzaBandi, SirketObligation
+from .nlp_rules import turkce_kucult
+
+
+# Shingle uzunluğu (kelime)
+SHINGLE = 5
+
+# İmza uzunluğu (kutu sayısı; 2'nin kuvveti olmalı) ve LSH bant yapısı
+IMZA_UZUNLUGU = 128
+BANT_SAYISI = 16
+BANT_SATIRI = IMZA_UZUNLUGU // BANT_SAYISI
+
+# Tahmini Jaccard bu değer ve üstündeyse kopya sayılır
+ESIK = 0.85
+
+# Bundan kısa metinler imzalanmaz: "Karar eki yayımlanmıştır." gibi kalıp kısa
+# metinler farklı düzenlemelerde aynı olabilir, kopya sayılmamalı
+MIN_KELIME = 30
+
+# Kutu değeri 24 bit; boş kutu doldurulurken komşu kutuya uzaklık üst bitlere yazılır
+_DEGER_MASKESI = (1 << 24) - 1
+_KUTU_MASKESI = IMZA_UZUNLUGU - 1
+_BOS = 0xFFFFFFFF
+
+# Shingle polinom hash'inin tabanı (FNV asalı)
+_P = 0x01000193
+
+_KELIME = re.compile(r"\w+")
+
+
+def kelimeler(metin: str):
+    """Türkçe küçültülmüş kelime listesi (büyük/küçük harf farkı kopya tespitini bozmasın)."""
+    return _KELIME.findall(turkce_kucult(metin or ""))
+
+
+def imza_hesapla(metin: str):
+    """
+    Metnin MinHash imzası (array('I'), IMZA_UZUNLUGU değer).
+    Metin MIN_KELIME'den kısaysa None (kopya tespitine girmez).
+    Aynı metin her süreçte aynı imzayı verir (Python'un rastgele hash()'i kullanılmaz).
+    """
+    sozcukler = kelimeler(metin)
+    if len(sozcukler) < MIN_KELIME:
+        return None
+
+    # Kelime hash'leri bir kez hesaplanır; shingle hash'i kelime hash'lerinden yuvarlanır
+    onbellek = {}
+    wh = []
+    for k in sozcukler:
+        h = onbellek.get(k)
+        if h is None:
+            h = onbellek[k] = zlib.crc32(k.encode("utf-8"))
+        wh.append(h)
+
+    # Shingle hash'i: kelime hash'lerinin polinom toplamı, kayan pencereyle (rolling) güncellenir
+    n = SHINGLE
+    ust = pow(_P, n - 1, 1 << 32)
+    r = 0
+    for x in wh[:n - 1]:
+        r = (r * _P + x) & 0xFFFFFFFF
+
+    kutular = [_BOS] * IMZA_UZUNLUGU
+    for i in range(n - 1, len(wh)):
+        r = (r * _P + wh[i]) & 0xFFFFFFFF
+        # karıştır (avalanche): kutu ve değer bitleri birbirinden bağımsız olsun
+        h = (r * 0x9E3779B1) & 0xFFFFFFFF
+        h ^= h >> 15
+        kutu = h & _KUTU_MASKESI
+        deger = (h >> 7) & _DEGER_MASKESI
+        if deger < kutular[kutu]:
+            kutular[kutu] = deger
+        # pencereden çıkan kelime
+        r = (r - wh[i - n + 1] * ust) & 0xFFFFFFFF
+
+    # Densification: boş kutu, sağındaki ilk dolu kutunun değerini (uzaklıkla işaretli) alır
+    imza = array("I", kutular)
+    for kutu in range(IMZA_UZUNLUGU):
+        if kutular[kutu] == _BOS:
+            for uzaklik in range(1, IMZA_UZUNLUGU):
+                komsu = kutular[(kutu + uzaklik) & _KUTU_MASKESI]
+                if komsu != _BOS:
+                    imza[kutu] = (uzaklik << 24) | komsu
+                    break
+    return imza
+
+
+def benzerlik(a, b) -> float:
+    """İki imzanın tahmini Jaccard benzerliği (eşit kutu oranı)."""
+    return sum(x == y for x, y in zip(a, b)) / IMZA_UZUNLUGU
+
+
+def bant_hashleri(imza):
+    """İmzanın LSH bant özetleri: [(band, hash), ...] (hash: signed 64 bit)."""
+    sonuc = []
+    for band in range(BANT_SAYISI):
+        parca = imza[band * BANT_SATIRI:(band + 1) * BANT_SATIRI].tobytes()
+        ozet = hashlib.blake2b(parca, digest_size=8, person=band.to_bytes(2, "little")).digest()
+        sonuc.append((band, int.from_bytes(ozet, "little", signed=True)))
+    return sonuc
+
+
+def imza_coz(blob) -> array:
+    imza = array("I")
+    imza.frombytes(bytes(blob))
+    return imza
+
+
+def yukumlulukleri_asila_tasi(kopya_id: int, asil_id: int):
+    """
+    Kopyaya bağlanmış yükümlülükleri asıl kayda taşır.
+    Şirketin asıl kayıtta zaten yükümlülüğü varsa kopyadaki silinir (asıl kayıttaki geçerli).
+    """
+    mevcut = SirketObligation.objects.filter(duzenleme_id=asil_id).values("sirket_id")
+    tasinan = SirketObligation.objects.filter(duzenleme_id=kopya_id).exclude(sirket_id__in=mevcut)
+    # Asıl kaydın etki tipi farklı olabilir: taşınan şirketlerin skoru baştan hesaplanır
+    sirket_ids = list(tasinan.values_list("sirket_id", flat=True))
+    tasinan.update(duzenleme_id=asil_id)
+    skorlama.skorlari_yenile(sirket_ids)
+    panel_onbellek.gecersiz_kil(sirket_ids)
+    # Silinenlerin katkısı şirket başına tek farkla düşülür (SirketObligationQuerySet.delete)
+    SirketObligation.objects.filter(duzenleme_id=kopya_id).delete()
+
+
+def _aday_bantlari(hashler, haric):
+    """(band, hash) listesine uyan mevcut kayıtlar: {(band, hash): {duzenleme_id, ...}}"""
+    sonuc = {}
+    hash_listesi = sorted({h for _, h in hashler})
+    # SQLite parametre sınırına takılmamak için parça parça
+    for i in range(0, len(hash_listesi), 500):
+        rows = (
+            ImzaBandi.objects.filter(hash__in=hash_listesi[i:i + 500])
+            .exclude(duzenleme_id__in=haric)
+            .values_list("band", "hash", "duzenleme_id")
+        )
+        for band, h, did in rows:
+            sonuc.setdefault((band, h), set()).add(did)
+    return sonuc
+
+
+def indeksle(duzenlemeler, esik=ESIK) -> dict:
+    """
+    Düzenlemelerin imzalarını yazar ve yakın kopyalarını bağlar (tek transaction).
+    duzenlemeler: pk'sı olan Duzenleme nesneleri (raw_text yüklü olmalı).
+    Dönüş: {"indexed": ..., "linked": ..., "unlinked": ...}
+    """
+    sayac = {"indexed": 0, "linked": 0, "unlinked": 0}
+    objs = sorted((d for d in duzenlemeler if d.pk), key=lambda d: d.pk)
+    if not objs:
+        return sayac
+
+    imzalar = {d.pk: imza_hesapla(d.raw_text) for d in objs}
+    bantlar = {pk: bant_hashleri(imza) for pk, imza in imzalar.items() if imza is not None}
+    ids = [d.pk for d in objs]
+
+    # Mevcut indekste adaylar (1 sorgu / 500 bant) + adayların imzaları ve kökleri
+    eslesen = _aday_bantlari([b for bl in bantlar.values() for b in bl], ids)
+    aday_idler = set().union(*eslesen.values()) if eslesen else set()
+    aday_imzalari = {}
+    kokler = {}
+    if aday_idler:
+        aday_imzalari = {
+            pk: imza_coz(blob)
+            for pk, blob in DuzenlemeImzasi.objects.filter(pk__in=aday_idler).values_list("pk", "signature")
+        }
+        kokler = dict(Duzenleme.objects.filter(pk__in=aday_idler).values_list("pk", "duplicate_of_id"))
+
+    # Batch içindeki kayıtlar da birbirinin kopyası olabilir: sırayla indekse eklenir
+    degisen = []
+    for d in objs:
+        imza = imzalar[d.pk]
+        adaylar = set()
+        for bh in bantlar.get(d.pk, ()):
+            adaylar |= eslesen.get(bh, set())
+
+        # En benzer aday (eşitlikte daha eski kayıt); eşiğin altındaysa kopya değil
+        asil = None
+        if adaylar:
+            skor, en_iyi = max((benzerlik(imza, aday_imzalari[a]), -a) for a in adaylar)
+            if skor >= esik:
+                asil = kokler.get(-en_iyi) or -en_iyi
+                if asil == d.pk:
+                    asil = None
+
+        if asil != d.duplicate_of_id:
+            sayac["linked" if asil else "unlinked"] += 1
+            d.duplicate_of_id = asil
+            degisen.append(d)
+
+        if imza is not None:
+            aday_imzalari[d.pk] = imza
+            kokler[d.pk] = asil
+            for bh in bantlar[d.pk]:
+                eslesen.setdefault(bh, set()).add(d.pk)
+        sayac["indexed"] += 1
+
+    with transaction.atomic():
+        ImzaBandi.objects.filter(duzenleme_id__in=ids).delete()
+        # Kayıt başına 16 satır: model nesnesi üretmek yerine düz executemany (ORM'in ~3 katı hızlı)
+        satirlar = [(pk, b, h) for pk, bl in bantlar.items() for b, h in bl]
+        if satirlar:
+            with connection.cursor() as cur:
+                cur.executemany(
+                    f"INSERT INTO {ImzaBandi._meta.db_table} (duzenleme_id, band, hash) VALUES (%s, %s, %s)",
+                    satirlar,
+                )
+        # Kısa metinler de boş imzayla yazılır: "güncel" sayılsınlar, her çalıştırmada tekrar işlenmesinler
+        DuzenlemeImzasi.objects.bulk_create(
+            [
+                DuzenlemeImzasi(
+                    duzenleme_id=d.pk,
+                    content_hash=d.content_hash,
+                    signature=imzalar[d.pk].tobytes() if imzalar[d.pk] is not None else b"",
+                )
+                for d in objs
+            ],
+            update_conflicts=True,
+            unique_fields=["duzenleme"],
+            update_fields=["content_hash", "signature"],
+        )
+
+        # duplicate_of listede görünür: updated_at elle (bulk_update / update auto_now'ı doldurmaz)
+        simdi = timezone.now()
+        if degisen:
+            for d in degisen:
+                d.updated_at = simdi
+            Duzenleme.objects.bulk_update(degisen, ["duplicate_of", "updated_at"])
+        for d in degisen:
+            if d.duplicate_of_id:
+                # Zincir olmasın: bu kaydın kopyaları da doğrudan asıl kayda bağlanır
+                Duzenleme.objects.filter(duplicate_of_id=d.pk).update(
+                    duplicate_of_id=d.duplicate_of_id, updated_at=simdi
+                )
+                yukumlulukleri_asila_tasi(d.pk, d.duplicate_of_id)
+    return sayac
+
+
+def eksik_imzalar():
+    """İmzası olmayan veya metni imzadan sonra değişmiş düzenlemeler (index_duplicates için)."""
+    return Duzenleme.objects.filter(Q(imza__isnull=True) | ~Q(imza__content_hash=F("content_hash")))
@@ -0,0 +1,177 @@
+# mevzuat_parca/disa_aktarim.py
+#
+# Portföy uyum dışa aktarımı (denetçiler için): her şirket + skoru + sayaçları + açık yükümlülükleri.
+# GET /api/export/portfolio/ (StreamingHttpResponse) ve export_portfolio komutu bunu kullanır.
+#
+# Bellek sabit, ilk bayt hemen:
+#   - şirketler ve açık yükümlülükler iki ayrı sıralı sorgudan iterator(chunk_size=...) ile
+#     parça parça okunur (tümü belleğe alınmaz) ve sirket_id üzerinden birleştirilir
+#     (ikisi de sirket pk sırasında: merge join, şirket başına sorgu yok)
+#   - yükümlülük sorgusu ORDER BY sirket_id, id → FK indeksinden okunur, tüm tablo sıralanmaz
+#   - skorlar şirket grubu başına score_many ile (1-2 sorgu / grup)
+#   - ilk grup küçük tutulur: ilk satır tüm grubun skorunu beklemez
+#   - CSV başlığı hiçbir sorgudan önce yazılır
+#
+# Açık yükümlülük = dashboard "todo" listesiyle aynı: uygulanabilir ve tamamlanmamış, pk sırasında.
+
+import csv
+from datetime import date
+from itertools import islice
+
+from .hizli_json import dumps
+from .models import Sirket, SirketObligation
+from .skorlama import score_many
+
+# Sorgu başına DB'den çekilen satır / skoru birlikte hesaplanan şirket sayısı
+PARCA_BOYUTU = 2000
+
+# İlk grubun boyutu (ilk satır gecikmesi bununla sınırlı)
+ILK_GRUP = 50
+
+# Küçük satırlar bu boyuta kadar birleştirilip tek parça yazılır (ilk parça beklemeden gider)
+YAZMA_TAMPONU = 64 * 1024
+
+BICIMLER = ("ndjson", "csv")
+
+# CSV: açık yükümlülük başına bir satır (açık yükümlülüğü yoksa şirket tek satır, yükümlülük boş)
+CSV_KOLONLARI = (
+    "company_id", "company_name", "sector", "location_city", "is_exporter",
+    "score", "total_obligations", "open_obligations", "overdue_obligations",
+    "obligation_id", "regulation_id", "regulation_title", "due_date", "risk_level", "impact_type", "overdue",
+)
+
+_SIRKET_KOLONLARI = ("id", "name", "sector", "location_city", "is_exporter")
+_YUKUMLULUK_KOLONLARI = (
+    "sirket_id", "id", "duzenleme_id", "duzenleme__title", "due_date", "risk_level", "duzenleme__impact_type",
+)
+
+
+def _gruplar(iterable, ilk, boyut):
+    """İlk grup ilk, sonrakiler boyut elemanlı listeler."""
+    it = iter(iterable)
+    grup = list(islice(it, ilk))
+    while grup:
+        yield grup
+        grup = list(islice(it, boyut))
+
+
+def kayitlar(bugun=None, chunk_size=PARCA_BOYUTU, sirketler=None):
+    """
+    Şirket başına bir kayıt (sirket pk sırasında):
+    {"id", "name", "sector", "location_city", "is_exporter", "score",
+     "total_obligations", "open_obligations", "overdue_obligations",
+     "open": [{"obligation_id", "regulation_id", "regulation_title", "due_date",
+               "risk_level", "impact_type", "overdue"}, ...]}
+    sirketler: isteğe bağlı Sirket queryset'i (filtre); verilmezse tümü.
+    """
+    bugun = bugun or date.today()
+    acik = SirketObligation.objects.filter(is_applicable=True, is_compliant=False)
+    if sirketler is None:
+        sirketler = Sirket.objects.all()
+    else:
+        acik = acik.filter(sirket__in=sirketler.values("pk"))
+
+    sirket_satirlari = (
+        sirketler.order_by("pk").values_list(*_SIRKET_KOLONLARI).iterator(chunk_size=chunk_size)
+    )
+    acik = (
+        acik.order_by("sirket_id", "pk")
+        .values_list(*_YUKUMLULUK_KOLONLARI)
+        .iterator(chunk_size=chunk_size)
+    )
+    siradaki = next(acik, None)
+
+    for grup in _gruplar(sirket_satirlari, min(ILK_GRUP, chunk_size), chunk_size):
+        skorlar = score_many([satir[0] for satir in grup], bugun=bugun)
+        for pk, name, sector, city, exporter in grup:
+            # Yükümlülük akışını bu şirkete kadar ilerlet (silinmiş / filtre dışı şirketlerinki atlanır)
+            while siradaki is not None and siradaki[0] < pk:
+                siradaki = next(acik, None)
+            open_items = []
+            while siradaki is not None and siradaki[0] == pk:
+                _, obl_id, reg_id, title, due, risk, impact = siradaki
+                open_items.append({
+                    "obligation_id": obl_id,
+                    "regulation_id": reg_id,
+                    "regulation_title": title,
+                    "due_date": due,
+                    "risk_level": risk,
+                    "impact_type": impact,
+                    "overdue": due is not None and due < bugun,
+                })
+                siradaki = next(acik, None)
+
+            skor = skorlar.get(pk, {})
+            yield {
+                "id": pk,
+                "name": name,
+                "sector": sector,
+                "location_city": city,
+                "is_exporter": exporter,
+                "score": skor.get("score", 100),
+                "total_obligations": skor.get("total_obligations", 0),
+                "open_obligations": skor.get("open_obligations", 0),
+                "overdue_obligations": skor.get("overdue_obligations", 0),
+                "open": open_items,
+            }
+
+
+def ndjson_satirlari(kayit_akisi):
+    """Kayıt başına bir JSON satırı (bytes)."""
+    for kayit in kayit_akisi:
+        yield dumps(kayit) + b"\n"
+
+
+class _Yanki:
+    """csv.writer'ın yazdığı satırı geri döndüren dosya benzeri nesne (tampon yok)."""
+
+    def write(self, deger):
+        return deger
+
+
+def csv_satirlari(kayit_akisi):
+    """Başlık + açık yükümlülük başına bir satır (UTF-8 bytes)."""
+    yazici = csv.writer(_Yanki())
+    yield yazici.writerow(CSV_KOLONLARI).encode()
+    for k in kayit_akisi:
+        sirket = [
+            k["id"], k["name"], k["sector"], k["location_city"], k["is_exporter"],
+            k["score"], k["total_obligations"], k["open_obligations"], k["overdue_obligations"],
+        ]
+        if not k["open"]:
+            yield yazici.writerow(sirket + [""] * 7).encode()
+            continue
+        yield "".join(
+            yazici.writerow(sirket + [
+                o["obligation_id"], o["regulation_id"], o["regulation_title"],
+                o["due_date"].isoformat() if o["due_date"] else "", o["risk_level"], o["impact_type"] or "",
+                o["overdue"],
+            ])
+            for o in k["open"]
+        ).encode()
+
+
+def _biriktir(parcalar, esik=YAZMA_TAMPONU):
+    """İlk parçayı hemen, sonrakileri ~esik baytlık bloklar halinde verir (satır başına write yok)."""
+    it = iter(parcalar)
+    ilk = next(it, None)
+    if ilk is None:
+        return
+    yield ilk
+    blok, boyut = [], 0
+    for parca in it:
+        blok.append(parca)
+        boyut += len(parca)
+        if boyut >= esik:
+            yield b"".join(blok)
+            blok, boyut = [], 0
+    if blok:
+        yield b"".join(blok)
+
+
+def akis(bicim, **kwargs):
+    """bicim ("ndjson" / "csv") için bytes blokları üreten generator (kwargs → kayitlar)."""
+    if bicim not in BICIMLER:
+        raise ValueError(f"Bilinmeyen biçim: {bicim} (ndjson / csv)")
+    uret = csv_satirlari if bicim == "csv" else ndjson_satirlari
+    return _biriktir(uret(kayitlar(**kwargs)))
@@ -0,0 +1,466 @@
+# mevzuat_parca/eslestirme.py
+#
+# Yükümlülük eşleştirme motoru: Duzenleme.sectors/tags ile Sirket.sector/is_exporter
+# eşleşen her (şirket, düzenleme) çifti için SirketObligation satırı üretir.
+#
+# Kural:
+#   - Düzenlemenin sektörleri varsa: şirketin sektörü bunlardan biri olmalı
+#   - Bayrak etiketleri (BAYRAK_ETIKETLERI, örn. "ihracat") varsa: şirkette ilgili
+#     alan True olmalı (ihracatçı)
+#   - Sektörü de bayrak etiketi de olmayan (genel) düzenlemeler otomatik eşleşmez,
+#     elle atanır (her şirkete yükümlülük açmak anlamlı değil)
+#   - Yakın kopyalar (duplicate_of dolu) atlanır: yükümlülük sadece asıl kayıtta
+#
+# Küme tabanlı çalışır: kapsamdaki şirketler bir kez okunup ters indekse
+# (sektör → şirket id'leri, bayrak → şirket id'leri) alınır; her düzenlemenin
+# eşleşenleri küme kesişimiyle bulunur. Şirket başına / düzenleme başına sorgu yoktur:
+#   1 düzenleme × 100k şirket  → şirket indeksi (1 sorgu) + mevcut çiftler + tek toplu insert
+#   10k düzenleme × 1 şirket   → düzenleme sayfaları (2000'er) + mevcut çiftler + toplu insert
+# Yazma, bulk_create yerine tek INSERT ... ON CONFLICT DO NOTHING ile executemany'dir:
+# on binlerce satırda bulk_create'in satır başına model/alan hazırlığı SQL'in kendisinden
+# ~10 kat pahalı, SQLite'ta da 999 parametre sınırı yüzünden ~120 satırda bir sorgu atıyor.
+#
+# Artımlı yeniden eşleştirme: şirketin sektörü / ihracatçılığı ya da düzenlemenin
+# sektör / etiketleri değişince (EslesmeIzleyenModel) nesne EslestirmeIsi kuyruğuna
+# girer; commit'ten sonra arka plan thread'i (veya process_rematch_queue komutu)
+# sadece o nesnelerin yükümlülük farkını (delta) hesaplar ve toplu uygular:
+#   - eşleşip yükümlülüğü olmayan çift      → yeni satır ("matched")
+#   - eşleşmesi kalkmış "matched" satır     → is_applicable=False, "unmatched"
+#   - tekrar eşleşen "unmatched" satır      → is_applicable=True, "matched"
+# Fark her zaman işlendiği andaki DB durumundan hesaplanır (kuyruğa girerken görülen
+# eski/yeni değerlerden değil): eşzamanlı düzenlemelerde sıra ne olursa olsun son
+# durum doğru çıkar, aynı işi iki işleyici yapsa da sonuç değişmez.
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from . import panel_onbellek, skorlama
+from .models import Duzenleme, EslestirmeIsi, Sirket, SirketObligation
+
+
+logger = logging.getLogger(__name__)
+
+
+# Etiket → şirketin sağlaması gereken bool alan
+BAYRAK_ETIKETLERI = {
+    "ihracat": "is_exporter",
+}
+
+# Şirket tarafında indekslenen bayrak alanları (sıralı, tekil)
+BAYRAK_ALANLARI = tuple(dict.fromkeys(BAYRAK_ETIKETLERI.values()))
+
+# Düzenlemenin etki tipine göre yeni yükümlülüğün risk seviyesi
+ETKI_RISKI = {
+    "zorunlu": "high",
+    "risk": "high",
+    "opsiyonel_tesvik": "low",
+}
+
+# Yeni yükümlülükte yazılan alanlar (diğerleri model varsayılanları)
+YAZILAN_ALANLAR = (
+    "sirket", "duzenleme", "is_applicable", "is_compliant", "due_date", "risk_level",
+    "match_state", "created_at", "updated_at",
+)
+
+# Kuyruktan tek seferde işlenen iş sayısı: düzenleme başına 100k şirketlik fark
+# hesaplanabildiği için küçük tutulur (bellek)
+KUYRUK_PARCASI = 50
+
+# Düzenlemeler bu büyüklükte sayfalarla okunur (SQLite parametre sınırı + bellek)
+SAYFA = 2000
+
+
+class SirketIndeksi:
+    """Şirketlerin ters indeksi: sektör ve bayrak alanı → şirket id kümesi."""
+
+    def __init__(self, satirlar):
+        self.tumu = set()
+        self.sektor = defaultdict(set)
+        self.bayrak = {alan: set() for alan in BAYRAK_ALANLARI}
+        for sirket_id, sektor, *bayraklar in satirlar:
+            self.tumu.add(sirket_id)
+            self.sektor[sektor].add(sirket_id)
+            for alan, deger in zip(self.bayrak, bayraklar):
+                if deger:
+                    self.bayrak[alan].add(sirket_id)
+
+    @classmethod
+    def yukle(cls, sirketler=None):
+        """
+        sirketler: Sirket queryset'i (None → tüm şirketler). Tek sorgu.
+        Satırlar queryset'in kendi SQL'iyle doğrudan cursor'dan okunur: 100k satırda
+        values_list'in satır başına dönüştürücüleri indeks kurmaktan pahalı.
+        """
+        qs = Sirket.objects.all() if sirketler is None else sirketler
+        sql, params = qs.order_by().values_list("id", "sector", *BAYRAK_ALANLARI).query.sql_with_params()
+        with connection.cursor() as cur:
+            cur.execute(sql, params)
+            return cls(cur.fetchall())
+
+    def __len__(self):
+        return len(self.tumu)
+
+    def eslesenler(self, sectors, tags) -> set:
+        """Düzenlemenin (sectors, tags) değerleriyle eşleşen şirket id'leri."""
+        bayraklar = {BAYRAK_ETIKETLERI[t] for t in tags or () if t in BAYRAK_ETIKETLERI}
+        if not sectors and not bayraklar:
+            return set()
+
+        if sectors:
+            aday = set().union(*(self.sektor.get(s, ()) for s in sectors))
+        else:
+            aday = self.tumu
+        for alan in bayraklar:
+            aday = aday & self.bayrak[alan]
+        return aday
+
+
+def _duzenleme_sayfalari(duzenlemeler):
+    """(id, sectors, tags, impact_type) sayfaları; sadece asıl kayıtlar."""
+    qs = Duzenleme.objects.all() if duzenlemeler is None else duzenlemeler
+    qs = qs.filter(duplicate_of__isnull=True).order_by("pk")
+    son_pk = 0
+    while True:
+        sayfa = list(qs.filter(pk__gt=son_pk).values_list("id", "sectors", "tags", "impact_type")[:SAYFA])
+        if not sayfa:
+            break
+        son_pk = sayfa[-1][0]
+        yield sayfa
+
+
+def _insert_sql():
+    tablo = SirketObligation._meta.db_table
+    kolonlar = ", ".join(SirketObligation._meta.get_field(f).column for f in YAZILAN_ALANLAR)
+    yer = ", ".join(["%s"] * len(YAZILAN_ALANLAR))
+    cakisma = ", ".join(SirketObligation._meta.get_field(f).column for f in ("sirket", "duzenleme"))
+    return f"INSERT INTO {tablo} ({kolonlar}) VALUES ({yer}) ON CONFLICT ({cakisma}) DO NOTHING"
+
+
+def yukumlulukleri_yaz(ciftler) -> int:
+    """
+    [(sirket_id, duzenleme_id, impact_type), ...] için yükümlülük satırları ekler
+    (risk seviyesi etki tipinden) ve şirket skorlarına yeni satırların katkısını ekler.
+    Zaten var olan çift (unique sirket+duzenleme) sessizce atlanır: eşzamanlı iki
+    eşleştirme aynı çifti yazmaya çalışsa da tek satır oluşur.
+    Dönüş: gerçekten eklenen satır sayısı.
+    """
+    if not ciftler:
+        return 0
+    simdi = connection.ops.adapt_datetimefield_value(timezone.now())
+    bugun = date.today()
+    satirlar, farklar = [], defaultdict(lambda: skorlama.SIFIR)
+    for sirket_id, duzenleme_id, impact_type in ciftler:
+        risk = ETKI_RISKI.get(impact_type, "medium")
+        satirlar.append(
+            (sirket_id, duzenleme_id, True, False, None, risk, SirketObligation.MATCH_MATCHED, simdi, simdi)
+        )
+        farklar[sirket_id] += skorlama.katki(True, False, impact_type, risk, None, bugun)
+
+    with transaction.atomic():
+        with connection.cursor() as cur:
+            cur.executemany(_insert_sql(), satirlar)
+            eklenen = max(cur.rowcount, 0)
+        if eklenen == len(satirlar):
+            skorlama.farklari_uygula(farklar, bugun=bugun)
+        else:
+            # Bazı çiftler arada başkası tarafından yazılmış: hangileri bilinmiyor → baştan hesap
+            skorlama.skorlari_yenile(farklar, bugun=bugun)
+        panel_onbellek.gecersiz_kil(farklar)
+    return eklenen
+
+
+def yukumlulukleri_uret(duzenlemeler=None, sirketler=None, indeks=None) -> dict:
+    """
+    Eşleşen ve henüz olmayan (şirket, düzenleme) çiftleri için SirketObligation üretir.
+    duzenlemeler / sirketler: kapsamı daraltan queryset'ler (None → hepsi).
+    indeks: önceden yüklenmiş SirketIndeksi (aynı şirket kümesiyle art arda
+    çağrılırken şirketler tekrar okunmasın diye).
+    Zaten var olan çiftlere (is_applicable=False olanlar dahil) dokunulmaz.
+    Dönüş: {"companies": ..., "regulations": ..., "created": ..., "existing": ...}
+    """
+    if indeks is None:
+        indeks = SirketIndeksi.yukle(sirketler)
+    sayac = {"companies": len(indeks), "regulations": 0, "created": 0, "existing": 0}
+    if not len(indeks):
+        return sayac
+
+    # Şirket kapsamı dar ise (yeni şirket) mevcut çiftler tek sorguda baştan okunur ve
+    # yeni satırlar sonda tek seferde yazılır; geniş kapsamda ikisi de sayfa sayfa
+    # yapılır (bellek, düzenleme sayısıyla büyümesin)
+    bekleyen = []
+    onceden = None
+    if sirketler is not None:
+        onceden = set(SirketObligation.objects.filter(sirket__in=sirketler).values_list("duzenleme_id", "sirket_id"))
+
+    for sayfa in _duzenleme_sayfalari(duzenlemeler):
+        eslesme = {}
+        for duzenleme_id, sectors, tags, impact_type in sayfa:
+            sayac["regulations"] += 1
+            sirket_idler = indeks.eslesenler(sectors, tags)
+            if sirket_idler:
+                eslesme[duzenleme_id] = (sirket_idler, impact_type)
+        if not eslesme:
+            continue
+
+        if onceden is not None:
+            mevcut = onceden
+        else:
+            mevcut = set(
+                SirketObligation.objects.filter(duzenleme_id__in=list(eslesme)).values_list("duzenleme_id", "sirket_id")
+            )
+
+        yeni = []
+        for duzenleme_id, (sirket_idler, impact_type) in eslesme.items():
+            for sirket_id in sirket_idler:
+                if (duzenleme_id, sirket_id) in mevcut:
+                    sayac["existing"] += 1
+                else:
+                    yeni.append((sirket_id, duzenleme_id, impact_type))
+        if onceden is not None:
+            bekleyen.extend(yeni)
+        else:
+            sayac["created"] += yukumlulukleri_yaz(yeni)
+    sayac["created"] += yukumlulukleri_yaz(bekleyen)
+    return sayac
+
+
+# =========================
+# Artımlı yeniden eşleştirme
+# =========================
+
+# Süreç ömrü boyunca toplam delta sayaçları (sayaclar() ile okunur)
+_SAYACLAR = Counter()
+_SAYAC_KILIDI = threading.Lock()
+
+# Arka plan işleyicisi: tek thread → aynı süreçte iki işleyici birbirini beklemez
+_YURUTUCU = None
+_PLANLI = False
+_PLAN_KILIDI = threading.Lock()
+
+
+def kuyruga_ekle(tur: str, ids):
+    """
+    Şirket / düzenleme id'lerini yeniden eşleştirme kuyruğuna ekler (varsa version artar).
+    Commit'ten sonra arka plan işleyicisi tetiklenir; transaction geri alınırsa iş de gider.
+    """
+    ids = [pk for pk in ids if pk is not None]
+    if not ids:
+        return
+    tablo = EslestirmeIsi._meta.db_table
+    simdi = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {tablo} (kind, object_id, version, created_at, updated_at) "
+            f"VALUES (%s, %s, 1, %s, %s) "
+            f"ON CONFLICT (kind, object_id) DO UPDATE SET version = {tablo}.version + 1, "
+            f"updated_at = excluded.updated_at",
+            [(tur, pk, simdi, simdi) for pk in ids],
+        )
+    transaction.on_commit(arka_planda_isle)
+
+
+def arka_planda_isle():
+    """
+    Kuyruğu istek thread'i dışında işler (ESLESTIRME_ARKA_PLAN=False ise hiçbir şey yapmaz;
+    o durumda process_rematch_queue komutu cron'dan çalıştırılır).
+    Zaten bekleyen bir çalıştırma varsa yenisi planlanmaz: o çalıştırma kuyruğun tamamını işler.
+    """
+    global _YURUTUCU, _PLANLI
+    if not getattr(settings, "ESLESTIRME_ARKA_PLAN", True):
+        return
+    with _PLAN_KILIDI:
+        if _PLANLI:
+            return
+        if _YURUTUCU is None:
+            _YURUTUCU = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eslestirme")
+        _PLANLI = True
+    _YURUTUCU.submit(_arka_plan_isi)
+
+
+def _arka_plan_isi():
+    global _PLANLI
+    with _PLAN_KILIDI:
+        _PLANLI = False
+    try:
+        kuyrugu_isle()
+    except Exception:
+        # Kuyruk satırları silinmediği için iş kaybolmaz; sonraki tetiklemede / komutla tekrar denenir
+        logger.exception("Yeniden eşleştirme kuyruğu işlenemedi")
+    finally:
+        # Bu thread'in açtığı DB bağlantıları
+        connections.close_all()
+
+
+def _delta_hesapla(istenen, mevcut_satirlar):
+    """
+    istenen: {(duzenleme_id, sirket_id): impact_type} — kapsamın olması gereken eşleşmeleri
+    mevcut_satirlar: kapsamdaki tüm yükümlülükler (id, duzenleme_id, sirket_id, match_state, is_applicable)
+    Dönüş: (eklenecek [(sirket_id, duzenleme_id, impact_type)], açılacak pk'lar, kapatılacak pk'lar)
+    """
+    acilacak, kapatilacak, gorulen = [], [], set()
+    for pk, duzenleme_id, sirket_id, durum, uygulanabilir in mevcut_satirlar:
+        cift = (duzenleme_id, sirket_id)
+        gorulen.add(cift)
+        if cift in istenen:
+            if durum == SirketObligation.MATCH_UNMATCHED:
+                acilacak.append(pk)
+        elif durum == SirketObligation.MATCH_MATCHED and uygulanabilir:
+            kapatilacak.append(pk)
+
+    eklenecek = [(s, d, etki) for (d, s), etki in istenen.items() if (d, s) not in gorulen]
+    return eklenecek, acilacak, kapatilacak
+
+
+def _durumu_degistir(pks, kosul, is_applicable, match_state) -> int:
+    """
+    pks içinden kosul'a hâlâ uyan yükümlülükleri açar/kapatır ve şirket skorlarına
+    katkı farkını uygular. Kosul (match_state vb.) arada kullanıcının elle yaptığı
+    değişikliğin üzerine yazılmasını önler. Dönüş: değişen satır sayısı.
+    """
+    bugun = date.today()
+    simdi = timezone.now()
+    degisen = 0
+    for i in range(0, len(pks), 500):
+        satirlar = list(
+            SirketObligation.objects.filter(pk__in=pks[i:i + 500], **kosul).select_for_update()
+            .values_list("pk", "sirket_id", "is_applicable", "is_compliant", "duzenleme__impact_type",
+                         "risk_level", "due_date")
+        )
+        if not satirlar:
+            continue
+        degisen += SirketObligation.objects.filter(pk__in=[r[0] for r in satirlar]).update(
+            is_applicable=is_applicable, match_state=match_state, updated_at=simdi
+        )
+        farklar = defaultdict(lambda: skorlama.SIFIR)
+        for _, sirket_id, eski_uygulanabilir, *alanlar, son_tarih in satirlar:
+            farklar[sirket_id] += (
+                skorlama.katki(is_applicable, *alanlar, son_tarih, bugun)
+                - skorlama.katki(eski_uygulanabilir, *alanlar, son_tarih, bugun)
+            )
+        skorlama.farklari_uygula(farklar, bugun=bugun)
+        panel_onbellek.gecersiz_kil(farklar)
+    return degisen
+
+
+def _delta_uygula(delta, sayac):
+    """Farkı yazar: eksikler eklenir, kalkanlar kapatılır, geri gelenler açılır."""
+    eklenecek, acilacak, kapatilacak = delta
+    sayac["added"] += yukumlulukleri_yaz(eklenecek)
+    sayac["reactivated"] += _durumu_degistir(
+        acilacak, {"match_state": SirketObligation.MATCH_UNMATCHED},
+        True, SirketObligation.MATCH_MATCHED,
+    )
+    sayac["deactivated"] += _durumu_degistir(
+        kapatilacak, {"match_state": SirketObligation.MATCH_MATCHED, "is_applicable": True},
+        False, SirketObligation.MATCH_UNMATCHED,
+    )
+
+
+_MEVCUT_ALANLAR = ("id", "duzenleme_id", "sirket_id", "match_state", "is_applicable")
+
+
+def sirketleri_yeniden_eslestir(sirket_ids):
+    """Şirketlerin (güncel sektör / ihracatçılık) tüm düzenlemelere göre yükümlülük farkı."""
+    indeks = SirketIndeksi.yukle(Sirket.objects.filter(pk__in=sirket_ids))
+    istenen = {}
+    if len(indeks):
+        for sayfa in _duzenleme_sayfalari(None):
+            for duzenleme_id, sectors, tags, impact_type in sayfa:
+                for sirket_id in indeks.eslesenler(sectors, tags):
+                    istenen[(duzenleme_id, sirket_id)] = impact_type
+    mevcut = SirketObligation.objects.filter(sirket_id__in=sirket_ids).values_list(*_MEVCUT_ALANLAR)
+    return _delta_hesapla(istenen, mevcut)
+
+
+def duzenlemeleri_yeniden_eslestir(duzenleme_ids, indeks=None):
+    """
+    Düzenlemelerin (güncel sektör / etiketleri) tüm şirketlere göre yükümlülük farkı.
+    Silinmiş veya yakın kopya olmuş düzenlemenin istenen eşleşmesi yoktur.
+    Etki tipi değiştiyse skor katkıları da değişir; o şirketler kuyrugu_isle'de baştan hesaplanır.
+    """
+    if indeks is None:
+        indeks = SirketIndeksi.yukle()
+    istenen = {}
+    for sayfa in _duzenleme_sayfalari(Duzenleme.objects.filter(pk__in=duzenleme_ids)):
+        for duzenleme_id, sectors, tags, impact_type in sayfa:
+            for sirket_id in indeks.eslesenler(sectors, tags):
+                istenen[(duzenleme_id, sirket_id)] = impact_type
+    mevcut = SirketObligation.objects.filter(duzenleme_id__in=duzenleme_ids).values_list(*_MEVCUT_ALANLAR)
+    return _delta_hesapla(istenen, mevcut)
+
+
+def kuyrugu_isle(parca=KUYRUK_PARCASI) -> dict:
+    """
+    Yeniden eşleştirme kuyruğunu boşaltır. Fark transaction dışında okunup hesaplanır,
+    sadece yazma kısa bir transaction'da yapılır (SQLite'ta okuma kilidini yazmaya
+    yükseltmeye çalışan transaction, eşzamanlı yazan varsa beklemeden "database is locked" alır).
+    Arada nesne tekrar değişirse güvenli: iş satırı sadece version'ı değişmediyse silinir,
+    değiştiyse bir sonraki turda güncel durumla tekrar işlenir; yazmalar da durum
+    filtreli / ON CONFLICT DO NOTHING olduğu için eski fark güncel satırı bozmaz.
+    Dönüş (bu çalıştırmanın delta boyutları):
+    {"jobs": ..., "added": ..., "deactivated": ..., "reactivated": ...}
+    """
+    sayac = {"jobs": 0, "added": 0, "deactivated": 0, "reactivated": 0}
+    tablo = EslestirmeIsi._meta.db_table
+    sirket_indeksi = None  # düzenleme işleri için tüm şirketler; çalıştırma başına bir kez
+    son_pk = 0
+    while True:
+        isler = list(
+            EslestirmeIsi.objects.filter(pk__gt=son_pk).order_by("pk")
+            .values_list("pk", "kind", "object_id", "version")[:parca]
+        )
+        if not isler:
+            break
+        son_pk = isler[-1][0]
+        sirket_ids = [oid for _, tur, oid, _ in isler if tur == "sirket"]
+        duzenleme_ids = [oid for _, tur, oid, _ in isler if tur == "duzenleme"]
+
+        deltalar = []
+        if sirket_ids:
+            deltalar.append(sirketleri_yeniden_eslestir(sirket_ids))
+        if duzenleme_ids:
+            if sirket_indeksi is None:
+                sirket_indeksi = SirketIndeksi.yukle()
+            deltalar.append(duzenlemeleri_yeniden_eslestir(duzenleme_ids, indeks=sirket_indeksi))
+
+        with transaction.atomic():
+            for delta in deltalar:
+                _delta_uygula(delta, sayac)
+            if duzenleme_ids:
+                # Değişen alan etki tipi olabilir (ceza / bonus değişir): bu düzenlemelerden
+                # yükümlülüğü olan şirketlerin skorları baştan hesaplanır
+                skorlama.skorlari_yenile(
+                    SirketObligation.objects.filter(duzenleme_id__in=duzenleme_ids, is_applicable=True)
+                    .values_list("sirket_id", flat=True).distinct()
+                )
+            with connection.cursor() as cur:
+                cur.executemany(
+                    f"DELETE FROM {tablo} WHERE id = %s AND version = %s",
+                    [(pk, surum) for pk, _, _, surum in isler],
+                )
+        sayac["jobs"] += len(isler)
+
+    if sayac["jobs"]:
+        with _SAYAC_KILIDI:
+            _SAYACLAR.update(sayac)
+            _SAYACLAR["runs"] += 1
+        logger.info("Yeniden eşleştirme: %s", sayac)
+    return sayac
+
+
+def sayaclar() -> dict:
+    """
+    Bu sürecin toplam delta sayaçları + kuyrukta bekleyen iş sayısı:
+    {"runs", "jobs", "added", "deactivated", "reactivated", "queued"}
+    """
+    with _SAYAC_KILIDI:
+        sonuc = {k: _SAYACLAR[k] for k in ("runs", "jobs", "added", "deactivated", "reactivated")}
+    sonuc["queued"] = EslestirmeIsi.objects.count()
+    return sonuc
@@ -0,0 +1,229 @@
+# mevzuat_parca/etiket_indeksi.py
+#
+# Düzenleme etiket / sektör filtreleri (GET /api/Duzenlemes/?tag=&sector=&impact_type=&date_from=&date_to=).
+#
+# Duzenleme.tags / sectors JSON listesi: "KDV etiketli, imalat sektörlü" sorusu ya satırları
+# Python'a çekip süzmek ya da SQLite'ta json_each() ile her satırın JSON'unu açmak demek
+# (indeks kullanılamaz, tüm tablo taranır). Bunun yerine listeler iki izdüşüm tablosuna
+# satır satır yazılır (DuzenlemeEtiketi, DuzenlemeSektoru; (değer, düzenleme) unique indeksli)
+# ve filtreler bu tablolardaki indeksli aramalara çevrilir:
+#   - JOIN: SQLite en seçici değerin indeks aralığından başlar, sadece eşleşenleri okuyup sıralar
+#     (değerlerden biri nadirse ya da tüm liste isteniyorsa)
+#   - EXISTS: sayfalı listede tüm etiket / sektör değerleri yaygınsa yayın tarihi (ya da etki
+#     tipi + tarih) indeksinden sırayla yürünür, her satır izdüşüm indeksinde yoklanır; ilk
+#     sayfa dolunca durulur. Yaygın değerlerde JOIN on binlerce eşleşmeyi okuyup sıralardı
+#     (1M düzenlemede ?tag=KDV&sector=imalat&impact_type=zorunlu: ~140 ms → birkaç ms).
+#     Yürüyüş değerlerin birlikte görülme oranına bağlıdır (birbirinden bağımsız varsayılır).
+#
+# İzdüşüm, Duzenleme tablosundaki trigger'larla güncel kalır: save(), toplu upsert
+# (ON CONFLICT DO UPDATE), bulk_update, QuerySet.update ve ham SQL dahil her yazmada.
+# Trigger'lar sadece yerleşik SQL (json_each) kullanır; başka bağlantıdan yazma da senkron.
+# Sadece SQLite'ta; diğer veritabanlarında filtreler JSON "contains" sorgusuna düşer
+# (PostgreSQL'de jsonb, GIN indeksiyle).
+# SQLite'ta tabloyu yeniden oluşturan migration'lar (çoğu AlterField / RemoveField) trigger'ları
+# sessizce siler: post_migrate'te eksikse kurulur ve izdüşüm baştan doldurulur (tetikleyicileri_onar).
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.dateparse import parse_date
+
+from .models import Duzenleme, DuzenlemeEtiketi, DuzenlemeSektoru
+
+DUZENLEME_TABLE = Duzenleme._meta.db_table
+
+# (izdüşüm modeli, değer kolonu = query parametresi, Duzenleme JSON kolonu, ilişki adı)
+IZDUSUMLER = (
+    (DuzenlemeEtiketi, "tag", "tags", "etiket_satirlari"),
+    (DuzenlemeSektoru, "sector", "sectors", "sektor_satirlari"),
+)
+
+# Sayfalı listede izdüşüm satırı en az bu kadar olan değer "yaygın" sayılır. Tarih indeksinden
+# yürümenin maliyeti ~ sayfa × (toplam / eşleşen), JOIN'inki ~ eşleşen: 1M düzenlemede denge ~5k.
+YAYGIN_ESIGI = 5000
+
+
+def _trigger_sql(tablo, kolon, json_kolon):
+    # Listedeki sadece metin öğeler, tekrarlar bir kez (unique indeks)
+    ekle = (
+        f"INSERT INTO {tablo} (duzenleme_id, {kolon}) "
+        f"SELECT DISTINCT new.id, value FROM json_each(new.{json_kolon}) WHERE type = 'text';"
+    )
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_ai AFTER INSERT ON {DUZENLEME_TABLE} BEGIN
+            {ekle}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_au AFTER UPDATE OF {json_kolon} ON {DUZENLEME_TABLE}
+        WHEN old.{json_kolon} IS NOT new.{json_kolon} BEGIN
+            DELETE FROM {tablo} WHERE duzenleme_id = old.id;
+            {ekle}
+        END
+        """,
+        # ORM silmesi izdüşümü CASCADE ile zaten siler; bu ham SQL silmeleri için
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_ad AFTER DELETE ON {DUZENLEME_TABLE} BEGIN
+            DELETE FROM {tablo} WHERE duzenleme_id = old.id;
+        END
+        """,
+    ]
+
+
+TRIGGER_SQL = [
+    sql for model, kolon, json_kolon, _ in IZDUSUMLER for sql in _trigger_sql(model._meta.db_table, kolon, json_kolon)
+]
+TRIGGER_ADLARI = [f"{model._meta.db_table}_{ek}" for model, *_ in IZDUSUMLER for ek in ("ai", "au", "ad")]
+
+
+def izdusum_kullanilabilir(conn=None) -> bool:
+    """İzdüşüm tabloları sadece SQLite'ta trigger'larla doldurulur."""
+    return (conn or connection).vendor == "sqlite"
+
+
+def tetikleyicileri_kur(apps=None, schema_editor=None):
+    """Migration'da RunPython olarak: trigger'ları kurar (varsa dokunmaz). SQLite dışında hiçbir şey yapmaz."""
+    if not izdusum_kullanilabilir(schema_editor.connection):
+        return
+    for sql in TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+def tetikleyicileri_kaldir(apps=None, schema_editor=None):
+    if not izdusum_kullanilabilir(schema_editor.connection):
+        return
+    for ad in TRIGGER_ADLARI:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {ad}")
+
+
+def eksik_tetikleyiciler(conn=None) -> list:
+    """Duzenleme tablosunda olmayan izdüşüm trigger'ları (SQLite dışında boş)."""
+    conn = conn or connection
+    if not izdusum_kullanilabilir(conn):
+        return []
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [DUZENLEME_TABLE])
+        mevcut = {ad for ad, in cur.fetchall()}
+    return [ad for ad in TRIGGER_ADLARI if ad not in mevcut]
+
+
+def tetikleyicileri_onar(conn=None) -> bool:
+    """
+    post_migrate: trigger'lardan biri eksikse hepsini kurar ve aradaki yazmalar izdüşüme
+    yansımadığı için baştan doldurur. Tablolar yoksa (migration'lar geri alınmış) dokunmaz.
+    Dönüş: onarım yapıldı mı?
+    """
+    conn = conn or connection
+    if not izdusum_kullanilabilir(conn):
+        return False
+    tablolar = {DUZENLEME_TABLE, *(model._meta.db_table for model, *_ in IZDUSUMLER)}
+    if not tablolar <= set(conn.introspection.table_names()):
+        return False
+    if not eksik_tetikleyiciler(conn):
+        return False
+    with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+        for sql in TRIGGER_SQL:
+            cur.execute(sql)
+        _doldur(cur)
+    return True
+
+
+def yeniden_doldur(apps=None, schema_editor=None):
+    """
+    İzdüşümü Duzenleme'deki JSON listelerinden baştan kurar (tek INSERT ... SELECT / tablo).
+    Trigger'lar kapalıyken / eksikken yapılmış yazmalardan sonra çağrılır.
+    """
+    conn = schema_editor.connection if schema_editor is not None else connection
+    if not izdusum_kullanilabilir(conn):
+        return
+    with conn.cursor() as cur:
+        _doldur(cur)
+
+
+def _doldur(cur):
+    for model, kolon, json_kolon, _ in IZDUSUMLER:
+        tablo = model._meta.db_table
+        cur.execute(f"DELETE FROM {tablo}")
+        cur.execute(
+            f"INSERT INTO {tablo} (duzenleme_id, {kolon}) "
+            f"SELECT DISTINCT d.id, j.value FROM {DUZENLEME_TABLE} d, json_each(d.{json_kolon}) j "
+            f"WHERE j.type = 'text'"
+        )
+
+
+# =========================
+# Liste filtreleri
+# =========================
+
+class GecersizFiltre(ValueError):
+    """Filtre parametresi geçersiz (param: hangi query parametresi)."""
+
+    def __init__(self, param, mesaj):
+        super().__init__(mesaj)
+        self.param = param
+
+
+def _tarih(params, ad):
+    deger = params.get(ad)
+    if not deger:
+        return None
+    try:
+        tarih = parse_date(deger)
+    except ValueError:
+        tarih = None
+    if tarih is None:
+        raise GecersizFiltre(ad, "Tarih YYYY-AA-GG biçiminde olmalı.")
+    return tarih
+
+
+def _yaygin_mi(model, kolon, deger) -> bool:
+    # En fazla YAYGIN_ESIGI indeks girdisi sayılır (tüm aralık taranmaz)
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT count(*) FROM (SELECT 1 FROM {model._meta.db_table} WHERE {kolon} = %s LIMIT {YAYGIN_ESIGI})",
+            [deger],
+        )
+        return cur.fetchone()[0] >= YAYGIN_ESIGI
+
+
+def filtrele(qs, params, sayfali=False):
+    """
+    Düzenleme queryset'ine liste filtrelerini uygular:
+    - ?tag=KDV          → etiketlerinde KDV olanlar (tekrar verilirse hepsi: ?tag=KDV&tag=vergi)
+    - ?sector=imalat    → sektörlerinde imalat olanlar (tekrar verilirse hepsi)
+    - ?impact_type=zorunlu
+    - ?date_from=2025-01-01 / ?date_to=2025-12-31 → yayın tarihi aralığı (iki uç dahil)
+    Etiket / sektör değerleri kayıttakiyle birebir karşılaştırılır ("KDV" ≠ "kdv").
+    sayfali: sonuç yayın tarihine göre sıralı ve LIMIT'li okunacak (keyset sayfa); etiket /
+    sektör koşullarının JOIN mi EXISTS mi olacağını belirler (bkz. dosya başı).
+    """
+    kosullar = [
+        (model, kolon, json_kolon, iliski, deger)
+        for model, kolon, json_kolon, iliski in IZDUSUMLER
+        for deger in dict.fromkeys(params.getlist(kolon))
+        if deger
+    ]
+    if not izdusum_kullanilabilir():
+        for _, _, json_kolon, _, deger in kosullar:
+            qs = qs.filter(**{f"{json_kolon}__contains": [deger]})
+    elif sayfali and kosullar and all(_yaygin_mi(model, kolon, deger) for model, kolon, _, _, deger in kosullar):
+        for model, kolon, _, _, deger in kosullar:
+            qs = qs.filter(Exists(model.objects.filter(duzenleme=OuterRef("pk"), **{kolon: deger})))
+    else:
+        for _, kolon, _, iliski, deger in kosullar:
+            # Ayrı filter() çağrıları çok değerli ilişkide ayrı JOIN üretir (VE koşulu)
+            qs = qs.filter(**{f"{iliski}__{kolon}": deger})
+
+    impact_type = params.get("impact_type")
+    if impact_type:
+        gecerli = [k for k, _ in Duzenleme.IMPACT_CHOICES]
+        if impact_type not in gecerli:
+            raise GecersizFiltre("impact_type", f"Geçerli değerler: {', '.join(gecerli)}.")
+        qs = qs.filter(impact_type=impact_type)
+
+    baslangic, bitis = _tarih(params, "date_from"), _tarih(params, "date_to")
+    if baslangic:
+        qs = qs.filter(publish_date__gte=baslangic)
+    if bitis:
+        qs = qs.filter(publish_date__lte=bitis)
+    return qs
@@ -0,0 +1,114 @@
+# mevzuat_parca/hizli_json.py
+#
+# Sıcak okuma yolları (şirket listesi, SPA listesi, dashboard) için hızlı JSON yazımı.
+# (Satırları dict'e çeviren derlenmiş alan eşlemcisi: serilestiriciler.eslemci)
+#
+# 1) dumps(): orjson kuruluysa orjson, değilse stdlib json — çıktı aynı (kompakt, UTF-8,
+#    \u2028/\u2029 kaçışlı, tarih-saatler DRF / Django encoder'ından geçer).
+#
+# 2) DRF renderer'ları (settings.REST_FRAMEWORK) ve JsonResponse karşılığı (yanit()).
+#    MessagePack: msgpack kuruluysa Accept: application/msgpack ile istenebilir (isteğe bağlı);
+#    kurulu değilse hiç sunulmaz, JSON istemcileri etkilenmez.
+#
+# Bu modül DRF ayarları yüklenirken import edilir: rest_framework.serializers / views
+# import etmemeli (döngüsel import).
+
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # isteğe bağlı hızlandırıcı
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # isteğe bağlı içerik türü
+    msgpack = None
+
+MSGPACK_TURU = "application/msgpack"
+
+
+# =========================
+# JSON / MessagePack
+# =========================
+
+# orjson tarih-saatleri kendisi biçimlendirmesin: encoder'lar (DRF "Z", Django milisaniye) belirlesin
+_ORJSON_SECENEKLERI = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def _kacis(ham: bytes) -> bytes:
+    # JSON'u JavaScript'in alt kümesi yap (DRF JSONRenderer ile aynı)
+    return ham.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+def dumps(data, encoder_class=DjangoJSONEncoder) -> bytes:
+    """Kompakt UTF-8 JSON; orjson varsa onunla. encoder_class.default bilinmeyen tipleri çevirir."""
+    varsayilan = encoder_class().default
+    if orjson is not None:
+        return _kacis(orjson.dumps(data, default=varsayilan, option=_ORJSON_SECENEKLERI))
+    ham = json.dumps(data, default=varsayilan, ensure_ascii=False, separators=(",", ":"))
+    return _kacis(ham.encode())
+
+
+def msgpack_dumps(data, encoder_class=DjangoJSONEncoder) -> bytes:
+    """MessagePack gövdesi; tarih / Decimal / UUID vb. JSON'daki metin karşılığıyla yazılır."""
+    varsayilan = encoder_class().default
+    return msgpack.packb(data, default=varsayilan, use_bin_type=True)
+
+
+class HizliJSONRenderer(JSONRenderer):
+    """DRF JSONRenderer'ın orjson'lu hali (girintili istek — browsable API — stdlib'e düşer)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Girintili / ASCII / geniş ayraçlı çıktı istenmişse DRF'in kendisi
+        # (orjson NaN yerine null yazar: STRICT_JSON'da da geçerli JSON)
+        if (self.get_indent(accepted_media_type, renderer_context or {}) is not None
+                or self.ensure_ascii or not self.compact):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data, self.encoder_class)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Accept: application/msgpack (ya da ?format=msgpack) ile seçilir; sadece msgpack kuruluysa listelenir."""
+
+    media_type = MSGPACK_TURU
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack_dumps(data, DRFJSONEncoder)
+
+
+def msgpack_acik() -> bool:
+    """msgpack kurulu ve settings.MEVZUAT_MSGPACK kapatılmamış."""
+    return msgpack is not None and getattr(settings, "MEVZUAT_MSGPACK", False)
+
+
+def msgpack_istendi_mi(request) -> bool:
+    return msgpack_acik() and MSGPACK_TURU in request.META.get("HTTP_ACCEPT", "")
+
+
+def yanit(request, data, status=200) -> HttpResponse:
+    """
+    JsonResponse(data, safe=False, ensure_ascii=False) karşılığı: hızlı JSON, msgpack kurulu ve
+    Accept'te istenmişse MessagePack. Aynı URL iki gösterimle dönebildiği için Vary: Accept.
+    """
+    if msgpack_istendi_mi(request):
+        response = HttpResponse(msgpack_dumps(data), content_type=MSGPACK_TURU, status=status)
+    else:
+        response = HttpResponse(dumps(data), content_type="application/json", status=status)
+    if msgpack_acik():
+        patch_vary_headers(response, ("Accept",))
+    return response
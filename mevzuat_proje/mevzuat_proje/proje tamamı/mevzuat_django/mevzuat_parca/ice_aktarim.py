@@ -0,0 +1,301 @@
+# mevzuat_parca/ice_aktarim.py
+#
+# Toplu şirket içe aktarımı (müşterinin bağlı şirket listesi): CSV / JSON / NDJSON → Sirket.
+# POST /api/companies/import/ ve import_companies komutu bunu kullanır.
+#
+# Şirket başına POST /api/companies/ yerine:
+#   - satırlar batch batch okunur (CSV / NDJSON dosyası tümüyle belleğe alınmaz)
+#   - doğrulama satır başına serializer ile değil, modelin alan tanımlarından bir kez kurulan
+#     kontrollerle yapılır (sektör SECTOR_CHOICES kümesinde mi, uzunluk, sayı, bool)
+#   - geçerli satırlar batch başına bulk_create + boş skor satırlarıyla yazılır
+#     (Sirket.save'in yaptığı: yeni şirketin 100 puanlık skor satırı)
+#   - hatalı satırlar yazılmaz; dosyadaki satır numarası ve alan başına mesajla raporlanır
+#   - istenirse yeni şirketler aynı batch'te eşleştirilir (şirket indeksi bellekteki
+#     nesnelerden kurulur, şirketler tekrar okunmaz)
+# Her batch kendi transaction'ında yazılır: yarıda kesilen aktarımda önceki batch'ler kalır.
+#
+# bulk_create save() çağırmaz: eşleştirme istenmezse yeni şirketler yeniden eşleştirme
+# kuyruğuna da girmez (sonradan match_obligations --company ... ile eşleştirilebilir).
+
+import codecs
+import csv
+import json
+from itertools import chain, islice
+
+from django.db import connection, transaction
+
+from . import eslestirme, panel_onbellek, skorlama
+from .models import Sirket
+
+# Transaction / bulk_create / eşleştirme kapsamı (şirket sayısı); eşleştirmede şirketler
+# pk__in ile süzülür, SQLite parametre sınırının (32766) altında kalmalı
+BATCH_BOYUTU = 5000
+
+BICIMLER = ("csv", "json", "ndjson")
+
+# Okunan kolonlar: bunlar + is_exporter, unvan (diğerleri, örn. dışa aktarımdan gelen id / score,
+# yok sayılır)
+ZORUNLU_KOLONLAR = ("name", "sector", "employee_count", "location_city")
+
+# CSV'de ayraç başlık satırından seçilir (Excel Türkçe yerel ayarı ";" ile kaydeder)
+_AYRACLAR = (",", ";", "\t")
+
+_DOGRU = {"1", "true", "evet", "yes", "e", "y"}
+_YANLIS = {"0", "false", "hayır", "hayir", "no", "h", "n", ""}
+
+
+class GecersizDosya(ValueError):
+    """Dosya bir bütün olarak okunamıyor (biçim, kodlama, eksik kolon)."""
+
+
+class _AlanHatasi(ValueError):
+    pass
+
+
+# =========================
+# Satır doğrulama
+# =========================
+
+def _metin(alan):
+    azami = Sirket._meta.get_field(alan).max_length
+
+    def kontrol(deger):
+        deger = ("" if deger is None else str(deger)).strip()
+        if alan in ZORUNLU_KOLONLAR and not deger:
+            raise _AlanHatasi("Bu alan zorunlu.")
+        if len(deger) > azami:
+            raise _AlanHatasi(f"En fazla {azami} karakter olabilir.")
+        return deger
+
+    return kontrol
+
+
+def _sektor():
+    # Anahtar ("imalat") ya da etiket ("İmalat"), büyük/küçük harf fark etmez
+    secenekler = {}
+    for anahtar, etiket in Sirket.SECTOR_CHOICES:
+        secenekler[anahtar.casefold()] = anahtar
+        secenekler[etiket.casefold()] = anahtar
+    gecerli = ", ".join(anahtar for anahtar, _ in Sirket.SECTOR_CHOICES)
+
+    def kontrol(deger):
+        deger = ("" if deger is None else str(deger)).strip()
+        if not deger:
+            raise _AlanHatasi("Bu alan zorunlu.")
+        try:
+            return secenekler[deger.casefold()]
+        except KeyError:
+            raise _AlanHatasi(f"Geçersiz sektör: {deger!r} (geçerli: {gecerli}).") from None
+
+    return kontrol
+
+
+def _calisan_sayisi():
+    _, azami = connection.ops.integer_field_range("PositiveIntegerField")
+
+    def kontrol(deger):
+        if isinstance(deger, str):
+            deger = deger.strip()
+        if deger is None or deger == "":
+            raise _AlanHatasi("Bu alan zorunlu.")
+        if isinstance(deger, str) and deger.isdigit():
+            sayi = int(deger)
+        elif isinstance(deger, int) and not isinstance(deger, bool):
+            sayi = deger
+        elif isinstance(deger, float) and deger.is_integer():
+            sayi = int(deger)  # JSON'da 12.0
+        else:
+            raise _AlanHatasi("Tam sayı olmalı.")
+        if sayi < 0 or sayi > azami:
+            raise _AlanHatasi(f"0 ile {azami} arasında olmalı.")
+        return sayi
+
+    return kontrol
+
+
+def _bool(deger):
+    if isinstance(deger, bool):
+        return deger
+    metin = ("" if deger is None else str(deger)).strip().casefold()
+    if metin in _DOGRU:
+        return True
+    if metin in _YANLIS:
+        return False
+    raise _AlanHatasi("true / false (evet / hayır, 1 / 0) olmalı.")
+
+
+_KONTROLLER = {
+    "name": _metin("name"),
+    "sector": _sektor(),
+    "employee_count": _calisan_sayisi(),
+    "location_city": _metin("location_city"),
+    "is_exporter": _bool,
+    "unvan": _metin("unvan"),
+}
+
+
+def dogrula(satir):
+    """
+    Tek satır (dict) → (Sirket nesnesi, None) ya da (None, {"alan": ["mesaj"], ...}).
+    Verilmeyen isteğe bağlı alanlar (is_exporter, unvan) model varsayılanını alır.
+    """
+    if not isinstance(satir, dict):
+        return None, {"non_field_errors": ["Satır bir nesne olmalı: {\"name\": ..., \"sector\": ..., ...}."]}
+    temiz, hatalar = {}, {}
+    for alan, kontrol in _KONTROLLER.items():
+        if alan not in satir and alan not in ZORUNLU_KOLONLAR:
+            continue
+        try:
+            temiz[alan] = kontrol(satir.get(alan))
+        except _AlanHatasi as e:
+            hatalar[alan] = [str(e)]
+    if hatalar:
+        return None, hatalar
+    return Sirket(**temiz), None
+
+
+# =========================
+# Dosya okuma
+# =========================
+
+def bicim_tahmin(dosya_adi="", icerik_turu="") -> str | None:
+    """Dosya uzantısından / içerik türünden biçim (bilinmiyorsa None)."""
+    uzanti = dosya_adi.rsplit(".", 1)[-1].lower() if "." in dosya_adi else ""
+    if uzanti in BICIMLER:
+        return uzanti
+    if uzanti == "jsonl" or "ndjson" in icerik_turu:
+        return "ndjson"
+    if "json" in icerik_turu:
+        return "json"
+    if "csv" in icerik_turu:
+        return "csv"
+    return None
+
+
+def json_ogeleri(veri):
+    """JSON dizisi ya da {"items": [...]} → (sıra no, öğe) (1'den başlar)."""
+    if isinstance(veri, dict) and "items" in veri:
+        veri = veri["items"]
+    if not isinstance(veri, list):
+        raise GecersizDosya("JSON bir dizi (ya da {\"items\": [...]}) olmalı.")
+    return enumerate(veri, 1)
+
+
+def _csv_satirlari(metin_satirlari):
+    ilk = next(metin_satirlari, None)
+    if ilk is None:
+        return
+    ayrac = max(_AYRACLAR, key=ilk.count)
+    okuyucu = csv.DictReader(chain([ilk], metin_satirlari), delimiter=ayrac)
+    basliklar = [(b or "").strip() for b in okuyucu.fieldnames or ()]
+    eksik = [k for k in ZORUNLU_KOLONLAR if k not in basliklar]
+    if eksik:
+        raise GecersizDosya(f"CSV başlığında eksik kolon: {', '.join(eksik)}.")
+    okuyucu.fieldnames = basliklar
+    for satir in okuyucu:
+        # Numara: dosyadaki satır (başlık 1. satır); tablo programında görülenle aynı
+        yield okuyucu.line_num, satir
+
+
+class _BozukSatir(str):
+    """Ayrıştırılamayan satır: doğrulamada satır hatası olarak raporlanır."""
+
+
+def _ndjson_satirlari(metin_satirlari):
+    for no, satir in enumerate(metin_satirlari, 1):
+        if not satir.strip():
+            continue
+        try:
+            yield no, json.loads(satir)
+        except ValueError as e:
+            yield no, _BozukSatir(f"Geçersiz JSON: {e}")
+
+
+def satirlari_oku(dosya, bicim, encoding="utf-8-sig"):
+    """
+    İkili (binary) dosya benzeri nesne → (satır no, dict) iterator'ı.
+    csv / ndjson satır satır okunur; json dizisi tek seferde ayrıştırılır.
+    Kodlama / biçim hatası GecersizDosya fırlatır.
+    """
+    if bicim not in BICIMLER:
+        raise GecersizDosya(f"Bilinmeyen biçim: {bicim} ({' / '.join(BICIMLER)}).")
+    if bicim == "json":
+        try:
+            veri = json.loads(dosya.read().decode(encoding))
+        except UnicodeDecodeError:
+            raise GecersizDosya(f"Dosya {encoding} kodlamasında değil.") from None
+        except ValueError as e:
+            raise GecersizDosya(f"Geçersiz JSON: {e}") from None
+        return json_ogeleri(veri)
+
+    metin = codecs.iterdecode(iter(dosya), encoding)
+    uret = _csv_satirlari if bicim == "csv" else _ndjson_satirlari
+    return _kodlama_denetle(uret(metin), encoding)
+
+
+def _kodlama_denetle(satirlar, encoding):
+    try:
+        yield from satirlar
+    except UnicodeDecodeError:
+        raise GecersizDosya(f"Dosya {encoding} kodlamasında değil.") from None
+    except csv.Error as e:
+        raise GecersizDosya(f"CSV okunamadı: {e}") from None
+
+
+# =========================
+# Yazma
+# =========================
+
+def _batch_yaz(sirketler, eslestir, sayac):
+    with transaction.atomic():
+        # SQLite 3.35+ / PostgreSQL: pk'lar geri döner
+        Sirket.objects.bulk_create(sirketler)
+        pks = [s.pk for s in sirketler]
+        skorlama.bos_skorlar_olustur(pks)
+        if eslestir:
+            indeks = eslestirme.SirketIndeksi(
+                (s.pk, s.sector, *(getattr(s, alan) for alan in eslestirme.BAYRAK_ALANLARI)) for s in sirketler
+            )
+            sonuc = eslestirme.yukumlulukleri_uret(sirketler=Sirket.objects.filter(pk__in=pks), indeks=indeks)
+            sayac["obligations"] += sonuc["created"]
+        # Yeni şirketlerin önbellekte payload'ı yok; değişen sadece listeler
+        panel_onbellek.liste_degisti()
+    sayac["created"] += len(sirketler)
+
+
+def ice_aktar(satirlar, batch_size=BATCH_BOYUTU, eslestir=False, dry_run=False, hata_siniri=None) -> dict:
+    """
+    (satır no, dict) iterator'ındaki geçerli satırlardan şirket oluşturur.
+    eslestir: yeni şirketlere mevcut düzenlemelerden yükümlülük aç (POST /api/companies/ gibi)
+    dry_run: sadece doğrula, yazma
+    hata_siniri: "errors" listesine en fazla bu kadar satır (None → hepsi; "invalid" hepsini sayar)
+    Dönüş: {"rows", "valid", "created", "invalid", "obligations",
+            "errors": [{"row": ..., "errors": {"alan": ["mesaj"]}}, ...]}
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size en az 1 olmalı")
+
+    sayac = {"rows": 0, "valid": 0, "created": 0, "invalid": 0, "obligations": 0}
+    hatalar = []
+    it = iter(satirlar)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        gecerli = []
+        for no, satir in batch:
+            if isinstance(satir, _BozukSatir):
+                sirket, hata = None, {"non_field_errors": [str(satir)]}
+            else:
+                sirket, hata = dogrula(satir)
+            if hata:
+                if hata_siniri is None or len(hatalar) < hata_siniri:
+                    hatalar.append({"row": no, "errors": hata})
+                sayac["invalid"] += 1
+            else:
+                gecerli.append(sirket)
+        sayac["rows"] += len(batch)
+        sayac["valid"] += len(gecerli)
+        if gecerli and not dry_run:
+            _batch_yaz(gecerli, eslestir, sayac)
+    return {**sayac, "errors": hatalar}
@@ -0,0 +1,8 @@
+# mevzuat_parca/ingestion
+#
+# Resmî kaynaklardan (Resmî Gazete, GİB) düzenleme çekme motoru.
+# Giriş noktası: run_ingestion(...) → fetch_duzenlemeler komutu bunu çağırır.
+
+from .pipeline import IngestionPipeline, run_ingestion
+
+__all__ = ["IngestionPipeline", "run_ingestion"]
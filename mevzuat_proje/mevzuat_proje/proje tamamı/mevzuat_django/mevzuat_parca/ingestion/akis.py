@@ -0,0 +1,197 @@
+# mevzuat_parca/ingestion/akis.py
+#
+# Büyük Resmî Gazete sayıları için akışlı (streaming) ayrıştırıcı.
+#
+# Tam sayı (tüm günün düzenlemeleri tek HTML'de) onlarca MB olabilir. Dosyayı
+# belleğe alıp string işlemleriyle bölmek yerine:
+#   - kaynak parça parça okunur (mmap'li yerel dosya veya akışlı HTTP gövdesi)
+#   - HTMLParser.feed() artımlı beslenir (yarım kalan etiket bir sonraki parçada tamamlanır)
+#   - her düzenleme tamamlanır tamamlanmaz aday olarak yield edilir
+# Bellekte en fazla: bir okuma parçası + o an işlenen tek düzenlemenin metni
+# (o da max_metin karakterle sınırlı).
+#
+# Sayı yapısı: <h1> sayı başlığı (tarih buradan okunur), her <h2>/<h3> yeni bir
+# düzenlemenin başlığı; başlıktan sonraki metin bir sonraki başlığa kadar gövdedir.
+
+import codecs
+import logging
+import mmap
+from collections import deque
+from html.parser import HTMLParser
+
+from .sources import _ATLANAN_ETIKETLER, _BLOK_ETIKETLER, _VOID_ETIKETLER, metinden_tarih
+
+
+logger = logging.getLogger(__name__)
+
+# Okuma parçası (bayt)
+PARCA_BOYUTU = 64 * 1024
+
+# Tek düzenleme metni için üst sınır (karakter); aşılırsa metin kesilir
+MAX_METIN = 5_000_000
+
+# Düzenleme başlığı sayılan etiketler
+BASLIK_ETIKETLERI = {"h2", "h3"}
+
+
+def dosya_parcalari(path, parca_boyutu=PARCA_BOYUTU):
+    """
+    Yerel dosyayı mmap ile parça parça okur (bytes).
+    İşlenen sayfalar MADV_DONTNEED ile bırakılır: dosya ne kadar büyük olursa
+    olsun süreç belleğinde (RSS) birikmez.
+    """
+    with open(path, "rb") as f:
+        boyut = f.seek(0, 2)
+        if boyut == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            birak = getattr(mmap, "MADV_DONTNEED", None)
+            sayfa = mmap.PAGESIZE
+            for bas in range(0, boyut, parca_boyutu):
+                yield mm[bas:bas + parca_boyutu]
+                if birak is not None:
+                    # madvise sayfa hizalı başlangıç ister
+                    hizali = bas - bas % sayfa
+                    mm.madvise(birak, hizali, min(boyut, bas + parca_boyutu) - hizali)
+
+
+def http_parcalari(url, parca_boyutu=PARCA_BOYUTU, client=None):
+    """HTTP gövdesini akışlı okur (bytes); yanıt hiçbir zaman tamamen belleğe alınmaz."""
+    import httpx
+
+    istemci = client or httpx.Client(timeout=60.0, follow_redirects=True)
+    try:
+        with istemci.stream("GET", url) as resp:
+            resp.raise_for_status()
+            yield from resp.iter_bytes(parca_boyutu)
+    finally:
+        if client is None:
+            istemci.close()
+
+
+class SayiParser(HTMLParser):
+    """
+    Tam sayı HTML'ini artımlı ayrıştırır; tamamlanan düzenlemeleri self.hazir
+    kuyruğuna (title, raw_text) olarak ekler. Kuyruğu çağıran boşaltır.
+    """
+
+    def __init__(self, max_metin=MAX_METIN):
+        super().__init__(convert_charrefs=True)
+        self.max_metin = max_metin
+        self.hazir = deque()
+        self.sayi_basligi = ""
+        self.kesilen = 0           # max_metin'e takılıp kesilen düzenleme sayısı
+
+        self._atla = 0
+        self._etiket_yigini = []
+        self._baslik = None        # okunmakta olan başlık parçaları (başlık etiketi içindeyken)
+        self._h1 = None
+        self._aktif_baslik = None  # gövdesi toplanan düzenlemenin başlığı
+        self._govde = []
+        self._uzunluk = 0
+        self._kesildi = False
+
+    # ---------- düzenleme sınırları ----------
+    def _bitir(self):
+        """Toplanan düzenlemeyi hazir kuyruğuna ekler, tamponu boşaltır."""
+        if self._aktif_baslik:
+            satirlar = (" ".join(s.split()) for s in "".join(self._govde).splitlines())
+            metin = "\n".join(s for s in satirlar if s)
+            if metin:
+                self.hazir.append((self._aktif_baslik, metin))
+            if self._kesildi:
+                self.kesilen += 1
+                logger.warning("Düzenleme metni %s karakterde kesildi: %s", self.max_metin, self._aktif_baslik)
+        self._aktif_baslik = None
+        self._govde = []
+        self._uzunluk = 0
+        self._kesildi = False
+
+    def _ekle(self, metin):
+        if self._aktif_baslik is None:
+            return
+        if self._uzunluk + len(metin) > self.max_metin:
+            metin = metin[: max(0, self.max_metin - self._uzunluk)]
+            self._kesildi = True
+        if metin:
+            self._govde.append(metin)
+            self._uzunluk += len(metin)
+
+    # ---------- HTMLParser ----------
+    def handle_starttag(self, tag, attrs):
+        if tag in _ATLANAN_ETIKETLER:
+            self._atla += 1
+        if tag not in _VOID_ETIKETLER:
+            self._etiket_yigini.append(tag)
+        if tag in BASLIK_ETIKETLERI and not self._atla:
+            self._bitir()
+            self._baslik = []
+        elif tag == "h1":
+            self._h1 = []
+        elif tag in _BLOK_ETIKETLER:
+            self._ekle("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _ATLANAN_ETIKETLER and self._atla:
+            self._atla -= 1
+        if tag in BASLIK_ETIKETLERI and self._baslik is not None:
+            self._aktif_baslik = " ".join("".join(self._baslik).split())[:500] or None
+            self._baslik = None
+        elif tag == "h1" and self._h1 is not None:
+            self.sayi_basligi = " ".join("".join(self._h1).split())
+            self._h1 = None
+        elif tag in _BLOK_ETIKETLER:
+            self._ekle("\n")
+        if self._etiket_yigini and self._etiket_yigini[-1] == tag:
+            self._etiket_yigini.pop()
+
+    def handle_data(self, data):
+        if self._atla:
+            return
+        if self._baslik is not None:
+            # Başlık da sınırlı: kapanmayan bir başlık etiketi belleği şişirmesin
+            if sum(map(len, self._baslik)) < 2000:
+                self._baslik.append(data)
+            return
+        if self._h1 is not None:
+            self._h1.append(data)
+            return
+        self._ekle(data)
+
+    def close(self):
+        super().close()
+        self._bitir()
+
+
+def sayi_adaylari(parcalar, url=None, publish_date=None, source="resmi_gazete",
+                  encoding="utf-8", max_metin=MAX_METIN):
+    """
+    Bayt parçalarından (dosya_parcalari / http_parcalari) düzenleme adaylarını
+    teker teker üretir (generator). Aday dict'i Kaynak.parse_detail ile aynı biçimdedir;
+    duzenlemeleri_upsert'e doğrudan verilebilir.
+    publish_date verilmezse sayı başlığındaki (h1) tarih kullanılır.
+    url verilirse her adaya "url#sıra" yazılır (yerel dosyada verilmez).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    parser = SayiParser(max_metin=max_metin)
+    sira = 0
+
+    def bosalt():
+        nonlocal sira
+        while parser.hazir:
+            title, raw_text = parser.hazir.popleft()
+            tarih = publish_date or metinden_tarih(parser.sayi_basligi)
+            if tarih is None:
+                raise ValueError(f"Sayı tarihi bulunamadı (publish_date verin): {url or parser.sayi_basligi}")
+            sira += 1
+            aday = {"source": source, "title": title, "publish_date": tarih, "raw_text": raw_text}
+            if url:
+                aday["url"] = f"{url}#{sira}"
+            yield aday
+
+    for parca in parcalar:
+        parser.feed(decoder.decode(parca))
+        yield from bosalt()
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    yield from bosalt()
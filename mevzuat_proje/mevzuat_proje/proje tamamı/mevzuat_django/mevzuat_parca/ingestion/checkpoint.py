@@ -0,0 +1,83 @@
+# mevzuat_parca/ingestion/checkpoint.py
+#
+# Artımlı çekme durumu (senkron DB yardımcıları; pipeline sync_to_async ile çağırır):
+#
+# - KaynakCheckpoint: kaynak başına en son görülen yayın tarihi + sayfalı listede imleç
+#   → bir sonraki çalıştırma tüm geçmişi değil, sadece bu noktadan sonrasını tarar
+# - KaynakSayfasi: URL başına ETag / Last-Modified / gövde özeti
+#   → istek koşullu yapılır, değişmeyen sayfa 304 döner ve ayrıştırılmaz
+
+import hashlib
+
+from mevzuat_parca.models import KaynakCheckpoint, KaynakSayfasi
+
+
+# KaynakSayfasi upsert'ünde güncellenecek alanlar
+DOGRULAYICI_ALANLARI = ["source", "etag", "last_modified", "body_hash", "fetched_at"]
+
+
+def govde_ozeti(body: bytes) -> str:
+    """Sayfa gövdesinin parmak izi (ETag vermeyen sunucularda değişikliği yakalamak için)."""
+    return hashlib.blake2b(body, digest_size=20).hexdigest()
+
+
+def kosullu_basliklar(onceki) -> dict:
+    """Önceki doğrulayıcılardan If-None-Match / If-Modified-Since başlıklarını üretir."""
+    if not onceki:
+        return {}
+    basliklar = {}
+    if onceki["etag"]:
+        basliklar["If-None-Match"] = onceki["etag"]
+    if onceki["last_modified"]:
+        basliklar["If-Modified-Since"] = onceki["last_modified"]
+    return basliklar
+
+
+def dogrulayici(source: str, url: str, resp) -> dict:
+    """HTTP cevabından KaynakSayfasi alanlarını çıkarır."""
+    return {
+        "url": url,
+        "source": source,
+        "etag": resp.headers.get("ETag", "")[:255],
+        "last_modified": resp.headers.get("Last-Modified", "")[:64],
+        "body_hash": govde_ozeti(resp.content),
+    }
+
+
+def checkpoint_oku(source: str):
+    """Kaynağın checkpoint kaydı (yoksa None)."""
+    return KaynakCheckpoint.objects.filter(source=source).first()
+
+
+def dogrulayicilari_oku(urls) -> dict:
+    """Verilen URL'lerin kayıtlı doğrulayıcıları: {url: {"etag", "last_modified", "body_hash"}}"""
+    rows = KaynakSayfasi.objects.filter(url__in=list(urls)).values(
+        "url", "etag", "last_modified", "body_hash"
+    )
+    return {r.pop("url"): r for r in rows}
+
+
+def dogrulayicilari_yaz(kayitlar):
+    """Doğrulayıcıları toplu upsert eder (url benzersiz; varsa günceller)."""
+    if not kayitlar:
+        return
+    KaynakSayfasi.objects.bulk_create(
+        [KaynakSayfasi(**k) for k in kayitlar],
+        update_conflicts=True,
+        unique_fields=["url"],
+        update_fields=DOGRULAYICI_ALANLARI,
+    )
+
+
+def checkpoint_yaz(source: str, last_publish_date=None, cursor=None):
+    """
+    Kaynağın checkpoint'ini ileri alır.
+    Tarih hiçbir zaman geri gitmez; cursor None ise eski değer korunur.
+    """
+    cp, _ = KaynakCheckpoint.objects.get_or_create(source=source)
+    if last_publish_date and (cp.last_publish_date is None or last_publish_date > cp.last_publish_date):
+        cp.last_publish_date = last_publish_date
+    if cursor is not None:
+        cp.cursor = cursor
+    cp.save()
+    return cp
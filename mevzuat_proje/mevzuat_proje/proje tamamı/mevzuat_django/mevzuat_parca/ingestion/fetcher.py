@@ -0,0 +1,129 @@
+# mevzuat_parca/ingestion/fetcher.py
+#
+# Havuzlu (pooled) asenkron HTTP istemcisi:
+# - tek httpx.AsyncClient → bağlantılar (keep-alive) tekrar kullanılır
+# - host başına eşzamanlılık limiti (aynı siteye en fazla N istek)
+# - host başına hız limiti (istekler arası en az 1/rate saniye)
+# - geçici hatalarda üstel bekleme ile tekrar deneme (tenacity)
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+
+# Tekrar denemeye değer HTTP durum kodları (sunucu geçici olarak meşgul/hatalı)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryableStatus(Exception):
+    """Sunucu geçici hata döndürdü (5xx/429); tekrar denenecek."""
+
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} {response.request.url}")
+        self.response = response
+
+
+class HostLimiter:
+    """
+    Tek bir host için eşzamanlılık + hız limiti.
+    - semaphore: aynı anda en fazla `concurrency` istek
+    - min_interval: iki isteğin başlangıcı arasında en az bu kadar saniye
+    """
+
+    def __init__(self, concurrency: int, rate: float):
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.min_interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        if self.min_interval:
+            # Sıradaki isteğin başlayabileceği zamanı ayır, gerekirse bekle
+            async with self._lock:
+                now = time.monotonic()
+                bekle = self._next_at - now
+                self._next_at = max(now, self._next_at) + self.min_interval
+            if bekle > 0:
+                await asyncio.sleep(bekle)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class Fetcher:
+    """
+    Pipeline'ın kullandığı HTTP katmanı.
+
+    Kullanım:
+        async with Fetcher(per_host=4, rate=5) as f:
+            resp = await f.get(url)
+    """
+
+    def __init__(self, per_host=4, rate=5.0, retries=4, backoff=0.5, timeout=30.0, client=None):
+        self.per_host = per_host
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self._own_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"User-Agent": "mevzuat-fetcher/1.0"},
+        )
+        self._limiters = {}
+
+        # İstatistik: toplam istek ve tekrar deneme sayısı
+        self.requests = 0
+        self.retried = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._own_client:
+            await self.client.aclose()
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(self.per_host, self.rate)
+        return self._limiters[host]
+
+    async def _tek_istek(self, url: str, headers=None) -> httpx.Response:
+        async with self._limiter(url):
+            self.requests += 1
+            resp = await self.client.get(url, headers=headers)
+        if resp.status_code in RETRY_STATUS:
+            raise RetryableStatus(resp)
+        return resp
+
+    async def get(self, url: str, headers=None) -> httpx.Response:
+        """
+        GET isteği; ağ hatası veya 5xx/429'da üstel bekleme ile tekrar dener.
+        Son denemede de başarısızsa istisnayı yukarı fırlatır.
+        4xx (404 vs.) tekrar denenmez, response olarak döner.
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(max(1, self.retries)),
+            wait=wait_exponential(multiplier=self.backoff, max=30),
+            retry=retry_if_exception_type((httpx.TransportError, RetryableStatus)),
+            reraise=True,
+        ):
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.retried += 1
+                return await self._tek_istek(url, headers=headers)
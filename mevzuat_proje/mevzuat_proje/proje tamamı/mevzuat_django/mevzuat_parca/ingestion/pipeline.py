@@ -0,0 +1,338 @@
+# mevzuat_parca/ingestion/pipeline.py
+#
+# Eşzamanlı mevzuat çekme hattı (pipeline):
+#
+#   [listeleme] → fetch_q → [fetch işçileri] → parse_q → [parse işçileri] → write_q → [yazıcı]
+#
+# - Kuyruklar sınırlıdır (maxsize): yavaş aşama hızlı aşamayı bekletir,
+#   bellekte sınırsız sayfa birikmez (backpressure).
+# - fetch: tek AsyncClient, host başına eşzamanlılık + hız limiti, tekrar deneme
+# - parse: HTML ayrıştırma CPU işi → event loop'u bloklamasın diye thread'de
+# - yazma: Django ORM senkron → sync_to_async ile, toplu (batch) halde
+# - artımlı: kaynak başına checkpoint'ten devam edilir, istekler koşulludur
+#   (If-None-Match / If-Modified-Since); değişmeyen sayfa 304 → ayrıştırılmaz
+
+import asyncio
+import logging
+from datetime import date
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from mevzuat_parca.toplu_yazma import duzenlemeleri_upsert
+
+from . import checkpoint as durum
+from .fetcher import Fetcher
+from .sources import kaynak_olustur
+
+
+logger = logging.getLogger(__name__)
+
+# Kuyrukların bitiş işareti
+_BITTI = object()
+
+# Varsayılan ayarlar (settings.MEVZUAT_INGESTION ile ezilebilir)
+VARSAYILAN_AYARLAR = {
+    "SOURCES": {
+        "resmi_gazete": "https://www.resmigazete.gov.tr",
+        "gib": "https://www.gib.gov.tr",
+    },
+    "CONCURRENCY": 8,      # toplam fetch işçisi
+    "PER_HOST": 4,         # host başına aynı anda en fazla istek
+    "RATE": 5.0,           # host başına saniyede en fazla istek
+    "RETRIES": 4,          # geçici hatada toplam deneme sayısı
+    "BACKOFF": 0.5,        # üstel bekleme çarpanı (sn)
+    "PARSERS": 2,          # parse işçisi sayısı
+    "QUEUE_SIZE": 100,     # kuyruk kapasitesi
+    "WRITE_BATCH": 50,     # yazıcının tek transaction'da yazdığı aday sayısı
+}
+
+
+def ayarlar(**override):
+    """settings.MEVZUAT_INGESTION + fonksiyon parametreleri ile birleşik ayarlar."""
+    sonuc = {**VARSAYILAN_AYARLAR, **getattr(settings, "MEVZUAT_INGESTION", {})}
+    sonuc.update({k: v for k, v in override.items() if v is not None})
+    return sonuc
+
+
+def adaylari_yaz(adaylar, dogrulayicilar=()):
+    """
+    Adayları veritabanına yazar (senkron; yazıcı aşaması sync_to_async ile çağırır).
+    Toplu upsert: yoksa eklenir, metni/URL'i değişmişse güncellenir, aynıysa dokunulmaz
+    (doğal anahtar: source + title + publish_date).
+    Sayfaların doğrulayıcıları da aynı transaction'da yazılır: yazma başarısız
+    olursa bir sonraki çalıştırma o sayfayı 304 sanıp atlamaz.
+    Dönüş: (eklenen, guncellenen, atlanan)
+    """
+    with transaction.atomic():
+        sayac = duzenlemeleri_upsert(adaylar)
+        durum.dogrulayicilari_yaz(dogrulayicilar)
+    return sayac["inserted"], sayac["updated"], sayac["unchanged"]
+
+
+class IngestionPipeline:
+    """
+    Kullanım:
+        stats = await IngestionPipeline(["resmi_gazete"], since, until).run()
+    """
+
+    def __init__(self, sources, since, until: date, max_pages=1, fetcher=None, full=False, **override):
+        self.conf = ayarlar(**override)
+        self.kaynaklar = [kaynak_olustur(code, self.conf["SOURCES"][code]) for code in sources]
+        # since=None → kaynağın checkpoint'inden devam (yoksa sadece until günü)
+        self.since = since
+        self.until = until
+        self.max_pages = max_pages
+        self.fetcher = fetcher
+        # full=True → checkpoint ve doğrulayıcıları yok say, her şeyi baştan çek
+        self.full = full
+
+        # Artımlı durum (çalıştırma sonunda yazılır)
+        self._hatali_kaynaklar = set()   # hata alan kaynak: checkpoint ilerletilmez
+        self._hatali_listeler = set()    # bir detayı alınamayan listeleme: doğrulayıcısı yazılmaz
+        self._listeler = []              # işlenen listeleme sayfalarının doğrulayıcıları
+        self._son_tarih = {}             # kaynak → görülen en son yayın tarihi
+        self._cursor = {}                # kaynak → yeni imleç (sayfalı kaynaklar)
+
+        self.stats = {
+            "listings": 0,   # çekilen listeleme sayfası
+            "fetched": 0,    # çekilen detay sayfası
+            "parsed": 0,     # adaya dönüşen sayfa
+            "created": 0,    # DB'ye yeni eklenen
+            "updated": 0,    # metni değişip güncellenen
+            "skipped": 0,    # zaten var olan (aynı metin)
+            "not_modified": 0,  # 304 / gövdesi aynı → ayrıştırılmayan sayfa
+            "errors": 0,     # fetch/parse hatası
+        }
+
+    # ---------- yardımcılar ----------
+    def _hata(self, kaynak, listing_url=None):
+        self.stats["errors"] += 1
+        self._hatali_kaynaklar.add(kaynak.code)
+        if listing_url:
+            self._hatali_listeler.add(listing_url)
+
+    def _tarih_gordu(self, kaynak, gun):
+        if gun and (kaynak.code not in self._son_tarih or gun > self._son_tarih[kaynak.code]):
+            self._son_tarih[kaynak.code] = gun
+
+    def _baslangic(self, cp):
+        """Kaynağın taranacağı ilk gün: checkpoint'ten önceye gidilmez (full hariç)."""
+        son = None if self.full or cp is None else cp.last_publish_date
+        if self.since is None:
+            return son or self.until
+        return max(self.since, son) if son else self.since
+
+    async def _kosullu_get(self, url, onceki):
+        """
+        Koşullu GET. Dönüş: (resp, degismedi)
+        degismedi=True → 304 veya gövde öncekiyle aynı (ayrıştırmaya gerek yok)
+        """
+        resp = await self.fetcher.get(url, headers=None if self.full else durum.kosullu_basliklar(onceki))
+        if resp.status_code == 304:
+            return resp, True
+        degismedi = (
+            not self.full and onceki is not None and resp.status_code < 400
+            and onceki["body_hash"] == durum.govde_ozeti(resp.content)
+        )
+        return resp, degismedi
+
+    # ---------- 1) listeleme ----------
+    async def _listele(self, kaynak, fetch_q):
+        """Kaynağın listeleme sayfalarını çekip yeni/değişmiş olabilecek detay linklerini fetch_q'ya koyar."""
+        oku = sync_to_async(durum.dogrulayicilari_oku, thread_sensitive=True)
+        cp = await sync_to_async(durum.checkpoint_oku, thread_sensitive=True)(kaynak.code)
+        cursor = "" if self.full or cp is None else cp.cursor
+        since = self._baslangic(cp)
+
+        for sayfa_no, (url, meta) in enumerate(kaynak.listing_urls(since, self.until, self.max_pages)):
+            onceki = None if self.full else (await oku([url])).get(url)
+            try:
+                resp, degismedi = await self._kosullu_get(url, onceki)
+            except Exception as e:  # ağ hatası: bu listeyi atla, diğerlerine devam
+                logger.warning("Listeleme alınamadı %s: %s", url, e)
+                self._hata(kaynak)
+                continue
+
+            if resp.status_code == 404:
+                # Resmî Gazete: o gün sayı yok / sayfalı kaynak: sayfalar bitti
+                if kaynak.paged:
+                    break
+                continue
+            if resp.status_code >= 400:
+                logger.warning("Listeleme %s → HTTP %s", url, resp.status_code)
+                self._hata(kaynak)
+                continue
+
+            if degismedi:
+                # Liste aynı → içindeki her şey daha önce işlendi.
+                # Sayfalı kaynakta en yeni kayıtlar başta: ilk sayfa aynıysa sonrası da aynı.
+                self.stats["not_modified"] += 1
+                self._tarih_gordu(kaynak, meta.get("publish_date"))
+                if kaynak.paged:
+                    break
+                continue
+
+            self.stats["listings"] += 1
+            self._tarih_gordu(kaynak, meta.get("publish_date"))
+            self._listeler.append(durum.dogrulayici(kaynak.code, url, resp))
+            items = await asyncio.to_thread(kaynak.parse_listing, resp.text, str(resp.url), meta)
+            if not items and kaynak.paged:
+                break
+            if kaynak.paged and sayfa_no == 0:
+                self._cursor[kaynak.code] = items[0][0]
+
+            oncekiler = {} if self.full else await oku([u for u, _ in items])
+            imlece_geldi = False
+            for item_url, item_meta in items:
+                if cursor and item_url == cursor:
+                    # Önceki çalıştırmanın en yeni kaydı: bundan sonrası zaten alındı
+                    imlece_geldi = True
+                    break
+                item_meta = {**item_meta, "listing_url": url}
+                await fetch_q.put((kaynak, item_url, item_meta, oncekiler.get(item_url)))
+            if imlece_geldi:
+                break
+
+    # ---------- 2) fetch ----------
+    async def _fetch_isci(self, fetch_q, parse_q):
+        while True:
+            is_ = await fetch_q.get()
+            if is_ is _BITTI:
+                return
+            kaynak, url, meta, onceki = is_
+            try:
+                resp, degismedi = await self._kosullu_get(url, onceki)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"HTTP {resp.status_code}")
+            except Exception as e:
+                logger.warning("Sayfa alınamadı %s: %s", url, e)
+                self._hata(kaynak, meta.get("listing_url"))
+                continue
+            if degismedi:
+                self.stats["not_modified"] += 1
+                continue
+            self.stats["fetched"] += 1
+            await parse_q.put((kaynak, str(resp.url), meta, resp.text, durum.dogrulayici(kaynak.code, url, resp)))
+
+    # ---------- 3) parse ----------
+    async def _parse_isci(self, parse_q, write_q):
+        while True:
+            is_ = await parse_q.get()
+            if is_ is _BITTI:
+                return
+            kaynak, url, meta, body, dogrulayici = is_
+            try:
+                aday = await asyncio.to_thread(kaynak.parse_detail, body, url, meta)
+            except Exception as e:
+                logger.warning("Sayfa ayrıştırılamadı %s: %s", url, e)
+                self._hata(kaynak, meta.get("listing_url"))
+                continue
+            if aday:
+                self.stats["parsed"] += 1
+                self._tarih_gordu(kaynak, aday["publish_date"])
+            # Aday çıkmasa da (boş sayfa) doğrulayıcı yazılır: aynı sayfa tekrar ayrıştırılmaz
+            await write_q.put((aday, dogrulayici))
+
+    # ---------- 4) yazma ----------
+    async def _yazici(self, write_q):
+        yaz = sync_to_async(adaylari_yaz, thread_sensitive=True)
+        batch = []
+        dogrulayicilar = []
+        while True:
+            is_ = await write_q.get()
+            if is_ is not _BITTI:
+                aday, dogrulayici = is_
+                if aday:
+                    batch.append(aday)
+                dogrulayicilar.append(dogrulayici)
+            if dogrulayicilar and (is_ is _BITTI or len(dogrulayicilar) >= self.conf["WRITE_BATCH"]):
+                eklenen, guncellenen, atlanan = await yaz(batch, dogrulayicilar)
+                self.stats["created"] += eklenen
+                self.stats["updated"] += guncellenen
+                self.stats["skipped"] += atlanan
+                batch = []
+                dogrulayicilar = []
+            if is_ is _BITTI:
+                return
+
+    # ---------- 5) durum ----------
+    def _durumu_kaydet(self):
+        """
+        Çalıştırma bitince (senkron): listeleme doğrulayıcıları + checkpoint'ler.
+        - Bir detayı alınamayan listenin doğrulayıcısı yazılmaz → sonraki çalıştırmada 304 olmaz
+        - Hata alan kaynağın checkpoint'i ilerletilmez → kaçan kayıt sonraki çalıştırmada alınır
+        """
+        with transaction.atomic():
+            durum.dogrulayicilari_yaz([d for d in self._listeler if d["url"] not in self._hatali_listeler])
+            for kaynak in self.kaynaklar:
+                if kaynak.code in self._hatali_kaynaklar:
+                    continue
+                durum.checkpoint_yaz(
+                    kaynak.code,
+                    last_publish_date=self._son_tarih.get(kaynak.code),
+                    cursor=self._cursor.get(kaynak.code),
+                )
+
+    async def run(self):
+        """Hattı baştan sona çalıştırır, istatistikleri döndürür."""
+        boyut = self.conf["QUEUE_SIZE"]
+        fetch_q = asyncio.Queue(maxsize=boyut)
+        parse_q = asyncio.Queue(maxsize=boyut)
+        write_q = asyncio.Queue(maxsize=boyut)
+
+        own_fetcher = self.fetcher is None
+        if own_fetcher:
+            self.fetcher = Fetcher(
+                per_host=self.conf["PER_HOST"],
+                rate=self.conf["RATE"],
+                retries=self.conf["RETRIES"],
+                backoff=self.conf["BACKOFF"],
+            )
+
+        fetchers = [asyncio.create_task(self._fetch_isci(fetch_q, parse_q))
+                    for _ in range(self.conf["CONCURRENCY"])]
+        parsers = [asyncio.create_task(self._parse_isci(parse_q, write_q))
+                   for _ in range(self.conf["PARSERS"])]
+        yazici = asyncio.create_task(self._yazici(write_q))
+
+        async def kapat():
+            # Aşamaları sırayla kapat: listeleme → fetch → parse → yazma
+            await asyncio.gather(*(self._listele(k, fetch_q) for k in self.kaynaklar))
+            for _ in fetchers:
+                await fetch_q.put(_BITTI)
+            await asyncio.gather(*fetchers)
+            for _ in parsers:
+                await parse_q.put(_BITTI)
+            await asyncio.gather(*parsers)
+            await write_q.put(_BITTI)
+            await yazici
+
+        tum = [asyncio.create_task(kapat()), yazici, *fetchers, *parsers]
+        try:
+            # Bir aşama beklenmedik şekilde çökerse (örn. DB hatası) diğerleri
+            # dolu kuyrukta sonsuza kadar beklemesin: hepsini iptal et
+            done, pending = await asyncio.wait(tum, return_when=asyncio.FIRST_EXCEPTION)
+            for t in done:
+                if t.exception():
+                    raise t.exception()
+            await sync_to_async(self._durumu_kaydet, thread_sensitive=True)()
+        finally:
+            for t in tum:
+                t.cancel()
+            if own_fetcher:
+                await self.fetcher.aclose()
+
+        self.stats["requests"] = self.fetcher.requests
+        self.stats["retried"] = self.fetcher.retried
+        return self.stats
+
+
+def run_ingestion(sources, since, until: date, max_pages=1, full=False, **override):
+    """
+    Senkron giriş noktası (management command buradan çağırır).
+    async_to_sync sayesinde DB yazmaları çağıran thread'de yapılır.
+    """
+    pipeline = IngestionPipeline(sources, since, until, max_pages=max_pages, full=full, **override)
+    return async_to_sync(pipeline.run)()
@@ -0,0 +1,224 @@
+# mevzuat_parca/ingestion/sources.py
+#
+# Kaynak tanımları: hangi listeleme sayfaları çekilir, listeden hangi
+# linkler düzenleme detayıdır, detay sayfasından Duzenleme adayı nasıl çıkar.
+#
+# Aday (candidate) = Duzenleme alanlarıyla aynı isimli dict:
+#   {"source", "title", "publish_date", "url", "raw_text"}
+
+import re
+from datetime import date, timedelta
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# Ay adlarını büyük/küçük harf ve Türkçe/ASCII yazımdan bağımsız eşlemek için (arama ile aynı katlama)
+from ..arama import tr_fold
+
+
+# Metin çıkarırken satır sonu koyulacak blok etiketler
+_BLOK_ETIKETLER = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "table", "section"}
+
+# Metni alınmayacak etiketler
+_ATLANAN_ETIKETLER = {"script", "style", "noscript"}
+
+# Kapanış etiketi olmayan (void) etiketler: yığına eklenmez
+_VOID_ETIKETLER = {"br", "img", "meta", "link", "input", "hr", "col", "wbr", "source"}
+
+# "20.12.2025" / "20/12/2025" gibi tarihler
+_TARIH = re.compile(r"\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b")
+
+# "20 Aralık 2025" gibi tarihler (Resmî Gazete sayı başlıkları); "1 EKIM 2025", "20 Aralik 2025" de olur
+_AYLAR = ["ocak", "şubat", "mart", "nisan", "mayıs", "haziran",
+          "temmuz", "ağustos", "eylül", "ekim", "kasım", "aralık"]
+# Katlanmış ay adı → ay numarası ("aralik" → 12); tr_fold "EKIM" / "EKİM" / "ekim"i aynı yapar
+_AY_NUMARALARI = {tr_fold(ad): no for no, ad in enumerate(_AYLAR, 1)}
+# Desende hem Türkçe hem ASCII yazım ("şubat" / "subat"), uzun olan önce
+_AY_YAZIMLARI = sorted({*_AYLAR, *_AY_NUMARALARI}, key=len, reverse=True)
+_YAZILI_TARIH = re.compile(r"\b(\d{1,2})\s+(" + "|".join(_AY_YAZIMLARI) + r")\s+(\d{4})\b", re.IGNORECASE)
+
+
+class SayfaParser(HTMLParser):
+    """
+    Tek geçişte HTML'den şunları toplar:
+    - links: [(href, link_metni), ...]
+    - title: <title> içeriği
+    - h1: ilk <h1> içeriği
+    - text: görünür metin (script/style hariç, bloklar satır satır)
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.title = ""
+        self.h1 = ""
+        self._parcalar = []
+        self._atla = 0
+        self._etiket_yigini = []
+        self._href = None
+        self._link_metni = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _ATLANAN_ETIKETLER:
+            self._atla += 1
+        if tag not in _VOID_ETIKETLER:
+            self._etiket_yigini.append(tag)
+        if tag in _BLOK_ETIKETLER:
+            self._parcalar.append("\n")
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._link_metni = []
+
+    def handle_endtag(self, tag):
+        if tag in _ATLANAN_ETIKETLER and self._atla:
+            self._atla -= 1
+        if tag == "a" and self._href:
+            self.links.append((self._href, " ".join("".join(self._link_metni).split())))
+            self._href = None
+        if tag in _BLOK_ETIKETLER:
+            self._parcalar.append("\n")
+        if self._etiket_yigini and self._etiket_yigini[-1] == tag:
+            self._etiket_yigini.pop()
+
+    def handle_data(self, data):
+        etiket = self._etiket_yigini[-1] if self._etiket_yigini else ""
+        if etiket == "title":
+            self.title += data
+            return
+        if self._atla:
+            return
+        if etiket == "h1" and not self.h1.strip():
+            self.h1 = data
+        if self._href is not None:
+            self._link_metni.append(data)
+        self._parcalar.append(data)
+
+    @property
+    def text(self) -> str:
+        # Satırları sadeleştir: fazla boşlukları at, boş satırları birleştir
+        satirlar = (" ".join(s.split()) for s in "".join(self._parcalar).splitlines())
+        return "\n".join(s for s in satirlar if s)
+
+
+def html_coz(body: str) -> SayfaParser:
+    """HTML metnini parse eder ve SayfaParser döndürür."""
+    p = SayfaParser()
+    p.feed(body)
+    p.close()
+    return p
+
+
+def metinden_tarih(metin: str):
+    """Metindeki ilk tarihi (gg.aa.yyyy veya "20 Aralık 2025") date olarak döndürür (yoksa None)."""
+    adaylar = []
+    for m in _TARIH.finditer(metin or ""):
+        adaylar.append((m.start(), int(m.group(1)), int(m.group(2)), int(m.group(3))))
+    for m in _YAZILI_TARIH.finditer(metin or ""):
+        ay = _AY_NUMARALARI.get(tr_fold(m.group(2)))
+        if ay is not None:
+            adaylar.append((m.start(), int(m.group(1)), ay, int(m.group(3))))
+
+    for _, gun, ay, yil in sorted(adaylar):
+        try:
+            return date(yil, ay, gun)
+        except ValueError:
+            continue
+    return None
+
+
+class Kaynak:
+    """
+    Kaynak arayüzü. Alt sınıflar şunları sağlar:
+    - listing_urls(...)  → [(listeleme_url, meta), ...]
+    - parse_listing(...) → [(detay_url, meta), ...]
+    - parse_detail(...)  → aday dict veya None
+    """
+
+    code = ""
+
+    # Sayfalı listeleme mi? (True ise ilk boş/404 sayfada durulur)
+    paged = False
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    # Detay linki olarak kabul edilecek (tam) URL deseni
+    item_pattern = re.compile(r".")
+
+    def listing_urls(self, since: date, until: date, max_pages: int):
+        raise NotImplementedError
+
+    def parse_listing(self, body: str, url: str, meta: dict):
+        sayfa = html_coz(body)
+        sonuc = []
+        gorulen = set()
+        for href, metin in sayfa.links:
+            if not href:
+                continue
+            tam = urljoin(url, href)
+            if tam in gorulen or not self.item_pattern.search(tam):
+                continue
+            gorulen.add(tam)
+            sonuc.append((tam, {**meta, "link_text": metin}))
+        return sonuc
+
+    def parse_detail(self, body: str, url: str, meta: dict):
+        sayfa = html_coz(body)
+        title = " ".join((sayfa.h1 or meta.get("link_text") or sayfa.title).split())
+        raw_text = sayfa.text
+        if not title or not raw_text:
+            return None
+
+        publish_date = meta.get("publish_date") or metinden_tarih(raw_text) or date.today()
+        return {
+            "source": self.code,
+            "title": title[:500],
+            "publish_date": publish_date,
+            "url": url,
+            "raw_text": raw_text,
+        }
+
+
+class ResmiGazeteKaynagi(Kaynak):
+    """
+    Resmî Gazete: her gün için bir fihrist (index) sayfası vardır:
+        {base}/eskiler/2025/12/20251220.htm
+    Fihristteki "20251220-1.htm" gibi linkler o günün düzenlemeleridir.
+    """
+
+    code = "resmi_gazete"
+    item_pattern = re.compile(r"\d{8}-\d+\.htm$")
+
+    def listing_urls(self, since: date, until: date, max_pages: int):
+        gun = since
+        while gun <= until:
+            url = f"{self.base_url}/eskiler/{gun:%Y}/{gun:%m}/{gun:%Y%m%d}.htm"
+            yield url, {"publish_date": gun}
+            gun += timedelta(days=1)
+
+
+class GibKaynagi(Kaynak):
+    """
+    Gelir İdaresi Başkanlığı: sayfalı mevzuat listesi
+        {base}/mevzuat/tebligler/sayfa-1.html, sayfa-2.html, ...
+    Yayın tarihi detay sayfasındaki ilk tarihten okunur.
+    """
+
+    code = "gib"
+    paged = True
+    item_pattern = re.compile(r"/mevzuat/(teblig|sirkuler|ozelge)/[^/]+$")
+
+    def listing_urls(self, since: date, until: date, max_pages: int):
+        for sayfa in range(1, max_pages + 1):
+            yield f"{self.base_url}/mevzuat/tebligler/sayfa-{sayfa}.html", {}
+
+
+# Kaynak kodu → sınıf (Duzenleme.SOURCE_CHOICES ile aynı kodlar)
+KAYNAK_SINIFLARI = {
+    ResmiGazeteKaynagi.code: ResmiGazeteKaynagi,
+    GibKaynagi.code: GibKaynagi,
+}
+
+
+def kaynak_olustur(code: str, base_url: str) -> Kaynak:
+    """Kaynak kodundan Kaynak nesnesi üretir (bilinmeyen kodda KeyError)."""
+    return KAYNAK_SINIFLARI[code](base_url)
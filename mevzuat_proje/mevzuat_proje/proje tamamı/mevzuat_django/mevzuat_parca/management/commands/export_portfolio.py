@@ -0,0 +1,43 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+# Portföy dışa aktarımı (NDJSON / CSV akışı; bellek sabit)
+from mevzuat_parca import disa_aktarim
+from mevzuat_parca.models import Sirket
+
+
+class Command(BaseCommand):
+    """
+    python manage.py export_portfolio > portfoy.ndjson
+    python manage.py export_portfolio --format csv --output portfoy.csv
+    python manage.py export_portfolio --sector imalat --chunk-size 5000
+
+    GET /api/export/portfolio/ ile aynı içerik: şirket + skor + sayaçlar + açık yükümlülükler.
+    Satırlar DB'den parça parça okunurken yazılır (tüm portföy belleğe alınmaz).
+    """
+
+    help = "Tüm şirketlerin uyum skorunu ve açık yükümlülüklerini NDJSON / CSV olarak dışa aktarır."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=disa_aktarim.BICIMLER, default="ndjson", dest="bicim")
+        parser.add_argument("--output", dest="cikti", help="Dosya yolu (verilmezse stdout)")
+        parser.add_argument("--sector", dest="sektor", help="Sadece bu sektördeki şirketler")
+        parser.add_argument("--chunk-size", type=int, default=disa_aktarim.PARCA_BOYUTU, dest="parca",
+                            help="Sorgu başına okunan satır / skor grubu boyutu")
+
+    def handle(self, *args, **options):
+        if options["parca"] < 1:
+            raise CommandError("--chunk-size en az 1 olmalı")
+        sirketler = Sirket.objects.filter(sector=options["sektor"]) if options["sektor"] else None
+        bloklar = disa_aktarim.akis(options["bicim"], sirketler=sirketler, chunk_size=options["parca"])
+
+        if options["cikti"]:
+            with open(options["cikti"], "wb") as f:
+                boyut = sum(f.write(blok) for blok in bloklar)
+            self.stderr.write(self.style.SUCCESS(f"Bitti: {options['cikti']} ({boyut} bayt)"))
+            return
+
+        # stdout: bloklar satır sınırında biter, metin olarak yazılabilir (ek satır sonu yok)
+        for blok in bloklar:
+            self.stdout.write(blok.decode(), ending="")
+        self.stdout.flush()
@@ -1,40 +1,44 @@
 # Django'da custom management command yazmak için temel sınıf
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-# Bugünün tarihini almak için
+# Tarih parametrelerini işlemek için
 from datetime import date
 
-# Düzenleme modelini DB’ye yazmak/okumak için
+# Düzenleme modeli (kaynak seçenekleri için)
 from mevzuat_parca.models import Duzenleme
 
+# Eşzamanlı çekme motoru (fetch → parse → write)
+from mevzuat_parca.ingestion import run_ingestion
 
-def run():
+
+# Kaynak kodları: Duzenleme.SOURCE_CHOICES ile aynı
+KAYNAK_KODLARI = [code for code, _ in Duzenleme.SOURCE_CHOICES]
+
+
+def run(sources=None, since=None, until=None, max_pages=1, full=False, **override):
     """
     Bu fonksiyon:
-    - Test amaçlı DB’ye 1 tane Duzenleme kaydı ekler (veya varsa tekrar eklemez).
-    - get_or_create sayesinde aynı başlık + tarih + source ile duplicate üretmez.
+    - Seçilen kaynakların listeleme sayfalarını çeker (Resmî Gazete: günlük fihrist,
+      GİB: sayfalı liste)
+    - Detay sayfalarını eşzamanlı indirir, ayrıştırır
+    - Yeni düzenlemeleri DB'ye yazar, metni değişenleri günceller
+      (aynı source + title + publish_date tekrar eklenmez)
+    Artımlı çalışır: her kaynak kendi checkpoint'inden devam eder (since bundan
+    eskiyse checkpoint'e çekilir), istekler koşulludur (değişmeyen sayfa → 304).
+    full=True: checkpoint ve doğrulayıcılar yok sayılır.
+    Dönüş: istatistik sözlüğü
     """
+    sources = sources or KAYNAK_KODLARI
+    until = until or date.today()
+    return run_ingestion(sources, since, until, max_pages=max_pages, full=full, **override)
 
-    # 1) Test amaçlı DB’ye 1 tane kayıt atıyoruz (varsa tekrar eklemez)
-    obj, created = Duzenleme.objects.get_or_create(
-        source="resmi_gazete",               # kaynağı
-        title="TEST - Örnek Düzenleme",      # başlığı (unique davranış için kritik)
-        publish_date=date.today(),           # yayın tarihi = bugün
-
-        # Eğer kayıt yoksa, oluştururken doldurulacak ekstra alanlar
-        defaults={
-            "raw_text": "Bu bir test metnidir.",  # ham metin
-            "summary": "Test özet.",              # özet
-            "url": "https://example.com",         # link
-        },
-    )
 
-    # created=True ise yeni oluşturdu demek
-    if created:
-        print("✅ DB’ye eklendi:", obj.id)
-    else:
-        # created=False ise zaten vardı, tekrar eklemedi
-        print("ℹ️ Zaten vardı, tekrar eklemedim:", obj.id)
+def tarih(deger: str) -> date:
+    """argparse için: "2025-12-20" → date"""
+    try:
+        return date.fromisoformat(deger)
+    except ValueError:
+        raise CommandError(f"Geçersiz tarih (YYYY-AA-GG bekleniyor): {deger}")
 
 
 class Command(BaseCommand):
@@ -42,19 +46,49 @@ class Command(BaseCommand):
     Bu sınıf Django'nun management command sistemine bağlanır.
     Dosya adı fetch_duzenlemeler.py ise:
       python manage.py fetch_duzenlemeler
-    komutuyla çalışır.
+      python manage.py fetch_duzenlemeler --source resmi_gazete --since 2025-12-01
+    komutuyla çalışır. Günlük cron için parametresiz çalıştırmak yeterli:
+    her kaynak son checkpoint'inden devam eder.
     """
 
     # Komut açıklaması (python manage.py help komutunda görünür)
     help = "Resmî kaynaklardan düzenlemeleri çek ve veritabanına kaydet."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--source", action="append", choices=KAYNAK_KODLARI, dest="sources",
+                            help="Çekilecek kaynak (birden fazla verilebilir; varsayılan: hepsi)")
+        parser.add_argument("--since", type=tarih, help="Başlangıç tarihi (varsayılan: kaynağın checkpoint'i, yoksa bugün)")
+        parser.add_argument("--until", type=tarih, help="Bitiş tarihi (varsayılan: bugün)")
+        parser.add_argument("--max-pages", type=int, default=1,
+                            help="Sayfalı kaynaklarda (GİB) en fazla kaç liste sayfası")
+        parser.add_argument("--full", action="store_true",
+                            help="Checkpoint ve ETag/Last-Modified kayıtlarını yok say, baştan çek")
+        parser.add_argument("--concurrency", type=int, help="Eşzamanlı fetch işçisi sayısı")
+        parser.add_argument("--per-host", type=int, help="Host başına aynı anda en fazla istek")
+        parser.add_argument("--rate", type=float, help="Host başına saniyede en fazla istek")
+        parser.add_argument("--retries", type=int, help="Geçici hatada toplam deneme sayısı")
+
     def handle(self, *args, **options):
         """
         Komut çalıştırılınca burası tetiklenir.
         Burada run() fonksiyonunu çağırıyoruz.
         """
-        run()
+        stats = run(
+            sources=options["sources"],
+            since=options["since"],
+            until=options["until"],
+            max_pages=options["max_pages"],
+            full=options["full"],
+            CONCURRENCY=options["concurrency"],
+            PER_HOST=options["per_host"],
+            RATE=options["rate"],
+            RETRIES=options["retries"],
+        )
+
+        self.stdout.write(
+            "listeleme={listings} sayfa={fetched} aday={parsed} yeni={created} guncel={updated} "
+            "mevcut={skipped} degismedi={not_modified} hata={errors} istek={requests} tekrar={retried}".format(**stats)
+        )
 
         # Terminalde yeşil SUCCESS mesajı basar
         self.stdout.write(self.style.SUCCESS("Bitti: fetch_duzenlemeler"))
-
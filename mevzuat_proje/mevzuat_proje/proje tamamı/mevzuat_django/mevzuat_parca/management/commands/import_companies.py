@@ -0,0 +1,61 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+# Toplu şirket içe aktarımı (batch doğrulama + bulk_create)
+from mevzuat_parca import ice_aktarim
+
+
+class Command(BaseCommand):
+    """
+    python manage.py import_companies bagli_sirketler.csv
+    python manage.py import_companies liste.json --match           # yükümlülükleri de aç
+    python manage.py import_companies liste.csv --dry-run          # sadece doğrula
+    python manage.py import_companies liste.txt --format ndjson --encoding cp1254
+
+    POST /api/companies/import/ ile aynı kurallar: geçerli satırlar yazılır, hatalı satırlar
+    atlanır ve satır numarasıyla stderr'e yazılır. Her batch ayrı transaction'da.
+    """
+
+    help = "CSV / JSON / NDJSON dosyasındaki şirketleri toplu olarak ekler (isteğe bağlı eşleştirme ile)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dosya", help="İçe aktarılacak dosya")
+        parser.add_argument("--format", choices=ice_aktarim.BICIMLER, dest="bicim",
+                            help="Dosya biçimi (verilmezse uzantıdan)")
+        parser.add_argument("--encoding", default="utf-8-sig", dest="kodlama", help="Dosya kodlaması")
+        parser.add_argument("--match", action="store_true", dest="eslestir",
+                            help="Yeni şirketlere mevcut düzenlemelerden yükümlülük aç")
+        parser.add_argument("--dry-run", action="store_true", help="Sadece doğrula, yazma")
+        parser.add_argument("--batch-size", type=int, default=ice_aktarim.BATCH_BOYUTU, dest="batch",
+                            help="Transaction / bulk_create başına şirket sayısı")
+
+    def handle(self, *args, **options):
+        if options["batch"] < 1:
+            raise CommandError("--batch-size en az 1 olmalı")
+        bicim = options["bicim"] or ice_aktarim.bicim_tahmin(options["dosya"])
+        if bicim is None:
+            raise CommandError("Dosya biçimi uzantıdan anlaşılamadı: --format csv|json|ndjson verin.")
+
+        try:
+            with open(options["dosya"], "rb") as f:
+                sonuc = ice_aktarim.ice_aktar(
+                    ice_aktarim.satirlari_oku(f, bicim, encoding=options["kodlama"]),
+                    batch_size=options["batch"], eslestir=options["eslestir"], dry_run=options["dry_run"],
+                )
+        except OSError as e:
+            raise CommandError(f"Dosya açılamadı: {e}") from e
+        except ice_aktarim.GecersizDosya as e:
+            raise CommandError(str(e)) from e
+
+        for hata in sonuc["errors"]:
+            mesajlar = "; ".join(f"{alan}: {' '.join(m)}" for alan, m in hata["errors"].items())
+            self.stderr.write(f"satır {hata['row']}: {mesajlar}")
+
+        ozet = f"{sonuc['rows']} satır, {sonuc['valid']} geçerli, {sonuc['invalid']} hatalı"
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Doğrulandı (yazılmadı): {ozet}"))
+            return
+        ozet += f"; {sonuc['created']} şirket eklendi"
+        if options["eslestir"]:
+            ozet += f", {sonuc['obligations']} yükümlülük açıldı"
+        self.stdout.write(self.style.SUCCESS(f"Bitti: {ozet}"))
@@ -0,0 +1,83 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+from pathlib import Path
+
+# Akışlı sayı ayrıştırıcı (mmap'li dosya / akışlı HTTP)
+from mevzuat_parca.ingestion.akis import (
+    MAX_METIN,
+    dosya_parcalari,
+    http_parcalari,
+    sayi_adaylari,
+)
+
+# Tarih parametresi (fetch_duzenlemeler ile aynı format)
+from mevzuat_parca.management.commands.fetch_duzenlemeler import tarih
+
+# Toplu upsert (adayları iterator olarak alır, batch batch yazar)
+from mevzuat_parca.toplu_yazma import duzenlemeleri_upsert
+
+
+def run(kaynaklar, publish_date=None, batch_size=200, encoding="utf-8", max_metin=MAX_METIN, log=print):
+    """
+    Tam Resmî Gazete sayılarını (yerel dosya veya URL) akışlı okuyup DB'ye yazar.
+    Her sayı için bellekte en fazla bir okuma parçası + batch_size düzenleme bulunur.
+    Dönüş: {"inserted": ..., "updated": ..., "unchanged": ...}
+    """
+    toplam = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for kaynak in kaynaklar:
+        if kaynak.startswith(("http://", "https://")):
+            parcalar, url = http_parcalari(kaynak), kaynak
+        else:
+            path = Path(kaynak)
+            if not path.is_file():
+                raise FileNotFoundError(f"Dosya bulunamadı: {kaynak}")
+            parcalar, url = dosya_parcalari(path), None
+
+        adaylar = sayi_adaylari(parcalar, url, publish_date=publish_date,
+                                encoding=encoding, max_metin=max_metin)
+        sonuc = duzenlemeleri_upsert(adaylar, batch_size=batch_size)
+        log(f"{kaynak}: yeni={sonuc['inserted']} guncel={sonuc['updated']} mevcut={sonuc['unchanged']}")
+        for k in toplam:
+            toplam[k] += sonuc[k]
+    return toplam
+
+
+class Command(BaseCommand):
+    """
+    python manage.py import_gazete_issue sayi-20251220.htm [--date 2025-12-20]
+    python manage.py import_gazete_issue https://.../20251220.htm
+
+    Geçmiş yılları doldurmak (backfill) için: tam sayı HTML'lerini tek tek
+    belleğe almadan ayrıştırır ve toplu upsert ile yazar.
+    PDF sayılar önce metin/HTML'e çevrilmelidir (pdftotext -htmlmeta vb.).
+    """
+
+    help = "Tam Resmî Gazete sayılarını akışlı ayrıştırıp düzenlemeleri kaydet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kaynaklar", nargs="+", help="Sayı HTML dosyası veya URL'i")
+        parser.add_argument("--date", type=tarih, dest="publish_date",
+                            help="Yayın tarihi (varsayılan: sayı başlığındaki tarih)")
+        parser.add_argument("--batch-size", type=int, default=200,
+                            help="Tek transaction'da yazılacak düzenleme sayısı")
+        parser.add_argument("--encoding", default="utf-8", help="Dosya karakter kodlaması")
+        parser.add_argument("--max-text", type=int, default=MAX_METIN, dest="max_metin",
+                            help="Tek düzenleme metni için karakter sınırı")
+
+    def handle(self, *args, **options):
+        try:
+            sonuc = run(
+                options["kaynaklar"],
+                publish_date=options["publish_date"],
+                batch_size=options["batch_size"],
+                encoding=options["encoding"],
+                max_metin=options["max_metin"],
+                log=self.stdout.write,
+            )
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Bitti: yeni={sonuc['inserted']} guncel={sonuc['updated']} mevcut={sonuc['unchanged']}"
+        ))
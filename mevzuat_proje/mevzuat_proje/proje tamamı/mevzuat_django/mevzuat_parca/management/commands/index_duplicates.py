@@ -0,0 +1,55 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+# Yakın kopya indeksi (MinHash + LSH)
+from mevzuat_parca import benzerlik
+
+
+def run(batch_size=500, log=print):
+    """
+    İmzası olmayan veya metni değişmiş düzenlemeleri yakın kopya indeksine ekler.
+    İndeks artımlıdır: zaten güncel imzası olan kayıtlara dokunulmaz.
+    Dönüş: {"indexed": ..., "linked": ..., "unlinked": ...}
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size en az 1 olmalı")
+
+    toplam = {"indexed": 0, "linked": 0, "unlinked": 0}
+    son_pk = 0
+    while True:
+        # pk sırasıyla: eski kayıtlar önce imzalanır → kopya hep yenisi olur
+        batch = list(benzerlik.eksik_imzalar().filter(pk__gt=son_pk).order_by("pk")[:batch_size])
+        if not batch:
+            break
+        son_pk = batch[-1].pk
+        sonuc = benzerlik.indeksle(batch)
+        for k in toplam:
+            toplam[k] += sonuc[k]
+        log(f"{toplam['indexed']} kayıt indekslendi, {toplam['linked']} kopya bağlandı")
+    return toplam
+
+
+class Command(BaseCommand):
+    """
+    python manage.py index_duplicates [--batch-size 500]
+
+    Yakın kopya indeksini günceller (ilk kurulumda mevcut kayıtlar için;
+    sonrasında çekme hattı yeni kayıtları zaten indeksliyor).
+    """
+
+    help = "Düzenlemeleri yakın kopya (MinHash/LSH) indeksine ekle ve kopyaları bağla."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Tek seferde imzalanacak kayıt sayısı")
+
+    def handle(self, *args, **options):
+        try:
+            sonuc = run(batch_size=options["batch_size"], log=self.stdout.write)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Bitti: {sonuc['indexed']} indekslendi, {sonuc['linked']} bağlandı, "
+            f"{sonuc['unlinked']} bağ kaldırıldı"
+        ))
@@ -0,0 +1,44 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand
+
+# Eşleştirme motoru (ters indeks + bulk_create)
+from mevzuat_parca.eslestirme import yukumlulukleri_uret
+from mevzuat_parca.models import Duzenleme, Sirket
+
+
+def run(sirket_ids=None, duzenleme_ids=None):
+    """
+    Eşleşen (şirket, düzenleme) çiftleri için eksik yükümlülükleri üretir.
+    sirket_ids / duzenleme_ids verilirse kapsam onlarla sınırlanır (None → hepsi).
+    Dönüş: yukumlulukleri_uret sonucu
+    """
+    sirketler = Sirket.objects.filter(pk__in=sirket_ids) if sirket_ids else None
+    duzenlemeler = Duzenleme.objects.filter(pk__in=duzenleme_ids) if duzenleme_ids else None
+    return yukumlulukleri_uret(duzenlemeler=duzenlemeler, sirketler=sirketler)
+
+
+class Command(BaseCommand):
+    """
+    python manage.py match_obligations                    # tüm portföy
+    python manage.py match_obligations --company 12 15    # sadece bu şirketler
+    python manage.py match_obligations --regulation 301   # sadece bu düzenleme
+
+    Çekme hattı yeni düzenlemeleri, API yeni şirketleri zaten eşleştiriyor;
+    bu komut ilk kurulum ve elle düzeltmeler (sektör/etiket) sonrası içindir.
+    Var olan yükümlülüklere dokunmaz, sadece eksikleri ekler.
+    """
+
+    help = "Şirket sektörü / ihracatçılığı ile düzenleme sektör / etiketlerini eşleştirip yükümlülük üret."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", type=int, nargs="+", dest="sirket_ids",
+                            help="Sadece bu şirket id'leri")
+        parser.add_argument("--regulation", type=int, nargs="+", dest="duzenleme_ids",
+                            help="Sadece bu düzenleme id'leri")
+
+    def handle(self, *args, **options):
+        sonuc = run(sirket_ids=options["sirket_ids"], duzenleme_ids=options["duzenleme_ids"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Bitti: {sonuc['companies']} şirket × {sonuc['regulations']} düzenleme, "
+            f"{sonuc['created']} yükümlülük eklendi, {sonuc['existing']} zaten vardı"
+        ))
@@ -0,0 +1,29 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand
+
+# Artımlı yeniden eşleştirme kuyruğu
+from mevzuat_parca.eslestirme import kuyrugu_isle
+
+
+class Command(BaseCommand):
+    """
+    python manage.py process_rematch_queue
+
+    Sektörü / ihracatçılığı değişen şirketler ve sektör / etiketi değişen düzenlemeler
+    için bekleyen yükümlülük farklarını uygular. Normalde commit sonrası arka plan
+    thread'i bunu yapar; MEVZUAT_ESLESTIRME_ARKA_PLAN=0 ise (çok süreçli dağıtım)
+    cron'dan çalıştırılır. Aynı anda iki kez çalışması güvenlidir.
+    """
+
+    help = "Yeniden eşleştirme kuyruğundaki şirket / düzenleme değişikliklerini yükümlülüklere uygula."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50,
+                            help="Tek transaction'da işlenen iş sayısı")
+
+    def handle(self, *args, **options):
+        sonuc = kuyrugu_isle(parca=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Bitti: {sonuc['jobs']} iş, {sonuc['added']} yükümlülük eklendi, "
+            f"{sonuc['deactivated']} kapatıldı, {sonuc['reactivated']} yeniden açıldı"
+        ))
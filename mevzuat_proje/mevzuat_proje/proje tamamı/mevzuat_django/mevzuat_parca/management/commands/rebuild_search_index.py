@@ -0,0 +1,24 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+# FTS5 indeks yardımcıları
+from mevzuat_parca import arama
+
+
+class Command(BaseCommand):
+    """
+    python manage.py rebuild_search_index
+
+    Düzenleme FTS indeksini sıfırdan kurar. Normalde trigger'lar indeksi
+    güncel tutar; bu komut sadece tr_fold() kuralı değiştiğinde veya
+    indeks elle bozulduğunda gerekir.
+    """
+
+    help = "Düzenleme tam metin arama (FTS5) indeksini yeniden kur."
+
+    def handle(self, *args, **options):
+        if not arama.fts_kullanilabilir():
+            raise CommandError("FTS5 indeksi sadece SQLite'ta kullanılabilir.")
+
+        arama.indeksi_yeniden_kur()
+        self.stdout.write(self.style.SUCCESS("Bitti: rebuild_search_index"))
@@ -0,0 +1,229 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand, CommandError
+
+# Proje kök klasörü (varsayılan checkpoint dosyası burada durur)
+from django.conf import settings
+
+# Toplu UPDATE'i tek transaction içinde yapmak için
+from django.db import transaction
+from django.utils import timezone
+
+# Paralel analiz için süreç havuzu (NLP saf CPU işi → thread değil process)
+from concurrent.futures import ProcessPoolExecutor
+
+# Sıralı bekleme kuyruğu (işleri gönderildiği sırayla yazmak için)
+from collections import deque
+
+import json
+import os
+import time
+from pathlib import Path
+
+# Düzenleme modeli
+from mevzuat_parca.models import Duzenleme
+
+# Sektör / etiketi değişen kayıtlar için yükümlülük farkı (arka planda)
+from mevzuat_parca.eslestirme import kuyruga_ekle
+from mevzuat_parca.panel_onbellek import duzenlemeler_degisti
+
+# Django'suz analiz fonksiyonu (process havuzunda çalışır) + aktif kural sürümü
+from mevzuat_parca.nlp_rules import RULES_VERSION, analyze_batch
+
+
+# bulk_update ile yazılacak alanlar (bulk_update auto_now'ı doldurmaz: updated_at elle)
+GUNCELLENECEK_ALANLAR = ["tags", "sectors", "impact_type", "content_hash", "nlp_version", "nlp_result", "updated_at"]
+
+# Ana süreçte tutulan (işçiye gönderilmeyen) alanlar
+MEVCUT_ALANLAR = ("id", "tags", "sectors", "impact_type", "content_hash", "nlp_version", "nlp_result")
+
+
+def checkpoint_oku(path: Path):
+    """Checkpoint dosyasını okur: {"last_pk": ..., "rules_version": ...} (yoksa None)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def checkpoint_yaz(path: Path, last_pk: int):
+    """Son işlenen pk'yı atomik olarak yazar (yarım dosya kalmasın diye tmp + replace)."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"last_pk": last_pk, "rules_version": RULES_VERSION}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def chunk_oku(start_pk: int, batch_size: int, all_rows: bool):
+    """
+    pk > start_pk olan ilk batch_size düzenlemeyi pk sırasıyla okur.
+    Dönüş: (işçiye gidecek [(pk, title, raw_text)], ana süreçte kalan {pk: mevcut_alanlar})
+    """
+    qs = Duzenleme.objects.filter(pk__gt=start_pk).order_by("pk")
+
+    # varsayılan: sadece eski kural sürümüyle analiz edilmiş kayıtlar
+    if not all_rows:
+        qs = qs.exclude(nlp_version=RULES_VERSION)
+
+    rows = []
+    mevcut = {}
+    alanlar = MEVCUT_ALANLAR + ("title", "raw_text")
+    for r in qs.values_list(*alanlar)[:batch_size].iterator(chunk_size=batch_size):
+        kayit = dict(zip(alanlar, r))
+        rows.append((kayit["id"], kayit.pop("title"), kayit.pop("raw_text")))
+        mevcut[kayit["id"]] = kayit
+    return rows, mevcut
+
+
+def sonuclari_uygula(sonuclar, mevcut):
+    """
+    İşçiden gelen analiz sonuçlarını kayıtlara uygular.
+    Sadece gerçekten değişen kayıtları (model instance olarak) döndürür.
+    """
+    degisenler = []
+    simdi = timezone.now()
+    for pk, fingerprint, sonuc in sonuclar:
+        obj = Duzenleme(**mevcut[pk])
+        if obj.nlp_sonucunu_uygula(sonuc, fingerprint):
+            obj.updated_at = simdi
+            degisenler.append(obj)
+    return degisenler
+
+
+def run(workers=None, batch_size=500, dry_run=False, resume=False,
+        checkpoint=None, all_rows=False, log=print):
+    """
+    Tüm düzenlemeleri yeni kural setiyle tekrar sınıflandırır.
+
+    - Kayıtlar pk sırasıyla batch_size'lık parçalar halinde okunur (iterator)
+    - Analiz ProcessPoolExecutor'da paralel yapılır (workers<=1 → aynı süreçte)
+    - Sonuçlar bulk_update ile tek sorguda yazılır
+    - Her yazılan batch'ten sonra son pk checkpoint dosyasına kaydedilir
+
+    Dönüş: {"processed": ..., "updated": ..., "seconds": ...}
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size en az 1 olmalı")
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    checkpoint = Path(checkpoint) if checkpoint else Path(settings.BASE_DIR) / ".reclassify_checkpoint.json"
+
+    # Kaldığı yerden devam: aynı kural sürümüyle yazılmış checkpoint varsa
+    start_pk = 0
+    if resume:
+        cp = checkpoint_oku(checkpoint)
+        if cp and cp.get("rules_version") == RULES_VERSION:
+            start_pk = int(cp.get("last_pk", 0))
+            log(f"Checkpoint'ten devam: pk > {start_pk}")
+        elif cp:
+            log("Checkpoint farklı kural sürümüne ait, baştan başlanıyor.")
+
+    qs = Duzenleme.objects.filter(pk__gt=start_pk)
+    if not all_rows:
+        qs = qs.exclude(nlp_version=RULES_VERSION)
+    toplam = qs.count()
+
+    processed = 0
+    updated = 0
+    t0 = time.perf_counter()
+
+    def yaz(sonuclar, mevcut, last_pk):
+        nonlocal processed, updated
+        degisenler = sonuclari_uygula(sonuclar, mevcut)
+        if not dry_run:
+            with transaction.atomic():
+                if degisenler:
+                    Duzenleme.objects.bulk_update(degisenler, GUNCELLENECEK_ALANLAR, batch_size=batch_size)
+                    # bulk_update save() çağırmaz: eşleşme alanı değişenler elle kuyruğa
+                    eslesmesi_degisen = [
+                        obj.pk for obj in degisenler
+                        if any(getattr(obj, alan) != mevcut[obj.pk][alan] for alan in Duzenleme.ESLESME_ALANLARI)
+                    ]
+                    kuyruga_ekle("duzenleme", eslesmesi_degisen)
+                    # Etki tipi dashboard payload'ında da var
+                    duzenlemeler_degisti(eslesmesi_degisen)
+            checkpoint_yaz(checkpoint, last_pk)
+
+        processed += len(sonuclar)
+        updated += len(degisenler)
+        gecen = time.perf_counter() - t0
+        hiz = processed / gecen if gecen > 0 else 0.0
+        log(f"{processed}/{toplam} kayıt işlendi, {updated} güncellendi ({hiz:.0f} kayıt/sn)")
+
+    cursor = start_pk
+
+    if workers <= 1:
+        # Tek süreç: test ve küçük veri için
+        while True:
+            rows, mevcut = chunk_oku(cursor, batch_size, all_rows)
+            if not rows:
+                break
+            cursor = rows[-1][0]
+            yaz(analyze_batch(rows), mevcut, cursor)
+    else:
+        # Havuzda en fazla workers*2 iş bekler → bellek sınırlı kalır
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            bekleyen = deque()
+            bitti = False
+            while not bitti or bekleyen:
+                while not bitti and len(bekleyen) < workers * 2:
+                    rows, mevcut = chunk_oku(cursor, batch_size, all_rows)
+                    if not rows:
+                        bitti = True
+                        break
+                    cursor = rows[-1][0]
+                    bekleyen.append((pool.submit(analyze_batch, rows), mevcut, cursor))
+
+                if bekleyen:
+                    # Gönderildiği sırayla yaz: checkpoint hep "buraya kadar tamam" demek
+                    future, mevcut, last_pk = bekleyen.popleft()
+                    yaz(future.result(), mevcut, last_pk)
+
+    # Baştan sona bitti → checkpoint'e gerek kalmadı
+    if not dry_run and checkpoint.exists():
+        checkpoint.unlink()
+
+    return {"processed": processed, "updated": updated, "seconds": time.perf_counter() - t0}
+
+
+class Command(BaseCommand):
+    """
+    python manage.py reclassify_duzenlemeler [--workers 4] [--batch-size 500] [--dry-run] [--resume]
+
+    nlp_rules.py'deki kurallar değiştiğinde mevcut Duzenleme kayıtlarını
+    tek tek save() etmeden, toplu ve paralel olarak yeniden etiketler.
+    """
+
+    help = "Düzenlemeleri güncel NLP kurallarıyla toplu ve paralel olarak yeniden sınıflandır."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Analiz süreç sayısı (varsayılan: CPU sayısı, 1 = paralel değil)")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Her parçada okunacak/yazılacak kayıt sayısı")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Sadece hesapla, veritabanına yazma")
+        parser.add_argument("--resume", action="store_true",
+                            help="Checkpoint dosyasındaki son pk'dan devam et")
+        parser.add_argument("--checkpoint", default=None,
+                            help="Checkpoint dosya yolu (varsayılan: BASE_DIR/.reclassify_checkpoint.json)")
+        parser.add_argument("--all", action="store_true", dest="all_rows",
+                            help="Güncel kural sürümüyle analiz edilmiş kayıtları da işle")
+
+    def handle(self, *args, **options):
+        try:
+            sonuc = run(
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                resume=options["resume"],
+                checkpoint=options["checkpoint"],
+                all_rows=options["all_rows"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        onek = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{onek}Bitti: {sonuc['processed']} kayıt işlendi, {sonuc['updated']} güncellendi "
+            f"({sonuc['seconds']:.1f} sn)"
+        ))
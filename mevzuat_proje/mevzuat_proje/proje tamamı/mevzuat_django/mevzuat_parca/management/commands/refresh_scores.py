@@ -0,0 +1,32 @@
+# Django'da custom management command yazmak için temel sınıf
+from django.core.management.base import BaseCommand
+
+# Saklanan uyum skoru (SirketSkoru)
+from mevzuat_parca.skorlama import gunluk_yenile, skorlari_yenile
+
+
+class Command(BaseCommand):
+    """
+    python manage.py refresh_scores          # gece işi (cron: her gün 00:05)
+    python manage.py refresh_scores --all    # tüm şirketleri baştan hesapla
+
+    Yükümlülük değişiklikleri skora anında yansır; bu komut sadece takvime bağlı
+    değişiklikler içindir (son tarihi geçen / 7 gün penceresine giren yükümlülükler).
+    Sadece sınırı geçen şirketler yeniden hesaplanır, diğerleri olduğu gibi bugüne taşınır.
+    """
+
+    help = "Şirket uyum skorlarını tarih cezaları için günceller (gece işi)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", dest="hepsi",
+                            help="Tüm şirketleri yükümlülüklerinden baştan hesapla")
+
+    def handle(self, *args, **options):
+        if options["hepsi"]:
+            adet = skorlari_yenile()
+            self.stdout.write(self.style.SUCCESS(f"Bitti: {adet} şirketin skoru baştan hesaplandı"))
+            return
+        sonuc = gunluk_yenile()
+        self.stdout.write(self.style.SUCCESS(
+            f"Bitti: {sonuc['recomputed']} şirket yeniden hesaplandı, {sonuc['carried']} şirket değişmedi"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0003_sirket_unvan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='duzenleme',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='duzenleme',
+            name='nlp_result',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='duzenleme',
+            name='nlp_version',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Düzenleme metinleri için SQLite FTS5 tam metin arama indeksi.
+# Sadece SQLite'ta çalışır; diğer veritabanlarında hiçbir şey yapmaz.
+
+from django.db import migrations
+
+FTS_TABLE = "mevzuat_parca_duzenleme_fts"
+TABLE = "mevzuat_parca_duzenleme"
+
+# İndeks içerik saklamaz (content=''). Katlama sadece yerleşik SQL ile: tokenizer büyük/küçük
+# harfi ve Türkçe harflerin işaretlerini (ç, ş, ğ, ö, ü, â, İ) kendisi indirir; indiremediği
+# tek harf "ı" → replace(). Sonuç arama.tr_fold ile katlanmış metnin token'larıyla aynı.
+# Trigger'lar Python fonksiyonu çağırmaz: başka bağlantıdan (dbshell, betik) yazma da çalışır.
+# Silmede FTS5'e indekslenmiş değerlerin aynısı verilmelidir, bu yüzden
+# delete/update trigger'ları da old.* değerlerini aynı şekilde katlar.
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, raw_text, content='', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, raw_text ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+    # Mevcut kayıtları indekse al
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+    SELECT id, replace(title, 'ı', 'i'), replace(raw_text, 'ı', 'i') FROM {TABLE}
+    """,
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _calistir(schema_editor, sql_listesi):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in sql_listesi:
+        schema_editor.execute(sql)
+
+
+def olustur(apps, schema_editor):
+    _calistir(schema_editor, CREATE_SQL)
+
+
+def kaldir(apps, schema_editor):
+    _calistir(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0004_duzenleme_nlp_cache'),
+    ]
+
+    operations = [
+        migrations.RunPython(olustur, kaldir),
+    ]
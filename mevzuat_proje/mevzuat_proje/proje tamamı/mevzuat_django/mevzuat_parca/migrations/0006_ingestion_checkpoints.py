@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-17 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0005_duzenleme_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KaynakCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('resmi_gazete', 'Resmî Gazete'), ('gib', 'Gelir İdaresi Başkanlığı')], max_length=50, unique=True)),
+                ('last_publish_date', models.DateField(blank=True, null=True)),
+                ('cursor', models.CharField(blank=True, default='', max_length=1000)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KaynakSayfasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=1000, unique=True)),
+                ('source', models.CharField(choices=[('resmi_gazete', 'Resmî Gazete'), ('gib', 'Gelir İdaresi Başkanlığı')], db_index=True, max_length=50)),
+                ('etag', models.CharField(blank=True, default='', max_length=255)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=64)),
+                ('body_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.5 on 2026-10-17 13:54
+
+from django.db import migrations, models
+
+FTS_TABLE = "mevzuat_parca_duzenleme_fts"
+TABLE = "mevzuat_parca_duzenleme"
+
+# 0005_duzenleme_fts'teki trigger'ların bu migration anındaki hali (sadece yerleşik SQL)
+FTS_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, raw_text ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+]
+
+
+def fts_tetikleyicileri_kur(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in FTS_TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+def tekrarlari_birlestir(apps, schema_editor):
+    """
+    Kısıt eklenmeden önce aynı (source, title, publish_date) kayıtlarını birleştirir:
+    en eski kayıt (en küçük id) kalır, diğerlerinin yükümlülükleri ona taşınır.
+    """
+    Duzenleme = apps.get_model("mevzuat_parca", "Duzenleme")
+    SirketObligation = apps.get_model("mevzuat_parca", "SirketObligation")
+
+    tekrarlar = (
+        Duzenleme.objects.values("source", "title", "publish_date")
+        .annotate(adet=models.Count("id"), kalan=models.Min("id"))
+        .filter(adet__gt=1)
+    )
+    for t in tekrarlar:
+        fazlalar = Duzenleme.objects.filter(
+            source=t["source"], title=t["title"], publish_date=t["publish_date"]
+        ).exclude(id=t["kalan"])
+        SirketObligation.objects.filter(duzenleme__in=fazlalar).update(duzenleme_id=t["kalan"])
+        fazlalar.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0006_ingestion_checkpoints'),
+    ]
+
+    operations = [
+        migrations.RunPython(tekrarlari_birlestir, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='duzenleme',
+            constraint=models.UniqueConstraint(fields=('source', 'title', 'publish_date'), name='duzenleme_dogal_anahtar_uniq'),
+        ),
+        # SQLite unique constraint için tabloyu yeniden oluşturur → FTS trigger'ları geri kur
+        migrations.RunPython(fts_tetikleyicileri_kur, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 14:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0007_duzenleme_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuzenlemeImzasi',
+            fields=[
+                ('duzenleme', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='imza', serialize=False, to='mevzuat_parca.duzenleme')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='duzenleme',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='mevzuat_parca.duzenleme'),
+        ),
+        migrations.CreateModel(
+            name='ImzaBandi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('hash', models.BigIntegerField()),
+                ('duzenleme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imza_bantlari', to='mevzuat_parca.duzenleme')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'hash'], name='imza_bandi_lsh_idx')],
+            },
+        ),
+    ]
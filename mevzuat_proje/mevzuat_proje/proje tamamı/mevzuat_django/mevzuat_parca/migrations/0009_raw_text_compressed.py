@@ -0,0 +1,128 @@
+# Generated by Django 5.2.5 on 2026-10-17 14:12
+
+import zlib
+
+import mevzuat_parca.sikistirma
+from django.db import migrations
+
+TABLE = "mevzuat_parca_duzenleme"
+FTS_TABLE = "mevzuat_parca_duzenleme_fts"
+
+# Tek seferde dönüştürülen satır sayısı (tüm metinler belleğe alınmasın)
+BATCH = 500
+
+# sikistirma.py'nin bu migration anındaki biçimi: biçim baytı + zlib (seviye 6)
+ZLIB = b"\x01"
+
+
+def sikistir(metin):
+    return ZLIB + zlib.compress(metin.encode("utf-8"), 6)
+
+
+def sikistirilmis_mi(deger) -> bool:
+    return isinstance(deger, (bytes, memoryview)) and bytes(deger[:1]) == ZLIB
+
+
+def metin_ac(deger):
+    if deger is None or isinstance(deger, str):
+        return deger
+    deger = bytes(deger)
+    if deger[:1] == ZLIB:
+        return zlib.decompress(deger[1:]).decode("utf-8")
+    return deger.decode("utf-8")
+
+
+# 0005 / 0007'deki FTS trigger'ları düz metni okur; sıkıştırılmış kolonu SQL'de açmak
+# mümkün değil. Dönüşümden önce kaldırılır (metin aynı, indeks geçerli kalır);
+# indeksi 0014_fts_index_queue'deki kuyruk trigger'ları sürdürür.
+FTS_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, raw_text ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, raw_text)
+        VALUES ('delete', old.id, replace(old.title, 'ı', 'i'), replace(old.raw_text, 'ı', 'i'));
+        INSERT INTO {FTS_TABLE}(rowid, title, raw_text)
+        VALUES (new.id, replace(new.title, 'ı', 'i'), replace(new.raw_text, 'ı', 'i'));
+    END
+    """,
+]
+
+
+def fts_tetikleyicileri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for ek in ("au", "ad", "ai"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{ek}")
+
+
+def fts_tetikleyicileri_kur(apps, schema_editor):
+    # Geri alma: metin yeniden düz, 0005'teki trigger'lar okuyabilir
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in FTS_TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+def _donustur(schema_editor, sikistirilacak):
+    """
+    raw_text'i satır satır dönüştürür (ORM'siz: alanın from_db_value'su devreye girmesin).
+    sikistirilacak=True → düz metinleri sıkıştırır, False → sıkıştırılmışları açar.
+    """
+    conn = schema_editor.connection
+    son_id = 0
+    with conn.cursor() as cur:
+        while True:
+            cur.execute(
+                f"SELECT id, raw_text FROM {TABLE} WHERE id > %s ORDER BY id LIMIT %s",
+                [son_id, BATCH],
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            son_id = rows[-1][0]
+
+            degisen = []
+            for pk, deger in rows:
+                if sikistirilacak and not sikistirilmis_mi(deger):
+                    degisen.append((conn.Database.Binary(sikistir(metin_ac(deger))), pk))
+                elif not sikistirilacak and sikistirilmis_mi(deger):
+                    degisen.append((metin_ac(deger), pk))
+            if degisen:
+                cur.executemany(f"UPDATE {TABLE} SET raw_text = %s WHERE id = %s", degisen)
+
+
+def sikistir_mevcut(apps, schema_editor):
+    _donustur(schema_editor, sikistirilacak=True)
+
+
+def ac_mevcut(apps, schema_editor):
+    _donustur(schema_editor, sikistirilacak=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0008_near_duplicate_index'),
+    ]
+
+    operations = [
+        # Dönüşüm sırasında FTS indeksi değişmesin (metin aynı, sadece saklama biçimi değişiyor)
+        migrations.RunPython(fts_tetikleyicileri_kaldir, fts_tetikleyicileri_kur),
+        migrations.AlterField(
+            model_name='duzenleme',
+            name='raw_text',
+            field=mevzuat_parca.sikistirma.SikistirilmisMetinField(),
+        ),
+        migrations.RunPython(sikistir_mevcut, ac_mevcut),
+    ]
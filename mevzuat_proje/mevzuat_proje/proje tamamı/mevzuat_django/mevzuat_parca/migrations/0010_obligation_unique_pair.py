@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 14:15
+
+from django.db import migrations, models
+
+
+def tekrarlari_birlestir(apps, schema_editor):
+    """
+    Kısıt eklenmeden önce aynı (sirket, duzenleme) yükümlülüklerini birleştirir:
+    en eski kayıt kalır; tekrarlardan biri tamamlanmışsa kalan da tamamlanmış sayılır.
+    """
+    SirketObligation = apps.get_model("mevzuat_parca", "SirketObligation")
+
+    tekrarlar = (
+        SirketObligation.objects.values("sirket_id", "duzenleme_id")
+        .annotate(adet=models.Count("id"), kalan=models.Min("id"), tamam=models.Count("id", filter=models.Q(is_compliant=True)))
+        .filter(adet__gt=1)
+    )
+    for t in tekrarlar:
+        if t["tamam"]:
+            SirketObligation.objects.filter(id=t["kalan"]).update(is_compliant=True)
+        SirketObligation.objects.filter(
+            sirket_id=t["sirket_id"], duzenleme_id=t["duzenleme_id"]
+        ).exclude(id=t["kalan"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0009_raw_text_compressed'),
+    ]
+
+    operations = [
+        migrations.RunPython(tekrarlari_birlestir, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='sirketobligation',
+            constraint=models.UniqueConstraint(fields=('sirket', 'duzenleme'), name='sirket_duzenleme_uniq'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-17 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0010_obligation_unique_pair'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sirketobligation',
+            name='match_state',
+            field=models.CharField(choices=[('manual', 'Elle'), ('matched', 'Otomatik eşleşti'), ('unmatched', 'Eşleşme kalktı')], default='manual', editable=False, max_length=10),
+        ),
+        migrations.CreateModel(
+            name='EslestirmeIsi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('sirket', 'Şirket'), ('duzenleme', 'Düzenleme')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='eslestirme_isi_uniq')],
+            },
+        ),
+    ]
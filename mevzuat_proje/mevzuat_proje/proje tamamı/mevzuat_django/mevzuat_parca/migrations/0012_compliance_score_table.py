@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-17 14:28
+
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from mevzuat_parca.skorlama import TAM_PUAN, Katki, katki, sinirla
+
+
+def skorlari_doldur(apps, schema_editor):
+    """Mevcut şirketlerin skor satırlarını yükümlülüklerinden bir kez hesaplar."""
+    Sirket = apps.get_model("mevzuat_parca", "Sirket")
+    SirketObligation = apps.get_model("mevzuat_parca", "SirketObligation")
+    SirketSkoru = apps.get_model("mevzuat_parca", "SirketSkoru")
+
+    bugun = date.today()
+    toplamlar = {pk: Katki(TAM_PUAN, 0, 0, 0) for pk in Sirket.objects.values_list("pk", flat=True)}
+    rows = SirketObligation.objects.filter(is_applicable=True).values_list(
+        "sirket_id", "is_compliant", "duzenleme__impact_type", "risk_level", "due_date"
+    )
+    for sirket_id, is_compliant, impact_type, risk_level, due_date in rows.iterator(chunk_size=5000):
+        toplamlar[sirket_id] += katki(True, is_compliant, impact_type, risk_level, due_date, bugun)
+
+    simdi = timezone.now()
+    SirketSkoru.objects.bulk_create(
+        (
+            SirketSkoru(
+                sirket_id=pk, score=sinirla(k.puan), raw_score=k.puan, open_obligations=k.acik,
+                overdue_obligations=k.geciken, total_obligations=k.toplam, computed_for=bugun, computed_at=simdi,
+            )
+            for pk, k in toplamlar.items()
+        ),
+        batch_size=100,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0011_rematch_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SirketSkoru',
+            fields=[
+                ('sirket', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='skor', serialize=False, to='mevzuat_parca.sirket')),
+                ('score', models.IntegerField(db_index=True)),
+                ('raw_score', models.IntegerField()),
+                ('open_obligations', models.IntegerField(default=0)),
+                ('overdue_obligations', models.IntegerField(default=0)),
+                ('total_obligations', models.IntegerField(default=0)),
+                ('computed_for', models.DateField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(skorlari_doldur, migrations.RunPython.noop),
+    ]
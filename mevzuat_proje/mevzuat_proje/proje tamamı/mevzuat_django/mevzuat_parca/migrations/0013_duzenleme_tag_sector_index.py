@@ -0,0 +1,117 @@
+# Generated by Django 5.2.5 on 2026-10-17 15:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = "mevzuat_parca_duzenleme"
+
+# (izdüşüm tablosu, değer kolonu, Duzenleme JSON kolonu): etiket_indeksi.py'nin bu migration anındaki hali
+IZDUSUMLER = (
+    ("mevzuat_parca_duzenlemeetiketi", "tag", "tags"),
+    ("mevzuat_parca_duzenlemesektoru", "sector", "sectors"),
+)
+
+
+def _trigger_sql(tablo, kolon, json_kolon):
+    ekle = (
+        f"INSERT INTO {tablo} (duzenleme_id, {kolon}) "
+        f"SELECT DISTINCT new.id, value FROM json_each(new.{json_kolon}) WHERE type = 'text';"
+    )
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_ai AFTER INSERT ON {TABLE} BEGIN
+            {ekle}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_au AFTER UPDATE OF {json_kolon} ON {TABLE}
+        WHEN old.{json_kolon} IS NOT new.{json_kolon} BEGIN
+            DELETE FROM {tablo} WHERE duzenleme_id = old.id;
+            {ekle}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {tablo}_ad AFTER DELETE ON {TABLE} BEGIN
+            DELETE FROM {tablo} WHERE duzenleme_id = old.id;
+        END
+        """,
+    ]
+
+
+def tetikleyicileri_kur(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for tablo, kolon, json_kolon in IZDUSUMLER:
+        for sql in _trigger_sql(tablo, kolon, json_kolon):
+            schema_editor.execute(sql)
+
+
+def tetikleyicileri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for tablo, *_ in IZDUSUMLER:
+        for ek in ("au", "ad", "ai"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {tablo}_{ek}")
+
+
+def doldur(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for tablo, kolon, json_kolon in IZDUSUMLER:
+        schema_editor.execute(
+            f"INSERT INTO {tablo} (duzenleme_id, {kolon}) "
+            f"SELECT DISTINCT d.id, j.value FROM {TABLE} d, json_each(d.{json_kolon}) j WHERE j.type = 'text'"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0012_compliance_score_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuzenlemeEtiketi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DuzenlemeSektoru',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sector', models.CharField(max_length=50)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='duzenleme',
+            index=models.Index(fields=['publish_date'], name='duzenleme_tarih_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='duzenleme',
+            index=models.Index(fields=['impact_type', 'publish_date'], name='duzenleme_etki_tarih_idx'),
+        ),
+        migrations.AddField(
+            model_name='duzenlemeetiketi',
+            name='duzenleme',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='etiket_satirlari', to='mevzuat_parca.duzenleme'),
+        ),
+        migrations.AddField(
+            model_name='duzenlemesektoru',
+            name='duzenleme',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sektor_satirlari', to='mevzuat_parca.duzenleme'),
+        ),
+        migrations.AddConstraint(
+            model_name='duzenlemeetiketi',
+            constraint=models.UniqueConstraint(fields=('tag', 'duzenleme'), name='duzenleme_etiketi_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='duzenlemesektoru',
+            constraint=models.UniqueConstraint(fields=('sector', 'duzenleme'), name='duzenleme_sektoru_uniq'),
+        ),
+        # İzdüşümü güncel tutan trigger'lar + mevcut kayıtların etiket / sektörleri (SQLite)
+        migrations.RunPython(tetikleyicileri_kur, tetikleyicileri_kaldir),
+        migrations.RunPython(doldur, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.5 on 2026-10-17 15:41
+
+import zlib
+
+from django.db import migrations, models
+
+TABLE = "mevzuat_parca_duzenleme"
+FTS_TABLE = "mevzuat_parca_duzenleme_fts"
+KUYRUK_TABLE = "mevzuat_parca_aramaindeksisi"
+
+# İndeks yeniden doldurulurken tek seferde okunan satır
+BATCH = 500
+
+# FTS indeksi artık kuyruktan (arama.indeksi_guncelle) beslenir: trigger'lar sadece eski değerleri
+# kuyruğa kopyalar, Python fonksiyonu çağırmaz (arama.TRIGGER_SQL'in bu migration anındaki hali).
+# Önceki trigger'lar (aynı adlarla, bağlantıya kayıtlı tr_fold / metin_ac çağıran) kaldırılır.
+TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id, eski_title, eski_raw_text)
+        VALUES (old.id, old.title, old.raw_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, raw_text ON {TABLE}
+    WHEN old.title IS NOT new.title OR old.raw_text IS NOT new.raw_text BEGIN
+        INSERT INTO {KUYRUK_TABLE}(duzenleme_id, eski_title, eski_raw_text)
+        VALUES (old.id, old.title, old.raw_text);
+    END
+    """,
+]
+
+
+def metin_ac(deger):
+    # 0009_raw_text_compressed'teki biçim: biçim baytı (\x01) + zlib; baytsız değer düz metin
+    if deger is None or isinstance(deger, str):
+        return deger
+    deger = bytes(deger)
+    if deger[:1] == b"\x01":
+        return zlib.decompress(deger[1:]).decode("utf-8")
+    return deger.decode("utf-8")
+
+
+def katla(metin):
+    # Tokenizer (unicode61 remove_diacritics 2) indiremediği tek harf: "ı"
+    return metin.replace("ı", "i") if metin is not None else None
+
+
+def tetikleyicileri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for ek in ("au", "ad", "ai"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{ek}")
+
+
+def kuyrugu_kur(apps, schema_editor):
+    """Kuyruk trigger'larını kurar ve indeksi baştan doldurur (0009'dan beri kimse güncellemiyordu)."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    tetikleyicileri_kaldir(apps, schema_editor)
+    for sql in TRIGGER_SQL:
+        schema_editor.execute(sql)
+    with schema_editor.connection.cursor() as cur:
+        cur.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        son_id = 0
+        while True:
+            cur.execute(f"SELECT id, title, raw_text FROM {TABLE} WHERE id > %s ORDER BY id LIMIT %s", [son_id, BATCH])
+            satirlar = cur.fetchall()
+            if not satirlar:
+                break
+            son_id = satirlar[-1][0]
+            cur.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, raw_text) VALUES (%s, %s, %s)",
+                [(pk, katla(title), katla(metin_ac(raw_text))) for pk, title, raw_text in satirlar],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mevzuat_parca', '0013_duzenleme_tag_sector_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AramaIndeksIsi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('duzenleme_id', models.BigIntegerField(db_index=True)),
+                ('eski_title', models.TextField(null=True)),
+                ('eski_raw_text', models.BinaryField(null=True)),
+            ],
+        ),
+        migrations.RunPython(kuyrugu_kur, tetikleyicileri_kaldir),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:05
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def olusturma_zamanindan_doldur(apps, schema_editor):
+    # Mevcut kayıtların son değişikliği bilinmiyor: en erken olası an (oluşturulma) yazılır
+    Duzenleme = apps.get_model("mevzuat_parca", "Duzenleme")
+    Duzenleme.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mevzuat_parca", "0014_fts_index_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="duzenleme",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(olusturma_zamanindan_doldur, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,72 @@
 # Django model altyapısı (DB tablolarını tanımlamak için)
-from django.db import models
+from django.db import models, transaction
 
 # Mevzuat metninden otomatik tag/sector/impact çıkaran fonksiyon
-# (Senin yazdığın NLP kural motoru)
-from .nlp_rules import analyze_regulation_text
+# (Senin yazdığın NLP kural motoru) + aktif kural seti sürümü
+from .nlp_rules import RULES_VERSION, analyze_regulation_text, content_fingerprint
 
+# Tam metin DB'de sıkıştırılmış saklanır (Python tarafında yine str)
+from .sikistirma import SikistirilmisMetinField
 
-class Sirket(models.Model):
+
+class EslesmeIzleyenModel(models.Model):
+    """
+    Yükümlülük eşleşmesini etkileyen alanları (ESLESME_ALANLARI) izler.
+    DB'den yüklenirken bu alanların değeri saklanır; save()'de değiştiyse
+    (veya kayıt yeniyse) nesne yeniden eşleştirme kuyruğuna eklenir.
+    Eşleştirmenin kendisi istek thread'inde değil, commit sonrası arka planda yapılır
+    (eslestirme.kuyrugu_isle).
+    NOT: QuerySet.update() / bulk_update save() çağırmaz; o yollar
+    eslestirme.kuyruga_ekle'yi kendisi çağırmalı. Eşleştirmeyi aynı istekte kendisi
+    yapan çağıran save(eslesme_kuyrugu=False) ile kuyruğu atlar (iki kez eşleştirilmez).
+    """
+
+    # Değişince yeniden eşleştirme gereken alanlar (alt sınıf belirler)
+    ESLESME_ALANLARI = ()
+
+    # Kuyruktaki iş türü (EslestirmeIsi.kind)
+    ESLESME_TURU = ""
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        obj._eslesme_onceki = obj.eslesme_degerleri()
+        return obj
+
+    def eslesme_degerleri(self) -> dict:
+        """İzlenen alanların şu anki değerleri (defer edilmiş alanlar hariç)."""
+        return {alan: self.__dict__[alan] for alan in self.ESLESME_ALANLARI if alan in self.__dict__}
+
+    def eslesme_degisiklikleri(self) -> dict:
+        """
+        Yüklendikten sonra değişen izlenen alanlar: {alan: (eski, yeni)}.
+        Yeni (DB'den gelmemiş) nesnede tüm izlenen alanlar değişmiş sayılır.
+        """
+        onceki = getattr(self, "_eslesme_onceki", None)
+        simdiki = self.eslesme_degerleri()
+        if onceki is None:
+            return {alan: (None, deger) for alan, deger in simdiki.items()}
+        return {
+            alan: (onceki[alan], deger)
+            for alan, deger in simdiki.items()
+            if alan in onceki and onceki[alan] != deger
+        }
+
+    def save(self, *args, eslesme_kuyrugu=True, **kwargs):
+        degisti = eslesme_kuyrugu and bool(self.eslesme_degisiklikleri())
+        super().save(*args, **kwargs)
+        if degisti:
+            # models ↔ eslestirme döngüsel import olmasın diye burada
+            from .eslestirme import kuyruga_ekle
+
+            kuyruga_ekle(self.ESLESME_TURU, [self.pk])
+        self._eslesme_onceki = self.eslesme_degerleri()
+
+
+class Sirket(EslesmeIzleyenModel):
     # UI'da sektör seçimi için seçenek listesi
     SECTOR_CHOICES = [
         ("yazilim", "Yazılım"),
@@ -37,12 +97,27 @@ class Sirket(models.Model):
     # DB tarafında boş gelmesin diye default "" veriyoruz
     unvan = models.CharField(max_length=255, blank=True, default="")
 
+    # Sektör / ihracatçılık değişince yükümlülükler yeniden eşleştirilir
+    ESLESME_ALANLARI = ("sector", "is_exporter")
+    ESLESME_TURU = "sirket"
+
+    def save(self, *args, **kwargs):
+        # Yeni şirketin skor satırı (yükümlülüğü yok → 100) şirketle birlikte yazılır;
+        # sonradan gelen yükümlülükler bu satıra fark olarak eklenir
+        yeni_mi = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if yeni_mi:
+                from .skorlama import bos_skorlar_olustur
+
+                bos_skorlar_olustur([self.pk])
+
     def __str__(self):
         # Admin panelde veya template’te {{ sirket }} yazınca gözükecek metin
         return self.name
 
 
-class Duzenleme(models.Model):
+class Duzenleme(EslesmeIzleyenModel):
     # Mevzuat kaynağı seçenekleri
     SOURCE_CHOICES = [
         ("resmi_gazete", "Resmî Gazete"),
@@ -69,7 +144,9 @@ class Duzenleme(models.Model):
     url = models.URLField(blank=True, null=True)
 
     # Mevzuatın ham tam metni (zorunlu)
-    raw_text = models.TextField()
+    # DB'de zlib ile sıkıştırılmış saklanır; metne ihtiyacı olmayan sorgular
+    # defer("raw_text") / defer("duzenleme__raw_text") ile hiç yüklemez
+    raw_text = SikistirilmisMetinField()
 
     # Özet metin (opsiyonel)
     summary = models.TextField(blank=True, null=True)
@@ -93,17 +170,110 @@ class Duzenleme(models.Model):
     # Oluşturulma zamanı
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Son yazılma zamanı: liste endpoint'inin koşullu GET doğrulayıcısı bunun en büyüğüne bakar.
+    # save() dışındaki toplu yollar (bulk_create upsert, bulk_update, update) elle yazar.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # ---- NLP önbelleği ----
+    # title + raw_text'in parmak izi: metin değişmediyse analiz tekrar çalışmaz
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+
+    # Son analizin hangi kural seti sürümüyle yapıldığı (nlp_rules.RULES_VERSION)
+    nlp_version = models.CharField(max_length=32, blank=True, default="", editable=False)
+
+    # Son analizin ham sonucu: {"tags": [...], "sectors": [...], "impact_type": ...}
+    nlp_result = models.JSONField(default=dict, blank=True, editable=False)
+
+    # ---- Yakın kopya (near-duplicate) ----
+    # Aynı düzenleme başka kaynakta / küçük değişiklikle tekrar yayımlandıysa
+    # asıl (ilk görülen) kayda bağlanır. Yükümlülükler sadece asıl kayıt için üretilir.
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+    )
+
+    # NLP analizinin yazdığı alanlar (save(update_fields=...) için)
+    NLP_FIELDS = ("content_hash", "nlp_version", "nlp_result", "tags", "sectors", "impact_type")
+
+    # Doğal anahtar: aynı kaynakta aynı gün aynı başlık = aynı düzenleme
+    NATURAL_KEY = ("source", "title", "publish_date")
+
+    # Sektör / etiket düzeltilince yükümlülükler yeniden eşleştirilir
+    # (etki tipi de: yeni yükümlülüğün riski ve şirket skorları ona bağlı)
+    ESLESME_ALANLARI = ("sectors", "tags", "impact_type")
+    ESLESME_TURU = "duzenleme"
+
+    # Dashboard payload'ında görünen alanlar: değişince yükümlülüğü olan şirketlerin önbelleği
+    # geçersiz kılınır (panel_onbellek.duzenleme_kaydedildi); özet / url düzeltmesi kılmaz
+    PANEL_ALANLARI = ("title", "impact_type")
+
+    class Meta:
+        constraints = [
+            # Dedup artık sadece uygulamada değil, DB'de de garanti
+            # (toplu upsert'teki ON CONFLICT de bu kısıtı kullanır)
+            models.UniqueConstraint(
+                fields=["source", "title", "publish_date"],
+                name="duzenleme_dogal_anahtar_uniq",
+            ),
+        ]
+        indexes = [
+            # Liste sırası (-publish_date, -id) ve tarih aralığı filtresi (SQLite indekse id'yi kendisi ekler)
+            models.Index(fields=["publish_date"], name="duzenleme_tarih_idx"),
+            # ?impact_type= + tarih aralığı / sıra
+            models.Index(fields=["impact_type", "publish_date"], name="duzenleme_etki_tarih_idx"),
+        ]
+
     def __str__(self):
         # Admin panelde daha anlamlı görünmesi için
         return f"{self.title} ({self.source})"
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        obj._panel_onceki = obj.panel_degerleri()
+        return obj
+
+    def panel_degerleri(self) -> dict:
+        """PANEL_ALANLARI'nın şu anki değerleri (defer edilmiş alanlar hariç)."""
+        return {alan: self.__dict__[alan] for alan in self.PANEL_ALANLARI if alan in self.__dict__}
+
+    def panel_degisti_mi(self, update_fields=None) -> bool:
         """
-        Bu model kaydedilirken:
-        - tags, sectors veya impact_type boşsa
-        - title + raw_text üzerinden analyze_regulation_text çalıştır
-        - çıkan sonuçları otomatik doldur
+        Kayıt dashboard payload'ını değiştirir mi? (post_save'de, önceki değerler henüz yenilenmeden)
+        - update_fields verildiyse: PANEL_ALANLARI'ndan biri yazılıyorsa evet, hiçbiri yoksa hayır
+        - tam save: yüklendikten sonra değişen (ya da eski değeri bilinmeyen) alan varsa evet
+        """
+        if update_fields is not None:
+            return any(alan in update_fields for alan in self.PANEL_ALANLARI)
+        onceki = getattr(self, "_panel_onceki", None)
+        if onceki is None:
+            return True
+        simdiki = self.panel_degerleri()
+        return any(alan not in onceki or onceki[alan] != simdiki.get(alan) for alan in self.PANEL_ALANLARI)
+
+    def hesapla_content_hash(self) -> str:
+        """title + raw_text için parmak izi (nlp_rules.content_fingerprint)."""
+        return content_fingerprint(self.title, self.raw_text)
+
+    def nlp_sonucu(self):
+        """
+        NLP analiz sonucunu {"tags", "sectors", "impact_type"} sözlüğü olarak döndürür.
+        - Metin ve kural sürümü değişmediyse önbellekteki sonucu kullanır
+        - Değiştiyse analyze_regulation_text'i çalıştırır
+        Dönüş: (sonuc, fingerprint, analiz_calisti)
         """
+        fingerprint = self.hesapla_content_hash()
+
+        # Önbellek geçerli: aynı metin + aynı kurallar → analize gerek yok
+        if (
+            self.nlp_result
+            and fingerprint == self.content_hash
+            and self.nlp_version == RULES_VERSION
+        ):
+            return self.nlp_result, fingerprint, False
 
         # NLP'ye verilecek metni birleştiriyoruz:
         # raw_text None olabilir diye "or ''" ile güvene alıyoruz
@@ -112,20 +282,79 @@ class Duzenleme(models.Model):
         # NLP kural motoru: (tags_list, sectors_list, impact_type) döndürsün
         auto_tags, auto_sectors, auto_impact = analyze_regulation_text(combined_text)
 
-        # Eğer tags boşsa ve NLP tags bulduysa doldur
-        if (not self.tags) and auto_tags:
-            self.tags = auto_tags
+        sonuc = {"tags": auto_tags, "sectors": auto_sectors, "impact_type": auto_impact}
+        return sonuc, fingerprint, True
+
+    def nlp_sonucunu_uygula(self, sonuc: dict, fingerprint: str) -> bool:
+        """
+        NLP sonucunu alanlara uygular ve önbelleği günceller.
+        Bir alan şu durumlarda NLP'den gelen değeri alır:
+        - alan boşsa (eski davranış)
+        - alan önceki NLP sonucuyla aynıysa (yani elle girilmemiş, otomatik dolmuşsa)
+        Elle girilmiş değerlere dokunulmaz.
+        Dönüş: herhangi bir alan değişti mi?
+        """
+        onceki = self.nlp_result or {}
+        degisti = False
+
+        for alan in ("tags", "sectors", "impact_type"):
+            mevcut = getattr(self, alan)
+            yeni = sonuc.get(alan)
+            otomatik = bool(onceki) and mevcut == onceki.get(alan)
 
-        # Eğer sectors boşsa ve NLP sectors bulduysa doldur
-        if (not self.sectors) and auto_sectors:
-            self.sectors = auto_sectors
+            if ((not mevcut) and yeni) or (otomatik and mevcut != yeni):
+                setattr(self, alan, yeni)
+                degisti = True
 
-        # Eğer impact_type boşsa ve NLP impact tipi bulduysa doldur
-        if (not self.impact_type) and auto_impact:
-            self.impact_type = auto_impact
+        if (self.content_hash, self.nlp_version, self.nlp_result) != (fingerprint, RULES_VERSION, sonuc):
+            self.content_hash = fingerprint
+            self.nlp_version = RULES_VERSION
+            self.nlp_result = sonuc
+            degisti = True
 
-        # Normal Django save'i çağır (DB’ye yaz)
+        return degisti
+
+    def save(self, *args, **kwargs):
+        """
+        Bu model kaydedilirken:
+        - title + raw_text üzerinden analyze_regulation_text çalıştır
+          (metin + kural sürümü değişmediyse önbellekteki sonuç kullanılır)
+        - boş (veya daha önce otomatik dolmuş) tags/sectors/impact_type alanlarını doldur
+        """
+
+        # Analiz (veya önbellekten sonuç): sadece bir hash maliyeti olabilir
+        sonuc, fingerprint, analiz_calisti = self.nlp_sonucu()
+        self.nlp_sonucunu_uygula(sonuc, fingerprint)
+
+        # save(update_fields=[...]) ile çağrıldıysa NLP'nin değiştirdiği alanlar ve
+        # updated_at da yazılsın (auto_now alan update_fields'ta yoksa yazılmaz)
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at", *(self.NLP_FIELDS if analiz_calisti else ())}
+
+        # Normal Django save'i çağır (DB’ye yaz; eşleşme alanları değiştiyse kuyruğa ekler;
+        # post_save payload alanlarının değişip değişmediğine _panel_onceki'den bakar)
         super().save(*args, **kwargs)
+        self._panel_onceki = self.panel_degerleri()
+
+
+class SirketObligationQuerySet(models.QuerySet):
+
+    def delete(self):
+        """
+        Toplu silme: şirket başına skor farkı tek GROUP BY sorgusuyla bulunur, tek UPDATE
+        (executemany) ile uygulanır, dashboard önbelleği tek seferde geçersiz kılınır.
+        Yükümlülük başına post_delete alıcıları bu yolda atlanır (skorlama.toplu_silmede_mi).
+        """
+        from .panel_onbellek import gecersiz_kil
+        from .skorlama import farklari_uygula, silinen_farklar
+
+        with transaction.atomic():
+            farklar = silinen_farklar(self)
+            sonuc = super().delete()
+            farklari_uygula(farklar)
+            gecersiz_kil(farklar)
+        return sonuc
 
 
 class SirketObligation(models.Model):
@@ -136,6 +365,16 @@ class SirketObligation(models.Model):
         ("high", "Yüksek"),
     ]
 
+    # Yükümlülük nereden geldi? (eşleştirme motoru sadece kendi açtıklarını kapatır)
+    MATCH_MANUAL = "manual"
+    MATCH_MATCHED = "matched"
+    MATCH_UNMATCHED = "unmatched"
+    MATCH_STATE_CHOICES = [
+        (MATCH_MANUAL, "Elle"),
+        (MATCH_MATCHED, "Otomatik eşleşti"),
+        (MATCH_UNMATCHED, "Eşleşme kalktı"),
+    ]
+
     # Bu obligation hangi şirkete ait?
     # Şirket silinirse obligationlar da silinsin (CASCADE)
     sirket = models.ForeignKey(Sirket, on_delete=models.CASCADE)
@@ -166,6 +405,246 @@ class SirketObligation(models.Model):
     # Kayıt her güncellendiğinde otomatik güncellenir
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Eşleştirme durumu: motor "matched" satırları, eşleşme kalkınca is_applicable=False +
+    # "unmatched" yapar; tekrar eşleşirse geri açar. Elle girilenlere dokunmaz.
+    match_state = models.CharField(
+        max_length=10,
+        choices=MATCH_STATE_CHOICES,
+        default=MATCH_MANUAL,
+        editable=False,
+    )
+
+    class Meta:
+        constraints = [
+            # Bir şirketin aynı düzenlemeden tek yükümlülüğü olur
+            # (eşleştirme motoru tekrar çalışınca çift satır üretmesin)
+            models.UniqueConstraint(fields=["sirket", "duzenleme"], name="sirket_duzenleme_uniq"),
+        ]
+
+    # QuerySet.delete() skor farkını ve önbelleği tek seferde uygular
+    objects = SirketObligationQuerySet.as_manager()
+
+    # Şirket skorunu etkileyen alanlar: değişince SirketSkoru'na fark uygulanır (skorlama)
+    SKOR_ALANLARI = ("sirket_id", "duzenleme_id", "is_applicable", "is_compliant", "risk_level", "due_date")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        obj._skor_onceki = obj.skor_degerleri()
+        return obj
+
+    def skor_degerleri(self) -> dict:
+        """Skor alanlarının şu anki değerleri (defer edilmiş alanlar hariç)."""
+        return {alan: self.__dict__[alan] for alan in self.SKOR_ALANLARI if alan in self.__dict__}
+
+    def save(self, *args, **kwargs):
+        # Yükümlülük ve şirket skoru aynı transaction'da yazılır
+        from .panel_onbellek import gecersiz_kil
+        from .skorlama import yukumluluk_kaydedildi
+
+        yeni_mi = self._state.adding
+        onceki = getattr(self, "_skor_onceki", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            yukumluluk_kaydedildi(self, onceki, yeni_mi)
+            # Dashboard payload'ı (yükümlülük başka şirkete taşındıysa eskisininki de)
+            gecersiz_kil([self.sirket_id, (onceki or {}).get("sirket_id")])
+        self._skor_onceki = self.skor_degerleri()
+
     def __str__(self):
         # Admin panelde obligation daha okunur görünür
         return f"{self.sirket.name} / {self.duzenleme.title}"
+
+
+class SirketSkoru(models.Model):
+    """
+    Şirketin saklanan uyum skoru ve sayaçları (liste ekranları buradan okur, skora göre sıralar/filtreler).
+    Yükümlülük eklenince / değişince / silinince artımlı güncellenir, tarih cezaları için
+    her gece refresh_scores çalışır (bkz. skorlama.py).
+    """
+
+    # Şirket başına tek satır
+    sirket = models.OneToOneField(Sirket, on_delete=models.CASCADE, primary_key=True, related_name="skor")
+
+    # 0-100 arası uyum skoru (sıralama / eşik filtresi için indeksli)
+    score = models.IntegerField(db_index=True)
+
+    # 0-100'e sıkıştırılmamış skor: artımlı fark bunun üzerine eklenir
+    raw_score = models.IntegerField()
+
+    # Dashboard istatistikleri (uygulanabilir yükümlülükler)
+    open_obligations = models.IntegerField(default=0)
+    overdue_obligations = models.IntegerField(default=0)
+    total_obligations = models.IntegerField(default=0)
+
+    # Tarih cezalarının hesaplandığı gün (başka günse satır bayattır)
+    computed_for = models.DateField()
+
+    # Son güncellenme zamanı
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.sirket_id}: {self.score}"
+
+
+class KaynakCheckpoint(models.Model):
+    """
+    Kaynak başına çekme durumu (fetch_duzenlemeler artımlı çalışsın diye).
+    Bir sonraki çalıştırma buradan devam eder; tüm geçmiş tekrar taranmaz.
+    """
+
+    # Hangi kaynak (Duzenleme.SOURCE_CHOICES ile aynı kodlar)
+    source = models.CharField(max_length=50, choices=Duzenleme.SOURCE_CHOICES, unique=True)
+
+    # Bu kaynakta görülen en son yayın tarihi
+    last_publish_date = models.DateField(blank=True, null=True)
+
+    # Sayfalı kaynaklarda (GİB) en son görülen ilk kaydın URL'i:
+    # listede bu URL'e gelince daha eskilerine bakmaya gerek yok
+    cursor = models.CharField(max_length=1000, blank=True, default="")
+
+    # Son başarılı çalıştırma zamanı
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.last_publish_date}"
+
+
+class KaynakSayfasi(models.Model):
+    """
+    Çekilen her sayfanın (listeleme veya detay) HTTP doğrulayıcıları.
+    Sonraki istek If-None-Match / If-Modified-Since ile koşullu yapılır:
+    değişmeyen sayfa 304 döner ve hiç ayrıştırılmaz.
+    """
+
+    # Sayfanın tam URL'i
+    url = models.CharField(max_length=1000, unique=True)
+
+    # Hangi kaynağa ait
+    source = models.CharField(max_length=50, choices=Duzenleme.SOURCE_CHOICES, db_index=True)
+
+    # Sunucunun döndürdüğü ETag / Last-Modified başlıkları (yoksa boş)
+    etag = models.CharField(max_length=255, blank=True, default="")
+    last_modified = models.CharField(max_length=64, blank=True, default="")
+
+    # Gövde parmak izi: doğrulayıcı desteklemeyen sunucularda değişmeyen sayfayı yakalar
+    body_hash = models.CharField(max_length=64, blank=True, default="")
+
+    # Son çekilme zamanı
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
+
+
+class DuzenlemeImzasi(models.Model):
+    """
+    Düzenleme metninin MinHash imzası (benzerlik.py).
+    Yakın kopya karşılaştırmasında metnin kendisi yerine bu imza okunur.
+    """
+
+    duzenleme = models.OneToOneField(
+        Duzenleme, on_delete=models.CASCADE, primary_key=True, related_name="imza"
+    )
+
+    # İmza hangi metinden üretildi (Duzenleme.content_hash): farklıysa imza eskidir
+    content_hash = models.CharField(max_length=64)
+
+    # MinHash değerleri (uint32 dizisi, little-endian)
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"imza #{self.duzenleme_id}"
+
+
+class ImzaBandi(models.Model):
+    """
+    LSH indeksi: her imza bantlara bölünür, her bandın özeti bir satırdır.
+    Aynı (band, hash) satırına sahip düzenlemeler benzer olmaya adaydır;
+    arama tüm tabloyu değil sadece (band, hash) indeksini gezer.
+    """
+
+    duzenleme = models.ForeignKey(Duzenleme, on_delete=models.CASCADE, related_name="imza_bantlari")
+    band = models.PositiveSmallIntegerField()
+    hash = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "hash"], name="imza_bandi_lsh_idx")]
+
+    def __str__(self):
+        return f"{self.duzenleme_id}:{self.band}"
+
+
+class DuzenlemeEtiketi(models.Model):
+    """
+    Duzenleme.tags listesinin satır satır izdüşümü: (etiket, düzenleme) başına bir satır.
+    ?tag= filtresi JSON'u satır satır açmak yerine (etiket, düzenleme) indeksinden okur.
+    Elle yazılmaz: Duzenleme tablosundaki trigger'lar günceller (etiket_indeksi.py).
+    """
+
+    duzenleme = models.ForeignKey(Duzenleme, on_delete=models.CASCADE, related_name="etiket_satirlari")
+    tag = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["tag", "duzenleme"], name="duzenleme_etiketi_uniq")]
+
+    def __str__(self):
+        return f"{self.duzenleme_id}:{self.tag}"
+
+
+class DuzenlemeSektoru(models.Model):
+    """Duzenleme.sectors listesinin izdüşümü (?sector= filtresi); DuzenlemeEtiketi ile aynı düzen."""
+
+    duzenleme = models.ForeignKey(Duzenleme, on_delete=models.CASCADE, related_name="sektor_satirlari")
+    sector = models.CharField(max_length=50)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["sector", "duzenleme"], name="duzenleme_sektoru_uniq")]
+
+    def __str__(self):
+        return f"{self.duzenleme_id}:{self.sector}"
+
+
+class AramaIndeksIsi(models.Model):
+    """
+    FTS indeksi kuyruğu (arama.py): Duzenleme tablosundaki trigger'lar her ekleme / başlık
+    veya metin değişikliği / silmede bir satır yazar; arama.indeksi_guncelle metni Python'da
+    açıp katlayarak indekse işler ve satırları siler.
+    eski_*: değişiklikten önceki değerler (indeksten silmek için); yeni eklenen düzenlemede boş.
+    Trigger'lar sadece yerleşik SQL kullanır: başka bağlantıdan (dbshell, betik) yazma da çalışır.
+    """
+
+    duzenleme_id = models.BigIntegerField(db_index=True)
+    eski_title = models.TextField(null=True)
+    eski_raw_text = models.BinaryField(null=True)
+
+    def __str__(self):
+        return f"#{self.duzenleme_id}"
+
+
+class EslestirmeIsi(models.Model):
+    """
+    Yeniden eşleştirme kuyruğu: eşleşme alanı değişen şirket / düzenleme.
+    Aynı nesne için tek satır tutulur (art arda düzenlemeler birleşir); her yeni
+    değişiklik version'ı artırır. İşleyici satırı ancak version değişmediyse siler,
+    işlenirken gelen düzenleme böylece kaybolmaz.
+    """
+
+    KIND_CHOICES = [
+        ("sirket", "Şirket"),
+        ("duzenleme", "Düzenleme"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="eslestirme_isi_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} (v{self.version})"
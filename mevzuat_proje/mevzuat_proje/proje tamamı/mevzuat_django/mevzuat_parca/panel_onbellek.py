@@ -0,0 +1,299 @@
+# mevzuat_parca/panel_onbellek.py
+#
+# Şirket dashboard payload önbelleği (views.build_dashboard_payload sonucu, şirket başına bir kayıt).
+#
+# Payload sadece iki durumda değişir:
+#   1) Şirketin kendisi, bir yükümlülüğü ya da yükümlülüğü olan bir düzenlemenin başlığı /
+#      etki tipi değişince → yazma yolları gecersiz_kil(...) çağırır
+#   2) Takvim bir son tarih sınırını geçince (açık yükümlülük gecikmiş olur ya da
+#      YAKLASAN_GUN penceresine girer) → kayıt bu sınırın gününü ("geçerlilik bitişi")
+#      taşır; o gün gelince kayıt kullanılmaz, payload yeniden hesaplanır
+#
+# Geçersiz kılma kaydı silmek yerine şirketin "sürüm" anahtarını yeni bir değere çeker;
+# kayıt, hesaplandığı andaki sürümü taşır ve sürüm tutmuyorsa okunmaz. Böylece:
+#   - geçersiz kılma ile eşzamanlı hesaplanan eski bir payload sonradan yazılsa da kullanılmaz
+#   - sürüm commit'te bir kez daha değişir: transaction içinde (commit'ten önce) eski veriyle
+#     hesaplanıp yazılmış kayıt da geçersiz olur
+#   - sürüm anahtarı backend'den düşerse (LRU vb.) yeni sürüm üretilir, eski kayıt tutmaz
+#
+# Backend Django cache framework'ünden gelir (settings.CACHES["panel"]): varsayılan ortak DB
+# tablosu (DatabaseCache, migrate sonunda kurulur); Redis / Memcached da verilebilir. Süreç içi
+# LocMemCache sadece tek süreçli çalıştırmada kullanılmalı: bir süreçteki geçersiz kılmayı
+# (sürüm değişikliğini) diğerleri görmez, eski payload ve 304 dönerler.
+#
+# Sayaçlar (isabet oranı, yeniden hesaplama süresi) süreç başınadır: sayaclar() / GET /api/metrics/
+#
+# Aynı sürüm anahtarları koşullu GET'in (ETag / Last-Modified → 304) doğrulayıcısıdır:
+#   dashboard ETag = hash(şirket sürümü, bugün)  — payload değişmeden ikisi de değişmez
+#   liste ETag     = hash(liste sürümü, saklanan skorların son yazılma anı + satır sayısı, bugün, istek)
+# Liste sürümü her gecersiz_kil'de değişir (şirket adı / sektörü de listede); skor tablosu
+# ayrıca DB'den okunur çünkü gece işi (refresh_scores) başka süreçte çalışır.
+#   düzenleme listesi ETag = hash(filtreli düzenlemelerin en son updated_at'i + satır sayısı, istek)
+#   (önbellek sürümü yok: her yazma yolu updated_at'i günceller, silme sayıyı değiştirir)
+# Doğrulayıcılar payload / skor hesaplamadan bulunur: 304 yanıtı skorlayıcıyı hiç çalıştırmaz.
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import Sirket, SirketObligation, SirketSkoru
+from .skorlama import YAKLASAN_GUN, toplu_silmede_mi
+
+# Süreç ömrü boyunca toplam sayaçlar (sayaclar() ile okunur)
+_SAYACLAR = Counter()
+_SAYAC_KILIDI = threading.Lock()
+
+
+def _onbellek():
+    return caches[getattr(settings, "PANEL_ONBELLEK", "panel")]
+
+
+def _surum_anahtari(sirket_id) -> str:
+    return f"panel:surum:{sirket_id}"
+
+
+def _kayit_anahtari(sirket_id) -> str:
+    return f"panel:kayit:{sirket_id}"
+
+
+# Tüm şirket listelerinin sürümü (her geçersiz kılmada değişir)
+_LISTE_ANAHTARI = "panel:surum:liste"
+
+
+def _yeni_surum() -> tuple:
+    """(oluşturulma anı — Last-Modified için, rastgele değer)"""
+    return (time.time(), uuid.uuid4().hex)
+
+
+def _surum(onbellek, anahtar):
+    """Sürüm anahtarının değeri; yoksa (hiç yazılmamış / backend'den düşmüş) yenisi yazılır."""
+    surum = onbellek.get(anahtar)
+    if surum is None:
+        # add: eşzamanlı başka bir istek sürümü yazdıysa onunki geçerli
+        onbellek.add(anahtar, _yeni_surum(), timeout=None)
+        surum = onbellek.get(anahtar)
+    return surum
+
+
+def _say(**artis):
+    with _SAYAC_KILIDI:
+        _SAYACLAR.update(artis)
+
+
+def gecerlilik_bitisi(todo, bugun):
+    """
+    Açık yükümlülüklerin (payload["todo"]) son tarihlerinden payload'ın değişeceği ilk gün:
+    - son tarih − YAKLASAN_GUN → yükümlülük yaklaşan pencereye girer
+    - son tarih + 1            → yükümlülük gecikmiş olur
+    bugun'den sonraki en yakın sınır döner; sınır yoksa None (sadece yazmalar geçersiz kılar).
+    """
+    sinirlar = [
+        gun
+        for item in todo
+        if item["due_date"] is not None
+        for gun in (item["due_date"] - timedelta(days=YAKLASAN_GUN), item["due_date"] + timedelta(days=1))
+        if gun > bugun
+    ]
+    return min(sinirlar, default=None)
+
+
+def _zaman_asimi(onbellek, bitis):
+    """Kaydın backend'de tutulacağı süre (sn): bitiş gününün başına kadar, en fazla backend varsayılanı."""
+    varsayilan = onbellek.default_timeout
+    if bitis is None:
+        return varsayilan
+    kalan = max(1, int((datetime.combine(bitis, datetime.min.time()) - datetime.now()).total_seconds()))
+    return kalan if varsayilan is None else min(kalan, varsayilan)
+
+
+def getir(sirket_id, hesapla, bugun=None):
+    """
+    Şirketin dashboard payload'ı: geçerli kayıt varsa önbellekten (DB sorgusu yok),
+    yoksa hesapla() çağrılır ve sonuç saklanır. hesapla() istisna atarsa (ör. Http404)
+    hiçbir şey saklanmaz.
+    """
+    bugun = bugun or date.today()
+    onbellek = _onbellek()
+    surum_anahtari, kayit_anahtari = _surum_anahtari(sirket_id), _kayit_anahtari(sirket_id)
+
+    degerler = onbellek.get_many([surum_anahtari, kayit_anahtari])
+    surum = degerler.get(surum_anahtari)
+    kayit = degerler.get(kayit_anahtari)
+    if kayit is not None and surum is not None and kayit[0] == surum:
+        if kayit[1] is None or bugun < kayit[1]:
+            _say(hits=1)
+            return kayit[2]
+        _say(expired=1)
+    else:
+        _say(misses=1)
+
+    if surum is None:
+        surum = _surum(onbellek, surum_anahtari)
+
+    t0 = time.perf_counter()
+    payload = hesapla()
+    _say(recomputes=1, recompute_seconds=time.perf_counter() - t0)
+
+    bitis = gecerlilik_bitisi(payload["todo"], bugun)
+    onbellek.set(kayit_anahtari, (surum, bitis, payload), timeout=_zaman_asimi(onbellek, bitis))
+    return payload
+
+
+def gecersiz_kil(sirket_ids):
+    """
+    Şirketlerin önbellekteki payload'larını geçersiz kılar (şimdi ve transaction commit olunca).
+    Yükümlülük / şirket / düzenleme yazan her yol çağırır.
+    """
+    ids = {pk for pk in sirket_ids if pk is not None}
+    if not ids:
+        return
+
+    def surumleri_degistir():
+        yeni = {_surum_anahtari(pk): _yeni_surum() for pk in ids}
+        yeni[_LISTE_ANAHTARI] = _yeni_surum()
+        _onbellek().set_many(yeni, timeout=None)
+
+    surumleri_degistir()
+    # Transaction dışında hemen çalışır (ikinci kez değiştirmek zararsız)
+    transaction.on_commit(surumleri_degistir)
+    _say(invalidations=len(ids))
+
+
+def liste_degisti():
+    """
+    Sadece liste sürümü (şimdi ve commit'te): toplu eklenen yeni şirketlerin önbellekte
+    payload'ı yok, şirket başına sürüm değiştirmek gerekmez.
+    """
+    def surumu_degistir():
+        _onbellek().set(_LISTE_ANAHTARI, _yeni_surum(), timeout=None)
+
+    surumu_degistir()
+    transaction.on_commit(surumu_degistir)
+
+
+def duzenlemeler_degisti(duzenleme_ids):
+    """Başlığı / etki tipi değişen düzenlemelerde yükümlülüğü olan şirketlerin payload'ları."""
+    ids = list(duzenleme_ids)
+    for i in range(0, len(ids), 500):
+        gecersiz_kil(
+            SirketObligation.objects.filter(duzenleme_id__in=ids[i:i + 500])
+            .values_list("sirket_id", flat=True).distinct()
+        )
+
+
+# =========================
+# Koşullu GET doğrulayıcıları
+# =========================
+
+def _gun_basi(bugun) -> float:
+    return datetime.combine(bugun, datetime.min.time()).timestamp()
+
+
+def _dogrulayici(parcalar, degisiklik_anlari):
+    """(strong ETag değeri, Last-Modified) — Last-Modified aware UTC datetime."""
+    etag = hashlib.sha1("|".join(map(str, parcalar)).encode()).hexdigest()
+    son = datetime.fromtimestamp(max(degisiklik_anlari), tz=dt_timezone.utc)
+    return etag, son
+
+
+def dogrulayici(sirket_id, bugun=None):
+    """
+    Şirket dashboard'unun (ETag, Last-Modified) değeri; tek önbellek okuması.
+    Payload sürüm değişmeden değişmez; son tarih sınırları gün bazında olduğu için
+    güne göre de değişir (Last-Modified en az bugünün başı).
+    """
+    bugun = bugun or date.today()
+    zaman, deger = _surum(_onbellek(), _surum_anahtari(sirket_id))
+    return _dogrulayici(("panel", sirket_id, deger, bugun), (zaman, _gun_basi(bugun)))
+
+
+def liste_dogrulayici(istek_anahtari, bugun=None):
+    """
+    Şirket listeleri (skorlu) için (ETag, Last-Modified): liste sürümü + saklanan skor
+    tablosunun son yazılma anı ve satır sayısı (tek aggregate sorgusu).
+    istek_anahtari: aynı URL'nin farklı gösterimleri (query string, Accept) ayrı ETag alsın diye.
+    """
+    bugun = bugun or date.today()
+    zaman, deger = _surum(_onbellek(), _LISTE_ANAHTARI)
+    skor = SirketSkoru.objects.aggregate(son=Max("computed_at"), adet=Count("pk"))
+    son_skor = skor["son"].timestamp() if skor["son"] else 0
+    return _dogrulayici(
+        ("liste", istek_anahtari, deger, skor["son"], skor["adet"], bugun),
+        (zaman, son_skor, _gun_basi(bugun)),
+    )
+
+
+def duzenleme_liste_dogrulayici(duzenlemeler, istek_anahtari):
+    """
+    Düzenleme listesi için (ETag, Last-Modified): filtrelenmiş queryset'in en son değişiklik
+    anı ve satır sayısı (tek aggregate sorgusu; liste serileştirilmez).
+    """
+    son = duzenlemeler.order_by().aggregate(son=Max("updated_at"), adet=Count("pk"))
+    return _dogrulayici(
+        ("duzenlemeler", istek_anahtari, son["son"], son["adet"]),
+        (son["son"].timestamp() if son["son"] else 0,),
+    )
+
+
+# =========================
+# Sinyal alıcıları (apps.py bağlar)
+# =========================
+
+def yukumluluk_silindi(sender, instance, origin=None, **kwargs):
+    """
+    post_delete (SirketObligation): tek nesne silme. Toplu yollarda şirketler bir kez geçersiz
+    kılınır (şirket alıcısı, duzenleme_silindi, SirketObligationQuerySet.delete).
+    """
+    if toplu_silmede_mi(origin):
+        return
+    gecersiz_kil([instance.sirket_id])
+
+
+def duzenleme_silindi(sender, instance, **kwargs):
+    """post_delete (Duzenleme): yükümlülüğü silinen şirketler (skorlama.duzenleme_siliniyor bulur) tek seferde."""
+    gecersiz_kil(getattr(instance, "_silinen_farklar", {}))
+
+
+def sirket_degisti(sender, instance, **kwargs):
+    """post_save / post_delete (Sirket): payload şirket bilgilerini de içerir."""
+    gecersiz_kil([instance.pk])
+
+
+def duzenleme_kaydedildi(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    post_save (Duzenleme): sadece payload'da görünen alan (başlık, etki tipi) değiştiyse
+    yükümlülüğü olan şirketler taranıp geçersiz kılınır (Duzenleme.panel_degisti_mi).
+    Yeni düzenlemenin henüz yükümlülüğü yok, eşleştirme kendisi geçersiz kılar.
+    """
+    if not created and instance.panel_degisti_mi(update_fields):
+        duzenlemeler_degisti([instance.pk])
+
+
+def sayaclar() -> dict:
+    """
+    Bu sürecin önbellek sayaçları:
+    {"hits", "misses", "expired", "invalidations", "hit_ratio",
+     "recomputes", "recompute_seconds_total", "recompute_seconds_avg"}
+    expired: son tarih sınırı geçtiği için kullanılmayan kayıtlar (isabet sayılmaz)
+    """
+    with _SAYAC_KILIDI:
+        s = Counter(_SAYACLAR)
+    istek = s["hits"] + s["misses"] + s["expired"]
+    return {
+        "hits": s["hits"],
+        "misses": s["misses"],
+        "expired": s["expired"],
+        "invalidations": s["invalidations"],
+        "hit_ratio": round(s["hits"] / istek, 4) if istek else None,
+        "recomputes": s["recomputes"],
+        "recompute_seconds_total": round(s["recompute_seconds"], 6),
+        "recompute_seconds_avg": round(s["recompute_seconds"] / s["recomputes"], 6) if s["recomputes"] else None,
+    }
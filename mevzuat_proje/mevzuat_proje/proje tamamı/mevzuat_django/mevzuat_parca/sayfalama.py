@@ -0,0 +1,157 @@
+# mevzuat_parca/sayfalama.py
+#
+# Liste endpoint'leri için keyset (cursor) sayfalama.
+#
+# OFFSET yerine "son görülen satırın sıralama değerlerinden sonrası" sorgulanır:
+#   ORDER BY publish_date DESC, id DESC LIMIT 51
+#   WHERE publish_date < :d OR (publish_date = :d AND id < :id)
+# Böylece sayfa maliyeti kaçıncı sayfada olunduğundan bağımsızdır (indeks üzerinden
+# başlangıç noktasına atlanır) ve sayfalar arasında eklenen / silinen satırlar
+# tekrar ya da atlama üretmez.
+#
+# Sıralama her zaman benzersiz bir kolonla (id) biter; cursor son satırın bu kolonlardaki
+# değerlerini taşır (urlsafe base64 JSON, içinde sıralamanın adı da var: başka sıralamayla
+# gelen cursor reddedilir).
+#
+# NULL olabilen kolonlar (ör. LEFT JOIN ile gelen ilişkili tablo kolonu) için sıra
+# açıkça verilir: artan sırada NULL'lar başta, azalan sırada sonda (SQLite'ın varsayılanı,
+# diğer DB'lerde de aynı sonuç).
+
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class GecersizCursor(ValueError):
+    """Çözülemeyen / başka sıralamaya ait / tip uyuşmayan cursor (view 400 döner)."""
+
+
+def _ayarlar():
+    """(varsayılan sayfa boyutu, izin verilen en büyük sayfa boyutu)"""
+    return (
+        getattr(settings, "LISTE_SAYFA_BOYUTU", 50),
+        getattr(settings, "LISTE_AZAMI_SAYFA_BOYUTU", 500),
+    )
+
+
+def istendi_mi(params) -> bool:
+    """Sayfalama isteğe bağlı: ?page_size= ya da ?cursor= gelmezse liste eskisi gibi tamamı döner."""
+    return "page_size" in params or "cursor" in params
+
+
+def sayfa_boyutu(params) -> int:
+    """?page_size= (hatalıysa varsayılan, 1..azami aralığına kırpılır)"""
+    varsayilan, azami = _ayarlar()
+    try:
+        boyut = int(params.get("page_size", varsayilan))
+    except (TypeError, ValueError):
+        boyut = varsayilan
+    return max(1, min(azami, boyut))
+
+
+def _alan(terim):
+    """"-publish_date" → ("publish_date", azalan=True)"""
+    return terim.lstrip("-"), terim.startswith("-")
+
+
+def sirala(qs, sira, bos_olabilir=()):
+    """Queryset'i sira'ya göre sıralar (NULL'ların yeri açık, keyset filtresiyle tutarlı)."""
+    ifadeler = []
+    for terim in sira:
+        alan, azalan = _alan(terim)
+        if alan in bos_olabilir:
+            ifadeler.append(F(alan).desc(nulls_last=True) if azalan else F(alan).asc(nulls_first=True))
+        else:
+            ifadeler.append(terim)
+    return qs.order_by(*ifadeler)
+
+
+def _sonrasi(alan, azalan, deger, bos_olabilir):
+    """Sıralamada deger'den sonra gelen satırlar (tek kolon için); hiç yoksa None."""
+    if deger is None:
+        # NULL artan sırada başta: sonrası NULL olmayanlar; azalan sırada sonda: sonrası yok
+        return None if azalan else Q(**{f"{alan}__isnull": False})
+    q = Q(**{f"{alan}__lt" if azalan else f"{alan}__gt": deger})
+    if azalan and alan in bos_olabilir:
+        q |= Q(**{f"{alan}__isnull": True})
+    return q
+
+
+def sonraki_filtre(sira, degerler, bos_olabilir=()) -> Q:
+    """
+    (a, b, c) > (x, y, z) karşılaştırmasının sütun yönlerine göre açılımı:
+    a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z)
+    """
+    terimler = []
+    esitler = Q()
+    for terim, deger in zip(sira, degerler):
+        alan, azalan = _alan(terim)
+        sonrasi = _sonrasi(alan, azalan, deger, bos_olabilir)
+        if sonrasi is not None:
+            terimler.append(esitler & sonrasi)
+        esitler &= Q(**{f"{alan}__isnull": True} if deger is None else {alan: deger})
+    if not terimler:
+        return Q(pk__in=[])  # son satır sıralamanın en sonundaydı: sonrası yok
+    filtre = terimler[0]
+    for q in terimler[1:]:
+        filtre |= q
+    return filtre
+
+
+def cursor_kodla(sira_adi, degerler) -> str:
+    ham = json.dumps({"s": sira_adi, "d": list(degerler)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(ham.encode()).decode().rstrip("=")
+
+
+def cursor_coz(metin, sira_adi, adet) -> list:
+    try:
+        ham = base64.urlsafe_b64decode(metin + "=" * (-len(metin) % 4))
+        veri = json.loads(ham)
+        degerler = veri["d"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise GecersizCursor("Geçersiz cursor.")
+    if veri.get("s") != sira_adi or not isinstance(degerler, list) or len(degerler) != adet:
+        raise GecersizCursor("Cursor bu sıralamaya ait değil.")
+    return degerler
+
+
+def sayfala(qs, sira, params, bos_olabilir=()):
+    """
+    Sıralı keyset sayfası: (satırlar, sonraki_cursor | None, sayfa_boyutu).
+    Tek sorgu: LIMIT sayfa_boyutu + 1 (fazla satır "sonraki sayfa var" demektir).
+    qs model nesneleri ya da values() dict'leri döndürebilir; sıralama kolonları
+    "_sayfa_<i>" adıyla annotate edilir, cursor bunlardan yazılır.
+    """
+    sira_adi = ",".join(sira)
+    boyut = sayfa_boyutu(params)
+    anahtarlar = [f"_sayfa_{i}" for i in range(len(sira))]
+
+    cursor = params.get("cursor")
+    if cursor:
+        degerler = cursor_coz(cursor, sira_adi, len(sira))
+        try:
+            qs = qs.filter(sonraki_filtre(sira, degerler, bos_olabilir))
+        except (ValidationError, ValueError, TypeError):
+            # Alan tipine uymayan değer (ör. id="abc", tarih="xx")
+            raise GecersizCursor("Geçersiz cursor.")
+
+    qs = qs.annotate(**{a: F(_alan(t)[0]) for a, t in zip(anahtarlar, sira)})
+    satirlar = list(sirala(qs, sira, bos_olabilir)[:boyut + 1])
+
+    sonraki = None
+    if len(satirlar) > boyut:
+        satirlar = satirlar[:boyut]
+        son = satirlar[-1]
+        sonraki = cursor_kodla(
+            sira_adi, [son[a] if isinstance(son, dict) else getattr(son, a) for a in anahtarlar]
+        )
+    # values() dict'lerinde yardımcı kolonlar yanıta sızmasın
+    for satir in satirlar:
+        if isinstance(satir, dict):
+            for a in anahtarlar:
+                del satir[a]
+    return satirlar, sonraki, boyut
@@ -1,10 +1,78 @@
-from rest_framework import serializers
+from datetime import date
+from functools import lru_cache
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from .models import Sirket, Duzenleme  # Modelleri import ediyoruz (veritabanı tabloları)
 
+# Toplu skor servisi (şirket başına ayrı skor sorgusu atılmasın)
+from .skorlama import score_many
+
+
+def _alan_listesi(params, ad):
+    """?fields=a,b&fields=c → ["a", "b", "c"] (boş parametre → None)"""
+    degerler = [v.strip() for ham in params.getlist(ad) for v in ham.split(",") if v.strip()]
+    return degerler or None
+
+
+class SeyrekAlanlarMixin:
+    """
+    GET isteklerinde istemci hangi alanların döneceğini seçebilir:
+    - ?fields=id,title   → sadece bu alanlar
+    - ?include=raw_text  → varsayılanda gönderilmeyen (Meta.istege_bagli) alanları ekle
+    Bilinmeyen alan adı 400 döner. Yazma isteklerinde (POST/PUT/PATCH) tüm alanlar kalır.
+    sorguyu_daralt(qs): seçilmeyen model kolonlarını defer eder (DB'den hiç okunmaz).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        istege_bagli = set(getattr(self.Meta, "istege_bagli", ()))
+        tumu = set(self.fields)
+        fields = _alan_listesi(request.query_params, "fields")
+        include = _alan_listesi(request.query_params, "include") or []
+
+        bilinmeyen = sorted(set(fields or []).union(include) - tumu)
+        if bilinmeyen:
+            raise serializers.ValidationError({"fields": f"Bilinmeyen alan: {', '.join(bilinmeyen)}"})
+
+        secili = set(fields) if fields else (tumu - istege_bagli) | set(include)
+        for ad in tumu - secili:
+            self.fields.pop(ad)
+
+    def sorguyu_daralt(self, qs):
+        """Seçili alanların okumadığı model kolonları defer edilir (pk hariç)."""
+        okunan = {alan.source for alan in self.fields.values()}
+        gereksiz = [
+            f.name for f in qs.model._meta.concrete_fields
+            if not f.primary_key and f.name not in okunan
+        ]
+        return qs.defer(*gereksiz) if gereksiz else qs
+
+
+class SirketListSerializer(serializers.ListSerializer):
+    """
+    many=True ile serialize edilen şirketlerin skorlarını tek seferde (score_many) çeker.
+    Queryset skor_ekle ile gelmişse ("kayitli_skor" annotate edilmiş) hiç sorgu atılmaz.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, "all") else data
+        sirketler = list(iterable)
+        eksik = [s.pk for s in sirketler if getattr(s, "kayitli_skor", None) is None]
+        if eksik:
+            skorlar = self.context.setdefault("skorlar", {})
+            skorlar.update({pk: v["score"] for pk, v in score_many(eksik).items()})
+        return super().to_representation(sirketler)
+
+
 # =========================
 # 1) SirketSerializer
 # =========================
-class SirketSerializer(serializers.ModelSerializer):
+class SirketSerializer(SeyrekAlanlarMixin, serializers.ModelSerializer):
     # Modelde olmayan ama API çıktısına eklemek istediğin "hesaplanmış" alan.
     # SerializerMethodField → değeri get_<alan_adı>() fonksiyonundan alır.
     compliance_score = serializers.SerializerMethodField()
@@ -26,28 +94,141 @@ class SirketSerializer(serializers.ModelSerializer):
             "compliance_score", # hesaplanan uyum skoru (modelde yok)
         ]
 
+        # many=True → skorlar toplu çekilir
+        list_serializer_class = SirketListSerializer
+
+        # Hızlı okuma yolu (hizli_json): compliance_score skor_ekle'nin kolonundan
+        hizli_kaynaklar = {"compliance_score": "kayitli_skor"}
+
     def get_compliance_score(self, obj):
         # compliance_score alanının değerini üretir.
         # obj → şu an serialize edilen Sirket kaydı.
 
-        # Skor hesaplayan fonksiyon views.py içinde durduğu için burada içerden import ediyoruz.
-        # (Not: Bu import döngüsel import riskini azaltmak için fonksiyon içinde yapılmış.)
-        from .views import hesapla_sirket_skoru
+        # Liste view'leri saklanan skoru queryset'e ekliyor (skorlama.skor_ekle) → hesaplama yok
+        kayitli = getattr(obj, "kayitli_skor", None)
+        if kayitli is not None:
+            return kayitli
 
-        # Şirketin skorunu hesaplatıyoruz
-        result = hesapla_sirket_skoru(obj)
+        # Skoru zaten bilen çağıranlar (dashboard, SirketListSerializer) context'te verir
+        skorlar = self.context.get("skorlar", {})
+        if obj.pk in skorlar:
+            return skorlar[obj.pk]
 
-        # result dict'i içinde "score" anahtarı var → onu döndürüyoruz
-        return result["score"]
+        # Tek şirket: skor servisi (saklanan satır, yoksa SQL'de hesap) → tek sorgu
+        return score_many([obj.pk]).get(obj.pk, {}).get("score", 100)
 
 
 # =========================
 # 2) DuzenlemeSerializer
 # =========================
-class DuzenlemeSerializer(serializers.ModelSerializer):
+class DuzenlemeSerializer(SeyrekAlanlarMixin, serializers.ModelSerializer):
     class Meta:
         # Bu serializer hangi modele bağlı? → Duzenleme
         model = Duzenleme
 
-        # "__all__" demek: modeldeki tüm alanları API çıktısına bas.
-        fields = "__all__"
+        # Modeldeki tüm alanlar API çıktısına basılır; NLP önbelleği (Duzenleme.nlp_sonucu'nun
+        # iç durumu) hariç: public sözleşmenin parçası değil, tags / sectors / impact_type'ı tekrarlar
+        exclude = ("content_hash", "nlp_version", "nlp_result")
+
+
+class DuzenlemeListeSerializer(DuzenlemeSerializer):
+    """
+    Liste gösterimi: tam metin (raw_text) varsayılanda yok, sorguda da defer edilir
+    (düzenleme başına sıkıştırılmış metni açmak + yanıtı megabaytlarca büyütmek yerine).
+    ?include=raw_text ile istenebilir; detay endpoint'i her zaman tam metni döner.
+    """
+
+    class Meta(DuzenlemeSerializer.Meta):
+        istege_bagli = ("raw_text",)
+
+
+# =========================
+# 3) Hızlı okuma yolu: derlenmiş satır eşlemcisi
+# =========================
+# Sıcak liste / dashboard yolları serializer'ı satır başına çalıştırmaz: alanlardan bir kez
+# (ad, kaynak kolon, dönüştürücü) planı derlenir; values() satırından ya da model nesnesinden
+# serializer çıktısının aynısı üretilir. Kimlik dönüşümlü alanlar (metin, sayı, bool, choice,
+# JSON, pk) çağrı yapmaz; tarih isoformat, tarih-saat DRF alanının kendisiyle (saat dilimi, "Z").
+# SerializerMethodField'lar Meta.hizli_kaynaklar ile bir kolona bağlanır.
+
+# DB'den gelen değerde to_representation'ı kimlik olan DRF alanları
+_KIMLIK_ALANLARI = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _donusturucu(alan):
+    """Alanın DB değerini JSON değerine çeviren fonksiyon; kimlikse None."""
+    if isinstance(alan, serializers.DateTimeField):
+        return alan.to_representation
+    if isinstance(alan, serializers.DateField):
+        if getattr(alan, "format", api_settings.DATE_FORMAT) in (ISO_8601, None):
+            return date.isoformat
+        return alan.to_representation
+    if isinstance(alan, _KIMLIK_ALANLARI):
+        return None
+    return alan.to_representation
+
+
+class SatirEslemcisi:
+    """
+    Derlenmiş alan planı: sorgu(qs) → values() queryset'i,
+    satirdan(dict) / nesneden(obj) → serializer çıktısıyla aynı dict.
+    """
+
+    def __init__(self, serializer_class, alanlar=None):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        hizli_kaynaklar = getattr(serializer.Meta, "hizli_kaynaklar", {})
+
+        self.plan = []         # (ad, values() anahtarı, dönüştürücü)
+        self.oznitelikler = []  # nesneden() için model attribute adları (FK → *_id)
+        for ad, alan in serializer.fields.items():
+            if alanlar is not None and ad not in alanlar:
+                continue
+            if ad in hizli_kaynaklar:
+                kaynak, oznitelik, donustur = hizli_kaynaklar[ad], hizli_kaynaklar[ad], None
+            elif isinstance(alan, serializers.SerializerMethodField) or "." in alan.source:
+                raise ValueError(f"{serializer_class.__name__}.{ad} için Meta.hizli_kaynaklar gerekli")
+            else:
+                kaynak = alan.source
+                oznitelik = model._meta.get_field(kaynak).attname
+                donustur = _donusturucu(alan)
+            self.plan.append((ad, kaynak, donustur))
+            self.oznitelikler.append(oznitelik)
+
+    def sorgu(self, qs):
+        return qs.values(*[kaynak for _, kaynak, _ in self.plan])
+
+    def satirdan(self, satir: dict) -> dict:
+        return {
+            ad: deger if donustur is None or deger is None else donustur(deger)
+            for ad, kaynak, donustur in self.plan
+            for deger in (satir[kaynak],)
+        }
+
+    def coklu(self, satirlar) -> list:
+        satirdan = self.satirdan
+        return [satirdan(satir) for satir in satirlar]
+
+    def nesneden(self, obj) -> dict:
+        return {
+            ad: deger if donustur is None or deger is None else donustur(deger)
+            for (ad, _, donustur), oznitelik in zip(self.plan, self.oznitelikler)
+            for deger in (getattr(obj, oznitelik, None),)
+        }
+
+
+@lru_cache(maxsize=64)
+def eslemci(serializer_class, alanlar=None) -> SatirEslemcisi:
+    """
+    (serializer sınıfı, seçili alan adları) için derlenmiş eşlemci (süreç boyunca önbellekte).
+    alanlar: ?fields= ile daraltılmış serializer'ın alan adları (tuple) ya da None (hepsi).
+    """
+    return SatirEslemcisi(serializer_class, alanlar)
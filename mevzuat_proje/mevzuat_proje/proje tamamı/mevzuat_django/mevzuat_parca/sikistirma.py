@@ -0,0 +1,77 @@
+# mevzuat_parca/sikistirma.py
+#
+# Düzenleme metinleri için sıkıştırılmış saklama.
+#
+# Mevzuat metinleri tablodaki en büyük alan: düz TEXT olarak saklanınca hem
+# veritabanı dosyası büyüyor hem de raw_text'i defer etmeyen her sorgu tam
+# metni belleğe taşıyor. SikistirilmisMetinField:
+#   - Python tarafında normal bir TextField gibi davranır (str okunur/yazılır,
+#     admin formu ve DRF serializer'ı değişmez)
+#   - DB'de BLOB olarak, zlib ile sıkıştırılmış saklanır (~3-4 kat küçük)
+#   - Her değer bir biçim baytıyla başlar; biçim baytı olmayan değer eski düz
+#     metindir ve olduğu gibi okunur (migration yarıda kalsa bile okuma bozulmaz)
+#
+# NOT: Sıkıştırılmış kolonda LIKE/icontains anlamsızdır; metin araması FTS
+# indeksinden yapılır (arama.py, trigger'lar metin_ac() ile açıp indeksler).
+
+import zlib
+
+from django.db import models
+
+
+# Biçim baytı: ileride başka bir sıkıştırıcı (zstd vb.) eklenirse yeni bayt alır
+ZLIB = b"\x01"
+
+# Sıkıştırma seviyesi: 6 (zlib varsayılanı) hız/oran dengesi; 9 sadece %1-2 daha küçük
+SEVIYE = 6
+
+
+def sikistir(metin):
+    """str → biçim baytı + zlib verisi (bytes). None → None."""
+    if metin is None:
+        return None
+    return ZLIB + zlib.compress(metin.encode("utf-8"), SEVIYE)
+
+
+def metin_ac(deger):
+    """
+    DB değeri → str. Sıkıştırılmış (biçim baytlı) veri açılır; düz metin
+    (str veya biçim baytı olmayan bytes) olduğu gibi döner. None → None.
+    Aynı fonksiyon SQLite'a SQL fonksiyonu olarak da kaydedilir (FTS trigger'ları).
+    """
+    if deger is None or isinstance(deger, str):
+        return deger
+    deger = bytes(deger)  # PostgreSQL memoryview döndürür
+    if deger[:1] == ZLIB:
+        return zlib.decompress(deger[1:]).decode("utf-8")
+    return deger.decode("utf-8")
+
+
+def sikistirilmis_mi(deger) -> bool:
+    """DB değeri zaten sıkıştırılmış mı? (migration'da tekrar sıkıştırmamak için)"""
+    return isinstance(deger, (bytes, memoryview)) and bytes(deger[:1]) == ZLIB
+
+
+class SikistirilmisMetinField(models.TextField):
+    """
+    DB'de sıkıştırılmış BLOB, Python'da str olan metin alanı.
+    Exact karşılaştırma çalışır (aynı metin aynı baytlara sıkışır), LIKE çalışmaz.
+    """
+
+    description = "Sıkıştırılmış metin"
+
+    def get_internal_type(self):
+        # Kolon tipi BinaryField'ınki (SQLite: BLOB, PostgreSQL: bytea)
+        return "BinaryField"
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if isinstance(value, str):
+            value = sikistir(value)
+        if value is not None:
+            return connection.Database.Binary(value)
+        return value
+
+    def from_db_value(self, value, expression, connection):
+        return metin_ac(value)
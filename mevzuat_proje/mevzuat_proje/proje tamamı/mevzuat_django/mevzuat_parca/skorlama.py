@@ -0,0 +1,448 @@
+# mevzuat_parca/skorlama.py
+#
+# Saklanan (materialize) uyum skoru: SirketSkoru tablosu.
+#
+# Skor formülü views.hesapla_sirket_skoru ile aynıdır (sabitler burada):
+#   100 − Σ açık yükümlülük cezası (etki + risk + tarih) + Σ tamamlanmış teşvik bonusu, 0–100 arası.
+# Her yükümlülüğün skora "katkısı" bağımsızdır; tabloda clamp'siz toplam (raw_score) da
+# tutulduğu için tek yükümlülük değişince şirketin bütün yükümlülüklerini okumadan
+# farkı (eski katkı → yeni katkı) uygulamak yeterli:
+#   UPDATE ... SET raw_score = raw_score + Δ, score = clamp(raw_score + Δ) WHERE computed_for = bugün
+# Satır yoksa veya başka bir gün için hesaplanmışsa (tarih cezaları değişmiş olabilir)
+# şirket baştan hesaplanır. Tarih cezaları günden güne değiştiği için gece işi
+# (refresh_scores komutu → gunluk_yenile) sadece sınırı geçen şirketleri yeniden hesaplar.
+#
+# Aynı formül SQL'de de var (skor_ifadeleri: Case/When ile ceza/bonus, Sum ile toplam):
+# baştan hesaplama yükümlülükleri Python'a taşımadan şirket başına tek GROUP BY satırı okur;
+# canli_skor_ekle ile herhangi bir gün için skora göre filtre / sıralama / sayfalama DB'de yapılır.
+# Okuma yolları (score_many, skor_ekle) saklanan satırı sadece bugün için hesaplanmışsa kullanır;
+# satırı olmayan / eski günde kalmış şirketlerin skoru aynı formülle SQL'de hesaplanır.
+
+from collections import namedtuple
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import Duzenleme, Sirket, SirketObligation, SirketSkoru
+
+
+# Etki tipine göre açık yükümlülük cezası
+ETKI_CEZASI = {"zorunlu": 15, "risk": 10, "opsiyonel_tesvik": 5}
+
+# Risk seviyesine göre açık yükümlülük cezası (boşsa medium sayılır)
+RISK_CEZASI = {"low": 0, "medium": 3, "high": 7}
+
+# Tarih cezaları: son tarihi geçmiş / YAKLASAN_GUN içinde dolacak açık yükümlülük
+GECIKME_CEZASI = 10
+YAKLASAN_CEZASI = 5
+YAKLASAN_GUN = 7
+
+# Tamamlanmış opsiyonel teşvik bonusu
+TESVIK_BONUSU = 5
+
+# Başlangıç skoru (yükümlülüğü olmayan şirketin skoru)
+TAM_PUAN = 100
+
+# Tek sorguda işlenen şirket sayısı (SQLite parametre sınırı)
+PARCA = 500
+
+
+class Katki(namedtuple("Katki", "puan acik geciken toplam")):
+    """Bir yükümlülüğün (veya farkın) skora ve sayaçlara katkısı."""
+
+    __slots__ = ()
+
+    def __add__(self, diger):
+        return Katki(*(a + b for a, b in zip(self, diger)))
+
+    def __sub__(self, diger):
+        return Katki(*(a - b for a, b in zip(self, diger)))
+
+
+SIFIR = Katki(0, 0, 0, 0)
+
+
+def sinirla(puan: int) -> int:
+    """Skoru 0–100 aralığına sıkıştırır."""
+    return max(0, min(TAM_PUAN, puan))
+
+
+def katki(is_applicable, is_compliant, impact_type, risk_level, due_date, bugun) -> Katki:
+    """
+    Tek yükümlülüğün katkısı (hesapla_sirket_skoru döngüsünün bir adımı).
+    Uygulanabilir olmayan yükümlülük hiç sayılmaz.
+    """
+    if not is_applicable:
+        return SIFIR
+    if is_compliant:
+        return Katki(TESVIK_BONUSU if impact_type == "opsiyonel_tesvik" else 0, 0, 0, 1)
+
+    ceza = ETKI_CEZASI.get(impact_type or "", 0) + RISK_CEZASI.get(risk_level or "medium", 0)
+    geciken = 0
+    if due_date:
+        if due_date < bugun:
+            geciken = 1
+            ceza += GECIKME_CEZASI
+        elif due_date <= bugun + timedelta(days=YAKLASAN_GUN):
+            ceza += YAKLASAN_CEZASI
+    return Katki(-ceza, 1, geciken, 1)
+
+
+# =========================
+# SQL formülü
+# =========================
+
+def _tablo_case(alan, tablo, varsayilan=0, bos=None):
+    """{deger: puan} sözlüğünden CASE alan WHEN ... ifadesi (bos: NULL/"" değerin puanı)."""
+    kosullar = [When(**{alan: deger}, then=Value(puan)) for deger, puan in tablo.items()]
+    if bos is not None:
+        kosullar.insert(0, When(Q(**{f"{alan}__isnull": True}) | Q(**{alan: ""}), then=Value(bos)))
+    return Case(*kosullar, default=Value(varsayilan), output_field=IntegerField())
+
+
+def skor_ifadeleri(bugun, onek="sirketobligation__") -> dict:
+    """
+    katki() formülünün SQL karşılığı: Sirket queryset'ine eklenecek aggregate'ler.
+    {"skor_ham", "acik_yukumluluk", "geciken_yukumluluk", "toplam_yukumluluk"}
+    onek: Sirket'ten yükümlülüğe giden yol.
+    """
+    uygulanabilir = Q(**{f"{onek}is_applicable": True})
+    acik = uygulanabilir & Q(**{f"{onek}is_compliant": False})
+    tamam = uygulanabilir & Q(**{f"{onek}is_compliant": True})
+    gecikmis = Q(**{f"{onek}due_date__lt": bugun})
+
+    ceza = (
+        _tablo_case(f"{onek}duzenleme__impact_type", ETKI_CEZASI)
+        + _tablo_case(f"{onek}risk_level", RISK_CEZASI, bos=RISK_CEZASI["medium"])
+        + Case(
+            When(gecikmis, then=Value(GECIKME_CEZASI)),
+            When(**{f"{onek}due_date__lte": bugun + timedelta(days=YAKLASAN_GUN)}, then=Value(YAKLASAN_CEZASI)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    bonus = _tablo_case(f"{onek}duzenleme__impact_type", {"opsiyonel_tesvik": TESVIK_BONUSU})
+
+    sifir = Value(0)
+    return {
+        "skor_ham": (
+            Value(TAM_PUAN)
+            - Coalesce(Sum(ceza, filter=acik), sifir)
+            + Coalesce(Sum(bonus, filter=tamam), sifir)
+        ),
+        "acik_yukumluluk": Count(f"{onek}id", filter=acik),
+        "geciken_yukumluluk": Count(f"{onek}id", filter=acik & gecikmis),
+        "toplam_yukumluluk": Count(f"{onek}id", filter=uygulanabilir),
+    }
+
+
+def canli_skor_ekle(sirketler, bugun=None):
+    """
+    Sirket queryset'ine skoru yükümlülüklerden SQL'de hesaplayıp ekler ("canli_skor", 0–100)
+    + skor_ifadeleri sayaçları. Saklanan tablodan bağımsızdır: başka bir gün için
+    (bugun=...) veya tablo doğrulaması için kullanılır; canli_skor ile filter/order_by DB'de çalışır.
+    Okuma yollarında satırı olmayan / bayat şirketlerin yedeğidir (score_many, skor_ekle →
+    liste eşik filtresi, sıralama, sayfalama ve riskli şirketler sayfası).
+    """
+    return sirketler.annotate(**skor_ifadeleri(bugun or date.today())).annotate(
+        canli_skor=Greatest(Value(0), Least(Value(TAM_PUAN), "skor_ham"))
+    )
+
+
+# =========================
+# Baştan hesaplama
+# =========================
+
+def _upsert_sql():
+    tablo = SirketSkoru._meta.db_table
+    return (
+        f"INSERT INTO {tablo} (sirket_id, score, raw_score, open_obligations, overdue_obligations, "
+        f"total_obligations, computed_for, computed_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+        f"ON CONFLICT (sirket_id) DO UPDATE SET score = excluded.score, raw_score = excluded.raw_score, "
+        f"open_obligations = excluded.open_obligations, overdue_obligations = excluded.overdue_obligations, "
+        f"total_obligations = excluded.total_obligations, computed_for = excluded.computed_for, "
+        f"computed_at = excluded.computed_at"
+    )
+
+
+def _parcayi_yenile(sirketler, bugun, simdi) -> list:
+    """sirketler queryset'inin skorlarını tek GROUP BY sorgusuyla hesaplayıp yazar. Dönüş: şirket id'leri"""
+    rows = list(
+        sirketler.annotate(**skor_ifadeleri(bugun))
+        .values_list("pk", "skor_ham", "acik_yukumluluk", "geciken_yukumluluk", "toplam_yukumluluk")
+    )
+    if rows:
+        ops = connection.ops
+        gun = ops.adapt_datefield_value(bugun)
+        zaman = ops.adapt_datetimefield_value(simdi)
+        with connection.cursor() as cur:
+            cur.executemany(_upsert_sql(), [
+                (pk, sinirla(ham), ham, acik, geciken, toplam, gun, zaman)
+                for pk, ham, acik, geciken, toplam in rows
+            ])
+    return [r[0] for r in rows]
+
+
+def skorlari_yenile(sirket_ids=None, bugun=None) -> int:
+    """
+    Şirketlerin skor satırlarını yükümlülüklerinden baştan hesaplar (yoksa oluşturur).
+    sirket_ids=None → tüm şirketler. Var olmayan (silinmiş) şirket id'leri atlanır.
+    Dönüş: yazılan satır sayısı
+    """
+    bugun = bugun or date.today()
+    simdi = timezone.now()
+    yazilan = 0
+    if sirket_ids is None:
+        son_pk = 0
+        while True:
+            with transaction.atomic():
+                parca = _parcayi_yenile(
+                    Sirket.objects.filter(pk__gt=son_pk).order_by("pk")[:PARCA], bugun, simdi
+                )
+            if not parca:
+                break
+            son_pk = parca[-1]
+            yazilan += len(parca)
+        return yazilan
+
+    ids = sorted(set(sirket_ids))
+    for i in range(0, len(ids), PARCA):
+        with transaction.atomic():
+            yazilan += len(_parcayi_yenile(Sirket.objects.filter(pk__in=ids[i:i + PARCA]), bugun, simdi))
+    return yazilan
+
+
+def bos_skorlar_olustur(sirket_ids, bugun=None):
+    """Yükümlülüğü henüz olmayan (yeni) şirketler için 100 puanlık satır (varsa dokunmaz)."""
+    ops = connection.ops
+    gun = ops.adapt_datefield_value(bugun or date.today())
+    zaman = ops.adapt_datetimefield_value(timezone.now())
+    tablo = SirketSkoru._meta.db_table
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {tablo} (sirket_id, score, raw_score, open_obligations, overdue_obligations, "
+            f"total_obligations, computed_for, computed_at) VALUES (%s, {TAM_PUAN}, {TAM_PUAN}, 0, 0, 0, %s, %s) "
+            f"ON CONFLICT (sirket_id) DO NOTHING",
+            [(pk, gun, zaman) for pk in sirket_ids],
+        )
+
+
+# =========================
+# Artımlı güncelleme
+# =========================
+
+def _fark_sql():
+    tablo = SirketSkoru._meta.db_table
+    yeni = "raw_score + %s"
+    return (
+        f"UPDATE {tablo} SET "
+        f"score = CASE WHEN {yeni} < 0 THEN 0 WHEN {yeni} > {TAM_PUAN} THEN {TAM_PUAN} ELSE {yeni} END, "
+        f"raw_score = {yeni}, open_obligations = open_obligations + %s, "
+        f"overdue_obligations = overdue_obligations + %s, total_obligations = total_obligations + %s, "
+        f"computed_at = %s WHERE sirket_id = %s AND computed_for = %s"
+    )
+
+
+def farklari_uygula(farklar, bugun=None):
+    """
+    farklar: {sirket_id: Katki} — şirket başına toplam katkı farkı (yeni − eski).
+    Bugün için hesaplanmış satırlara tek UPDATE (executemany) ile eklenir; satırı
+    olmayan / eski günde kalmış şirketler (değişiklik yazıldıktan sonra) baştan hesaplanır.
+    Çağıran, yükümlülük değişikliğiyle aynı transaction içinde çağırmalı.
+    """
+    farklar = {pk: k for pk, k in farklar.items() if k != SIFIR}
+    if not farklar:
+        return
+    bugun = bugun or date.today()
+    ops = connection.ops
+    gun = ops.adapt_datefield_value(bugun)
+    zaman = ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cur:
+        # score ifadesi raw_score'un eski değerini kullanır (SQL'de SET'in sağ tarafı güncellemeden önceki satırı görür)
+        cur.executemany(_fark_sql(), [
+            (k.puan, k.puan, k.puan, k.puan, k.acik, k.geciken, k.toplam, zaman, pk, gun)
+            for pk, k in farklar.items()
+        ])
+        guncellenen = cur.rowcount
+    if guncellenen == len(farklar):
+        return
+
+    ids = list(farklar)
+    guncel = set()
+    for i in range(0, len(ids), PARCA):
+        guncel.update(SirketSkoru.objects.filter(
+            sirket_id__in=ids[i:i + PARCA], computed_for=bugun
+        ).values_list("sirket_id", flat=True))
+    skorlari_yenile([pk for pk in ids if pk not in guncel], bugun=bugun)
+
+
+def _etki_tipleri(duzenleme_ids) -> dict:
+    return dict(Duzenleme.objects.filter(pk__in=duzenleme_ids).values_list("pk", "impact_type"))
+
+
+def yukumluluk_kaydedildi(obl, onceki, yeni_mi: bool):
+    """
+    SirketObligation.save() sonrası skor farkı.
+    onceki: DB'den yüklendiği andaki skor alanları (SirketObligation.SKOR_ALANLARI) veya None.
+    """
+    bugun = date.today()
+    if not yeni_mi and (onceki is None or len(onceki) < len(obl.SKOR_ALANLARI)):
+        # Eski hali bilinmiyor (defer edilmiş alan vb.) → şirketi baştan hesapla
+        skorlari_yenile([obl.sirket_id], bugun=bugun)
+        return
+    if not yeni_mi and onceki["sirket_id"] != obl.sirket_id:
+        skorlari_yenile([onceki["sirket_id"], obl.sirket_id], bugun=bugun)
+        return
+
+    # Düzenleme nesnesi zaten yüklüyse etki tipi ondan, değilse tek sorgu
+    duzenleme_ids = {obl.duzenleme_id} | ({onceki["duzenleme_id"]} if onceki else set())
+    yuklu = obl._state.fields_cache.get("duzenleme")
+    if len(duzenleme_ids) == 1 and yuklu is not None and "impact_type" in yuklu.__dict__:
+        etkiler = {obl.duzenleme_id: yuklu.impact_type}
+    else:
+        etkiler = _etki_tipleri(duzenleme_ids)
+
+    yeni = katki(obl.is_applicable, obl.is_compliant, etkiler.get(obl.duzenleme_id),
+                 obl.risk_level, obl.due_date, bugun)
+    eski = SIFIR
+    if onceki:
+        eski = katki(onceki["is_applicable"], onceki["is_compliant"], etkiler.get(onceki["duzenleme_id"]),
+                     onceki["risk_level"], onceki["due_date"], bugun)
+    farklari_uygula({obl.sirket_id: yeni - eski}, bugun=bugun)
+
+
+def silinen_farklar(yukumlulukler, bugun=None) -> dict:
+    """
+    Silinecek yükümlülüklerin şirket başına skor farkı (SIFIR − toplam katkı):
+    skor_ifadeleri ile tek GROUP BY sorgusu (yükümlülük başına sorgu yok).
+    Dönüş: {sirket_id: Katki}; yükümlülüğü silinen her şirket yer alır (fark sıfır olsa da
+    dashboard listeleri değişir).
+    """
+    bugun = bugun or date.today()
+    satirlar = (
+        yukumlulukler.order_by().values("sirket_id").annotate(**skor_ifadeleri(bugun, onek=""))
+        .values_list("sirket_id", "skor_ham", "acik_yukumluluk", "geciken_yukumluluk", "toplam_yukumluluk")
+    )
+    return {pk: SIFIR - Katki(ham - TAM_PUAN, acik, geciken, toplam) for pk, ham, acik, geciken, toplam in satirlar}
+
+
+def toplu_silmede_mi(origin) -> bool:
+    """
+    Silme, yükümlülük başına post_delete alıcılarının atlayacağı bir toplu yoldan mı geliyor?
+    - şirket siliniyor (cascade): skor satırı da gider
+    - düzenleme siliniyor (cascade): duzenleme_siliniyor / duzenleme_silindi şirket başına bir kez uygular
+    - yükümlülük QuerySet.delete(): SirketObligationQuerySet.delete farkları tek seferde uygular
+    """
+    model = type(origin) if isinstance(origin, (Sirket, Duzenleme)) else getattr(origin, "model", None)
+    return model in (Sirket, Duzenleme, SirketObligation)
+
+
+def duzenleme_siliniyor(sender, instance, **kwargs):
+    """pre_delete (Duzenleme): cascade ile silinecek yükümlülüklerin şirket farkları (tek sorgu)."""
+    instance._silinen_farklar = silinen_farklar(SirketObligation.objects.filter(duzenleme_id=instance.pk))
+
+
+def duzenleme_silindi(sender, instance, **kwargs):
+    """post_delete (Duzenleme): yükümlülükler silindikten sonra farklar tek UPDATE ile."""
+    farklari_uygula(getattr(instance, "_silinen_farklar", {}))
+
+
+def yukumluluk_silindi(sender, instance, origin=None, **kwargs):
+    """
+    post_delete: silinen yükümlülüğün katkısı şirket skorundan düşülür (tek nesne delete()).
+    Toplu yollar (şirket / düzenleme cascade'i, QuerySet.delete()) atlanır: bkz. toplu_silmede_mi.
+    """
+    if toplu_silmede_mi(origin):
+        return
+    bugun = date.today()
+    etki = _etki_tipleri([instance.duzenleme_id]).get(instance.duzenleme_id)
+    eski = katki(instance.is_applicable, instance.is_compliant, etki, instance.risk_level, instance.due_date, bugun)
+    farklari_uygula({instance.sirket_id: SIFIR - eski}, bugun=bugun)
+
+
+# =========================
+# Okuma
+# =========================
+
+def skor_ekle(sirketler, bugun=None):
+    """
+    Sirket queryset'ine skoru "kayitli_skor" olarak ekler (score_many ile aynı değer):
+    - bugün için hesaplanmış saklanan satır varsa onun score kolonu
+    - satırı olmayan / eski günde kalmış şirketlerde canli_skor_ekle formülü
+      (ilişkili alt sorgu; CASE sadece bu satırlarda çalıştırır)
+    Eşik filtresi / sıralama / keyset sayfalama "kayitli_skor" üzerinden DB'de yapılır.
+    bugun istek anında verilmeli (modül seviyesinde kurulan queryset'te gün donar).
+    """
+    bugun = bugun or date.today()
+    canli = canli_skor_ekle(Sirket.objects.filter(pk=OuterRef("pk")), bugun=bugun).values("canli_skor")
+    return sirketler.annotate(kayitli_skor=Case(
+        When(skor__computed_for=bugun, then=F("skor__score")),
+        default=Subquery(canli[:1]),
+        output_field=IntegerField(),
+    ))
+
+
+def score_many(sirket_ids, bugun=None) -> dict:
+    """
+    Toplu skor servisi: view / serializer / template'ler tek tek hesapla_sirket_skoru
+    çağırmak yerine bunu kullanır (N+1 yok).
+    Dönüş: {sirket_id: {"score", "open_obligations", "overdue_obligations", "total_obligations"}}
+
+    - Bugün için hesaplanmış saklanan satırlar tek sorguda okunur (sadece skor kolonları)
+    - Satırı olmayan / eski günde kalmış şirketler için skor SQL'de (canli_skor_ekle)
+      tek GROUP BY sorgusuyla hesaplanır; yükümlülükler ve raw_text Python'a taşınmaz
+    Var olmayan id'ler sonuçta yer almaz.
+    """
+    bugun = bugun or date.today()
+    ids = list(dict.fromkeys(sirket_ids))
+    sonuc = {}
+    for i in range(0, len(ids), PARCA):
+        parca = ids[i:i + PARCA]
+        for pk, skor, acik, geciken, toplam in SirketSkoru.objects.filter(
+            sirket_id__in=parca, computed_for=bugun
+        ).values_list("sirket_id", "score", "open_obligations", "overdue_obligations", "total_obligations"):
+            sonuc[pk] = {"score": skor, "open_obligations": acik,
+                         "overdue_obligations": geciken, "total_obligations": toplam}
+
+        eksik = [pk for pk in parca if pk not in sonuc]
+        if eksik:
+            for pk, skor, acik, geciken, toplam in canli_skor_ekle(
+                Sirket.objects.filter(pk__in=eksik), bugun=bugun
+            ).values_list("pk", "canli_skor", "acik_yukumluluk", "geciken_yukumluluk", "toplam_yukumluluk"):
+                sonuc[pk] = {"score": skor, "open_obligations": acik,
+                             "overdue_obligations": geciken, "total_obligations": toplam}
+    return sonuc
+
+
+# =========================
+# Gece işi
+# =========================
+
+def gunluk_yenile(bugun=None) -> dict:
+    """
+    Tarih cezaları için günlük yenileme (gece çalıştırılır):
+    - dün için hesaplanmış satırlarda sadece sınırı geçen açık yükümlülüğü olan şirketler
+      yeniden hesaplanır (son tarihi dün olan → gecikmiş, bugün+7 olan → 7 gün penceresine girdi);
+      diğerlerinin skoru değişmez, sadece computed_for bugüne alınır
+    - daha eski günde kalmış ya da satırı hiç olmayan şirketler baştan hesaplanır
+    Dönüş: {"recomputed": ..., "carried": ...}
+    """
+    bugun = bugun or date.today()
+    dun = bugun - timedelta(days=1)
+
+    sinir = set(
+        SirketObligation.objects.filter(
+            is_applicable=True, is_compliant=False,
+            due_date__in=[dun, bugun + timedelta(days=YAKLASAN_GUN)],
+            sirket__skor__computed_for=dun,
+        ).values_list("sirket_id", flat=True).distinct()
+    )
+    eski = set(
+        Sirket.objects.exclude(skor__computed_for__in=[dun, bugun]).values_list("pk", flat=True)
+    )
+    yenilenen = skorlari_yenile(sinir | eski, bugun=bugun)
+    tasinan = SirketSkoru.objects.filter(computed_for=dun).update(computed_for=bugun)
+    return {"recomputed": yenilenen, "carried": tasinan}
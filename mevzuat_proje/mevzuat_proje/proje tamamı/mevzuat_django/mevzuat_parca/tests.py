@@ -1,8 +1,32 @@
 ﻿# Zaman hesapları için (due_date -1 gün gibi)
 from datetime import timedelta
 
+# Fonksiyonların çağrılıp çağrılmadığını izlemek için
+from unittest import mock
+
+# Geçici checkpoint dosyaları için
+import json
+import random
+import tempfile
+from pathlib import Path
+
+# Management command'ları testten çağırmak için
+from io import StringIO
+from django.core.management import call_command
+
+# Çekme motoru testleri için yerel (offline) HTTP sunucusu
+import os
+import shutil
+import threading
+from datetime import date
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from django.test import override_settings
+
 # Django test altyapısı
-from django.test import TestCase
+from django.db import IntegrityError, connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 
 # URL name’leriyle endpoint üretmek için
 from django.urls import reverse
@@ -14,10 +38,71 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 
 # Testte kullanılacak modeller
-from .models import Sirket, Duzenleme, SirketObligation
+from .models import Sirket, Duzenleme, SirketObligation, KaynakCheckpoint, KaynakSayfasi
 
 # Skor hesaplayan fonksiyonu direkt test edeceğiz
-from .views import hesapla_sirket_skoru
+from .views import build_dashboard_payload, hesapla_sirket_skoru
+
+# NLP kural motoru (DB'siz test edilebilir)
+from .nlp_rules import analyze_regulation_text
+
+# Toplu upsert + FTS arama (indeks senkron mu kontrolü için)
+from .toplu_yazma import duzenlemeleri_upsert
+from . import arama
+
+# Yakın kopya indeksi
+from .models import DuzenlemeImzasi
+
+# Yükümlülük eşleştirme motoru
+from .eslestirme import yukumlulukleri_uret, kuyruga_ekle, kuyrugu_isle, sayaclar
+from . import eslestirme
+from .models import AramaIndeksIsi, EslestirmeIsi, SirketSkoru
+from .skorlama import canli_skor_ekle, gunluk_yenile, score_many, skorlari_yenile
+from .serilestiriciler import SirketSerializer
+
+# Dashboard payload önbelleği
+from django.conf import settings
+from django.core.cache import caches
+from . import panel_onbellek
+from . import sayfalama
+from . import hizli_json
+from . import disa_aktarim
+from . import ice_aktarim
+from . import etiket_indeksi
+from .models import DuzenlemeEtiketi, DuzenlemeSektoru
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import CommandError
+import csv
+from .hizli_json import HizliJSONRenderer
+from .serilestiriciler import SatirEslemcisi
+from .skorlama import skor_ekle
+from datetime import datetime, timezone as dt_timezone
+from unittest import skipIf, skipUnless
+from django.http import JsonResponse
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+# Sıkıştırılmış raw_text saklama
+from .sikistirma import sikistirilmis_mi
+
+# Duzenleme trigger'ları: başka bağlantıdan yazma, tablo yeniden oluşunca post_migrate onarımı
+import sqlite3
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import models
+from django.test import TransactionTestCase
+
+# Tam sayı (issue) akışlı ayrıştırıcı
+from .ingestion.akis import dosya_parcalari, sayi_adaylari
+from .ingestion.sources import metinden_tarih
+
+
+# Sorgu bütçesi ölçen testlerde panel önbelleği süreç içi bellekte: varsayılan ortak backend
+# (DB tablosu) sorguları view'in kendi sorgularıyla karışmasın. Ortak backend: OrtakPanelOnbellekTests
+SUREC_ICI_PANEL = override_settings(CACHES={
+    **settings.CACHES,
+    "panel": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test-panel",
+              "OPTIONS": {"MAX_ENTRIES": 20000}},
+})
 
 
 # Test sınıfı: Django her testte ayrı bir test DB kurar (izole)
@@ -319,3 +404,2393 @@ class RegTechBasicTests(TestCase):
 
         # JSON payload’lar birebir aynı olmalı
         self.assertEqual(r1.json(), r2.json())
+
+
+# NLP kural motoru testleri: DB gerekmez → SimpleTestCase
+class NlpRulesTests(SimpleTestCase):
+
+    # ---------------------------------------
+    # 1) Kısaltmalar tam kelime olarak eşleşmeli ("bt" → "abtest" içinde değil)
+    # ---------------------------------------
+    def test_kisaltma_kelime_sinirina_bakar(self):
+        tags, sectors, _ = analyze_regulation_text("Abtest sonuçları ve KDV'nin beyanı")
+        self.assertNotIn("yazilim", sectors)
+        self.assertIn("KDV", tags)
+
+    # ---------------------------------------
+    # 2) Kelimeler Türkçe eklerle eşleşmeli, Türkçe büyük harf doğru küçültülmeli
+    # ---------------------------------------
+    def test_turkce_ek_ve_buyuk_harf(self):
+        tags, sectors, impact = analyze_regulation_text("İMALAT tesislerine İdari para cezaları uygulanır")
+        self.assertIn("imalat", sectors)
+        self.assertEqual(impact, "risk")
+
+    # ---------------------------------------
+    # 3) Çok kelimeli ifade satır sonu ile bölünse de bulunmalı
+    # ---------------------------------------
+    def test_cok_kelimeli_ifade_satir_sonu(self):
+        tags, _, _ = analyze_regulation_text("Katma değer\nvergisi oranları")
+        self.assertEqual(set(tags), {"vergi", "KDV"})
+
+    # ---------------------------------------
+    # 4) impact_type önceliği korunmalı: zorunlu > teşvik > risk
+    # ---------------------------------------
+    def test_impact_onceligi(self):
+        _, _, impact = analyze_regulation_text("Ceza riski var ama teşvik de var.")
+        self.assertEqual(impact, "opsiyonel_tesvik")
+
+        _, _, impact = analyze_regulation_text("Teşvik var, bildirim zorunludur.")
+        self.assertEqual(impact, "zorunlu")
+
+        self.assertEqual(analyze_regulation_text(""), ([], [], None))
+
+
+# Duzenleme.save() NLP önbelleği testleri
+class DuzenlemeNlpCacheTests(TestCase):
+
+    def setUp(self):
+        self.d = Duzenleme.objects.create(
+            source="gib",
+            title="KDV Tebliği",
+            publish_date=timezone.localdate(),
+            raw_text="Beyan zorunludur.",
+        )
+
+    # ---------------------------------------
+    # 1) Metin değişmeden kaydetmek analizi tekrar çalıştırmamalı
+    # ---------------------------------------
+    def test_metin_degismediyse_analiz_calismaz(self):
+        self.assertTrue(self.d.content_hash)
+        with mock.patch("mevzuat_parca.models.analyze_regulation_text") as m:
+            self.d.summary = "Yeni özet"
+            self.d.save()
+        m.assert_not_called()
+
+    # ---------------------------------------
+    # 2) raw_text değişince analiz çalışmalı ve önbellek yenilenmeli
+    # ---------------------------------------
+    def test_metin_degisince_analiz_calisir(self):
+        eski_hash = self.d.content_hash
+        self.d.raw_text = "Kargo firmalarına teşvik."
+        self.d.save()
+        self.assertNotEqual(self.d.content_hash, eski_hash)
+        self.assertEqual(self.d.nlp_result["sectors"], ["lojistik"])
+
+    # ---------------------------------------
+    # 3) Kural sürümü değişince analiz tekrar çalışmalı
+    # ---------------------------------------
+    def test_kural_surumu_degisince_analiz_calisir(self):
+        with mock.patch("mevzuat_parca.models.RULES_VERSION", "yeni-surum"):
+            self.d.save()
+        self.assertEqual(self.d.nlp_version, "yeni-surum")
+
+    # ---------------------------------------
+    # 3b) NLP önbellek kolonları API yanıtlarında yok (liste, detay, oluşturma)
+    # ---------------------------------------
+    def test_nlp_onbellegi_api_yanitinda_yok(self):
+        ic_alanlar = {"content_hash", "nlp_version", "nlp_result"}
+        api = APIClient()
+        yeni = api.post(reverse("Duzenleme-list-create"), {
+            "source": "gib", "title": "ÖTV Tebliği", "publish_date": "2025-12-01", "raw_text": "Beyan zorunludur.",
+        }, format="json")
+        self.assertEqual(yeni.status_code, 201)
+        yanitlar = [
+            yeni.json(),
+            *api.get(reverse("Duzenleme-list-create")).json(),
+            api.get(reverse("Duzenleme-detail", args=[self.d.pk])).json(),
+        ]
+        for yanit in yanitlar:
+            self.assertIn("tags", yanit)
+            self.assertFalse(ic_alanlar & set(yanit), yanit)
+
+    # ---------------------------------------
+    # 4) Boşaltılan tags önbellekteki sonuçtan tekrar dolmalı
+    # ---------------------------------------
+    def test_bos_tags_onbellekten_dolar(self):
+        self.d.tags = []
+        with mock.patch("mevzuat_parca.models.analyze_regulation_text") as m:
+            self.d.save(update_fields=["tags"])
+        m.assert_not_called()
+        self.d.refresh_from_db()
+        self.assertIn("KDV", self.d.tags)
+
+
+# reclassify_duzenlemeler komutu testleri
+class ReclassifyCommandTests(TestCase):
+
+    def setUp(self):
+        # Kayıtları oluştur, sonra "eski kurallarla analiz edilmiş" gibi göster
+        self.kdv = Duzenleme.objects.create(
+            source="gib", title="KDV", publish_date=timezone.localdate(), raw_text="Beyan zorunludur.",
+        )
+        self.elle = Duzenleme.objects.create(
+            source="gib", title="Elle", publish_date=timezone.localdate(),
+            raw_text="Kargo teşvik.", tags=["ozel_etiket"],
+        )
+        Duzenleme.objects.update(nlp_version="eski", nlp_result={"tags": [], "sectors": [], "impact_type": None})
+        Duzenleme.objects.filter(pk=self.kdv.pk).update(tags=[], sectors=[], impact_type=None)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint = Path(self.tmp.name) / "cp.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def calistir(self, **kwargs):
+        out = StringIO()
+        call_command("reclassify_duzenlemeler", checkpoint=str(self.checkpoint), stdout=out, **kwargs)
+        return out.getvalue()
+
+    # ---------------------------------------
+    # 1) Eski sürümlü kayıtlar yeniden etiketlenmeli, elle girilen tags korunmalı
+    # ---------------------------------------
+    def test_yeniden_siniflandirir_elle_girileni_korur(self):
+        out = self.calistir(workers=1, batch_size=1)
+        self.assertIn("kayıt/sn", out)
+
+        self.kdv.refresh_from_db()
+        self.elle.refresh_from_db()
+        self.assertIn("KDV", self.kdv.tags)
+        self.assertEqual(self.kdv.impact_type, "zorunlu")
+        self.assertEqual(self.elle.tags, ["ozel_etiket"])
+        self.assertEqual(self.elle.sectors, ["lojistik"])
+        self.assertFalse(self.checkpoint.exists())
+
+    # ---------------------------------------
+    # 2) --dry-run veritabanına yazmamalı
+    # ---------------------------------------
+    def test_dry_run_yazmaz(self):
+        self.calistir(workers=1, dry_run=True)
+        self.kdv.refresh_from_db()
+        self.assertEqual(self.kdv.tags, [])
+        self.assertEqual(self.kdv.nlp_version, "eski")
+
+    # ---------------------------------------
+    # 3) --resume checkpoint'teki pk'dan sonrasını işlemeli
+    # ---------------------------------------
+    def test_resume_checkpointten_devam_eder(self):
+        from mevzuat_parca.nlp_rules import RULES_VERSION
+
+        self.checkpoint.write_text(json.dumps({"last_pk": self.kdv.pk, "rules_version": RULES_VERSION}))
+        self.calistir(workers=1, resume=True)
+
+        self.kdv.refresh_from_db()
+        self.elle.refresh_from_db()
+        self.assertEqual(self.kdv.nlp_version, "eski")
+        self.assertEqual(self.elle.nlp_version, RULES_VERSION)
+
+    # ---------------------------------------
+    # 4) Süreç havuzu (workers=2) ile de aynı sonuç
+    # ---------------------------------------
+    def test_process_pool_ile_calisir(self):
+        self.calistir(workers=2, batch_size=1)
+        self.kdv.refresh_from_db()
+        self.assertIn("KDV", self.kdv.tags)
+
+
+# FTS5 tam metin arama testleri
+class DuzenlemeSearchTests(TestCase):
+
+    def setUp(self):
+        self.api = APIClient()
+        self.ihracat = Duzenleme.objects.create(
+            source="resmi_gazete",
+            title="İhracatçılara Destek Tebliği",
+            publish_date=timezone.localdate(),
+            raw_text="Bu tebliğ ile ihracatçı şirketlerin <belge> süreleri uzatılmıştır.",
+        )
+        self.kvkk = Duzenleme.objects.create(
+            source="gib",
+            title="Kişisel Veri Yönetmeliği",
+            publish_date=timezone.localdate(),
+            raw_text="Veri sorumlusu ihracat verilerini de korur.",
+        )
+
+    def ara(self, q):
+        return self.api.get(reverse("Duzenleme-search"), {"q": q}).json()
+
+    # ---------------------------------------
+    # 1) Türkçe harf duyarsız, önek ve sıralı (başlık eşleşmesi önde)
+    # ---------------------------------------
+    def test_turkce_katlama_ve_siralama(self):
+        data = self.ara("IHRACATCI")
+        ids = [r["id"] for r in data["results"]]
+        self.assertEqual(ids, [self.ihracat.id])
+
+        data = self.ara("ihracat")
+        ids = [r["id"] for r in data["results"]]
+        self.assertEqual(ids, [self.ihracat.id, self.kvkk.id])
+        self.assertEqual(data["count"], 2)
+
+    # ---------------------------------------
+    # 2) Snippet eşleşmeyi <mark> ile işaretler ve HTML kaçışlar
+    # ---------------------------------------
+    def test_snippet_vurgulu_ve_kacisli(self):
+        snippet = self.ara("sirket")["results"][0]["snippet"]
+        self.assertIn("<mark>şirketlerin</mark>", snippet)
+        self.assertIn("&lt;belge&gt;", snippet)
+
+    # ---------------------------------------
+    # 3) İndeks update ve delete ile senkron kalır
+    # ---------------------------------------
+    def test_indeks_update_delete_senkron(self):
+        self.kvkk.raw_text = "Lojistik firmaları"
+        self.kvkk.save()
+        self.assertEqual([r["id"] for r in self.ara("ihracat")["results"]], [self.ihracat.id])
+        self.assertEqual([r["id"] for r in self.ara("lojistik")["results"]], [self.kvkk.id])
+
+        self.ihracat.delete()
+        self.assertEqual(self.ara("ihracat")["count"], 0)
+
+    # ---------------------------------------
+    # 4) q zorunlu; FTS sözdizimi kullanıcıdan enjekte edilemez
+    # ---------------------------------------
+    def test_bos_ve_ozel_karakterli_sorgu(self):
+        res = self.api.get(reverse("Duzenleme-search"))
+        self.assertEqual(res.status_code, 400)
+        # "OR" operatör değil düz kelime olarak aranır → hata yok, eşleşme yok
+        res = self.api.get(reverse("Duzenleme-search"), {"q": '"ihracat" OR *'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["count"], 0)
+
+    # ---------------------------------------
+    # 5) Admin araması aynı indeksi kullanır
+    # ---------------------------------------
+    def test_admin_aramasi_fts_kullanir(self):
+        from django.contrib.admin.sites import site
+
+        model_admin = site._registry[Duzenleme]
+        qs, _ = model_admin.get_search_results(None, Duzenleme.objects.all(), "kisisel")
+        self.assertEqual(list(qs), [self.kvkk])
+
+
+class DuzenlemeUpsertTests(TestCase):
+
+    def aday(self, i, metin="Genel duyuru metni.", **ek):
+        return {
+            "source": "resmi_gazete",
+            "title": f"Tebliğ {i}",
+            "publish_date": date(2025, 12, 20),
+            "url": f"https://example.org/{i}",
+            "raw_text": metin,
+            **ek,
+        }
+
+    # ---------------------------------------
+    # 1) Doğal anahtar DB'de benzersiz olmalı
+    # ---------------------------------------
+    def test_dogal_anahtar_unique(self):
+        Duzenleme.objects.create(**self.aday(1))
+        with self.assertRaises(IntegrityError):
+            Duzenleme.objects.bulk_create([Duzenleme(**self.aday(1))])
+
+    # ---------------------------------------
+    # 2) Eklenen / güncellenen / değişmeyen sayıları + batch başına sabit sorgu
+    # ---------------------------------------
+    def test_upsert_sayilari_ve_sorgu_sayisi(self):
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = duzenlemeleri_upsert([self.aday(i) for i in range(60)], batch_size=30)
+        self.assertEqual(sonuc, {"inserted": 60, "updated": 0, "unchanged": 0, "duplicates": 0, "obligations": 0})
+        # batch başına sabit: SELECT + INSERT ... ON CONFLICT + kopya indeksi
+        # (bant/imza okuma-yazma) + savepoint açma/kapama; satır sayısından bağımsız
+        # + FTS kuyruğu (var mı, al, eskileri indeksten sil, güncel hali oku, ekle)
+        # + çağrı başına bir kez şirket indeksi (yükümlülük eşleştirme; şirket yoksa başka sorgu yok)
+        self.assertLessEqual(len(ctx.captured_queries), 2 * (8 + 5) + 1)
+
+        adaylar = [self.aday(i) for i in range(60)]
+        adaylar[5] = self.aday(5, metin="İhracatçı firmalar için KDV iadesi zorunludur.")
+        adaylar.append(self.aday(60))
+        sonuc = duzenlemeleri_upsert(adaylar)
+        self.assertEqual(sonuc, {"inserted": 1, "updated": 1, "unchanged": 59, "duplicates": 0, "obligations": 0})
+        self.assertEqual(Duzenleme.objects.count(), 61)
+
+        # Güncellenen kayıtta NLP yeniden çalışmış olmalı
+        d = Duzenleme.objects.get(title="Tebliğ 5")
+        self.assertIn("KDV", d.tags)
+        self.assertEqual(d.impact_type, "zorunlu")
+
+    # ---------------------------------------
+    # 3) Güncellemede elle girilen alan korunmalı, FTS indeksi güncellenmeli
+    # ---------------------------------------
+    def test_elle_girilen_korunur_fts_guncel(self):
+        duzenlemeleri_upsert([self.aday(1, metin="KDV iadesi.")])
+        Duzenleme.objects.filter(title="Tebliğ 1").update(impact_type="risk")
+
+        sonuc = duzenlemeleri_upsert([self.aday(1, metin="KDV iadesi zorunludur, ihracatçı firmalar.")])
+        self.assertEqual(sonuc["updated"], 1)
+
+        d = Duzenleme.objects.get(title="Tebliğ 1")
+        self.assertEqual(d.impact_type, "risk")
+        self.assertEqual(arama.ara("ihracatci")[1][0][0], d.id)
+
+
+# Yakın kopya testleri için uzun (MIN_KELIME üstü) düzenleme metni
+KDV_METNI = " ".join(
+    f"Madde {i} - Katma değer vergisi iade talepleri için ihracatçı mükellefler "
+    f"{i}. fıkrada belirtilen belgeleri elektronik ortamda sunar."
+    for i in range(1, 8)
+)
+SGK_METNI = " ".join(
+    f"Madde {i} - Sosyal güvenlik prim teşvikinden yararlanan işverenler "
+    f"{i}. bentteki bildirgeleri süresi içinde verir."
+    for i in range(1, 8)
+)
+
+
+class YakinKopyaTests(TestCase):
+
+    def aday(self, source, title, metin):
+        return {"source": source, "title": title, "publish_date": date(2025, 12, 20), "raw_text": metin}
+
+    # ---------------------------------------
+    # 1) Farklı kaynakta küçük değişiklikle yayımlanan kopya asıl kayda bağlanmalı
+    # ---------------------------------------
+    def test_kaynaklar_arasi_kopya_baglanir(self):
+        duzenlemeleri_upsert([self.aday("resmi_gazete", "KDV Tebliği", KDV_METNI)])
+        sonuc = duzenlemeleri_upsert([
+            self.aday("gib", "KDV Genel Uygulama Tebliği (GİB)", KDV_METNI.replace("Madde 7", "MADDE 7 (Değişik)")),
+            self.aday("gib", "SGK Prim Teşviki", SGK_METNI),
+        ])
+        self.assertEqual(sonuc["duplicates"], 1)
+
+        asil = Duzenleme.objects.get(source="resmi_gazete")
+        kopya = Duzenleme.objects.get(title__startswith="KDV Genel")
+        self.assertEqual(kopya.duplicate_of, asil)
+        self.assertIsNone(Duzenleme.objects.get(title="SGK Prim Teşviki").duplicate_of)
+
+        # Metin tamamen değişirse bağ kaldırılır
+        duzenlemeleri_upsert([self.aday("gib", "KDV Genel Uygulama Tebliği (GİB)", SGK_METNI.upper())])
+        kopya.refresh_from_db()
+        self.assertIsNone(kopya.duplicate_of)
+
+    # ---------------------------------------
+    # 2) Mevcut kayıtlar: komut kopyayı bağlar, yükümlülükler asıl kayda toplanır,
+    #    ikinci çalıştırma hiçbir şeyi tekrar imzalamaz
+    # ---------------------------------------
+    def test_komut_yukumlulukleri_birlestirir_ve_artimli(self):
+        asil = Duzenleme.objects.create(**self.aday("resmi_gazete", "KDV Tebliği", KDV_METNI))
+        kopya = Duzenleme.objects.create(**self.aday("gib", "KDV Tebliği (GİB)", KDV_METNI))
+        s1 = Sirket.objects.create(name="A", sector="yazilim", employee_count=5, location_city="İzmir")
+        s2 = Sirket.objects.create(name="B", sector="imalat", employee_count=50, location_city="Bursa")
+        SirketObligation.objects.create(sirket=s1, duzenleme=asil)
+        SirketObligation.objects.create(sirket=s1, duzenleme=kopya)
+        SirketObligation.objects.create(sirket=s2, duzenleme=kopya, is_compliant=True)
+
+        out = StringIO()
+        call_command("index_duplicates", stdout=out)
+        self.assertIn("2 indekslendi, 1 bağlandı", out.getvalue())
+
+        kopya.refresh_from_db()
+        self.assertEqual(kopya.duplicate_of, asil)
+        self.assertFalse(SirketObligation.objects.filter(duzenleme=kopya).exists())
+        self.assertEqual(
+            sorted(SirketObligation.objects.filter(duzenleme=asil).values_list("sirket__name", "is_compliant")),
+            [("A", False), ("B", True)],
+        )
+        self.assertEqual(DuzenlemeImzasi.objects.count(), 2)
+
+        out = StringIO()
+        call_command("index_duplicates", stdout=out)
+        self.assertIn("0 indekslendi", out.getvalue())
+
+
+@SUREC_ICI_PANEL
+class YukumlulukEslestirmeTests(TestCase):
+
+    def setUp(self):
+        self.yazilim = Sirket.objects.create(name="Yazılım A.Ş.", sector="yazilim", employee_count=5, location_city="İzmir")
+        self.imalatci = Sirket.objects.create(
+            name="İmalat A.Ş.", sector="imalat", employee_count=50, location_city="Bursa", is_exporter=True
+        )
+        self.kargocu = Sirket.objects.create(
+            name="Kargo A.Ş.", sector="lojistik", employee_count=20, location_city="Mersin", is_exporter=True
+        )
+
+    def duzenleme(self, title, sectors=(), tags=(), impact_type=None, **ek):
+        return Duzenleme.objects.create(
+            source="gib", title=title, publish_date=date(2025, 12, 20), raw_text="Duyuru.",
+            sectors=list(sectors), tags=list(tags), impact_type=impact_type, **ek
+        )
+
+    def ciftler(self):
+        return set(SirketObligation.objects.values_list("duzenleme__title", "sirket__name", "risk_level"))
+
+    # ---------------------------------------
+    # 1) Sektör / ihracat bayrağı kuralları, kopya ve genel düzenleme atlanır, tekrar çalışınca ekleme yok
+    # ---------------------------------------
+    def test_kurallar_ve_tekrar_calistirma(self):
+        bt = self.duzenleme("BT Tebliği", sectors=["yazilim"], impact_type="zorunlu")
+        self.duzenleme("İhracat Desteği", tags=["ihracat"], impact_type="opsiyonel_tesvik")
+        self.duzenleme("İmalat İhracatı", sectors=["imalat", "perakende"], tags=["vergi", "ihracat"])
+        self.duzenleme("Genel KDV Duyurusu", tags=["vergi", "KDV"])
+        self.duzenleme("BT Tebliği (GİB)", sectors=["yazilim"], duplicate_of=bt)
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = yukumlulukleri_uret()
+        # şirket indeksi + düzenleme sayfası (+ boş sayfa) + mevcut çiftler + insert + skor farkı (+ savepoint)
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+        self.assertEqual(sonuc, {"companies": 3, "regulations": 4, "created": 4, "existing": 0})
+        self.assertEqual(self.ciftler(), {
+            ("BT Tebliği", "Yazılım A.Ş.", "high"),
+            ("İhracat Desteği", "İmalat A.Ş.", "low"),
+            ("İhracat Desteği", "Kargo A.Ş.", "low"),
+            ("İmalat İhracatı", "İmalat A.Ş.", "medium"),
+        })
+
+        # Elle kapatılmış / tamamlanmış yükümlülük korunur, çift satır oluşmaz
+        SirketObligation.objects.filter(sirket=self.kargocu).update(is_applicable=False)
+        sonuc = yukumlulukleri_uret()
+        self.assertEqual((sonuc["created"], sonuc["existing"]), (0, 4))
+        self.assertEqual(SirketObligation.objects.filter(is_applicable=False).count(), 1)
+
+    # ---------------------------------------
+    # 2) Yeni şirket (API) ve yeni düzenleme (upsert) otomatik eşleşir
+    # ---------------------------------------
+    def test_yeni_sirket_ve_yeni_duzenleme_eslesir(self):
+        self.duzenleme("BT Tebliği", sectors=["yazilim"])
+        self.duzenleme("İhracat Desteği", tags=["ihracat"])
+
+        resp = APIClient().post(
+            "/api/companies/",
+            {"name": "Yeni Yazılım", "sector": "yazilim", "employee_count": 3,
+             "location_city": "Ankara", "is_exporter": True},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(
+            sorted(SirketObligation.objects.filter(sirket_id=resp.data["id"]).values_list("duzenleme__title", flat=True)),
+            ["BT Tebliği", "İhracat Desteği"],
+        )
+
+        sonuc = duzenlemeleri_upsert([{
+            "source": "resmi_gazete", "title": "Kargo Taşımacılığı Yönetmeliği",
+            "publish_date": date(2025, 12, 21), "raw_text": "Kargo firmaları kayıt yaptırmak zorundadır.",
+        }])
+        self.assertEqual(sonuc["obligations"], 1)
+        self.assertTrue(SirketObligation.objects.filter(
+            sirket=self.kargocu, duzenleme__title="Kargo Taşımacılığı Yönetmeliği"
+        ).exists())
+
+        # Elle (ORM ile) eklenen düzenleme kuyruk işlenene kadar eşleşmez; komut eksiği tamamlar
+        out = StringIO()
+        call_command("match_obligations", "--company", str(self.kargocu.pk), stdout=out)
+        self.assertIn("1 yükümlülük eklendi, 1 zaten vardı", out.getvalue())
+
+
+@SUREC_ICI_PANEL
+class YenidenEslestirmeTests(TestCase):
+
+    def setUp(self):
+        self.bt = Duzenleme.objects.create(
+            source="gib", title="BT Tebliği", publish_date=date(2025, 12, 20), raw_text="Duyuru.",
+            sectors=["yazilim"], impact_type="zorunlu",
+        )
+        self.imalat = Duzenleme.objects.create(
+            source="gib", title="İmalat Tebliği", publish_date=date(2025, 12, 20), raw_text="Duyuru.",
+            sectors=["imalat"],
+        )
+        self.sirket = Sirket.objects.create(name="Değişen A.Ş.", sector="yazilim", employee_count=5, location_city="İzmir")
+        # Yeni kayıtlar kuyruğa girdi; testte on_commit çalışmadığı için elle işlenir
+        self.assertEqual(kuyrugu_isle()["jobs"], 3)
+
+    def durumlar(self):
+        return set(SirketObligation.objects.filter(sirket=self.sirket).values_list(
+            "duzenleme__title", "is_applicable", "match_state"
+        ))
+
+    def test_api_ile_olusturma_bir_kez_eslestirir(self):
+        # POST satır içi eşleştirir; aynı şirket ayrıca kuyruğa girmez (iki kez eşleştirilmez)
+        resp = APIClient().post("/api/companies/", {
+            "name": "Yeni Yazılım A.Ş.", "sector": "yazilim", "employee_count": 3, "location_city": "Van",
+        }, format="json")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(set(SirketObligation.objects.filter(sirket_id=resp.data["id"]).values_list(
+            "duzenleme__title", "match_state")), {("BT Tebliği", "matched")})
+        self.assertFalse(EslestirmeIsi.objects.exists())
+        self.assertEqual(kuyrugu_isle()["jobs"], 0)
+        self.assertEqual(resp.data["compliance_score"], 78)
+
+    # ---------------------------------------
+    # 1) Sektör değişince fark uygulanır, geri alınınca kapanan yükümlülük yeniden açılır;
+    #    elle açılmış yükümlülüğe dokunulmaz
+    # ---------------------------------------
+    def test_sektor_degisimi_farki(self):
+        genel = Duzenleme.objects.create(
+            source="gib", title="Genel Duyuru", publish_date=date(2025, 12, 20), raw_text="Duyuru.",
+        )
+        SirketObligation.objects.create(sirket=self.sirket, duzenleme=genel)
+        self.assertEqual(self.durumlar(), {
+            ("BT Tebliği", True, "matched"), ("Genel Duyuru", True, "manual"),
+        })
+
+        # İlgisiz alan değişikliği kuyruğa girmez
+        EslestirmeIsi.objects.all().delete()
+        self.sirket.employee_count = 6
+        self.sirket.save()
+        self.assertFalse(EslestirmeIsi.objects.exists())
+
+        self.sirket.sector = "imalat"
+        self.sirket.save()
+        self.assertEqual(kuyrugu_isle(), {"jobs": 1, "added": 1, "deactivated": 1, "reactivated": 0})
+        self.assertEqual(self.durumlar(), {
+            ("BT Tebliği", False, "unmatched"), ("İmalat Tebliği", True, "matched"), ("Genel Duyuru", True, "manual"),
+        })
+
+        # API'den geri alma (istek thread'i sadece kuyruğa yazar)
+        resp = APIClient().patch(f"/api/companies/{self.sirket.pk}/", {"sector": "yazilim"}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(EslestirmeIsi.objects.count(), 1)
+        self.assertEqual(kuyrugu_isle(), {"jobs": 1, "added": 0, "deactivated": 1, "reactivated": 1})
+        self.assertEqual(self.durumlar(), {
+            ("BT Tebliği", True, "matched"), ("İmalat Tebliği", False, "unmatched"), ("Genel Duyuru", True, "manual"),
+        })
+        self.assertEqual(kuyrugu_isle()["jobs"], 0)
+
+    # ---------------------------------------
+    # 2) Düzenlemenin sektörü düzeltilince sadece o düzenlemenin eşleşmeleri değişir
+    # ---------------------------------------
+    def test_duzenleme_sektor_duzeltmesi(self):
+        onceki = sayaclar()
+        self.imalat.sectors = ["imalat", "yazilim"]
+        self.imalat.save()
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = kuyrugu_isle()
+        self.assertEqual(sonuc, {"jobs": 1, "added": 1, "deactivated": 0, "reactivated": 0})
+        # iş listesi + şirket indeksi + düzenleme sayfası (+ boş) + mevcut + insert + skor farkı
+        # + etkilenen şirketlerin skor yenilemesi (4) + silme (+ savepoint'ler)
+        self.assertLessEqual(len(ctx.captured_queries), 19)
+        self.assertIn(("İmalat Tebliği", True, "matched"), self.durumlar())
+
+        simdi = sayaclar()
+        self.assertEqual(simdi["added"] - onceki["added"], 1)
+        self.assertEqual(simdi["runs"] - onceki["runs"], 1)
+        self.assertEqual(simdi["queued"], 0)
+
+    # ---------------------------------------
+    # 3) İşlenirken tekrar değişen nesnenin işi silinmez (sonraki turda güncel haliyle işlenir)
+    # ---------------------------------------
+    def test_islenirken_degisen_is_kuyrukta_kalir(self):
+        self.sirket.sector = "imalat"
+        self.sirket.save()
+        asil = eslestirme.sirketleri_yeniden_eslestir
+
+        def arada_degistir(ids):
+            delta = asil(ids)
+            Sirket.objects.filter(pk=self.sirket.pk).update(sector="yazilim")
+            kuyruga_ekle("sirket", [self.sirket.pk])
+            return delta
+
+        with mock.patch.object(eslestirme, "sirketleri_yeniden_eslestir", side_effect=arada_degistir):
+            kuyrugu_isle()
+        self.assertEqual(EslestirmeIsi.objects.get().version, 2)
+
+        self.assertEqual(kuyrugu_isle(), {"jobs": 1, "added": 0, "deactivated": 1, "reactivated": 1})
+        self.assertFalse(EslestirmeIsi.objects.exists())
+        self.assertIn(("BT Tebliği", True, "matched"), self.durumlar())
+
+
+@SUREC_ICI_PANEL
+class SirketSkoruTests(TestCase):
+
+    def setUp(self):
+        self.bugun = date.today()
+        self.duzenlemeler = [
+            Duzenleme.objects.create(
+                source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 12, 20), raw_text="Duyuru.",
+                impact_type=etki,
+            )
+            for i, etki in enumerate(["zorunlu", "risk", "opsiyonel_tesvik", None, "zorunlu", "opsiyonel_tesvik"])
+        ]
+        self.sirketler = [
+            Sirket.objects.create(name=f"Şirket {i}", sector="imalat", employee_count=5, location_city="Bursa")
+            for i in range(4)
+        ]
+
+    def skorlar_tutarli(self):
+        """Saklanan her skor satırı, baştan hesaplanan (hesapla_sirket_skoru) ile aynı mı?"""
+        for sirket in self.sirketler:
+            beklenen = hesapla_sirket_skoru(sirket)
+            satir = SirketSkoru.objects.get(sirket=sirket)
+            self.assertEqual(
+                (satir.score, satir.open_obligations, satir.overdue_obligations, satir.total_obligations),
+                (beklenen["score"], beklenen["stats"]["open_obligations"],
+                 beklenen["stats"]["overdue_obligations"], beklenen["stats"]["total_obligations"]),
+                sirket.name,
+            )
+
+    # ---------------------------------------
+    # 1) Oluşturma / API ve form ile değiştirme / silme sonrası saklanan skor baştan hesapla aynı
+    # ---------------------------------------
+    def test_artimli_guncelleme_tam_hesapla_ayni(self):
+        rnd = random.Random(7)
+        for sirket in self.sirketler:
+            for d in rnd.sample(self.duzenlemeler, rnd.randint(2, 6)):
+                gun = rnd.choice([None, -3, -1, 0, 1, 7, 8, 30])
+                SirketObligation.objects.create(
+                    sirket=sirket, duzenleme=d, is_applicable=rnd.random() < 0.85,
+                    is_compliant=rnd.random() < 0.3, risk_level=rnd.choice(["low", "medium", "high"]),
+                    due_date=None if gun is None else self.bugun + timedelta(days=gun),
+                )
+        self.skorlar_tutarli()
+
+        api = APIClient()
+        ids = list(SirketObligation.objects.values_list("id", flat=True))
+        for pk in rnd.sample(ids, 6):
+            resp = api.patch(f"/api/obligations/{pk}/status/", {"is_compliant": rnd.random() < 0.5}, format="json")
+            self.assertEqual(resp.status_code, 200)
+            # Dönen dashboard skoru da tabloyla aynı
+            self.assertEqual(resp.data["uyum_skoru"], SirketSkoru.objects.get(sirket_id=resp.data["sirket"]["id"]).score)
+        for pk in rnd.sample(ids, 3):
+            self.client.post(reverse("obligation-complete", args=[pk]))
+        for pk in rnd.sample(ids, 3):
+            self.client.post(reverse("obligation-reset", args=[pk]))
+        self.skorlar_tutarli()
+
+        # Tek silme, QuerySet.delete() ve düzenleme silinince cascade
+        SirketObligation.objects.get(pk=ids[0]).delete()
+        SirketObligation.objects.filter(pk__in=ids[1:4]).delete()
+        self.duzenlemeler[0].delete()
+        self.skorlar_tutarli()
+
+        # Şirket silinince skor satırı da gider (cascade sırasında skor yeniden yazılmaz)
+        self.sirketler.pop().delete()
+        self.assertEqual(SirketSkoru.objects.count(), 3)
+
+    # ---------------------------------------
+    # 2) Liste endpoint'leri saklanan skoru okur, eşik ve sıralama SQL'de
+    # ---------------------------------------
+    def test_liste_saklanan_skora_gore_filtreler_ve_siralar(self):
+        cezalar = {0: ["zorunlu", "risk"], 1: ["zorunlu"], 2: []}
+        for i, etkiler in cezalar.items():
+            for d in self.duzenlemeler:
+                if d.impact_type in etkiler:
+                    SirketObligation.objects.create(sirket=self.sirketler[i], duzenleme=d, risk_level="high")
+        # zorunlu: 15+7, risk: 10+7 → Şirket 0: 100-22*2-17 = 39, Şirket 1: 56, diğerleri 100
+
+        # liste + ETag doğrulayıcısı (skor tablosu aggregate'i)
+        with self.assertNumQueries(2):
+            resp = APIClient().get("/api/companies/?ordering=score")
+        self.assertEqual(
+            [(r["name"], r["compliance_score"]) for r in resp.json()],
+            [("Şirket 0", 39), ("Şirket 1", 56), ("Şirket 3", 100), ("Şirket 2", 100)],
+        )
+
+        with self.assertNumQueries(2):
+            resp = APIClient().get("/api/companies/?risky=true&threshold=50")
+        self.assertEqual([r["name"] for r in resp.json()], ["Şirket 0"])
+
+        resp = self.client.get(reverse("sirket-riskli-list-page") + "?max_score=60")
+        self.assertEqual([item["score"] for item in resp.context["sirketler"]], [39, 56])
+
+    # ---------------------------------------
+    # 1b) Düzenleme cascade'i / QuerySet.delete(): sorgu sayısı silinen yükümlülük sayısından bağımsız
+    # ---------------------------------------
+    def test_toplu_silme_sabit_sorgu(self):
+        for i in range(4, 60):
+            self.sirketler.append(Sirket.objects.create(name=f"Şirket {i}", sector="imalat", employee_count=5,
+                                                        location_city="Bursa"))
+        silinecek, kalan = self.duzenlemeler[0], self.duzenlemeler[1]
+        for i, sirket in enumerate(self.sirketler):
+            for d in (silinecek, kalan, self.duzenlemeler[2]):
+                SirketObligation.objects.create(
+                    sirket=sirket, duzenleme=d, is_compliant=i % 3 == 0, risk_level=["low", "high"][i % 2],
+                    due_date=self.bugun + timedelta(days=i % 12 - 4),
+                )
+        # Bir şirketin skor satırı bayat: silme sonrası baştan hesaplanır
+        SirketSkoru.objects.filter(sirket=self.sirketler[5]).update(computed_for=self.bugun - timedelta(days=1))
+        url = reverse("Sirket-dashboard", args=[self.sirketler[7].pk])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            silinecek.delete()
+        # yükümlülükleri oku + farklar (tek GROUP BY) + cascade DELETE'leri + tek skor UPDATE'i
+        # + bayat şirketin baştan hesabı (60 yükümlülük için 60 fark sorgusu değil)
+        self.assertLessEqual(len(ctx.captured_queries), 15)
+        self.skorlar_tutarli()
+        self.assertEqual(self.client.get(url).json()["stats"]["total_obligations"], 2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            SirketObligation.objects.filter(duzenleme=kalan, sirket__in=self.sirketler[:40]).delete()
+        # SAVEPOINT + farklar + yükümlülükleri oku + DELETE + tek skor UPDATE'i + RELEASE
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.skorlar_tutarli()
+        self.assertEqual(self.client.get(url).json()["stats"]["total_obligations"], 1)
+
+    # ---------------------------------------
+    # 2b) Bayat / eksik saklanan satır: her okuma yolu dashboard ile aynı skoru verir
+    # ---------------------------------------
+    def test_bayat_satir_okumalarda_kullanilmaz(self):
+        for d in self.duzenlemeler[:2]:
+            SirketObligation.objects.create(sirket=self.sirketler[0], duzenleme=d, risk_level="high")
+        SirketObligation.objects.create(sirket=self.sirketler[1], duzenleme=self.duzenlemeler[0])
+        # Gece işi çalışmamış gibi: dünden kalmış (yanlış) satırlar + hiç yazılmamış satır
+        SirketSkoru.objects.update(computed_for=self.bugun - timedelta(days=1), score=0)
+        SirketSkoru.objects.filter(sirket=self.sirketler[1]).delete()
+        beklenen = {s.pk: build_dashboard_payload(s)["uyum_skoru"] for s in self.sirketler}
+        self.assertEqual(sorted(beklenen.values()), [61, 82, 100, 100])
+
+        liste = APIClient().get("/api/companies/").json()
+        self.assertEqual({r["id"]: r["compliance_score"] for r in liste}, beklenen)
+        for sirket in self.sirketler[:2]:
+            detay = APIClient().get(reverse("Sirket-detail", args=[sirket.pk])).json()
+            self.assertEqual(detay["compliance_score"], beklenen[sirket.pk])
+        spa = self.client.get(reverse("companies-spa-list-api")).json()
+        self.assertEqual({r["id"]: r["uyum_skoru"] for r in spa}, beklenen)
+        sayfa = self.client.get(reverse("sirket-list-page"))
+        self.assertEqual({i["sirket"].pk: i["score"] for i in sayfa.context["sirketler"]}, beklenen)
+
+    # ---------------------------------------
+    # 3) Gece işi: sadece tarih sınırını geçen şirketler yeniden hesaplanır
+    # ---------------------------------------
+    def test_gece_isi_sinir_gecenleri_hesaplar(self):
+        yarin = self.bugun + timedelta(days=1)
+        zorunlu = self.duzenlemeler[0]
+        # Yarın 7 gün penceresine girecek (bugün 8 gün var) → 100-15-3 = 82, yarın 77
+        SirketObligation.objects.create(sirket=self.sirketler[0], duzenleme=zorunlu, due_date=yarin + timedelta(days=7))
+        # Son tarihi bugün → yarın gecikmiş: 100-15-3-5 = 77, yarın 72
+        SirketObligation.objects.create(sirket=self.sirketler[1], duzenleme=zorunlu, due_date=self.bugun)
+        # Son tarihi uzak → değişmez
+        SirketObligation.objects.create(sirket=self.sirketler[2], duzenleme=zorunlu, due_date=self.bugun + timedelta(days=60))
+        # Gece işi birkaç gün çalışmamış → baştan hesap
+        SirketSkoru.objects.filter(sirket=self.sirketler[3]).update(computed_for=self.bugun - timedelta(days=3))
+
+        self.assertEqual(gunluk_yenile(bugun=yarin), {"recomputed": 3, "carried": 1})
+        satirlar = {s.sirket_id: s for s in SirketSkoru.objects.all()}
+        self.assertEqual(
+            [(satirlar[s.pk].score, satirlar[s.pk].overdue_obligations, satirlar[s.pk].computed_for)
+             for s in self.sirketler],
+            [(77, 0, yarin), (72, 1, yarin), (82, 0, yarin), (100, 0, yarin)],
+        )
+
+        # Bayat satıra yapılan değişiklik fark olarak değil, baştan hesapla yazılır
+        SirketSkoru.objects.all().update(computed_for=self.bugun - timedelta(days=5), score=0)
+        SirketObligation.objects.filter(sirket=self.sirketler[2]).get().delete()
+        self.assertEqual(SirketSkoru.objects.get(sirket=self.sirketler[2]).score, 100)
+
+        # Kalan bayat satırlar komutla baştan hesaplanır
+        out = StringIO()
+        call_command("refresh_scores", stdout=out)
+        self.assertIn("3 şirket yeniden hesaplandı, 0 şirket değişmedi", out.getvalue())
+        self.skorlar_tutarli()
+
+
+class SkorSqlEsdegerlikTests(TestCase):
+    """
+    SQL skor formülü (skorlama.canli_skor_ekle) ↔ Python referansı (hesapla_sirket_skoru):
+    rastgele portföylerde (farklı tohumlar) skor, sayaçlar, eşik filtresi, sıralama ve
+    sayfalama birebir aynı olmalı. Uç durumlar: 0'a ve 100'e sıkışan skorlar, boş risk
+    seviyesi, etki tipi olmayan düzenleme, tam sınırdaki son tarihler.
+    """
+
+    ETKILER = ["zorunlu", "risk", "opsiyonel_tesvik", None]
+    RISKLER = ["low", "medium", "high", ""]
+    GUNLER = [None, -30, -1, 0, 1, 6, 7, 8, 45]
+
+    def portfoy_uret(self, rnd, bugun):
+        duzenlemeler = [
+            Duzenleme(
+                source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 1, 1) + timedelta(days=i),
+                raw_text="Duyuru.", impact_type=rnd.choice(self.ETKILER),
+            )
+            for i in range(40)
+        ]
+        Duzenleme.objects.bulk_create(duzenlemeler)
+        sirketler = Sirket.objects.bulk_create(
+            Sirket(name=f"Şirket {i}", sector="imalat", employee_count=5, location_city="Bursa") for i in range(30)
+        )
+
+        # Hız için bulk_create (skor tablosu burada test edilmiyor)
+        yukumlulukler = []
+        for i, sirket in enumerate(sirketler):
+            if i == 0:
+                continue  # yükümlülüğü olmayan şirket → 100
+            if i == 1:
+                # 0'ın altına düşen: gecikmiş, yüksek riskli zorunlu yükümlülükler
+                secilen = [(d, False, "high", -5, True) for d in duzenlemeler[:15]]
+            elif i == 2:
+                # 100'ün üstüne çıkan: tamamlanmış teşvikler
+                secilen = [(d, True, "low", None, True) for d in duzenlemeler if d.impact_type == "opsiyonel_tesvik"]
+            else:
+                secilen = [
+                    (d, rnd.random() < 0.35, rnd.choice(self.RISKLER), rnd.choice(self.GUNLER), rnd.random() < 0.85)
+                    for d in rnd.sample(duzenlemeler, rnd.randint(1, 20))
+                ]
+            for d, tamam, risk, gun, uygulanabilir in secilen:
+                yukumlulukler.append(SirketObligation(
+                    sirket=sirket, duzenleme=d, is_compliant=tamam, risk_level=risk,
+                    due_date=None if gun is None else bugun + timedelta(days=gun), is_applicable=uygulanabilir,
+                ))
+        SirketObligation.objects.bulk_create(yukumlulukler)
+        return sirketler
+
+    def test_sql_formulu_hesapla_ile_ayni(self):
+        bugun = date.today()
+        for tohum in range(4):
+            with self.subTest(tohum=tohum):
+                rnd = random.Random(tohum)
+                Duzenleme.objects.all().delete()
+                Sirket.objects.all().delete()
+                sirketler = self.portfoy_uret(rnd, bugun)
+
+                beklenen = {}
+                for sirket in sirketler:
+                    sonuc = hesapla_sirket_skoru(sirket)
+                    beklenen[sirket.pk] = (sonuc["score"], sonuc["stats"]["open_obligations"],
+                                           sonuc["stats"]["overdue_obligations"], sonuc["stats"]["total_obligations"])
+                skorlar = {pk: v[0] for pk, v in beklenen.items()}
+                self.assertIn(0, skorlar.values())
+                self.assertIn(100, skorlar.values())
+
+                qs = canli_skor_ekle(Sirket.objects.all(), bugun=bugun)
+                bulunan = {
+                    r[0]: r[1:]
+                    for r in qs.values_list("pk", "canli_skor", "acik_yukumluluk", "geciken_yukumluluk", "toplam_yukumluluk")
+                }
+                self.assertEqual(bulunan, beklenen)
+
+                # Eşik filtresi, sıralama ve sayfalama DB'de
+                for esik in rnd.sample(range(0, 102), 5):
+                    self.assertEqual(
+                        set(qs.filter(canli_skor__lt=esik).values_list("pk", flat=True)),
+                        {pk for pk, skor in skorlar.items() if skor < esik},
+                    )
+                sirali = sorted(skorlar, key=lambda pk: (skorlar[pk], -pk))
+                with self.assertNumQueries(1):
+                    sayfa = list(qs.order_by("canli_skor", "-pk").values_list("pk", flat=True)[10:20])
+                self.assertEqual(sayfa, sirali[10:20])
+
+                # Saklanan tablo da aynı formülle (SQL) baştan hesaplanır
+                skorlari_yenile(bugun=bugun)
+                self.assertEqual(dict(SirketSkoru.objects.values_list("sirket_id", "score")), skorlar)
+
+    def test_riskli_endpointler_bayat_satirda_canli_skor(self):
+        bugun = date.today()
+        sirketler = self.portfoy_uret(random.Random(11), bugun)
+        skorlar = {s.pk: hesapla_sirket_skoru(s)["score"] for s in sirketler}
+        skorlari_yenile(bugun=bugun)
+        # Gece işi çalışmamış: dünden kalmış satırlar ters skor taşır, bazı şirketlerin satırı yok
+        ids = list(skorlar)
+        for pk in ids[::3]:
+            SirketSkoru.objects.filter(sirket_id=pk).update(
+                computed_for=bugun - timedelta(days=1), score=100 - skorlar[pk]
+            )
+        SirketSkoru.objects.filter(sirket_id__in=ids[1::5]).delete()
+
+        url = reverse("Sirket-list-create")
+        for esik in (30, 60, 90):
+            with self.subTest(esik=esik):
+                beklenen = sorted((pk for pk, skor in skorlar.items() if skor < esik),
+                                  key=lambda pk: (skorlar[pk], -pk))
+                self.assertTrue(beklenen)
+                params = f"risky=true&threshold={esik}&ordering=score"
+                liste = self.client.get(f"{url}?{params}").json()
+                self.assertEqual([r["id"] for r in liste], beklenen)
+                self.assertEqual([r["compliance_score"] for r in liste], [skorlar[pk] for pk in beklenen])
+
+                # Keyset sayfaları da aynı sıra (cursor değeri canlı skordan)
+                idler, sonraki = [], f"{url}?{params}&page_size=4"
+                while sonraki:
+                    govde = self.client.get(sonraki).json()
+                    idler += [r["id"] for r in govde["results"]]
+                    sonraki = govde["next"]
+                self.assertEqual(idler, beklenen)
+
+                sayfa = self.client.get(reverse("sirket-riskli-list-page"), {"max_score": esik})
+                self.assertEqual({i["sirket"].pk: i["score"] for i in sayfa.context["sirketler"]},
+                                 {pk: skorlar[pk] for pk in beklenen})
+
+
+@SUREC_ICI_PANEL
+class SkorServisiTests(TestCase):
+    """
+    Toplu skor servisi (skorlama.score_many): view / serializer / template'ler şirket
+    başına skor sorgusu atmaz. Sorgu bütçeleri şirket ve yükümlülük sayısından bağımsızdır.
+    """
+
+    def setUp(self):
+        self.bugun = date.today()
+        self.duzenlemeler = [
+            Duzenleme.objects.create(
+                source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 12, 20), raw_text="Duyuru. " * 200,
+                impact_type=etki,
+            )
+            for i, etki in enumerate(["zorunlu", "risk", "opsiyonel_tesvik", "zorunlu", "risk", None])
+        ]
+        self.sirketler = []
+        for i in range(12):
+            sirket = Sirket.objects.create(name=f"Şirket {i}", sector="imalat", employee_count=5, location_city="Bursa")
+            for d in self.duzenlemeler[:i % 7]:
+                SirketObligation.objects.create(
+                    sirket=sirket, duzenleme=d, risk_level="high",
+                    due_date=self.bugun + timedelta(days=i - 6), is_compliant=(d.pk + i) % 3 == 0,
+                )
+            self.sirketler.append(sirket)
+        self.beklenen = {s.pk: hesapla_sirket_skoru(s) for s in self.sirketler}
+
+    def test_score_many_tek_sorgu_ve_eski_satirlarda_sql_hesap(self):
+        ids = [s.pk for s in self.sirketler]
+        with self.assertNumQueries(1):
+            skorlar = score_many(ids)
+        self.assertEqual({pk: v["score"] for pk, v in skorlar.items()},
+                         {pk: v["score"] for pk, v in self.beklenen.items()})
+
+        # Dünden kalmış / satırı olmayan şirketler SQL'de hesaplanır: +1 sorgu (şirket sayısından bağımsız)
+        SirketSkoru.objects.filter(sirket_id__in=ids[:5]).update(computed_for=self.bugun - timedelta(days=1))
+        SirketSkoru.objects.filter(sirket_id__in=ids[5:7]).delete()
+        with self.assertNumQueries(2):
+            skorlar = score_many(ids + [10_000])
+        self.assertEqual(
+            skorlar,
+            {pk: {"score": v["score"], **v["stats"]} for pk, v in self.beklenen.items()},
+        )
+
+    def test_sorgu_butceleri(self):
+        sirket = self.sirketler[-1]
+
+        # Serializer: annotate'siz queryset bile şirket sayısından bağımsız (liste + score_many)
+        with self.assertNumQueries(2):
+            data = SirketSerializer(Sirket.objects.order_by("pk"), many=True).data
+        self.assertEqual([r["compliance_score"] for r in data],
+                         [self.beklenen[s.pk]["score"] for s in self.sirketler])
+
+        with self.assertNumQueries(1):
+            resp = APIClient().get(reverse("Sirket-detail", args=[sirket.pk]))
+        self.assertEqual(resp.json()["compliance_score"], self.beklenen[sirket.pk]["score"])
+
+        # Dashboard: şirket + yükümlülükler (skor bir kez, serializer tekrar hesaplamaz)
+        for sirket in (self.sirketler[1], self.sirketler[6]):
+            with self.assertNumQueries(2):
+                resp = self.client.get(reverse("Sirket-dashboard", args=[sirket.pk]))
+            self.assertEqual(resp.json()["sirket"]["compliance_score"], self.beklenen[sirket.pk]["score"])
+
+        # Liste sayfaları tek sorgu; JSON listeler + ETag doğrulayıcısı (skor tablosu aggregate'i)
+        for url, butce in ((reverse("sirket-list-page"), 1), (reverse("sirket-riskli-list-page"), 1),
+                           (reverse("companies-spa-list-api"), 2), (reverse("Sirket-list-create"), 2)):
+            with self.subTest(url=url), self.assertNumQueries(butce):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+@SUREC_ICI_PANEL
+class PanelOnbellekTests(TestCase):
+    """
+    Dashboard payload önbelleği: tekrar eden GET DB'ye gitmez; yükümlülük / şirket /
+    düzenleme yazmaları kaydı geçersiz kılar; son tarih sınırı gelince yeniden hesaplanır.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.bugun = date.today()
+        self.sirket = Sirket.objects.create(name="Anadolu Döküm", sector="imalat", employee_count=40,
+                                            location_city="Bursa")
+        self.duzenleme = Duzenleme.objects.create(source="gib", title="KDV Tebliği", publish_date=date(2025, 12, 1),
+                                                  raw_text="Duyuru.", impact_type="zorunlu")
+        self.obl = SirketObligation.objects.create(sirket=self.sirket, duzenleme=self.duzenleme, risk_level="high",
+                                                   due_date=self.bugun + timedelta(days=20))
+        self.url = reverse("Sirket-dashboard", args=[self.sirket.pk])
+        self.spa_url = reverse("sirket-dashboard-api", args=[self.sirket.pk])
+
+    def panel(self):
+        with self.assertNumQueries(0):
+            return self.client.get(self.url).json()
+
+    def panel_isit(self):
+        """Önbellek geçersizse yeniden hesaplanır (sorgu atar); sonraki okuma önbellekten."""
+        with CaptureQueriesContext(connection) as ctx:
+            payload = self.client.get(self.url).json()
+        self.assertTrue(ctx.captured_queries)
+        return payload
+
+    def test_yazmalar_gecersiz_kilar(self):
+        onceki = panel_onbellek.sayaclar()
+        ilk = self.client.get(self.url).json()
+        self.assertEqual(self.panel(), ilk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.spa_url).json(), ilk)
+        self.assertEqual(ilk["uyum_skoru"], 100 - 15 - 7)
+
+        # Durum API'si: yanıt yeni payload, önbelleğe de o yazılır
+        yanit = APIClient().patch(reverse("obligation-status-api", args=[self.obl.pk]),
+                                  {"is_compliant": True}, format="json").json()
+        self.assertEqual(yanit["uyum_skoru"], 100)
+        self.assertEqual(self.panel()["completed"][0]["obligation_id"], self.obl.pk)
+
+        # Şirket bilgisi, düzenleme başlığı
+        self.sirket.name = "Anadolu Döküm A.Ş."
+        self.sirket.save()
+        self.assertEqual(self.client.get(self.url).json()["sirket"]["name"], "Anadolu Döküm A.Ş.")
+        self.duzenleme.title = "KDV Genel Uygulama Tebliği"
+        self.duzenleme.save()
+        self.assertEqual(self.client.get(self.url).json()["completed"][0]["regulation_title"],
+                         "KDV Genel Uygulama Tebliği")
+
+        # Eşleştirme motoru (toplu insert) ve toplu silme
+        yeni = Duzenleme.objects.create(source="gib", title="İmalat Genelgesi", publish_date=date(2025, 12, 2),
+                                        raw_text="Duyuru.", sectors=["imalat"], impact_type="risk")
+        self.panel()
+        yukumlulukleri_uret(duzenlemeler=Duzenleme.objects.filter(pk=yeni.pk))
+        self.assertEqual(self.client.get(self.url).json()["stats"]["total_obligations"], 2)
+        SirketObligation.objects.filter(duzenleme=yeni).delete()
+        self.assertEqual(self.client.get(self.url).json()["stats"]["total_obligations"], 1)
+
+        # Silinen şirket önbellekten dönmez
+        self.panel()
+        self.sirket.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        # Sayaçlar: /api/metrics/
+        metrik = self.client.get(reverse("metrics-api")).json()["dashboard_cache"]
+        self.assertEqual(metrik["hits"] - onceki["hits"], 5)
+        self.assertEqual(metrik["misses"] - onceki["misses"], 7)
+        self.assertEqual(metrik["recomputes"] - onceki["recomputes"], 6)  # 404 hesaplanmış sayılmaz
+        self.assertGreater(metrik["recompute_seconds_total"], 0)
+        self.assertTrue(0 < metrik["hit_ratio"] < 1)
+
+    def test_ozet_duzeltmesi_gecersiz_kilmaz(self):
+        self.panel_isit()
+        # Payload'da görünmeyen alanlar: yükümlülük taraması ve sürüm değişikliği yok
+        for alan, deger, update_fields in (("summary", "Yeni özet", None), ("url", "https://gib.gov.tr/k", ["url"])):
+            with self.subTest(alan=alan), CaptureQueriesContext(connection) as ctx:
+                setattr(self.duzenleme, alan, deger)
+                self.duzenleme.save(update_fields=update_fields)
+            self.assertFalse([q for q in ctx.captured_queries if "sirketobligation" in q["sql"]])
+            self.panel()
+
+        # Başlık (update_fields ile) ve etki tipi (yeniden yüklenmiş nesnede) kılar
+        self.duzenleme.title = "KDV Uygulama Tebliği"
+        self.duzenleme.save(update_fields=["title"])
+        self.assertEqual(self.panel_isit()["todo"][0]["regulation_title"], "KDV Uygulama Tebliği")
+        duzenleme = Duzenleme.objects.get(pk=self.duzenleme.pk)
+        duzenleme.impact_type = "risk"
+        duzenleme.save()
+        self.assertEqual(self.panel_isit()["todo"][0]["impact_type"], "risk")
+
+    def test_son_tarih_siniri_gelince_yeniden_hesaplanir(self):
+        b = self.bugun
+
+        # Gerçek payload: açık yükümlülüğün son tarihi bugün+20 → bugün+13'e kadar geçerli
+        self.client.get(self.url)
+        _, bitis, _ = caches["panel"].get(f"panel:kayit:{self.sirket.pk}")
+        self.assertEqual(bitis, b + timedelta(days=13))
+
+        todo = [{"due_date": b + timedelta(days=10)}, {"due_date": b - timedelta(days=3)},
+                {"due_date": None}, {"due_date": b + timedelta(days=30)}]
+        # +10 → +3'te 7 gün penceresine girer; −3 zaten gecikmiş; +30 → +23
+        self.assertEqual(panel_onbellek.gecerlilik_bitisi(todo, b), b + timedelta(days=3))
+        self.assertEqual(panel_onbellek.gecerlilik_bitisi(todo[1:3], b), None)
+        # Son tarih bugün → yarın gecikmiş olur
+        self.assertEqual(panel_onbellek.gecerlilik_bitisi([{"due_date": b}], b), b + timedelta(days=1))
+
+        hesaplanan = []
+
+        def hesapla():
+            hesaplanan.append(1)
+            return {"todo": todo}
+
+        panel_onbellek.gecersiz_kil([self.sirket.pk])
+        onceki = panel_onbellek.sayaclar()
+        for gun in (0, 2, 3, 3):
+            panel_onbellek.getir(self.sirket.pk, hesapla, bugun=b + timedelta(days=gun))
+        self.assertEqual(len(hesaplanan), 2)  # ilk okuma + 3. gün (sınır)
+        simdi = panel_onbellek.sayaclar()
+        self.assertEqual(simdi["expired"] - onceki["expired"], 1)
+        self.assertEqual(simdi["hits"] - onceki["hits"], 2)
+
+
+class OrtakPanelOnbellekTests(TestCase):
+    """
+    Varsayılan panel backend'i süreçler arası ortak: bir işçinin geçersiz kılması diğer işçinin
+    kaydını ve ETag'ini de geçersiz kılar (süreç içi LocMemCache'te bu görülmezdi).
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.sirket = Sirket.objects.create(name="Trakya Tekstil", sector="imalat", employee_count=8,
+                                            location_city="Edirne")
+        self.obl = SirketObligation.objects.create(sirket=self.sirket, duzenleme=Duzenleme.objects.create(
+            source="gib", title="KDV Tebliği", publish_date=date(2025, 12, 1), raw_text="Duyuru.",
+            impact_type="zorunlu",
+        ))
+
+    def test_baska_iscinin_gecersiz_kilmasi_gorulur(self):
+        self.assertFalse(settings.CACHES["panel"]["BACKEND"].endswith("LocMemCache"))
+        url = reverse("Sirket-dashboard", args=[self.sirket.pk])
+        ilk = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=ilk["ETag"]).status_code, 304)
+
+        # Yazma başka bir işçide: kendi backend bağlantısıyla sürümü değiştirir
+        diger_isci = caches.create_connection("panel")
+        with mock.patch.object(panel_onbellek, "_onbellek", return_value=diger_isci):
+            self.obl.is_compliant = True
+            self.obl.save()
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=ilk["ETag"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["uyum_skoru"], 100)
+        self.assertNotEqual(resp.json()["uyum_skoru"], ilk.json()["uyum_skoru"])
+
+
+@SUREC_ICI_PANEL
+class KosulluGetTests(TestCase):
+    """
+    ETag / Last-Modified: değişmemiş dashboard ve listeler 304 döner; doğrulayıcı
+    skorlayıcı çalışmadan (dashboard: hiç sorgu yok, liste: tek aggregate) bulunur.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.sirket = Sirket.objects.create(name="Ege Lojistik", sector="lojistik", employee_count=12,
+                                            location_city="İzmir")
+        self.duzenleme = Duzenleme.objects.create(source="gib", title="e-İrsaliye Tebliği",
+                                                  publish_date=date(2025, 12, 1), raw_text="Duyuru.",
+                                                  impact_type="zorunlu")
+        self.obl = SirketObligation.objects.create(sirket=self.sirket, duzenleme=self.duzenleme)
+
+    def test_dashboard_304(self):
+        for url in (reverse("Sirket-dashboard", args=[self.sirket.pk]),
+                    reverse("sirket-dashboard-api", args=[self.sirket.pk])):
+            with self.subTest(url=url):
+                resp = self.client.get(url)
+                etag = resp["ETag"]
+                self.assertTrue(etag.startswith('"'))  # strong
+                self.assertIn("no-cache", resp["Cache-Control"])
+
+                with self.assertNumQueries(0), mock.patch("mevzuat_parca.views.hesapla_sirket_skoru") as skorlayici:
+                    resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(resp.status_code, 304)
+                skorlayici.assert_not_called()
+                self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]).status_code, 304)
+
+                # Yükümlülük değişti → yeni gövde, yeni ETag
+                self.obl.is_compliant = not self.obl.is_compliant
+                self.obl.save()
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(resp.status_code, 200)
+                self.assertNotEqual(resp["ETag"], etag)
+
+        # Tarih kovası: aynı sürüm, farklı gün → farklı doğrulayıcı (son tarih cezaları değişebilir)
+        bugun = date.today()
+        self.assertNotEqual(panel_onbellek.dogrulayici(self.sirket.pk, bugun)[0],
+                            panel_onbellek.dogrulayici(self.sirket.pk, bugun + timedelta(days=1))[0])
+
+    def test_liste_304(self):
+        url = reverse("Sirket-list-create") + "?ordering=score"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        # Farklı filtre / farklı endpoint ayrı ETag
+        self.assertEqual(self.client.get(reverse("Sirket-list-create"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        spa_url = reverse("companies-spa-list-api")
+        spa_etag = self.client.get(spa_url)["ETag"]
+        self.assertNotEqual(spa_etag, etag)
+        self.assertEqual(self.client.get(spa_url, HTTP_IF_NONE_MATCH=spa_etag).status_code, 304)
+
+        # Şirket adı değişti (listede görünür)
+        self.sirket.name = "Ege Lojistik A.Ş."
+        self.sirket.save()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+
+        # Skor başka süreçte (gece işi) yeniden yazıldı: önbellek sürümü değişmese de DB'den görülür
+        skorlari_yenile([self.sirket.pk])
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+        # Yeni şirket → liste değişti
+        etag = resp["ETag"]
+        Sirket.objects.create(name="Yeni", sector="imalat", employee_count=1, location_city="Bursa")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_duzenleme_liste_304(self):
+        url = reverse("Duzenleme-list-create") + "?impact_type=zorunlu"
+
+        def etag_degisti(etag):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp["ETag"], etag)
+            return resp["ETag"]
+
+        resp = self.client.get(url)
+        etag = resp["ETag"]
+        self.assertIn("no-cache", resp["Cache-Control"])
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]).status_code, 304)
+
+        # Farklı filtre ayrı ETag; geçersiz filtre doğrulayıcısız 400
+        self.assertEqual(self.client.get(url + "&date_from=2025-01-01", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        resp = self.client.get(reverse("Duzenleme-list-create") + "?date_from=dun")
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.has_header("ETag"))
+
+        # Özet düzeltmesi (update_fields ile de updated_at yazılır), yeni kayıt, silme
+        self.duzenleme.summary = "Yeni özet"
+        self.duzenleme.save(update_fields=["summary"])
+        etag = etag_degisti(etag)
+        yeni = Duzenleme.objects.create(source="gib", title="e-Arşiv Tebliği", publish_date=date(2025, 12, 2),
+                                        raw_text="Duyuru.", impact_type="zorunlu")
+        etag = etag_degisti(etag)
+        yeni.delete()
+        etag_degisti(etag)
+
+
+class DurumDeltaTests(TestCase):
+    """
+    PATCH /api/obligations/<pk>/status/?delta=true: tam payload yerine taşınan öğe, yeni
+    sıraları, skor ve stats. İstemcinin elindeki payload'a delta uygulanınca baştan
+    hesaplanan payload elde edilmeli.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.api = APIClient()
+        self.sirket = Sirket.objects.create(name="Marmara Tekstil", sector="imalat", employee_count=80,
+                                            location_city="Bursa")
+        bugun = date.today()
+        rnd = random.Random(3)
+        self.obls = []
+        for i in range(30):
+            d = Duzenleme.objects.create(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 11, 1),
+                                         raw_text="Duyuru.", impact_type=rnd.choice(["zorunlu", "risk", None]))
+            self.obls.append(SirketObligation.objects.create(
+                sirket=self.sirket, duzenleme=d, is_compliant=rnd.random() < 0.4,
+                is_applicable=i % 10 != 9, risk_level=rnd.choice(["low", "medium", "high"]),
+                due_date=bugun + timedelta(days=rnd.randint(-5, 20)),
+            ))
+        self.panel_url = reverse("Sirket-dashboard", args=[self.sirket.pk])
+
+    def patch(self, obl, deger):
+        return self.api.patch(reverse("obligation-status-api", args=[obl.pk]) + "?delta=true",
+                              {"is_compliant": deger}, format="json")
+
+    def test_delta_uygulaninca_tam_payload(self):
+        istemci = self.client.get(self.panel_url).json()
+        rnd = random.Random(5)
+        for _ in range(40):
+            obl = rnd.choice(self.obls)
+            resp = self.patch(obl, rnd.random() < 0.5)
+            self.assertEqual(resp.status_code, 200)
+            delta = resp.json()
+            self.assertEqual(delta["mode"], "delta")
+            self.assertNotIn("todo", delta)
+
+            tasinan = delta["moved"]
+            if tasinan:
+                oge = istemci[tasinan["from"]].pop(tasinan["from_index"])
+                self.assertEqual(oge["obligation_id"], obl.pk)
+                istemci[tasinan["to"]].insert(tasinan["to_index"], tasinan["item"])
+            istemci["uyum_skoru"] = delta["uyum_skoru"]
+            istemci["stats"] = delta["stats"]
+
+            beklenen = self.client.get(self.panel_url).json()
+            for alan in ("todo", "completed", "uyum_skoru", "stats"):
+                self.assertEqual(istemci[alan], beklenen[alan], alan)
+
+    def test_sadece_degisen_kolon_yazilir_ve_sorgu_sayisi_sabit(self):
+        obl = next(o for o in self.obls if o.is_applicable and not o.is_compliant)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.patch(obl, True).status_code, 200)
+        guncelleme = [q["sql"] for q in ctx.captured_queries
+                      if q["sql"].startswith('UPDATE "mevzuat_parca_sirketobligation"')]
+        self.assertEqual(len(guncelleme), 1)
+        self.assertIn('"is_compliant"', guncelleme[0])
+        self.assertNotIn('"risk_level"', guncelleme[0])
+        self.assertNotIn('"due_date"', guncelleme[0])
+
+        # 30 yerine 300 yükümlülük olsa da aynı sayıda sorgu (listeler okunmaz)
+        sorgu_sayisi = len(ctx.captured_queries)
+        for i in range(270):
+            d = Duzenleme.objects.create(source="gib", title=f"Ek {i}", publish_date=date(2025, 10, 1),
+                                         raw_text="Duyuru.")
+            SirketObligation.objects.create(sirket=self.sirket, duzenleme=d)
+        with self.assertNumQueries(sorgu_sayisi):
+            self.patch(obl, False)
+
+        # Durum aynıysa yazma yok, moved yok
+        with CaptureQueriesContext(connection) as ctx:
+            delta = self.patch(obl, False).json()
+        self.assertIsNone(delta["moved"])
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in ctx.captured_queries))
+
+        # Varsayılan mod: tam payload (eski istemciler)
+        self.assertIn("todo", self.api.patch(reverse("obligation-status-api", args=[obl.pk]),
+                                             {"is_compliant": True}, format="json").json())
+
+
+class TopluDurumTests(TestCase):
+    """
+    PATCH /api/obligations/bulk-status/: tek transaction, tek UPDATE, tek skor farkı,
+    tek dashboard (veya delta) yanıtı, id başına hata raporu.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.api = APIClient()
+        self.url = reverse("obligation-bulk-status-api")
+        bugun = date.today()
+        rnd = random.Random(11)
+        self.sirket = Sirket.objects.create(name="Karadeniz Gıda", sector="imalat", employee_count=30,
+                                            location_city="Samsun")
+        self.diger = Sirket.objects.create(name="Başka", sector="imalat", employee_count=3, location_city="Ordu")
+        self.obls = []
+        for i in range(25):
+            d = Duzenleme.objects.create(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 11, 1),
+                                         raw_text="Duyuru.", impact_type=rnd.choice(["zorunlu", "risk", "opsiyonel_tesvik"]))
+            self.obls.append(SirketObligation.objects.create(
+                sirket=self.sirket, duzenleme=d, is_compliant=rnd.random() < 0.5, is_applicable=i % 8 != 7,
+                risk_level=rnd.choice(["low", "high"]), due_date=bugun + timedelta(days=rnd.randint(-3, 15)),
+            ))
+        self.baska_obl = SirketObligation.objects.create(sirket=self.diger, duzenleme=self.obls[0].duzenleme)
+
+    def panel(self):
+        return build_dashboard_payload(Sirket.objects.get(pk=self.sirket.pk))
+
+    def test_tam_payload_tek_update_ve_hata_raporu(self):
+        degisecek = self.obls[:10]
+        items = [{"id": o.pk, "is_compliant": not o.is_compliant} for o in degisecek]
+        items += [
+            {"id": self.obls[10].pk, "is_compliant": self.obls[10].is_compliant},  # zaten o durumda
+            {"id": 999_999, "is_compliant": True},
+            {"id": self.baska_obl.pk, "is_compliant": True},
+            {"id": self.obls[11].pk, "is_compliant": "evet"},
+            "bozuk",
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.api.patch(self.url, {"items": items}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+
+        # (executemany "N times: UPDATE ..." olarak kaydedilir)
+        yazmalar = [q["sql"] for q in ctx.captured_queries if "UPDATE " in q["sql"]]
+        self.assertEqual(sum('"mevzuat_parca_sirketobligation"' in q for q in yazmalar), 1)
+        self.assertEqual(sum("mevzuat_parca_sirketskoru" in q for q in yazmalar), 1)
+
+        self.assertEqual(data["updated"], [o.pk for o in degisecek])
+        self.assertEqual(data["unchanged"], [self.obls[10].pk])
+        self.assertEqual(set(data["errors"]),
+                         {"999999", str(self.baska_obl.pk), str(self.obls[11].pk), "bozuk"})
+        self.baska_obl.refresh_from_db()
+        self.assertFalse(self.baska_obl.is_compliant)
+
+        beklenen = json.loads(json.dumps(self.panel(), default=str))
+        for alan in ("uyum_skoru", "stats", "todo", "completed"):
+            self.assertEqual(data[alan], beklenen[alan], alan)
+        self.assertEqual(SirketSkoru.objects.get(sirket=self.sirket).score, beklenen["uyum_skoru"])
+        # Kısa biçim + dashboard önbelleği geçersiz kılındı
+        self.api.patch(self.url, {"ids": [self.obls[12].pk], "is_compliant": not self.obls[12].is_compliant},
+                       format="json")
+        self.assertEqual(self.client.get(reverse("Sirket-dashboard", args=[self.sirket.pk])).json()["uyum_skoru"],
+                         self.panel()["uyum_skoru"])
+
+    def test_delta_uygulaninca_tam_payload(self):
+        istemci = json.loads(json.dumps(self.panel(), default=str))
+        rnd = random.Random(2)
+        for _ in range(6):
+            secilen = rnd.sample(self.obls, 8)
+            items = [{"id": o.pk, "is_compliant": rnd.random() < 0.5} for o in secilen]
+            delta = self.api.patch(self.url + "?delta=true", {"items": items}, format="json").json()
+            self.assertEqual(delta["mode"], "delta")
+
+            # İstemci: taşınanları id ile çıkar, to_index sırasıyla ekle
+            tasinan = {m["obligation_id"] for m in delta["moved"]}
+            for liste in ("todo", "completed"):
+                istemci[liste] = [o for o in istemci[liste] if o["obligation_id"] not in tasinan]
+            for m in delta["moved"]:
+                istemci[m["to"]].insert(m["to_index"], m["item"])
+            istemci["uyum_skoru"], istemci["stats"] = delta["uyum_skoru"], delta["stats"]
+
+            beklenen = json.loads(json.dumps(self.panel(), default=str))
+            for alan in ("todo", "completed", "uyum_skoru", "stats"):
+                self.assertEqual(istemci[alan], beklenen[alan], alan)
+
+    def test_hatali_istekler_ve_geri_alma(self):
+        self.assertEqual(self.api.patch(self.url, {}, format="json").status_code, 400)
+        self.assertEqual(self.api.patch(self.url, {"items": [{"id": 999_999, "is_compliant": True}]},
+                                        format="json").status_code, 400)
+        self.assertEqual(self.api.patch(self.url, {"ids": list(range(1, 502))}, format="json").status_code, 400)
+
+        # sirket_id metin olarak da gelebilir; çevrilemeyen değer alan adıyla 400
+        obl = self.obls[0]
+        for sirket_id in (self.sirket.pk, str(self.sirket.pk)):
+            resp = self.api.patch(self.url, {"sirket_id": sirket_id, "ids": [obl.pk, self.baska_obl.pk],
+                                             "is_compliant": obl.is_compliant}, format="json")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual((resp.json()["unchanged"], list(resp.json()["errors"])),
+                             ([obl.pk], [str(self.baska_obl.pk)]))
+        for sirket_id in ("beş", "", True, 2.5, [1]):
+            resp = self.api.patch(self.url, {"sirket_id": sirket_id, "ids": [obl.pk]}, format="json")
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("sirket_id", resp.json())
+
+        # Skor yazılamazsa yükümlülük güncellemesi de geri alınır
+        onceki = [o.is_compliant for o in self.obls[:5]]
+        with mock.patch("mevzuat_parca.skorlama.farklari_uygula", side_effect=RuntimeError("skor")):
+            with self.assertRaises(RuntimeError):
+                self.api.patch(self.url, {"items": [{"id": o.pk, "is_compliant": not o.is_compliant}
+                                                    for o in self.obls[:5]]}, format="json")
+        self.assertEqual([SirketObligation.objects.get(pk=o.pk).is_compliant for o in self.obls[:5]], onceki)
+
+
+@SUREC_ICI_PANEL
+class CursorSayfalamaTests(TestCase):
+    """
+    Liste endpoint'lerinde keyset sayfalama: sayfalar art arda okununca sayfasız listeyle
+    aynı sıra (filtre / skor sıralaması / skor satırı olmayan şirketler dahil), sayfa başına sabit sorgu sayısı.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        rnd = random.Random(5)
+        bugun = date.today()
+        duzenlemeler = [
+            Duzenleme.objects.create(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 10, 1 + i % 3),
+                                     raw_text="Duyuru.", impact_type=rnd.choice(["zorunlu", "risk"]))
+            for i in range(9)
+        ]
+        self.sirketler = []
+        for i in range(23):
+            sirket = Sirket.objects.create(name=f"Şirket {i}", sector=["imalat", "yazilim"][i % 2],
+                                           employee_count=5, location_city="İzmir")
+            for d in rnd.sample(duzenlemeler, rnd.randint(0, 4)):
+                SirketObligation.objects.create(sirket=sirket, duzenleme=d, is_compliant=rnd.random() < 0.4,
+                                                risk_level="high", due_date=bugun + timedelta(days=rnd.randint(-5, 20)))
+            self.sirketler.append(sirket)
+        # Skor satırı olmayan şirketler sıralamada kaybolmamalı (skorları SQL'de hesaplanır)
+        SirketSkoru.objects.filter(sirket__in=self.sirketler[:3]).delete()
+
+    def sayfalari_oku(self, url, params, sorgu_butcesi):
+        idler, sayfa = [], 0
+        sonraki = f"{url}?{params}"
+        while sonraki:
+            with self.assertNumQueries(sorgu_butcesi):
+                resp = self.client.get(sonraki)
+            self.assertEqual(resp.status_code, 200)
+            govde = resp.json()
+            self.assertLessEqual(len(govde["results"]), govde["page_size"])
+            idler += [r["id"] for r in govde["results"]]
+            sonraki, sayfa = govde["next"], sayfa + 1
+            self.assertLess(sayfa, 50)
+        return idler
+
+    def test_sirket_listesi_filtre_ve_siralamalarla(self):
+        url = reverse("Sirket-list-create")
+        for params in ("", "ordering=score", "ordering=-score", "sector=imalat",
+                       "risky=true&threshold=90&ordering=score", "sector=yazilim&ordering=-score"):
+            with self.subTest(params=params):
+                tumu = [r["id"] for r in self.client.get(f"{url}?{params}").json()]
+                # Sayfa: ETag doğrulayıcısı (skor aggregate'i) + LIMIT'li tek liste sorgusu
+                self.assertEqual(self.sayfalari_oku(url, f"{params}&page_size=4", 2), tumu)
+        # Satırı olmayan şirketler de gerçek skorlarıyla sıralanır (score_many ile aynı)
+        skorlar = {pk: v["score"] for pk, v in score_many([s.pk for s in self.sirketler]).items()}
+        liste = self.client.get(f"{url}?ordering=score").json()
+        self.assertEqual({r["id"]: r["compliance_score"] for r in liste}, skorlar)
+        self.assertEqual([r["compliance_score"] for r in liste], sorted(skorlar.values()))
+
+    def test_sayfalar_arasi_yazma_tekrar_uretmez(self):
+        url = reverse("Sirket-list-create")
+        ilk = self.client.get(url, {"page_size": 10}).json()
+        Sirket.objects.create(name="Yeni", sector="imalat", employee_count=1, location_city="Van")
+        ikinci = self.client.get(ilk["next"]).json()
+        idler = [r["id"] for r in ilk["results"] + ikinci["results"]]
+        self.assertEqual(idler, sorted({s.pk for s in self.sirketler}, reverse=True)[:20])
+
+    def test_duzenleme_listesi_ayni_gun_yayimlananlar(self):
+        url = reverse("Duzenleme-list-create")
+        tumu = [r["id"] for r in self.client.get(url).json()]
+        beklenen = list(Duzenleme.objects.order_by("-publish_date", "-id").values_list("id", flat=True))
+        self.assertEqual(tumu, beklenen)
+        # Sayfa: ETag doğrulayıcısı (updated_at aggregate'i) + LIMIT'li tek liste sorgusu
+        self.assertEqual(self.sayfalari_oku(url, "page_size=2", 2), beklenen)
+
+    def test_spa_listesi(self):
+        url = reverse("companies-spa-list-api")
+        tumu = self.client.get(url).json()
+        govde = self.client.get(url, {"page_size": 7}).json()
+        self.assertEqual(govde["results"], tumu[:7])
+        self.assertEqual(set(govde["results"][0]), {"id", "name", "sector", "uyum_skoru"})
+        self.assertEqual(self.sayfalari_oku(url, "page_size=7", 2), [r["id"] for r in tumu])
+
+    def test_gecersiz_cursor_ve_sayfa_boyutu(self):
+        url = reverse("Sirket-list-create")
+        baska_sira = self.client.get(url, {"page_size": 2, "ordering": "score"}).json()["next"]
+        cursor = baska_sira.split("cursor=")[1].split("&")[0]
+        for deger in ("bozuk!", cursor, sayfalama.cursor_kodla("-id", ["abc"])):
+            with self.subTest(cursor=deger):
+                self.assertEqual(self.client.get(url, {"cursor": deger}).status_code, 400)
+        self.assertEqual(
+            self.client.get(reverse("Duzenleme-list-create"), {"cursor": sayfalama.cursor_kodla("-publish_date,-id", ["xx", 1])}).status_code,
+            400,
+        )
+
+        # Hatalı page_size varsayılana, aşırı büyüğü azamiye iner
+        with self.settings(LISTE_SAYFA_BOYUTU=5, LISTE_AZAMI_SAYFA_BOYUTU=8):
+            self.assertEqual(self.client.get(url, {"page_size": "x"}).json()["page_size"], 5)
+            govde = self.client.get(url, {"page_size": 1000}).json()
+        self.assertEqual((govde["page_size"], len(govde["results"])), (8, 8))
+
+
+@SUREC_ICI_PANEL
+class SeyrekAlanlarTests(TestCase):
+    """
+    DRF endpoint'lerinde ?fields= / ?include=: düzenleme listesi tam metni göndermez ve
+    DB'den okumaz, detay gönderir; seçilmeyen kolonlar sorguda defer edilir.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.metin = "MADDE 1 – Uzun metin. " * 500
+        self.duzenlemeler = [
+            Duzenleme.objects.create(source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 9, 1 + i),
+                                     raw_text=self.metin)
+            for i in range(4)
+        ]
+        self.sirket = Sirket.objects.create(name="Ege Lojistik", sector="lojistik", employee_count=8,
+                                            location_city="İzmir")
+
+    def secilen_kolonlar(self, url, params=None):
+        """İsteğin ana tablo SELECT'inde okunan kolonlar (yanıt, sorgu metinleri)."""
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params or {})
+        self.assertEqual(resp.status_code, 200)
+        select = " ".join(q["sql"] for q in ctx.captured_queries if "mevzuat_parca_duzenleme" in q["sql"])
+        return resp, select
+
+    def test_liste_tam_metinsiz_detay_tam_metinli(self):
+        resp, sql = self.secilen_kolonlar(reverse("Duzenleme-list-create"))
+        self.assertTrue(all("raw_text" not in r for r in resp.json()))
+        self.assertIn("title", resp.json()[0])
+        self.assertNotIn('"raw_text"', sql)
+
+        resp, sql = self.secilen_kolonlar(reverse("Duzenleme-list-create"), {"include": "raw_text"})
+        self.assertTrue(all(r["raw_text"] == self.metin for r in resp.json()))
+
+        resp, sql = self.secilen_kolonlar(reverse("Duzenleme-detail", args=[self.duzenlemeler[0].pk]))
+        self.assertEqual(resp.json()["raw_text"], self.metin)
+
+    def test_fields_alan_secimi_ve_defer(self):
+        resp, sql = self.secilen_kolonlar(reverse("Duzenleme-list-create"),
+                                          {"fields": "id,title", "page_size": 2})
+        self.assertEqual([set(r) for r in resp.json()["results"]], [{"id", "title"}] * 2)
+        for kolon in ('"summary"', '"nlp_result"', '"raw_text"', '"tags"'):
+            self.assertNotIn(kolon, sql)
+
+        resp, _ = self.secilen_kolonlar(reverse("Duzenleme-detail", args=[self.duzenlemeler[1].pk]),
+                                        {"fields": "title"})
+        self.assertEqual(resp.json(), {"title": "Tebliğ 1"})
+
+        # Şirketler: hesaplanan alan seçilebilir, sorgu sayısı değişmez
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse("Sirket-list-create"), {"fields": "id,compliance_score"})
+        self.assertEqual(resp.json(), [{"id": self.sirket.pk, "compliance_score": 100}])
+        resp = self.client.get(reverse("Sirket-detail", args=[self.sirket.pk]), {"fields": "name"})
+        self.assertEqual(resp.json(), {"name": "Ege Lojistik"})
+
+    def test_bilinmeyen_alan_400_ve_yazma_tam_alan(self):
+        for params in ({"fields": "id,yok"}, {"include": "sifre"}):
+            with self.subTest(params=params):
+                resp = self.client.get(reverse("Duzenleme-list-create"), params)
+                self.assertEqual(resp.status_code, 400)
+                self.assertIn("fields", resp.json())
+
+        # PATCH yanıtı ?fields='den etkilenmez (yazma yolu queryset'i daraltılmaz)
+        resp = APIClient().patch(f"{reverse('Duzenleme-detail', args=[self.duzenlemeler[2].pk])}?fields=id",
+                                 {"summary": "Özet"}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual((resp.json()["summary"], resp.json()["raw_text"]), ("Özet", self.metin))
+
+
+class HizliSerilestirmeTests(TestCase):
+    """
+    Sıcak okuma yolu: derlenmiş satır eşlemcisi serializer'ın çıktısının aynısını, hızlı JSON
+    renderer'ı DRF JSONRenderer'ın baytlarının aynısını üretir.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        d = Duzenleme.objects.create(source="gib", title="Tebliğ", publish_date=date(2025, 8, 1),
+                                     raw_text="Duyuru.", impact_type="zorunlu")
+        self.sirketler = [
+            Sirket.objects.create(name=f"Şirket “{i}” \u2028", sector=["imalat", "yazilim"][i % 2],
+                                  employee_count=i, location_city="Konya", is_exporter=i % 3 == 0)
+            for i in range(6)
+        ]
+        SirketObligation.objects.create(sirket=self.sirketler[0], duzenleme=d, due_date=date.today() - timedelta(days=2))
+
+    def test_eslemci_serializer_ile_ayni(self):
+        beklenen = SirketSerializer(skor_ekle(Sirket.objects.order_by("-id")), many=True).data
+        self.assertEqual(self.client.get(reverse("Sirket-list-create")).json(), json.loads(json.dumps(beklenen)))
+
+        resp = self.client.get(reverse("Sirket-list-create"), {"fields": "created_at,compliance_score", "page_size": 2})
+        self.assertEqual(resp.json()["results"],
+                         [{"created_at": r["created_at"], "compliance_score": r["compliance_score"]} for r in beklenen[:2]])
+
+        # Dashboard şirket bölümü (nesneden) — skor hesaplanan değerle
+        sirket = self.sirketler[0]
+        payload = build_dashboard_payload(sirket)
+        self.assertEqual(payload["sirket"], SirketSerializer(sirket).data)
+        self.assertLess(payload["sirket"]["compliance_score"], 100)
+
+        # Kolona bağlanmamış SerializerMethodField derlenemez (sessizce yanlış değer üretmesin)
+        with self.assertRaises(ValueError):
+            SatirEslemcisi(type("S", (SirketSerializer,), {"Meta": type("Meta", (SirketSerializer.Meta,), {"hizli_kaynaklar": {}})}))
+
+    def test_renderer_drf_ile_ayni_bayt(self):
+        from decimal import Decimal
+        from django.utils.translation import gettext_lazy
+
+        veri = {
+            "ad": "Çağrı “İş” \u2028 \u2029", 1: [date(2025, 1, 2), None, True, 1.5],
+            "an": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            "yerel": datetime(2025, 1, 2, 3, 4, 5), "para": Decimal("12.50"), "etiket": gettext_lazy("Özet"),
+        }
+        self.assertEqual(HizliJSONRenderer().render(veri), JSONRenderer().render(veri))
+        self.assertEqual(HizliJSONRenderer().render(None), b"")
+        # Girintili istek (browsable API) DRF'in kendisine düşer
+        self.assertEqual(HizliJSONRenderer().render(veri, "application/json; indent=2"),
+                         JSONRenderer().render(veri, "application/json; indent=2"))
+
+        # JsonResponse karşılığı: DjangoJSONEncoder çıktısıyla aynı gövde
+        resp = hizli_json.yanit(RequestFactory().get("/"), veri)
+        self.assertEqual(json.loads(resp.content), json.loads(JsonResponse(veri, safe=False).content))
+        self.assertEqual(resp["Content-Type"], "application/json")
+
+    @skipIf(hizli_json.msgpack_acik(), "msgpack kurulu: negotiation aşağıdaki testte")
+    def test_msgpack_kurulu_degilse_sunulmaz(self):
+        resp = self.client.get(reverse("Sirket-list-create"), HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(resp.status_code, 406)
+        # Düz Django view'leri JSON'a düşer
+        resp = self.client.get(reverse("companies-spa-list-api"), HTTP_ACCEPT="application/msgpack")
+        self.assertEqual((resp.status_code, resp["Content-Type"]), (200, "application/json"))
+
+    @skipUnless(hizli_json.msgpack_acik(), "msgpack kurulu değil")
+    def test_msgpack_negotiation(self):
+        import msgpack
+
+        for url in (reverse("Sirket-list-create"), reverse("companies-spa-list-api"),
+                    reverse("Sirket-dashboard", args=[self.sirketler[0].pk])):
+            with self.subTest(url=url):
+                json_govde = self.client.get(url).json()
+                resp = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+                self.assertEqual(resp["Content-Type"], "application/msgpack")
+                self.assertIn("Accept", resp["Vary"])
+                self.assertEqual(msgpack.unpackb(resp.content), json_govde)
+
+
+class PortfoyDisaAktarimTests(TestCase):
+    """
+    GET /api/export/portfolio/ ve export_portfolio: akış halinde şirket + skor + açık yükümlülük;
+    içerik dashboard ile aynı, sorgu sayısı şirket sayısına değil grup sayısına bağlı.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        rnd = random.Random(23)
+        bugun = date.today()
+        duzenlemeler = [
+            Duzenleme.objects.create(source="gib", title=f"Tebliğ, \"{i}\"", publish_date=date(2025, 7, 1),
+                                     raw_text="Duyuru.", impact_type=rnd.choice(["zorunlu", "risk", None]))
+            for i in range(8)
+        ]
+        self.sirketler = []
+        for i in range(9):
+            sirket = Sirket.objects.create(name=f"Şirket {i}", sector=["imalat", "yazilim"][i % 2],
+                                           employee_count=3, location_city="Bursa")
+            for d in rnd.sample(duzenlemeler, rnd.randint(0, 6)):
+                SirketObligation.objects.create(
+                    sirket=sirket, duzenleme=d, is_compliant=rnd.random() < 0.3, is_applicable=rnd.random() < 0.9,
+                    risk_level=rnd.choice(["low", "high"]),
+                    due_date=rnd.choice([None, bugun + timedelta(days=rnd.randint(-10, 10))]),
+                )
+            self.sirketler.append(sirket)
+        # Skor satırı eski günde kalmış şirket de güncel skorla çıkmalı
+        SirketSkoru.objects.filter(sirket=self.sirketler[4]).update(computed_for=bugun - timedelta(days=3))
+
+    def ndjson(self, **params):
+        resp = self.client.get(reverse("portfolio-export-api"), params)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        return resp, [json.loads(satir) for satir in b"".join(resp.streaming_content).splitlines()]
+
+    def test_ndjson_dashboard_ile_ayni(self):
+        resp, kayitlar = self.ndjson()
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        self.assertIn("attachment", resp["Content-Disposition"])
+        self.assertEqual([k["id"] for k in kayitlar], [s.pk for s in self.sirketler])
+        for kayit, sirket in zip(kayitlar, self.sirketler):
+            panel = build_dashboard_payload(sirket)
+            self.assertEqual(kayit["score"], panel["uyum_skoru"])
+            self.assertEqual({k: kayit[k] for k in panel["stats"]}, panel["stats"])
+            self.assertEqual([o["obligation_id"] for o in kayit["open"]],
+                             [o["obligation_id"] for o in panel["todo"]])
+            self.assertEqual([o["due_date"] for o in kayit["open"]],
+                             [o["due_date"] and o["due_date"].isoformat() for o in panel["todo"]])
+
+        _, imalat = self.ndjson(sector="imalat")
+        self.assertEqual([k["id"] for k in imalat], [s.pk for s in self.sirketler if s.sector == "imalat"])
+        self.assertEqual(self.client.get(reverse("portfolio-export-api"), {"format": "xml"}).status_code, 400)
+
+    def test_csv_yukumluluk_basina_satir(self):
+        resp = self.client.get(reverse("portfolio-export-api"), {"format": "csv"})
+        self.assertTrue(resp["Content-Type"].startswith("text/csv"))
+        satirlar = list(csv.reader(StringIO(b"".join(resp.streaming_content).decode())))
+        self.assertEqual(tuple(satirlar[0]), disa_aktarim.CSV_KOLONLARI)
+
+        _, kayitlar = self.ndjson()
+        beklenen = sum(max(1, len(k["open"])) for k in kayitlar)
+        self.assertEqual(len(satirlar) - 1, beklenen)
+        acik = [r for r in satirlar[1:] if r[9]]
+        self.assertEqual(len(acik), sum(len(k["open"]) for k in kayitlar))
+        # Virgül / tırnak içeren başlıklar kaçışlı, kolon sayısı sabit
+        self.assertTrue(all(len(r) == len(disa_aktarim.CSV_KOLONLARI) for r in satirlar))
+        self.assertTrue(any(r[11].startswith("Tebliğ, \"") for r in acik))
+
+    def test_sorgu_sayisi_grup_basina_ve_komut(self):
+        def sorgu_sayisi(chunk_size):
+            with CaptureQueriesContext(connection) as ctx:
+                list(disa_aktarim.akis("ndjson", chunk_size=chunk_size))
+            return len(ctx.captured_queries)
+
+        # Tek grup: şirketler + açık yükümlülükler + score_many (eski satır için +1)
+        self.assertEqual(sorgu_sayisi(1000), 4)
+        # Grup boyutu 3 → 3 grup: score_many grup başına, akış sorguları bir kez
+        self.assertLessEqual(sorgu_sayisi(3), 2 + 3 * 2)
+
+        cikti = StringIO()
+        call_command("export_portfolio", "--chunk-size", "2", stdout=cikti)
+        self.assertEqual(cikti.getvalue().encode(), b"".join(self.client.get(reverse("portfolio-export-api")).streaming_content))
+
+        with tempfile.TemporaryDirectory() as d:
+            yol = Path(d) / "p.csv"
+            call_command("export_portfolio", "--format", "csv", "--output", str(yol), stderr=StringIO())
+            self.assertEqual(yol.read_bytes(),
+                             b"".join(self.client.get(reverse("portfolio-export-api"), {"format": "csv"}).streaming_content))
+
+
+@SUREC_ICI_PANEL
+class TopluSirketIceAktarimTests(TestCase):
+    """
+    POST /api/companies/import/ ve import_companies: satırlar batch'ler halinde doğrulanıp
+    bulk_create ile yazılır, hatalı satırlar satır numarasıyla raporlanır, istenirse eşleştirilir.
+    """
+
+    def setUp(self):
+        caches["panel"].clear()
+        self.api = APIClient()
+        self.url = reverse("companies-import-api")
+
+    def test_csv_dosyasi_ve_satir_hatalari(self):
+        icerik = (
+            "name;sector;employee_count;location_city;is_exporter;score\n"
+            "Alfa A.Ş.;İmalat;40;Bursa;evet;12\n"
+            "\"Beta; Ltd.\";YAZILIM;5;İzmir;;\n"
+            "Gama;madencilik;5;Ankara;hayır;\n"
+            ";lojistik;-3;Mersin;belki;\n"
+        ).encode("utf-8-sig")
+        etag = self.client.get("/api/companies/")["ETag"]
+
+        resp = self.api.post(self.url, {"file": SimpleUploadedFile("liste.csv", icerik, content_type="text/csv")},
+                             format="multipart")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual({k: resp.data[k] for k in ("rows", "valid", "created", "invalid")},
+                         {"rows": 4, "valid": 2, "created": 2, "invalid": 2})
+        # Satır numarası dosyadaki satır (başlık 1. satır)
+        self.assertEqual([(h["row"], sorted(h["errors"])) for h in resp.data["errors"]],
+                         [(4, ["sector"]), (5, ["employee_count", "is_exporter", "name"])])
+
+        self.assertEqual(
+            set(Sirket.objects.values_list("name", "sector", "is_exporter")),
+            {("Alfa A.Ş.", "imalat", True), ("Beta; Ltd.", "yazilim", False)},
+        )
+        # Sirket.save gibi: boş skor satırı yazılmış, liste önbelleği / ETag yenilenmiş
+        self.assertEqual(SirketSkoru.objects.filter(score=100).count(), 2)
+        liste = self.client.get("/api/companies/")
+        self.assertNotEqual(liste["ETag"], etag)
+        self.assertEqual([s["compliance_score"] for s in liste.json()], [100, 100])
+
+        # Geçerli satır yoksa ya da dosya okunamıyorsa 400, hiçbir şey yazılmaz
+        self.assertEqual(self.api.post(self.url, [{"name": "X"}], format="json").status_code, 400)
+        resp = self.api.post(self.url, {"file": SimpleUploadedFile("l.csv", b"name,sector\nA,imalat\n")},
+                             format="multipart")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("employee_count", resp.data["detail"])
+        self.assertEqual(Sirket.objects.count(), 2)
+
+    def test_eslestirme_ve_batch_basina_sabit_sorgu(self):
+        Duzenleme.objects.create(source="gib", title="BT Tebliği", publish_date=date(2025, 12, 20),
+                                 raw_text="Duyuru.", sectors=["yazilim"], impact_type="zorunlu")
+        Duzenleme.objects.create(source="gib", title="İhracat Desteği", publish_date=date(2025, 12, 20),
+                                 raw_text="Duyuru.", tags=["ihracat"])
+
+        def satirlar(n, ek=0):
+            return [{"name": f"Şirket {ek + i}", "sector": ["yazilim", "imalat"][i % 2], "employee_count": i,
+                     "location_city": "Ankara", "is_exporter": i % 3 == 0} for i in range(n)]
+
+        def sorgu_sayisi(n, ek):
+            with CaptureQueriesContext(connection) as ctx:
+                sonuc = ice_aktarim.ice_aktar(enumerate(satirlar(n, ek), 1), batch_size=100, eslestir=True)
+            self.assertEqual(sonuc["created"], n)
+            return len(ctx.captured_queries)
+
+        # Sorgu sayısı satır sayısına değil batch sayısına bağlı
+        self.assertEqual(sorgu_sayisi(10, 0), sorgu_sayisi(40, 10))
+
+        resp = self.api.post(f"{self.url}?match=true", {"items": satirlar(6, 100)}, format="json")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        # POST /api/companies/ ile aynı kural: yazılım → BT Tebliği, ihracatçı → İhracat Desteği
+        beklenen = {(f"Şirket {100 + i}", "BT Tebliği") for i in range(6) if i % 2 == 0}
+        beklenen |= {(f"Şirket {100 + i}", "İhracat Desteği") for i in range(6) if i % 3 == 0}
+        yeni = SirketObligation.objects.filter(sirket__name__in=[f"Şirket {100 + i}" for i in range(6)])
+        self.assertEqual(set(yeni.values_list("sirket__name", "duzenleme__title")), beklenen)
+        self.assertEqual(resp.data["obligations"], len(beklenen))
+        # Skor yükümlülüklerle güncellenmiş (dashboard ile aynı)
+        sirket = Sirket.objects.get(name="Şirket 100")
+        self.assertEqual(SirketSkoru.objects.get(sirket=sirket).score, build_dashboard_payload(sirket)["uyum_skoru"])
+
+        # match verilmezse yükümlülük açılmaz
+        resp = self.api.post(self.url, satirlar(2, 200), format="json")
+        self.assertEqual((resp.status_code, resp.data["obligations"]), (201, 0))
+        self.assertFalse(SirketObligation.objects.filter(sirket__name="Şirket 200").exists())
+
+    def test_komut_ndjson_dry_run(self):
+        icerik = "\n".join([
+            json.dumps({"name": "Delta", "sector": "perakende", "employee_count": 7, "location_city": "Adana"}),
+            "{bozuk",
+            "",
+            json.dumps(["dizi"]),
+            json.dumps({"name": "Epsilon", "sector": "lojistik", "employee_count": "12",
+                        "location_city": "Mersin", "is_exporter": True, "unvan": "Epsilon Lojistik A.Ş."}),
+        ])
+        with tempfile.TemporaryDirectory() as d:
+            yol = Path(d) / "liste.ndjson"
+            yol.write_text(icerik, encoding="utf-8")
+
+            out, err = StringIO(), StringIO()
+            call_command("import_companies", str(yol), "--dry-run", stdout=out, stderr=err)
+            self.assertIn("4 satır, 2 geçerli, 2 hatalı", out.getvalue())
+            self.assertIn("satır 2: non_field_errors: Geçersiz JSON", err.getvalue())
+            self.assertIn("satır 4: non_field_errors", err.getvalue())
+            self.assertFalse(Sirket.objects.exists())
+
+            call_command("import_companies", str(yol), "--batch-size", "1", stdout=out, stderr=StringIO())
+            self.assertIn("2 şirket eklendi", out.getvalue())
+            self.assertEqual(Sirket.objects.get(name="Epsilon").employee_count, 12)
+
+            (Path(d) / "liste.xlsx").write_bytes(b"")
+            with self.assertRaises(CommandError):
+                call_command("import_companies", str(Path(d) / "liste.xlsx"))
+            (Path(d) / "latin.csv").write_bytes("name,sector,employee_count,location_city\nŞ,imalat,1,X\n".encode("cp1254"))
+            with self.assertRaises(CommandError):
+                call_command("import_companies", str(Path(d) / "latin.csv"))
+            call_command("import_companies", str(Path(d) / "latin.csv"), "--encoding", "cp1254", stdout=out)
+            self.assertTrue(Sirket.objects.filter(name="Ş").exists())
+
+
+class EtiketSektorFiltreTests(TestCase):
+    """
+    Duzenleme.tags / sectors izdüşüm tabloları (trigger'larla güncel) ve
+    GET /api/Duzenlemes/?tag=&sector=&impact_type=&date_from=&date_to= filtreleri.
+    """
+
+    def duzenleme(self, i, tags, sectors, impact_type=None, gun=0):
+        return Duzenleme.objects.create(
+            source="gib", title=f"Tebliğ {i}", publish_date=date(2025, 1, 1) + timedelta(days=gun),
+            raw_text="Duyuru.", tags=tags, sectors=sectors, impact_type=impact_type,
+        )
+
+    def izdusum_tutarli(self):
+        beklenen_etiket, beklenen_sektor = set(), set()
+        for pk, tags, sectors in Duzenleme.objects.values_list("id", "tags", "sectors"):
+            beklenen_etiket |= {(pk, t) for t in tags}
+            beklenen_sektor |= {(pk, s) for s in sectors}
+        self.assertEqual(set(DuzenlemeEtiketi.objects.values_list("duzenleme_id", "tag")), beklenen_etiket)
+        self.assertEqual(set(DuzenlemeSektoru.objects.values_list("duzenleme_id", "sector")), beklenen_sektor)
+
+    def test_izdusum_her_yazma_yolunda_guncel(self):
+        a = self.duzenleme(1, ["KDV", "vergi", "KDV"], ["imalat"])
+        b = self.duzenleme(2, ["ihracat"], ["yazilim", "imalat"])
+        self.izdusum_tutarli()
+
+        a.tags = ["vergi"]
+        a.save()
+        Duzenleme.objects.filter(pk=b.pk).update(sectors=["lojistik"])
+        duzenlemeleri_upsert([{"source": "gib", "title": "Tebliğ 3", "publish_date": date(2025, 2, 1),
+                               "raw_text": "KDV beyannamesi ihracatçı firmalar için zorunludur."}])
+        self.izdusum_tutarli()
+        self.assertTrue(DuzenlemeEtiketi.objects.filter(duzenleme__title="Tebliğ 3").exists())
+
+        b.delete()
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {Duzenleme._meta.db_table} WHERE id = %s", [a.pk])
+        self.izdusum_tutarli()
+
+        # Baştan doldurma aynı sonucu verir
+        etiketler = set(DuzenlemeEtiketi.objects.values_list("duzenleme_id", "tag"))
+        etiket_indeksi.yeniden_doldur()
+        self.assertEqual(set(DuzenlemeEtiketi.objects.values_list("duzenleme_id", "tag")), etiketler)
+
+    def test_liste_filtreleri_json_ile_ayni(self):
+        rnd = random.Random(25)
+        for i in range(60):
+            self.duzenleme(
+                i, rnd.sample(["KDV", "vergi", "ihracat", "KOSGEB"], rnd.randint(0, 3)),
+                rnd.sample(["imalat", "yazilim", "lojistik"], rnd.randint(0, 2)),
+                rnd.choice(["zorunlu", "risk", "opsiyonel_tesvik", None]), gun=rnd.randint(0, 20),
+            )
+        kayitlar = list(Duzenleme.objects.order_by("-publish_date", "-id").values(
+            "id", "tags", "sectors", "impact_type", "publish_date"))
+
+        def beklenen(tags=(), sectors=(), impact_type=None, date_from=None, date_to=None):
+            return [k["id"] for k in kayitlar
+                    if set(tags) <= set(k["tags"]) and set(sectors) <= set(k["sectors"])
+                    and (impact_type is None or k["impact_type"] == impact_type)
+                    and (date_from is None or k["publish_date"] >= date_from)
+                    and (date_to is None or k["publish_date"] <= date_to)]
+
+        url = reverse("Duzenleme-list-create")
+        for params, kosul in (
+            ({"tag": "KDV"}, {"tags": ["KDV"]}),
+            ({"tag": ["KDV", "vergi"], "sector": "imalat"}, {"tags": ["KDV", "vergi"], "sectors": ["imalat"]}),
+            ({"tag": "KDV", "sector": "imalat", "impact_type": "zorunlu"},
+             {"tags": ["KDV"], "sectors": ["imalat"], "impact_type": "zorunlu"}),
+            ({"sector": "yazilim", "date_from": "2025-01-05", "date_to": "2025-01-15"},
+             {"sectors": ["yazilim"], "date_from": date(2025, 1, 5), "date_to": date(2025, 1, 15)}),
+            ({"tag": "yok"}, {"tags": ["yok"]}),
+        ):
+            with self.subTest(params=params):
+                resp = self.client.get(url, params)
+                self.assertEqual([d["id"] for d in resp.json()], beklenen(**kosul))
+
+        # Keyset sayfalama filtreleri korur (next URL'si aynı parametrelerle)
+        ids, sonraki = [], f"{url}?tag=KDV&sector=imalat&page_size=3"
+        while sonraki:
+            sayfa = self.client.get(sonraki).json()
+            ids += [d["id"] for d in sayfa["results"]]
+            sonraki = sayfa["next"]
+        self.assertEqual(ids, beklenen(tags=["KDV"], sectors=["imalat"]))
+
+        # Yaygın etikette sayfalı liste EXISTS'e geçer; sonuç aynı
+        with mock.patch.object(etiket_indeksi, "YAYGIN_ESIGI", 1):
+            ids, sonraki = [], f"{url}?tag=KDV&page_size=3"
+            while sonraki:
+                with CaptureQueriesContext(connection) as ctx:
+                    sayfa = self.client.get(sonraki).json()
+                self.assertIn("EXISTS", ctx.captured_queries[-1]["sql"])
+                ids += [d["id"] for d in sayfa["results"]]
+                sonraki = sayfa["next"]
+        self.assertEqual(ids, beklenen(tags=["KDV"]))
+
+        # JSON fonksiyonu değil, izdüşüm tablosuyla JOIN
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {"tag": "KDV", "sector": "imalat"})
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertIn(DuzenlemeEtiketi._meta.db_table, sql)
+        self.assertIn(DuzenlemeSektoru._meta.db_table, sql)
+        self.assertNotIn("json_each", sql)
+
+        for params in ({"impact_type": "bilinmeyen"}, {"date_from": "2025-13-01"}, {"date_to": "dün"}):
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn(next(iter(params)), resp.json())
+
+
+@skipUnless(connection.vendor == "sqlite", "trigger'lar sadece SQLite'ta")
+# Gerçek commit'ler: yeniden eşleştirme kuyruğu arka plan thread'inde çalışmasın (paylaşılan bellek DB'sini kilitler)
+@override_settings(ESLESTIRME_ARKA_PLAN=False)
+class DuzenlemeTetikleyiciTests(TransactionTestCase):
+
+    def etiketler(self, d):
+        return sorted(DuzenlemeEtiketi.objects.filter(duzenleme=d).values_list("tag", flat=True))
+
+    # ---------------------------------------
+    # 1) Python fonksiyonu kayıtlı olmayan bağlantıdan (sqlite3 / dbshell) yazma çalışır,
+    #    FTS indeksi ve etiket izdüşümü güncel kalır
+    # ---------------------------------------
+    def test_baska_baglantidan_yazma(self):
+        d = Duzenleme.objects.create(
+            source="gib", title="KDV Tebliği", publish_date=date(2025, 1, 2), raw_text="İhracatçı firmalar için."
+        )
+        params = connection.get_connection_params()
+        dis = sqlite3.connect(params["database"], uri=params.get("uri", False))
+        try:
+            dis.execute(
+                "UPDATE mevzuat_parca_duzenleme SET title = ?, tags = ? WHERE id = ?",
+                ["Işıklı Levha Tebliği", '["levha"]', d.pk],
+            )
+            dis.commit()
+            self.assertEqual(arama.ara("isikli")[0], 1)
+            self.assertEqual(arama.ara("kdv")[0], 0)
+            self.assertEqual(arama.ara("ihracatci")[0], 1)
+            self.assertEqual(self.etiketler(d), ["levha"])
+
+            dis.execute("DELETE FROM mevzuat_parca_duzenleme WHERE id = ?", [d.pk])
+            dis.commit()
+        finally:
+            dis.close()
+        self.assertEqual(arama.ara("ihracatci")[0], 0)
+        self.assertEqual(self.etiketler(d), [])
+        self.assertFalse(AramaIndeksIsi.objects.exists())
+
+    # ---------------------------------------
+    # 2) Tabloyu yeniden oluşturan AlterField trigger'ları siler; post_migrate geri kurar,
+    #    aradaki yazmaları indekse / izdüşüme işler
+    # ---------------------------------------
+    def test_tablo_yeniden_olusunca_post_migrate_onarir(self):
+        self.assertEqual(arama.eksik_tetikleyiciler(), [])
+        self.assertEqual(etiket_indeksi.eksik_tetikleyiciler(), [])
+
+        eski = Duzenleme._meta.get_field("title")
+        yeni = models.CharField(max_length=600)
+        yeni.set_attributes_from_name("title")
+        with connection.schema_editor() as se:
+            se.alter_field(Duzenleme, eski, yeni)
+        try:
+            self.assertCountEqual(arama.eksik_tetikleyiciler(), arama.TRIGGER_ADLARI)
+            self.assertCountEqual(etiket_indeksi.eksik_tetikleyiciler(), etiket_indeksi.TRIGGER_ADLARI)
+
+            # Trigger'sız yazma: indeks ve izdüşüm kaçırır
+            d = Duzenleme.objects.create(
+                source="gib", title="İhracat Tebliği", publish_date=date(2025, 1, 2), raw_text="Genel duyuru."
+            )
+            Duzenleme.objects.filter(pk=d.pk).update(tags=["ihracat"])
+            self.assertEqual(self.etiketler(d), [])
+            self.assertEqual(arama.ara("ihracat")[0], 0)
+
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+            self.assertEqual(arama.eksik_tetikleyiciler(), [])
+            self.assertEqual(etiket_indeksi.eksik_tetikleyiciler(), [])
+            self.assertEqual(self.etiketler(d), ["ihracat"])
+            self.assertEqual(arama.ara("ihracat")[1][0][0], d.pk)
+            resp = APIClient().get(reverse("Duzenleme-list-create"), {"tag": "ihracat"})
+            self.assertEqual([r["id"] for r in resp.json()], [d.pk])
+        finally:
+            with connection.schema_editor() as se:
+                se.alter_field(Duzenleme, yeni, eski)
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+        self.assertEqual(arama.eksik_tetikleyiciler(), [])
+
+
+class SikistirilmisMetinTests(TestCase):
+
+    def ham_deger(self, pk):
+        """raw_text kolonunun DB'deki ham değeri (alanın dönüşümü olmadan)."""
+        with connection.cursor() as cur:
+            cur.execute("SELECT raw_text FROM mevzuat_parca_duzenleme WHERE id = %s", [pk])
+            return cur.fetchone()[0]
+
+    # ---------------------------------------
+    # 1) DB'de sıkıştırılmış, Python'da str; FTS indeksi açılmış metni görür
+    # ---------------------------------------
+    def test_sikistirilmis_saklanir_fts_calisir(self):
+        d = Duzenleme.objects.create(
+            source="gib", title="KDV Tebliği", publish_date=date(2025, 12, 20), raw_text=KDV_METNI * 5
+        )
+        ham = self.ham_deger(d.pk)
+        self.assertTrue(sikistirilmis_mi(ham))
+        self.assertLess(len(ham), len(KDV_METNI.encode("utf-8")))
+
+        self.assertEqual(Duzenleme.objects.get(pk=d.pk).raw_text, KDV_METNI * 5)
+        self.assertEqual(Duzenleme.objects.values_list("raw_text", flat=True).get(pk=d.pk), KDV_METNI * 5)
+        self.assertEqual(arama.ara("ihracatci")[0], 1)
+
+        # Güncellemede indeks açılmış eski/yeni metinle senkron kalır
+        d.raw_text = SGK_METNI
+        d.save()
+        self.assertEqual(arama.ara("ihracatci")[0], 0)
+        self.assertEqual(arama.ara("prim")[0], 1)
+
+        # Migration öncesinden kalmış düz metin satırı da okunur
+        with connection.cursor() as cur:
+            cur.execute("UPDATE mevzuat_parca_duzenleme SET raw_text = %s WHERE id = %s", ["Eski düz metin", d.pk])
+        self.assertEqual(Duzenleme.objects.get(pk=d.pk).raw_text, "Eski düz metin")
+
+    # ---------------------------------------
+    # 2) Skor hesaplarken tam metin yüklenmez (istenirse tembel yüklenir)
+    # ---------------------------------------
+    def test_skor_sorgusu_metni_yuklemez(self):
+        sirket = Sirket.objects.create(name="A", sector="yazilim", employee_count=5, location_city="İzmir")
+        d = Duzenleme.objects.create(
+            source="gib", title="KDV Tebliği", publish_date=date(2025, 12, 20), raw_text=KDV_METNI
+        )
+        SirketObligation.objects.create(sirket=sirket, duzenleme=d)
+
+        with CaptureQueriesContext(connection) as ctx:
+            hesapla_sirket_skoru(sirket)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("raw_text", ctx.captured_queries[0]["sql"])
+
+        obl = SirketObligation.objects.select_related("duzenleme").defer("duzenleme__raw_text").get()
+        self.assertEqual(obl.duzenleme.raw_text, KDV_METNI)
+
+
+# Kayıtlı sayfaları (test_data/ingestion) sunan yerel HTTP sunucusu
+KAYITLI_SAYFALAR = Path(__file__).resolve().parent / "test_data" / "ingestion"
+
+# Tüm günün düzenlemelerini içeren tam sayı
+TAM_SAYI = KAYITLI_SAYFALAR / "resmi_gazete" / "sayi" / "20251220.htm"
+
+
+class SayiAkisParserTests(SimpleTestCase):
+
+    # ---------------------------------------
+    # 1) Parça sınırı (çok baytlı harfin/etiketin ortası) sonucu değiştirmemeli
+    # ---------------------------------------
+    def test_parca_boyutundan_bagimsiz(self):
+        buyuk = list(sayi_adaylari(dosya_parcalari(TAM_SAYI)))
+        kucuk = list(sayi_adaylari(dosya_parcalari(TAM_SAYI, parca_boyutu=7)))
+        self.assertEqual(buyuk, kucuk)
+
+        # Bölüm başlığı (gövdesiz h2) aday değil; tarih sayı başlığından
+        self.assertEqual(len(buyuk), 3)
+        self.assertTrue(buyuk[0]["title"].startswith("Katma Değer Vergisi"))
+        self.assertEqual(buyuk[0]["publish_date"], date(2025, 12, 20))
+        self.assertNotIn("reklam", buyuk[0]["raw_text"])
+        self.assertIn("KOBİ'lere", buyuk[1]["raw_text"])
+
+    # ---------------------------------------
+    # 2) Tek düzenleme metni max_metin'i aşamaz; generator tembel çalışmalı
+    # ---------------------------------------
+    def test_metin_siniri_ve_tembel_uretim(self):
+        adaylar = sayi_adaylari(dosya_parcalari(TAM_SAYI, parca_boyutu=64), max_metin=40)
+        with self.assertLogs("mevzuat_parca.ingestion.akis", "WARNING"):
+            ilk = next(adaylar)
+            self.assertLessEqual(len(ilk["raw_text"]), 40)
+            self.assertEqual(len(list(adaylar)), 2)
+
+    # ---------------------------------------
+    # 3) Yazılı ay adı: büyük harf, ASCII yazım, noktalı İ; bilinmeyen ay → None
+    # ---------------------------------------
+    def test_yazili_tarih_buyuk_harf_ve_ascii(self):
+        for metin, beklenen in (
+            ("Resmî Gazete 1 EKIM 2025 Sayı: 33000", date(2025, 10, 1)),
+            ("3 NISAN 2024", date(2024, 4, 3)),
+            ("3 NİSAN 2024", date(2024, 4, 3)),
+            ("20 ARALIK 2025", date(2025, 12, 20)),
+            ("20 Aralik 2025", date(2025, 12, 20)),
+            ("14 ŞUBAT 2025", date(2025, 2, 14)),
+            ("14 Subat 2025", date(2025, 2, 14)),
+            ("9 AĞUSTOS 2024", date(2024, 8, 9)),
+            ("Sayı 5 Foo 2025", None),
+            ("31 Şubat 2025 tarihli, 2 Mart 2025", date(2025, 3, 2)),
+        ):
+            with self.subTest(metin=metin):
+                self.assertEqual(metinden_tarih(metin), beklenen)
+
+
+class KayitliSayfaHandler(SimpleHTTPRequestHandler):
+    # Bu path'ler ilk istekte 503 döner (tekrar deneme testi için)
+    fail_once = set()
+    # Gelen isteklerin path listesi
+    istekler = []
+
+    def do_GET(self):
+        KayitliSayfaHandler.istekler.append(self.path)
+        if self.path in KayitliSayfaHandler.fail_once:
+            KayitliSayfaHandler.fail_once.discard(self.path)
+            self.send_error(503)
+            return
+        # ETag (dosya mtime + boyut); If-None-Match tutarsa 304.
+        # If-Modified-Since → 304 zaten SimpleHTTPRequestHandler'da var.
+        self._etag = None
+        yol = Path(self.translate_path(self.path))
+        if yol.is_file():
+            st = yol.stat()
+            self._etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self.headers.get("If-None-Match") == self._etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+        super().do_GET()
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass  # test çıktısını kirletmesin
+
+
+class IngestionPipelineTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Testler sayfaları değiştirebilsin diye geçici kopya sunulur
+        cls.kok = Path(tempfile.mkdtemp()) / "sayfalar"
+        handler = partial(KayitliSayfaHandler, directory=str(cls.kok))
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.kok.parent, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(self.kok, ignore_errors=True)
+        shutil.copytree(KAYITLI_SAYFALAR, self.kok)
+        KayitliSayfaHandler.fail_once = set()
+        KayitliSayfaHandler.istekler = []
+        ayar = {
+            "SOURCES": {"resmi_gazete": f"{self.base}/resmi_gazete", "gib": f"{self.base}/gib"},
+            "RATE": 0,
+            "BACKOFF": 0.01,
+        }
+        self.override = override_settings(MEVZUAT_INGESTION=ayar)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+
+    def calistir(self, *args):
+        out = StringIO()
+        call_command("fetch_duzenlemeler", *args, stdout=out)
+        return out.getvalue()
+
+    def sayfayi_degistir(self, yol, eski, yeni):
+        """Sunulan sayfayı değiştirir; mtime ileri alınır (ETag/Last-Modified değişsin)."""
+        dosya = self.kok / yol
+        dosya.write_text(dosya.read_text(encoding="utf-8").replace(eski, yeni), encoding="utf-8")
+        st = dosya.stat()
+        os.utime(dosya, (st.st_atime + 10, st.st_mtime + 10))
+
+    # ---------------------------------------
+    # 1) Resmî Gazete fihristi + detaylar çekilip NLP ile kaydedilmeli
+    # ---------------------------------------
+    def test_resmi_gazete_gunluk_fihrist(self):
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-21")
+        self.assertIn("yeni=2", out)
+
+        kdv = Duzenleme.objects.get(title__startswith="Katma Değer Vergisi")
+        self.assertEqual(kdv.publish_date, date(2025, 12, 20))
+        self.assertIn("KDV", kdv.tags)
+        self.assertEqual(kdv.impact_type, "zorunlu")
+        self.assertNotIn("font-family", kdv.raw_text)  # style/script metne karışmamalı
+
+        kosgeb = Duzenleme.objects.get(title__startswith="KOSGEB")
+        self.assertEqual(kosgeb.impact_type, "opsiyonel_tesvik")
+
+    # ---------------------------------------
+    # 2) GİB sayfalı liste: 404 olan sayfada durmalı, tarih detaydan okunmalı
+    # ---------------------------------------
+    def test_gib_sayfali_liste(self):
+        out = self.calistir("--source", "gib", "--max-pages", "5")
+        self.assertIn("yeni=2", out)
+        self.assertNotIn("/gib/mevzuat/tebligler/sayfa-3.html", KayitliSayfaHandler.istekler)
+
+        sgk = Duzenleme.objects.get(source="gib", title__startswith="SGK")
+        self.assertEqual(sgk.publish_date, date(2025, 12, 15))
+        self.assertIn("lojistik", sgk.sectors)
+
+    # ---------------------------------------
+    # 3) Geçici 503 hatasında tekrar denemeli; ikinci çalıştırma duplicate üretmemeli
+    # ---------------------------------------
+    def test_retry_ve_tekrar_calistirma(self):
+        KayitliSayfaHandler.fail_once = {"/resmi_gazete/eskiler/2025/12/20251220-1.htm"}
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-20")
+        self.assertIn("yeni=2", out)
+        self.assertIn("tekrar=1", out)
+
+        # İkinci çalıştırma: fihrist değişmedi → 304, detaylar hiç istenmez
+        KayitliSayfaHandler.istekler = []
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-20")
+        self.assertIn("yeni=0", out)
+        self.assertIn("degismedi=1", out)
+        self.assertEqual(KayitliSayfaHandler.istekler, ["/resmi_gazete/eskiler/2025/12/20251220.htm"])
+        self.assertEqual(Duzenleme.objects.filter(source="resmi_gazete").count(), 2)
+
+        # --full: doğrulayıcılar yok sayılır, her şey tekrar çekilir ama duplicate olmaz
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-20", "--full")
+        self.assertIn("mevcut=2", out)
+        self.assertEqual(Duzenleme.objects.filter(source="resmi_gazete").count(), 2)
+
+    # ---------------------------------------
+    # 4) Checkpoint: eski --since checkpoint'e çekilmeli, geçmiş tekrar taranmamalı
+    # ---------------------------------------
+    def test_checkpoint_gecmisi_tekrar_taramaz(self):
+        self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-21")
+        cp = KaynakCheckpoint.objects.get(source="resmi_gazete")
+        self.assertEqual(cp.last_publish_date, date(2025, 12, 20))
+        self.assertTrue(KaynakSayfasi.objects.get(url__endswith="/20251220-1.htm").etag)
+
+        KayitliSayfaHandler.istekler = []
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-01-01", "--until", "2025-12-21")
+        self.assertIn("yeni=0", out)
+        # Sadece checkpoint günü (koşullu, 304) ve sonrası istenir
+        self.assertEqual(KayitliSayfaHandler.istekler, [
+            "/resmi_gazete/eskiler/2025/12/20251220.htm",
+            "/resmi_gazete/eskiler/2025/12/20251221.htm",
+        ])
+
+    # ---------------------------------------
+    # 5) Değişen sayfa: sadece değişen detay yeniden ayrıştırılıp güncellenmeli
+    # ---------------------------------------
+    def test_degisen_detay_guncellenir(self):
+        self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-20")
+        kdv = Duzenleme.objects.get(title__startswith="Katma Değer Vergisi")
+
+        # Fihrist (ör. mükerrer sayı eklendi) ve KDV detayı değişti; KOSGEB aynı
+        self.sayfayi_degistir("resmi_gazete/eskiler/2025/12/20251220.htm", "</body>", "<!-- mukerrer --></body>")
+        self.sayfayi_degistir("resmi_gazete/eskiler/2025/12/20251220-1.htm", "</body>", "<p>Ek madde: SGK bildirimi.</p></body>")
+
+        out = self.calistir("--source", "resmi_gazete", "--since", "2025-12-20", "--until", "2025-12-20")
+        self.assertIn("yeni=0 guncel=1", out)
+        self.assertIn("degismedi=1", out)
+
+        kdv.refresh_from_db()
+        self.assertIn("Ek madde", kdv.raw_text)
+        self.assertIn("SGK", kdv.tags)
+        self.assertEqual(Duzenleme.objects.filter(source="resmi_gazete").count(), 2)
+
+    # ---------------------------------------
+    # 6) Sayfalı kaynak: imleçteki (önceki en yeni) kayda gelince durmalı
+    # ---------------------------------------
+    def test_gib_imlec(self):
+        self.calistir("--source", "gib", "--max-pages", "5")
+        cp = KaynakCheckpoint.objects.get(source="gib")
+        self.assertTrue(cp.cursor.endswith("/teblig/kdv-iade-2025-12.html"))
+
+        # Listenin başına yeni bir kayıt geldi
+        (self.kok / "gib/mevzuat/teblig/e-fatura-2025.html").write_text(
+            "<html><body><h1>E-Fatura Geçiş Tebliği</h1><p>19.12.2025</p>"
+            "<p>E-fatura uygulamasına geçiş zorunludur.</p></body></html>",
+            encoding="utf-8",
+        )
+        self.sayfayi_degistir(
+            "gib/mevzuat/tebligler/sayfa-1.html",
+            '<ul class="mevzuat-liste">',
+            '<ul class="mevzuat-liste">\n  <li><a href="../teblig/e-fatura-2025.html">E-Fatura Geçiş Tebliği</a></li>',
+        )
+        KayitliSayfaHandler.istekler = []
+        out = self.calistir("--source", "gib", "--max-pages", "5")
+        self.assertIn("yeni=1", out)
+        # İmleçten sonrası ve 2. sayfa istenmemeli
+        self.assertNotIn("/gib/mevzuat/teblig/kdv-iade-2025-12.html", KayitliSayfaHandler.istekler)
+        self.assertNotIn("/gib/mevzuat/tebligler/sayfa-2.html", KayitliSayfaHandler.istekler)
+        cp.refresh_from_db()
+        self.assertTrue(cp.cursor.endswith("/teblig/e-fatura-2025.html"))
+        self.assertEqual(cp.last_publish_date, date(2025, 12, 19))
+
+    # ---------------------------------------
+    # 7) Tam sayı: akışlı HTTP gövdesinden toplu upsert'e
+    # ---------------------------------------
+    def test_tam_sayi_akisli_import(self):
+        url = f"{self.base}/resmi_gazete/sayi/20251220.htm"
+        out = StringIO()
+        call_command("import_gazete_issue", url, "--batch-size", "2", stdout=out)
+        self.assertIn("yeni=3", out.getvalue())
+
+        kvkk = Duzenleme.objects.get(title__startswith="Kişisel Verilerin")
+        self.assertEqual(kvkk.url, url + "#3")
+        self.assertEqual(kvkk.publish_date, date(2025, 12, 20))
+
+        # Aynı sayı yerel dosyadan: değişen bir şey yok
+        out = StringIO()
+        call_command("import_gazete_issue", str(self.kok / "resmi_gazete/sayi/20251220.htm"), stdout=out)
+        self.assertIn("mevcut=3", out.getvalue())
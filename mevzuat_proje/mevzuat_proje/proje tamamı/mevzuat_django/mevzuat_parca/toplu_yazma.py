@@ -0,0 +1,146 @@
+# mevzuat_parca/toplu_yazma.py
+#
+# Düzenlemeler için toplu upsert (çekme hattı, toplu içe aktarma vb.).
+#
+# get_or_create döngüsü satır başına bir SELECT + bir INSERT demek (50k kayıt → 100k sorgu).
+# Burada her batch için:
+#   1) tek SELECT: batch'teki doğal anahtarların mevcut kayıtları
+#   2) NLP: sadece yeni/değişen kayıtlar için (model önbelleği + elle girilen alanlar korunur)
+#   3) tek INSERT ... ON CONFLICT (source, title, publish_date) DO UPDATE
+# FTS indeksi trigger'larla güncel kalır (ON CONFLICT DO UPDATE, UPDATE trigger'ını çalıştırır).
+# Yeni/değişen kayıtlar yakın kopya indeksine de eklenir (benzerlik.indeksle),
+# yeni kayıtlar için eşleşen şirketlere yükümlülük açılır (eslestirme); sektör/etiketi
+# değişen mevcut kayıtlar yeniden eşleştirme kuyruğuna girer (eslestirme.kuyruga_ekle).
+
+from itertools import islice
+
+from django.db import transaction
+
+from . import arama, benzerlik, eslestirme, panel_onbellek
+from .models import Duzenleme
+from .nlp_rules import RULES_VERSION, content_fingerprint
+
+
+# Adaydan gelebilecek veri alanları (verilmeyen alan mevcut değerini korur)
+VERI_ALANLARI = ("url", "raw_text", "summary")
+
+# Çakışmada (kayıt zaten varsa) güncellenecek alanlar (updated_at: bulk_create auto_now'ı doldurur)
+UPSERT_ALANLARI = [*VERI_ALANLARI, *Duzenleme.NLP_FIELDS, "updated_at"]
+
+
+def dogal_anahtar(aday) -> tuple:
+    """Aday dict'inin doğal anahtarı: (source, title, publish_date)"""
+    return tuple(aday[alan] for alan in Duzenleme.NATURAL_KEY)
+
+
+def _mevcut_kayitlar(anahtarlar):
+    """
+    Batch'teki anahtarların DB'deki karşılıkları (tek sorgu; raw_text yüklenmez).
+    Sadece (source, title) ile filtrelenir: üç kolonda birden IN verilirse SQLite
+    unique indekste tüm kombinasyonları (kaynak × başlık × tarih) tek tek arıyor.
+    Tarih eşleşmesi Python'da yapılır.
+    """
+    qs = Duzenleme.objects.filter(
+        source__in={a[0] for a in anahtarlar},
+        title__in={a[1] for a in anahtarlar},
+    ).defer("raw_text")
+    mevcut = {}
+    for obj in qs:
+        anahtar = (obj.source, obj.title, obj.publish_date)
+        if anahtar in anahtarlar:
+            mevcut[anahtar] = obj
+    return mevcut
+
+
+def _degismedi(obj, aday) -> bool:
+    """Kayıt adayla aynı mı? (metin parmak izi + diğer alanlar + kural sürümü)"""
+    return (
+        obj.content_hash == content_fingerprint(obj.title, aday["raw_text"])
+        and obj.nlp_version == RULES_VERSION
+        and all(getattr(obj, alan) == aday[alan] for alan in ("url", "summary") if alan in aday)
+    )
+
+
+def _batch_yaz(adaylar, sayac, eslestirici):
+    # Aynı batch'te aynı anahtar birden fazla gelirse sonuncusu geçerli
+    tekil = {dogal_anahtar(a): a for a in adaylar}
+    mevcut = _mevcut_kayitlar(tekil)
+
+    yazilacak = []
+    yeniler = []
+    eslesmesi_degisen = []
+    for anahtar, aday in tekil.items():
+        obj = mevcut.get(anahtar)
+        if obj is not None and _degismedi(obj, aday):
+            sayac["unchanged"] += 1
+            continue
+
+        if obj is None:
+            obj = Duzenleme(**dict(zip(Duzenleme.NATURAL_KEY, anahtar)))
+            yeniler.append(obj)
+            sayac["inserted"] += 1
+        else:
+            sayac["updated"] += 1
+
+        for alan in VERI_ALANLARI:
+            if alan in aday:
+                setattr(obj, alan, aday[alan])
+
+        # save() ile aynı NLP kuralı: boş/otomatik dolmuş alanlar güncellenir
+        sonuc, fingerprint, _ = obj.nlp_sonucu()
+        obj.nlp_sonucunu_uygula(sonuc, fingerprint)
+        yazilacak.append(obj)
+        if obj.pk is not None and obj.eslesme_degisiklikleri():
+            eslesmesi_degisen.append(obj.pk)
+
+    if yazilacak:
+        # SQLite 3.35+ / PostgreSQL: ON CONFLICT'li insert de pk'ları geri döndürür
+        Duzenleme.objects.bulk_create(
+            yazilacak,
+            update_conflicts=True,
+            unique_fields=list(Duzenleme.NATURAL_KEY),
+            update_fields=UPSERT_ALANLARI,
+        )
+        sayac["duplicates"] += benzerlik.indeksle(yazilacak)["linked"]
+    if yeniler:
+        sayac["obligations"] += eslestirici([obj.pk for obj in yeniler])
+    # bulk_create save() çağırmaz: değişen eşleşme alanları burada kuyruğa yazılır,
+    # etki tipi dashboard'da da göründüğü için bu düzenlemelerin şirket payload'ları geçersiz
+    eslestirme.kuyruga_ekle("duzenleme", eslesmesi_degisen)
+    panel_onbellek.duzenlemeler_degisti(eslesmesi_degisen)
+    # Trigger'ların kuyruğa yazdığı metin değişiklikleri aynı transaction'da FTS indeksine
+    # (ilk arama binlerce satırı işlemek zorunda kalmasın)
+    arama.indeksi_guncelle()
+
+
+def duzenlemeleri_upsert(adaylar, batch_size=500) -> dict:
+    """
+    Aday dict'lerini ({"source", "title", "publish_date", "raw_text", ["url"], ["summary"]})
+    batch_size'lık parçalar halinde ekler veya günceller.
+    Her batch kendi transaction'ında yazılır; adaylar iterator olabilir.
+    Dönüş: {"inserted": ..., "updated": ..., "unchanged": ..., "duplicates": ..., "obligations": ...}
+    (duplicates: bu çağrıda başka bir kaydın yakın kopyası olarak bağlananlar,
+    obligations: yeni kayıtlar için açılan yükümlülükler)
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size en az 1 olmalı")
+
+    # Şirket indeksi ilk yeni kayıtta bir kez okunur, sonraki batch'ler aynısını kullanır
+    indeks = None
+
+    def eslestirici(ids):
+        nonlocal indeks
+        if indeks is None:
+            indeks = eslestirme.SirketIndeksi.yukle()
+        sonuc = eslestirme.yukumlulukleri_uret(Duzenleme.objects.filter(pk__in=ids), indeks=indeks)
+        return sonuc["created"]
+
+    sayac = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "obligations": 0}
+    it = iter(adaylar)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        with transaction.atomic():
+            _batch_yaz(batch, sayac, eslestirici)
+    return sayac
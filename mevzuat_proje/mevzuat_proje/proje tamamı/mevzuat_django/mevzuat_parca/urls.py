@@ -37,6 +37,11 @@ urlpatterns = [
     # 3) Obligation toggle (PATCH)
     # =========================
 
+    # Çok sayıda yükümlülüğün durumunu tek istekte / tek transaction'da güncelle
+    # Body: {"items": [{"id": ..., "is_compliant": true/false}, ...]}
+    # URL: /api/obligations/bulk-status/
+    path("api/obligations/bulk-status/", views.obligation_bulk_status_api, name="obligation-bulk-status-api"),
+
     # React’ta "Tamamlandı" / "Geri al" butonlarının PATCH attığı endpoint
     # Body: {"is_compliant": true/false}
     # URL: /api/obligations/<obligation_id>/status/
@@ -55,6 +60,11 @@ urlpatterns = [
     # URL: /api/companies/
     path("api/companies/", views.SirketListCreateView.as_view(), name="Sirket-list-create"),
 
+    # Toplu şirket içe aktarımı (POST; multipart "file" CSV / JSON / NDJSON ya da JSON dizisi)
+    # ?match=true → yükümlülük eşleştirmesi de yapılır, ?dry_run=true → sadece doğrulama
+    # URL: /api/companies/import/
+    path("api/companies/import/", views.companies_import_api, name="companies-import-api"),
+
     # Şirket detay (GET) / güncelle (PUT/PATCH) / sil (DELETE)
     # URL: /api/companies/<id>/
     path("api/companies/<int:pk>/", views.SirketDetailView.as_view(), name="Sirket-detail"),
@@ -63,6 +73,10 @@ urlpatterns = [
     # URL: /api/Duzenlemes/
     path("api/Duzenlemes/", views.DuzenlemeListCreateView.as_view(), name="Duzenleme-list-create"),
 
+    # Düzenleme tam metin arama (GET, FTS5 + sıralama + snippet)
+    # URL: /api/Duzenlemes/search/?q=...
+    path("api/Duzenlemes/search/", views.duzenleme_search_api, name="Duzenleme-search"),
+
     # Düzenleme detay (GET) / güncelle (PUT/PATCH) / sil (DELETE)
     # URL: /api/Duzenlemes/<id>/
     path("api/Duzenlemes/<int:pk>/", views.DuzenlemeDetailView.as_view(), name="Duzenleme-detail"),
@@ -110,4 +124,12 @@ urlpatterns = [
     # /api/companies-spa-list/ -> JSON döner (React bunu çeker)
     # NOT: /api/companies-spa/ HTML sayfadır (template render), JSON değildir.
     path("api/companies-spa-list/", views.companies_spa_list_api, name="companies-spa-list-api"),
+
+    # Portföy uyum dışa aktarımı (akış): ?format=ndjson|csv
+    # URL: /api/export/portfolio/
+    path("api/export/portfolio/", views.portfolio_export_api, name="portfolio-export-api"),
+
+    # Süreç sayaçları (dashboard önbelleği isabet oranı, yeniden hesaplama süresi)
+    # URL: /api/metrics/
+    path("api/metrics/", views.metrics_api, name="metrics-api"),
 ]
@@ -1,5 +1,3 @@
-# Python standart kütüphane: dict içinde list biriktirmek için
-from collections import defaultdict
 
 # Tarih hesapları (deadline kontrolü vs.)
 from datetime import date, timedelta
@@ -19,18 +17,80 @@ from rest_framework.decorators import api_view
 # DRF: JSON response helper
 from rest_framework.response import Response
 
+# DRF: 400 yanıtına dönüşen doğrulama hatası (geçersiz filtre parametresi)
+from rest_framework.exceptions import ValidationError
+
 # Proje modelleri
 from .models import Sirket, Duzenleme, SirketObligation
 
 # Serializer’lar (Model -> JSON)
-from .serilestiriciler import SirketSerializer, DuzenlemeSerializer
+from .serilestiriciler import SirketSerializer, DuzenlemeSerializer, DuzenlemeListeSerializer, eslemci
 
 # Django: JSON döndürmek için
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
 # Django: belirli HTTP methodlarına izin vermek için
 from django.views.decorators.http import require_http_methods
 
+# Koşullu GET (ETag / Last-Modified → 304)
+from functools import wraps
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+# FTS5 tam metin arama yardımcıları
+from . import arama
+
+# Yükümlülük eşleştirme motoru (yeni şirkete mevcut düzenlemelerden yükümlülük açar)
+from .eslestirme import yukumlulukleri_uret
+
+# Dashboard payload önbelleği (son tarih sınırına kadar geçerli, yazmalarda geçersiz)
+from . import panel_onbellek
+
+# Sıcak okuma yolları: orjson / msgpack yanıt (+ serilestiriciler.eslemci: derlenmiş alan eşlemcisi)
+from . import hizli_json
+
+# Portföy dışa aktarımı (NDJSON / CSV akışı) ve toplu şirket içe aktarımı
+from . import disa_aktarim, ice_aktarim
+
+# Düzenleme listesi etiket / sektör / etki tipi / tarih filtreleri (indeksli izdüşüm tabloları)
+from . import etiket_indeksi
+
+# Liste endpoint'leri için keyset (cursor) sayfalama
+from . import sayfalama
+from rest_framework.utils.urls import replace_query_param
+
+# Saklanan uyum skoru (liste ekranları her istekte hesaplamasın) + formül sabitleri
+from . import skorlama
+from .skorlama import ETKI_CEZASI, RISK_CEZASI, score_many, skor_ekle
+
+
+# Şirket listesinin skor sıralama kolonu (skor_ekle: güncel saklanan satır, yoksa SQL'de hesap; NULL olmaz)
+SKOR_SIRA_ALANI = "kayitli_skor"
+
+
+# hesapla_sirket_skoru'nun okuduğu kolonlar (başka alana erişim ek sorgu demektir)
+SKOR_KOLONLARI = (
+    "id", "sirket_id", "is_compliant", "due_date", "risk_level",
+    "duzenleme__id", "duzenleme__title", "duzenleme__impact_type",
+)
+
+
+def yukumluluk_ogesi(obl) -> dict:
+    """Dashboard todo / completed listelerindeki tek yükümlülük satırı."""
+    reg = obl.duzenleme
+    return {
+        "obligation_id": obl.id,
+        "regulation_id": reg.id,
+        "regulation_title": reg.title,
+        "due_date": obl.due_date,
+        "risk_level": obl.risk_level,
+        "impact_type": reg.impact_type,
+    }
+
 
 def hesapla_sirket_skoru(sirket: Sirket, obligations=None):
     """
@@ -56,6 +116,8 @@ def hesapla_sirket_skoru(sirket: Sirket, obligations=None):
             obligations = list(
                 SirketObligation.objects.filter(sirket=sirket, is_applicable=True)
                 .select_related("duzenleme")  # her obligation'ın duzenleme FK'sini tek query’de çek
+                .only(*SKOR_KOLONLARI)        # sadece skor/listeler için gereken kolonlar (raw_text yok)
+                .order_by("pk")               # liste sırası sabit (delta yanıtındaki pozisyonlar buna göre)
             )
     else:
         # dışarıdan gelen iterablesa listeye çevir (tek tip olsun)
@@ -79,11 +141,11 @@ def hesapla_sirket_skoru(sirket: Sirket, obligations=None):
     # Completed listesi (tamamlanmış yükümlülükler)
     completed_items = []
 
-    # Etki tipine göre ceza puanları
-    impact_penalties = {"zorunlu": 15, "risk": 10, "opsiyonel_tesvik": 5}
+    # Etki tipine göre ceza puanları (SirketSkoru ile aynı sabitler: skorlama.py)
+    impact_penalties = ETKI_CEZASI
 
     # Risk seviyesine göre ceza puanları
-    risk_penalties = {"low": 0, "medium": 3, "high": 7}
+    risk_penalties = RISK_CEZASI
 
     # Şirketin tüm obligations’ları üzerinde dolaş
     for obl in obligations:
@@ -91,14 +153,7 @@ def hesapla_sirket_skoru(sirket: Sirket, obligations=None):
 
         # Eğer yükümlülük tamamlandıysa completed listesine ekle
         if obl.is_compliant:
-            completed_items.append({
-                "obligation_id": obl.id,
-                "regulation_id": reg.id,
-                "regulation_title": reg.title,
-                "due_date": obl.due_date,
-                "risk_level": obl.risk_level,
-                "impact_type": reg.impact_type,
-            })
+            completed_items.append(yukumluluk_ogesi(obl))
 
             # Opsiyonel teşvik tamamlandıysa küçük bonus ver
             if reg.impact_type == "opsiyonel_tesvik":
@@ -131,14 +186,7 @@ def hesapla_sirket_skoru(sirket: Sirket, obligations=None):
         score -= (impact_pen + risk_pen + date_pen)
 
         # TODO listesine ekle
-        todo_items.append({
-            "obligation_id": obl.id,
-            "regulation_id": reg.id,
-            "regulation_title": reg.title,
-            "due_date": obl.due_date,
-            "risk_level": obl.risk_level,
-            "impact_type": reg.impact_type,
-        })
+        todo_items.append(yukumluluk_ogesi(obl))
 
     # Skoru 0-100 aralığına sıkıştır
     score = max(0, min(100, score))
@@ -166,8 +214,13 @@ def build_dashboard_payload(sirket: Sirket):
     """
     sonuc = hesapla_sirket_skoru(sirket)
 
+    # Şirket alanları derlenmiş eşlemciyle (SirketSerializer çıktısının aynısı);
+    # skor az önce hesaplandı, ikinci kez hesaplanmaz
+    sirket_data = eslemci(SirketSerializer).nesneden(sirket)
+    sirket_data["compliance_score"] = sonuc["score"]
+
     return {
-        "sirket": SirketSerializer(sirket).data,  # şirket bilgileri JSON
+        "sirket": sirket_data,                    # şirket bilgileri JSON
         "uyum_skoru": sonuc["score"],             # UI’da gösterilecek skor
         "stats": sonuc["stats"],                  # istatistikler
         "todo": sonuc["todo"],                    # yapılacaklar
@@ -175,15 +228,115 @@ def build_dashboard_payload(sirket: Sirket):
     }
 
 
+# =========================
+# Koşullu GET
+# =========================
+
+def _panel_dogrulayici(request, pk):
+    # condition() ETag ve Last-Modified'ı ayrı ayrı sorar: istek başına bir kez hesaplansın
+    if not hasattr(request, "_dogrulayici"):
+        request._dogrulayici = panel_onbellek.dogrulayici(pk)
+    return request._dogrulayici
+
+
+def _liste_dogrulayici(request, *args, **kwargs):
+    if not hasattr(request, "_dogrulayici"):
+        # Aynı URL'nin farklı filtreleri / gösterimleri (DRF browsable API) ayrı ETag alır
+        anahtar = (request.get_full_path(), request.META.get("HTTP_ACCEPT", ""))
+        request._dogrulayici = panel_onbellek.liste_dogrulayici(anahtar)
+    return request._dogrulayici
+
+
+def _duzenleme_liste_dogrulayici(request, *args, **kwargs):
+    if not hasattr(request, "_dogrulayici"):
+        anahtar = (request.get_full_path(), request.META.get("HTTP_ACCEPT", ""))
+        try:
+            duzenlemeler = etiket_indeksi.filtrele(Duzenleme.objects.all(), request.GET)
+        except etiket_indeksi.GecersizFiltre:
+            # Doğrulayıcı yok: view çalışır, 400 döner
+            request._dogrulayici = (None, None)
+        else:
+            request._dogrulayici = panel_onbellek.duzenleme_liste_dogrulayici(duzenlemeler, anahtar)
+    return request._dogrulayici
+
+
+def kosullu_get(dogrulayici):
+    """
+    View'e strong ETag + Last-Modified ekler; If-None-Match / If-Modified-Since tutarsa
+    view hiç çalışmadan 304 döner (skor / payload hesaplanmaz).
+    Cache-Control: private, no-cache → tarayıcı yanıtı saklar ama her kullanımda doğrular
+    (fetch() 304'ü kendisi çözüp saklanan gövdeyi verir; SPA tarafında değişiklik gerekmez).
+    """
+    def decorator(view):
+        kosullu = condition(
+            etag_func=lambda request, *a, **kw: dogrulayici(request, *a, **kw)[0],
+            last_modified_func=lambda request, *a, **kw: dogrulayici(request, *a, **kw)[1],
+        )(view)
+
+        @wraps(view)
+        def sarmalayici(request, *args, **kwargs):
+            response = kosullu(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return sarmalayici
+
+    return decorator
+
+
 @require_http_methods(["GET"])
+@kosullu_get(_panel_dogrulayici)
 def Sirket_dashboard(request, pk):
     """
     Django view: GET /api/companies/<pk>/dashboard/
-    JSON dashboard döndürür.
+    JSON dashboard döndürür (önbellekte geçerli kayıt varsa DB'ye hiç gitmez).
     """
-    sirket = get_object_or_404(Sirket, pk=pk)      # şirket yoksa 404
-    payload = build_dashboard_payload(sirket)      # ortak payload
-    return JsonResponse(payload, json_dumps_params={"ensure_ascii": False})  # Türkçe düzgün
+    payload = panel_onbellek.getir(
+        pk, lambda: build_dashboard_payload(get_object_or_404(Sirket, pk=pk))  # şirket yoksa 404
+    )
+    return hizli_json.yanit(request, payload)  # orjson, Türkçe karakterler kaçışsız
+
+
+def build_status_delta(obligation, onceki_durum: bool):
+    """
+    Durum değişikliğinin dashboard'a etkisi (tam payload yerine):
+    - moved: öğe hangi listeden hangisine, eski / yeni listedeki sırası (listeler pk sıralı) + öğenin kendisi;
+      durum değişmediyse veya yükümlülük uygulanabilir değilse (listelerde yok) None
+    - uyum_skoru / stats: saklanan skor satırından (save() farkı zaten uyguladı), yükümlülükler okunmaz
+    """
+    skor = score_many([obligation.sirket_id])[obligation.sirket_id]
+
+    moved = None
+    if obligation.is_applicable and onceki_durum != obligation.is_compliant:
+        # Öğeden önce gelen (küçük pk'lı) tamamlanmış / açık yükümlülük sayısı = iki listedeki sırası
+        once = SirketObligation.objects.filter(
+            sirket_id=obligation.sirket_id, is_applicable=True, pk__lt=obligation.pk
+        ).aggregate(
+            tamam=Count("pk", filter=Q(is_compliant=True)),
+            acik=Count("pk", filter=Q(is_compliant=False)),
+        )
+        listeler = {True: ("completed", once["tamam"]), False: ("todo", once["acik"])}
+        (kaynak, eski_sira), (hedef, yeni_sira) = listeler[onceki_durum], listeler[obligation.is_compliant]
+        moved = {
+            "from": kaynak,
+            "from_index": eski_sira,
+            "to": hedef,
+            "to_index": yeni_sira,
+            "item": yukumluluk_ogesi(obligation),
+        }
+
+    return {
+        "mode": "delta",
+        "obligation_id": obligation.pk,
+        "is_compliant": obligation.is_compliant,
+        "moved": moved,
+        "uyum_skoru": skor["score"],
+        "stats": {
+            "total_obligations": skor["total_obligations"],
+            "open_obligations": skor["open_obligations"],
+            "overdue_obligations": skor["overdue_obligations"],
+        },
+    }
 
 
 @api_view(["PATCH"])
@@ -191,115 +344,458 @@ def obligation_status_api(request, pk):
     """
     DRF endpoint: PATCH /api/obligations/<pk>/status/
     Body: {"is_compliant": true/false}
+    - varsayılan: güncel dashboard payload'ının tamamı (eski istemciler için)
+    - ?delta=true: sadece değişen kısım (build_status_delta) → yükümlülük listeleri okunmaz
     """
-    obligation = get_object_or_404(SirketObligation, pk=pk)  # obligation yoksa 404
+    obligation = get_object_or_404(
+        SirketObligation.objects.select_related("sirket", "duzenleme").defer("duzenleme__raw_text"), pk=pk
+    )  # yoksa 404
 
     # Body’den is_compliant al (gelmezse True varsayılmış)
     is_compliant = request.data.get("is_compliant", True)
 
-    # DB’de güncelle
+    # DB’de güncelle: sadece değişen kolon (+ updated_at); skor farkı ve önbellek save() içinde
+    onceki_durum = obligation.is_compliant
     obligation.is_compliant = bool(is_compliant)
-    obligation.save()
+    if obligation.is_compliant != onceki_durum:
+        obligation.save(update_fields=["is_compliant", "updated_at"])
+
+    if request.query_params.get("delta") == "true":
+        return Response(build_status_delta(obligation, onceki_durum), status=status.HTTP_200_OK)
+
+    # Güncel dashboard’u geri döndür (frontend bir daha GET atmak zorunda kalmasın);
+    # save() önbelleği geçersiz kıldı → yeni payload hesaplanıp önbelleğe de yazılır
+    payload = panel_onbellek.getir(obligation.sirket_id, lambda: build_dashboard_payload(obligation.sirket))
+    return Response(payload, status=status.HTTP_200_OK)
+
+
+# Tek toplu istekte en fazla bu kadar yükümlülük (tek UPDATE ... WHERE id IN)
+TOPLU_DURUM_SINIRI = 500
+
+
+def toplu_durum_yaz(hedefler: dict, sirket_id=None) -> dict:
+    """
+    {obligation_id: is_compliant} hedeflerini tek transaction'da uygular:
+    - tek SELECT (eski durum + skor alanları), tek UPDATE ... WHERE id IN (CASE ile iki hedef durum)
+    - şirket skoruna tek fark (skorlama.farklari_uygula), dashboard önbelleği tek geçersiz kılma
+    Tüm yükümlülükler aynı şirketin olmalı (sirket_id verilmezse ilk bulunanınki);
+    bulunamayan / başka şirkete ait olanlar yazılmaz, hatalarda raporlanır.
+    Dönüş: {"sirket_id", "updated": [...], "unchanged": [...], "errors": {id: mesaj}, "onceki": {id: eski durum}}
+    """
+    bugun = date.today()
+    sonuc = {"sirket_id": sirket_id, "updated": [], "unchanged": [], "errors": {}, "onceki": {}}
+    with transaction.atomic():
+        satirlar = {
+            r[0]: r
+            for r in SirketObligation.objects.filter(pk__in=list(hedefler)).select_for_update()
+            .values_list("pk", "sirket_id", "is_applicable", "is_compliant", "duzenleme__impact_type",
+                         "risk_level", "due_date")
+        }
+        fark = skorlama.SIFIR
+        for pk, hedef in hedefler.items():
+            satir = satirlar.get(pk)
+            if satir is None:
+                sonuc["errors"][pk] = "Yükümlülük bulunamadı."
+                continue
+            _, satir_sirket, uygulanabilir, eski, etki, risk, son_tarih = satir
+            if sonuc["sirket_id"] is None:
+                sonuc["sirket_id"] = satir_sirket
+            if satir_sirket != sonuc["sirket_id"]:
+                sonuc["errors"][pk] = "Yükümlülük başka bir şirkete ait."
+                continue
+            if eski == hedef:
+                sonuc["unchanged"].append(pk)
+                continue
+            sonuc["updated"].append(pk)
+            sonuc["onceki"][pk] = eski
+            fark += (skorlama.katki(uygulanabilir, hedef, etki, risk, son_tarih, bugun)
+                     - skorlama.katki(uygulanabilir, eski, etki, risk, son_tarih, bugun))
+
+        if sonuc["updated"]:
+            tamamlanan = [pk for pk in sonuc["updated"] if hedefler[pk]]
+            SirketObligation.objects.filter(pk__in=sonuc["updated"]).update(
+                is_compliant=Case(When(pk__in=tamamlanan, then=Value(True)), default=Value(False)),
+                updated_at=timezone.now(),
+            )
+            # update() save() / sinyal çalıştırmaz: skor ve önbellek burada
+            skorlama.farklari_uygula({sonuc["sirket_id"]: fark}, bugun=bugun)
+            panel_onbellek.gecersiz_kil([sonuc["sirket_id"]])
+    return sonuc
+
+
+def build_bulk_status_delta(sirket_id, onceki: dict) -> dict:
+    """
+    Toplu durum değişikliğinin dashboard'a etkisi: moved listesi (istemci öğeleri id ile
+    çıkarır, sonra to_index sırasıyla ekler) + skor / stats. Listeler yerine sadece
+    şirketin (pk, is_compliant) kolonları okunur.
+    """
+    skor = score_many([sirket_id])[sirket_id]
+    sira = {True: 0, False: 0}
+    hedef_sira = {}
+    for pk, tamam in SirketObligation.objects.filter(sirket_id=sirket_id, is_applicable=True) \
+            .order_by("pk").values_list("pk", "is_compliant"):
+        if pk in onceki:
+            hedef_sira[pk] = (tamam, sira[tamam])
+        sira[tamam] += 1
+
+    ogeler = {
+        o.pk: yukumluluk_ogesi(o)
+        for o in SirketObligation.objects.filter(pk__in=list(hedef_sira)).select_related("duzenleme")
+        .only(*SKOR_KOLONLARI)
+    }
+    liste = {True: "completed", False: "todo"}
+    moved = sorted(
+        (
+            {"obligation_id": pk, "from": liste[onceki[pk]], "to": liste[tamam], "to_index": i, "item": ogeler[pk]}
+            for pk, (tamam, i) in hedef_sira.items()
+        ),
+        key=lambda m: (m["to"], m["to_index"]),
+    )
+    return {
+        "mode": "delta",
+        "moved": moved,
+        "uyum_skoru": skor["score"],
+        "stats": {
+            "total_obligations": skor["total_obligations"],
+            "open_obligations": skor["open_obligations"],
+            "overdue_obligations": skor["overdue_obligations"],
+        },
+    }
+
+
+@api_view(["PATCH"])
+def obligation_bulk_status_api(request):
+    """
+    DRF endpoint: PATCH /api/obligations/bulk-status/
+    Body: {"items": [{"id": 12, "is_compliant": true}, ...]}
+          veya kısaca {"ids": [12, 13], "is_compliant": true}
+          isteğe bağlı "sirket_id" (sayı ya da "5" gibi metin): yükümlülükler bu şirketin olmalı
+    Hepsi tek transaction'da, tek UPDATE ile yazılır; skor bir kez güncellenir.
+    Yanıt: tek dashboard payload'ı (?delta=true → build_bulk_status_delta)
+    + "updated" / "unchanged" id'leri ve id başına "errors".
+    """
+    data = request.data if isinstance(request.data, dict) else {}
+    if "items" in data:
+        items = data["items"]
+    elif "ids" in data:
+        items = [{"id": pk, "is_compliant": data.get("is_compliant", True)} for pk in data["ids"] or []]
+    else:
+        items = None
+    if not isinstance(items, list) or not items:
+        return Response({"detail": "items (veya ids) listesi zorunlu."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > TOPLU_DURUM_SINIRI:
+        return Response({"detail": f"Tek istekte en fazla {TOPLU_DURUM_SINIRI} yükümlülük."},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    # Şirket id'si int'e çevrilir: "5" olduğu gibi karşılaştırılsa her yükümlülük
+    # "başka şirkete ait" sayılırdı
+    sirket_id = data.get("sirket_id")
+    if sirket_id is not None:
+        if isinstance(sirket_id, str) and sirket_id.strip().isdecimal():
+            sirket_id = int(sirket_id)
+        if not isinstance(sirket_id, int) or isinstance(sirket_id, bool):
+            return Response({"sirket_id": ["Geçerli bir şirket id'si olmalı."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+    # Biçim hataları id başına raporlanır, geçerli olanlar yine uygulanır
+    hedefler, hatalar = {}, {}
+    for item in items:
+        if not isinstance(item, dict):
+            hatalar[str(item)] = "Geçersiz öğe: {\"id\": ..., \"is_compliant\": ...} bekleniyor."
+            continue
+        pk = item.get("id")
+        if not isinstance(pk, int) or isinstance(pk, bool):
+            hatalar[str(pk)] = "Geçersiz id."
+        elif not isinstance(item.get("is_compliant"), bool):
+            hatalar[str(pk)] = "is_compliant true/false olmalı."
+        else:
+            hedefler[pk] = item["is_compliant"]  # aynı id tekrar gelirse sonuncusu geçerli
+
+    sonuc = toplu_durum_yaz(hedefler, sirket_id=sirket_id) if hedefler else None
+    if sonuc:
+        hatalar.update({str(pk): mesaj for pk, mesaj in sonuc["errors"].items()})
+    if not sonuc or sonuc["sirket_id"] is None or not (sonuc["updated"] or sonuc["unchanged"]):
+        return Response({"detail": "Uygulanabilir yükümlülük yok.", "errors": hatalar},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    sirket_id = sonuc["sirket_id"]
+    if request.query_params.get("delta") == "true":
+        payload = build_bulk_status_delta(sirket_id, sonuc["onceki"])
+    else:
+        payload = panel_onbellek.getir(
+            sirket_id, lambda: build_dashboard_payload(Sirket.objects.get(pk=sirket_id))
+        )
+    return Response(
+        {**payload, "updated": sonuc["updated"], "unchanged": sonuc["unchanged"], "errors": hatalar},
+        status=status.HTTP_200_OK,
+    )
 
-    # Güncel dashboard’u geri döndür (frontend bir daha GET atmak zorunda kalmasın)
-    return Response(build_dashboard_payload(obligation.sirket), status=status.HTTP_200_OK)
+
+class SeyrekAlanlarViewMixin:
+    """
+    GET'te queryset'i serializer'ın seçili alanlarına daraltır (?fields= / ?include=,
+    serilestiriciler.SeyrekAlanlarMixin): seçilmeyen kolonlar DB'den okunmaz.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method == "GET":
+            qs = self.get_serializer().sorguyu_daralt(qs)
+        return qs
+
+
+def sayfali_yanit(request, sonuclar, sonraki, boyut) -> dict:
+    """
+    Cursor sayfalı liste gövdesi: {"results", "next", "page_size"}.
+    next: aynı filtrelerle sonraki sayfanın tam URL'si (son sayfada None).
+    """
+    return {
+        "results": sonuclar,
+        "next": replace_query_param(request.build_absolute_uri(), "cursor", sonraki) if sonraki else None,
+        "page_size": boyut,
+    }
 
 
 # /api/companies/  -> şirket listele + oluştur
-class SirketListCreateView(generics.ListCreateAPIView):
+@method_decorator(kosullu_get(_liste_dogrulayici), name="get")
+class SirketListCreateView(SeyrekAlanlarViewMixin, generics.ListCreateAPIView):
     # Varsayılan query: tüm şirketleri id desc sırala
     queryset = Sirket.objects.all().order_by("-id")
 
     # Şirket serializer'ı (name, sector vs. döndüren)
     serializer_class = SirketSerializer
 
+    def perform_create(self, serializer):
+        # Yeni şirket: sektörüne / ihracatçılığına uyan mevcut düzenlemelerden yükümlülük hemen aç.
+        # Eşleştirme burada yapıldığı için save() şirketi yeniden eşleştirme kuyruğuna eklemez
+        # (yoksa arka plan işi aynı eşleştirmeyi ikinci kez yapar).
+        with transaction.atomic():
+            sirket = Sirket(**serializer.validated_data)
+            sirket.save(eslesme_kuyrugu=False)
+            serializer.instance = sirket
+            yukumlulukleri_uret(sirketler=Sirket.objects.filter(pk=sirket.pk))
+
     def list(self, request, *args, **kwargs):
         """
         Şirket listesi endpoint'i:
         - ?sector=yazilim   → sektöre göre filtre
         - ?risky=true       → compliance_score < threshold olanları getir
         - ?threshold=70     → eşiği override et (default 80)
-
-        ✅ Bu fonksiyon ayrıca her şirkete "compliance_score" alanı gömer
-        (React CompaniesList.jsx bunu ekranda gösterir)
+        - ?ordering=score / -score → skora göre sırala (varsayılan: id desc)
+        - ?fields=id,name,compliance_score → sadece bu alanlar (okunmayan kolonlar defer)
+        - ?page_size=50 / ?cursor=... → keyset sayfalama (ikisi de yoksa tüm liste, düz dizi)
+          Yanıt {"results", "next", "page_size"}; next URL'si filtreleri ve sıralamayı korur.
+
+        ✅ Her şirkete "compliance_score" alanı gömülür (React CompaniesList.jsx bunu ekranda gösterir).
+        Skor her istekte hesaplanmaz: bugün için hesaplanmış SirketSkoru satırından okunur; satırı
+        olmayan / eski günde kalmış şirketlerde aynı sorguda SQL'de hesaplanır (skorlama.skor_ekle).
+        Eşik filtresi, sıralama ve sayfalama bu değer üzerinden SQL'de yapılır (dashboard ile aynı skor).
         """
 
-        # 1) Temel query'yi al (Sirket.objects...)
-        queryset = self.get_queryset()
+        # 1) Temel query + skor (serializer "kayitli_skor"u kullanır)
+        queryset = skor_ekle(self.get_queryset())
 
         # 2) Query parametrelerini al
         sector = request.query_params.get("sector")
         risky = request.query_params.get("risky")
         threshold_param = request.query_params.get("threshold")
+        ordering = request.query_params.get("ordering")
 
         # 3) Sektör filtresi (seçilmişse)
         if sector:
             queryset = queryset.filter(sector=sector)
 
-        # 4) Performans: tüm seçili şirketlerin id'lerini al
-        # (obligation'ları tek seferde çekebilmek için)
-        sirket_ids = list(queryset.values_list("id", flat=True))
-
-        # 5) Seçili şirketlere ait tüm obligations'ları tek query ile çek
-        # (N+1 probleminden kaçınmak için)
-        ob_qs = SirketObligation.objects.filter(
-            sirket_id__in=sirket_ids,
-            is_applicable=True,
-        ).select_related("duzenleme")  # duzenleme'yi de yanına al
-
-        # 6) obligations'ları şirket bazında grupla: { company_id: [ob1, ob2, ...] }
-        by_company = defaultdict(list)
-        for ob in ob_qs:
-            by_company[ob.sirket_id].append(ob)
-
-        # 7) Şirket listesini serializer ile JSON'a çevir
-        serializer = self.get_serializer(queryset, many=True)
-        data = list(serializer.data)  # dict listesi
-
-        # 8) Her şirket için skor hesapla (hazır grouped obligations ile)
-        score_map = {}
-        for s in queryset:
-            sonuc = hesapla_sirket_skoru(s, obligations=by_company.get(s.id, []))
-            score_map[s.id] = sonuc["score"]  # 0-100 arası skor
-
-        # 9) Serializer'dan gelen her şirkete compliance_score alanını ekle
-        for item in data:
-            cid = item.get("id")
-            item["compliance_score"] = score_map.get(cid, 100)  # obligations yoksa default 100
-
-        # 10) Eğer risky=true ise eşik altını filtrele
+        # 4) Eğer risky=true ise eşik altını filtrele (DB'de)
         if risky == "true":
             try:
                 threshold = int(threshold_param) if threshold_param is not None else 80
             except ValueError:
                 threshold = 80
+            queryset = queryset.filter(kayitli_skor__lt=threshold)
+
+        # 5) Skora göre sıralama (eşit skorda en yeni şirket önce)
+        sira = ("-id",)
+        if ordering in ("score", "-score"):
+            sira = (ordering.replace("score", SKOR_SIRA_ALANI), "-id")
 
-            # sadece compliance_score < threshold olanları bırak
-            data = [item for item in data if item["compliance_score"] < threshold]
+        # 6) Satırlar model nesnesi değil values() dict'i olarak okunur; serializer çıktısı
+        #    derlenmiş eşlemciyle üretilir (?fields= seçimi dahil, çıktı SirketSerializer'ınkiyle aynı)
+        alanlar = eslemci(SirketSerializer, tuple(self.get_serializer().fields))
+        satirlar = alanlar.sorgu(queryset)
 
-        # 11) JSON response döndür
-        return Response(data)
+        # 7) Sayfalama istenmişse tek LIMIT'li sorgu, yoksa tüm liste
+        if sayfalama.istendi_mi(request.query_params):
+            try:
+                satirlar, sonraki, boyut = sayfalama.sayfala(satirlar, sira, request.query_params)
+            except sayfalama.GecersizCursor as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(sayfali_yanit(request, alanlar.coklu(satirlar), sonraki, boyut))
 
+        # 8) JSON response döndür
+        satirlar = sayfalama.sirala(satirlar, sira)
+        return Response(alanlar.coklu(satirlar))
 
 
 # /api/companies/<id>/  -> şirket getir/güncelle/sil
-class SirketDetailView(generics.RetrieveUpdateDestroyAPIView):
+class SirketDetailView(SeyrekAlanlarViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Sirket.objects.all()
     serializer_class = SirketSerializer
 
+    def get_queryset(self):
+        # Skor aynı sorguda gelir (serializer ayrıca skor sorgusu atmaz); gün istek anında
+        return skor_ekle(super().get_queryset())
+
+
+# Toplu içe aktarım yanıtında listelenen en fazla hatalı satır ("invalid" hepsini sayar)
+ICE_AKTARIM_HATA_SINIRI = 1000
+
+
+@api_view(["POST"])
+def companies_import_api(request):
+    """
+    DRF endpoint: POST /api/companies/import/[?match=true][&dry_run=true][&format=csv|json|ndjson]
+    Gövde:
+      - multipart "file": CSV (başlıklı; "," / ";" / tab) / JSON dizisi / NDJSON, UTF-8
+        (biçim uzantıdan ya da içerik türünden; büyük dosyalar için bu yol: gövde boyut
+        sınırına — DATA_UPLOAD_MAX_MEMORY_SIZE — takılmaz, CSV / NDJSON satır satır okunur)
+      - ya da JSON: [{"name", "sector", "employee_count", "location_city", ["is_exporter"], ["unvan"]}, ...]
+        veya {"items": [...]}
+    Geçerli satırlar batch'ler halinde bulk_create ile yazılır, hatalı satırlar atlanıp raporlanır
+    (ice_aktarim). match=true → yeni şirketlere yükümlülük de açılır; dry_run=true → sadece doğrulama.
+    Yanıt: {"rows", "valid", "created", "invalid", "obligations", "errors": [{"row", "errors"}, ...]}
+    201: en az bir şirket oluştu; 200: dry_run; 400: dosya okunamadı ya da geçerli satır yok.
+    """
+    eslestir = request.query_params.get("match") == "true"
+    dry_run = request.query_params.get("dry_run") == "true"
+    try:
+        if "file" in request.FILES:
+            dosya = request.FILES["file"]
+            bicim = request.query_params.get("format") or ice_aktarim.bicim_tahmin(dosya.name, dosya.content_type)
+            if bicim is None:
+                return Response({"detail": "Dosya biçimi anlaşılamadı: ?format=csv|json|ndjson verin."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            satirlar = ice_aktarim.satirlari_oku(dosya, bicim)
+        else:
+            satirlar = ice_aktarim.json_ogeleri(request.data)
+        sonuc = ice_aktarim.ice_aktar(
+            satirlar, eslestir=eslestir, dry_run=dry_run, hata_siniri=ICE_AKTARIM_HATA_SINIRI
+        )
+    except ice_aktarim.GecersizDosya as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not sonuc["rows"]:
+        return Response({"detail": "İçe aktarılacak satır yok.", **sonuc}, status=status.HTTP_400_BAD_REQUEST)
+    if dry_run:
+        return Response(sonuc, status=status.HTTP_200_OK)
+    if not sonuc["created"]:
+        return Response({"detail": "Geçerli satır yok.", **sonuc}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(sonuc, status=status.HTTP_201_CREATED)
+
 
 # /api/Duzenlemes/ -> mevzuat listele/oluştur
-class DuzenlemeListCreateView(generics.ListCreateAPIView):
-    queryset = Duzenleme.objects.all().order_by("-publish_date")
+@method_decorator(kosullu_get(_duzenleme_liste_dogrulayici), name="get")
+class DuzenlemeListCreateView(SeyrekAlanlarViewMixin, generics.ListCreateAPIView):
+    # Aynı gün yayımlanan düzenlemeler id ile sıralanır (keyset sayfalama benzersiz sıra ister)
+    SIRA = ("-publish_date", "-id")
+
+    queryset = Duzenleme.objects.all().order_by(*SIRA)
     serializer_class = DuzenlemeSerializer
 
+    def get_serializer_class(self):
+        # Liste hafif gösterimle (raw_text yok, ?include=raw_text ile gelir); oluşturma tam serializer
+        return DuzenlemeListeSerializer if self.request.method == "GET" else DuzenlemeSerializer
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method == "GET":
+            try:
+                qs = etiket_indeksi.filtrele(
+                    qs, self.request.query_params, sayfali=sayfalama.istendi_mi(self.request.query_params)
+                )
+            except etiket_indeksi.GecersizFiltre as e:
+                raise ValidationError({e.param: [str(e)]})
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        """
+        Düzenleme listesi (yeni yayımlanan önce, tam metin hariç).
+        - ?tag=KDV&sector=imalat&impact_type=zorunlu&date_from=2025-01-01&date_to=2025-12-31
+          → filtreler (etiket / sektör indeksli izdüşüm tablolarıyla JOIN, etiket_indeksi)
+        - ?fields=id,title / ?include=raw_text → alan seçimi (SeyrekAlanlarMixin)
+        - ?page_size=50 / ?cursor=... → keyset sayfalama, yanıt {"results", "next", "page_size"}
+          (ikisi de yoksa tüm liste, düz dizi)
+        """
+        if not sayfalama.istendi_mi(request.query_params):
+            return super().list(request, *args, **kwargs)
+        try:
+            duzenlemeler, sonraki, boyut = sayfalama.sayfala(self.get_queryset(), self.SIRA, request.query_params)
+        except sayfalama.GecersizCursor as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(duzenlemeler, many=True)
+        return Response(sayfali_yanit(request, serializer.data, sonraki, boyut))
+
 
 # /api/Duzenlemes/<id>/ -> mevzuat getir/güncelle/sil
-class DuzenlemeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DuzenlemeDetailView(SeyrekAlanlarViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Duzenleme.objects.all()
     serializer_class = DuzenlemeSerializer
 
 
+@api_view(["GET"])
+def duzenleme_search_api(request):
+    """
+    DRF endpoint: GET /api/Duzenlemes/search/?q=kdv iade&limit=20&offset=0
+    FTS5 indeksinde sıralı (bm25) arama yapar.
+    - Türkçe harf duyarsız: "ihracatci" → "İhracatçı"
+    - Her kelime önek olarak aranır, kelimeler arasında VE vardır
+    - snippet: eşleşmenin çevresi, eşleşen kelimeler <mark> içinde
+    """
+    q = (request.query_params.get("q") or "").strip()
+    if not q:
+        return Response({"detail": "q parametresi zorunlu."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Sayfalama parametreleri (hatalıysa varsayılan)
+    try:
+        limit = max(1, min(100, int(request.query_params.get("limit", 20))))
+    except ValueError:
+        limit = 20
+    try:
+        offset = max(0, int(request.query_params.get("offset", 0)))
+    except ValueError:
+        offset = 0
+
+    if arama.fts_kullanilabilir():
+        # 1) FTS: sıralı id listesi (metin yüklenmez)
+        toplam, sonuclar = arama.ara(q, limit=limit, offset=offset)
+        skorlar = dict(sonuclar)
+        ids = [pk for pk, _ in sonuclar]
+        rows = {d.id: d for d in Duzenleme.objects.filter(id__in=ids)}
+        sirali = [rows[pk] for pk in ids if pk in rows]
+    else:
+        # 2) Yedek: FTS yoksa başlıkta LIKE taraması (sadece SQLite dışı DB'ler için;
+        #    raw_text sıkıştırılmış saklandığı için metin içinde LIKE yapılamaz)
+        qs = Duzenleme.objects.filter(title__icontains=q).order_by("-publish_date")
+        toplam = qs.count()
+        sirali = list(qs[offset:offset + limit])
+        skorlar = {}
+
+    results = [
+        {
+            "id": d.id,
+            "title": d.title,
+            "source": d.source,
+            "publish_date": d.publish_date,
+            "impact_type": d.impact_type,
+            "url": d.url,
+            "rank": skorlar.get(d.id),
+            "snippet": arama.snippet(d.raw_text, q),
+        }
+        for d in sirali
+    ]
+
+    return Response({"count": toplam, "limit": limit, "offset": offset, "results": results})
+
+
 def sirket_dashboard_page(request, pk):
     """
     Django HTML panel:
@@ -328,29 +824,12 @@ def sirket_list_page(request):
     """
     selected_sector = request.GET.get("sector")
 
-    sirket_qs = Sirket.objects.all().order_by("name")
+    # Skorlar saklanan tablodan gelir (yükümlülükler okunmaz)
+    sirket_qs = skor_ekle(Sirket.objects.all()).order_by("name")
     if selected_sector:
         sirket_qs = sirket_qs.filter(sector=selected_sector)
 
-    # N+1 engellemek için: şirket id’lerini al
-    sirket_ids = list(sirket_qs.values_list("id", flat=True))
-
-    # Tüm obligations’ları tek seferde çek
-    ob_qs = SirketObligation.objects.filter(
-        sirket_id__in=sirket_ids,
-        is_applicable=True,
-    ).select_related("duzenleme")
-
-    # company_id -> obligations listesi
-    by_company = defaultdict(list)
-    for ob in ob_qs:
-        by_company[ob.sirket_id].append(ob)
-
-    # Her şirket için skor hesapla (DB’ye tekrar gitmeden)
-    sirketler = []
-    for s in sirket_qs:
-        sonuc = hesapla_sirket_skoru(s, obligations=by_company.get(s.id, []))
-        sirketler.append({"sirket": s, "score": sonuc["score"]})
+    sirketler = [{"sirket": s, "score": s.kayitli_skor} for s in sirket_qs]
 
     context = {
         "sirketler": sirketler,
@@ -371,17 +850,9 @@ def sirket_riskli_list_page(request):
     except ValueError:
         threshold = 80
 
-    sirket_qs = Sirket.objects.all().order_by("name")
-
-    # Eşik altı şirketleri topla
-    sirketler = []
-    for s in sirket_qs:
-        sonuc = hesapla_sirket_skoru(s)
-        if sonuc["score"] < threshold:
-            sirketler.append({
-                "sirket": s,
-                "score": sonuc["score"],
-            })
+    # Eşik altı şirketler: liste API'si ve dashboard ile aynı skor (güncel satır, yoksa SQL'de hesap)
+    sirket_qs = skor_ekle(Sirket.objects.all()).filter(kayitli_skor__lt=threshold).order_by("name")
+    sirketler = [{"sirket": s, "score": s.kayitli_skor} for s in sirket_qs]
 
     context = {
         "sirketler": sirketler,
@@ -440,28 +911,65 @@ def companies_spa_detail(request, pk):
 
 
 @require_http_methods(["GET"])
+@kosullu_get(_panel_dogrulayici)
 def sirket_dashboard_api(request, pk):
     """
     GET dashboard JSON (SPA’nın çağırdığı endpoint olarak da kullanılabilir).
     """
-    sirket = get_object_or_404(Sirket, pk=pk)
-    payload = build_dashboard_payload(sirket)
-    return JsonResponse(payload, json_dumps_params={"ensure_ascii": False})
+    payload = panel_onbellek.getir(pk, lambda: build_dashboard_payload(get_object_or_404(Sirket, pk=pk)))
+    return hizli_json.yanit(request, payload)
 
 
 @require_http_methods(["GET"])
+@kosullu_get(_liste_dogrulayici)
 def companies_spa_list_api(request):
-    qs = Sirket.objects.all().order_by("id")
-
-    # hesaplanan skoru da gömelim (uyum_skoru)
-    data = []
-    for s in qs:
-        sonuc = hesapla_sirket_skoru(s)
-        data.append({
-            "id": s.id,
-            "name": s.name,
-            "sector": s.sector,
-            "uyum_skoru": sonuc["score"],
-        })
-
-    return JsonResponse(data, safe=False, json_dumps_params={"ensure_ascii": False})
+    """
+    SPA şirket listesi (id artan, saklanan skor "uyum_skoru" olarak).
+    ?page_size= / ?cursor= verilirse keyset sayfalı: {"results", "next", "page_size"}.
+    """
+    # saklanan skoru da gömelim (uyum_skoru)
+    qs = skor_ekle(Sirket.objects.all()).values("id", "name", "sector", uyum_skoru=F("kayitli_skor"))
+
+    if sayfalama.istendi_mi(request.GET):
+        try:
+            data, sonraki, boyut = sayfalama.sayfala(qs, ("id",), request.GET)
+        except sayfalama.GecersizCursor as e:
+            return JsonResponse({"detail": str(e)}, status=400)
+        return hizli_json.yanit(request, sayfali_yanit(request, data, sonraki, boyut))
+
+    data = list(qs.order_by("id"))
+
+    return hizli_json.yanit(request, data)
+
+
+@require_http_methods(["GET"])
+def portfolio_export_api(request):
+    """
+    GET /api/export/portfolio/?format=ndjson|csv[&sector=imalat]
+    Tüm şirketler + skor + sayaçlar + açık yükümlülükler, akış halinde (disa_aktarim):
+    satırlar DB'den parça parça okunurken yazılır, bellek şirket / yükümlülük sayısından bağımsız.
+    ndjson: şirket başına bir JSON satırı; csv: açık yükümlülük başına bir satır.
+    """
+    bicim = request.GET.get("format", "ndjson")
+    if bicim not in disa_aktarim.BICIMLER:
+        return JsonResponse({"detail": "format ndjson ya da csv olmalı."}, status=400)
+
+    sirketler = None
+    if request.GET.get("sector"):
+        sirketler = Sirket.objects.filter(sector=request.GET["sector"])
+
+    icerik_turu = "text/csv; charset=utf-8" if bicim == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(disa_aktarim.akis(bicim, sirketler=sirketler), content_type=icerik_turu)
+    response["Content-Disposition"] = f'attachment; filename="portfolio-{date.today():%Y%m%d}.{bicim}"'
+    # Ters vekil (nginx) yanıtı tamponlamasın: ilk satır hemen istemciye gitsin
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_http_methods(["GET"])
+def metrics_api(request):
+    """
+    GET /api/metrics/ → bu sürecin çalışma sayaçları (izleme / scrape için).
+    dashboard_cache: isabet oranı, yeniden hesaplama sayısı ve süresi (panel_onbellek.sayaclar)
+    """
+    return JsonResponse({"dashboard_cache": panel_onbellek.sayaclar()})